@@ -436,7 +436,7 @@ const KanbanView = ({ onRowClick, onAction, actionLoading, refresh }) => {
   useEffect(() => {
     setLoading(true);
     dispatchService.getKanban()
-      .then(res => setKanban(res.data || {}))
+      .then(res => setKanban(res.data?.columns || {}))
       .catch(() => {})
       .finally(() => setLoading(false));
   }, [refresh]);
@@ -450,13 +450,13 @@ const KanbanView = ({ onRowClick, onAction, actionLoading, refresh }) => {
   return (
     <div className="flex gap-3 overflow-x-auto pb-2">
       {KANBAN_COLS.map(({ key, label, color }) => {
-        const cards = kanban[key] || [];
+        const cards = kanban[key]?.results || [];
         return (
           <div key={key} className="flex-shrink-0 w-64">
             <div className={cn('rounded-lg border-t-2 bg-muted/30 border border-border', color)}>
               <div className="px-3 py-2 flex items-center justify-between border-b border-border">
                 <span className="text-xs font-semibold">{label}</span>
-                <span className="text-xs bg-muted rounded-full px-2 py-0.5 font-mono">{cards.length}</span>
+                <span className="text-xs bg-muted rounded-full px-2 py-0.5 font-mono">{kanban[key]?.count ?? cards.length}</span>
               </div>
               <div className="p-2 space-y-2 max-h-[60vh] overflow-y-auto">
                 {cards.length === 0 ? (
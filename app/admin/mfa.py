@@ -26,6 +26,7 @@ from app.api.services.auth_service import (
 )
 from app.models.auth_security import MFADevice, MFABackupCode, WebAuthnCredential
 from app.models.security import AuditLog
+from app.services.rate_limiter import SlidingWindowLimiter
 
 logger = logging.getLogger(__name__)
 
@@ -53,50 +54,33 @@ def _audit(user, action, request, details=None):
     )
 
 
-def _get_attempt_key(request, prefix='mfa'):
-    """Session key for brute-force tracking."""
-    return f'_admin_{prefix}_attempts'
-
-
-def _get_lockout_key(request, prefix='mfa'):
-    """Session key for lockout timestamp."""
-    return f'_admin_{prefix}_lockout_until'
+def _limiter(prefix='mfa'):
+    """Failed-attempt window for one admin MFA step (shared across sessions)."""
+    return SlidingWindowLimiter(f'admin-{prefix}', MAX_ATTEMPTS, LOCKOUT_MINUTES * 60)
 
 
 def _is_locked_out(request, prefix='mfa'):
     """Check if user is currently locked out."""
-    lockout_until = request.session.get(_get_lockout_key(request, prefix))
-    if lockout_until:
-        if timezone.now().isoformat() < lockout_until:
-            return True
-        # Lockout expired — clear
-        request.session.pop(_get_lockout_key(request, prefix), None)
-        request.session.pop(_get_attempt_key(request, prefix), None)
-    return False
+    return _limiter(prefix).is_locked(request.user.pk)
 
 
 def _record_failed_attempt(request, prefix='mfa'):
     """Record a failed attempt. Returns (is_now_locked, attempts_remaining)."""
-    key = _get_attempt_key(request, prefix)
-    attempts = request.session.get(key, 0) + 1
-    request.session[key] = attempts
+    locked, remaining = _limiter(prefix).hit(request.user.pk)
 
-    if attempts >= MAX_ATTEMPTS:
-        lockout = timezone.now() + timedelta(minutes=LOCKOUT_MINUTES)
-        request.session[_get_lockout_key(request, prefix)] = lockout.isoformat()
+    if locked:
         _audit(request.user, f'LOCKOUT_{prefix.upper()}', request, {
-            'attempts': attempts,
+            'attempts': MAX_ATTEMPTS,
             'lockout_minutes': LOCKOUT_MINUTES,
         })
         return True, 0
 
-    return False, MAX_ATTEMPTS - attempts
+    return False, remaining
 
 
 def _clear_attempts(request, prefix='mfa'):
     """Clear attempt counter on success."""
-    request.session.pop(_get_attempt_key(request, prefix), None)
-    request.session.pop(_get_lockout_key(request, prefix), None)
+    _limiter(prefix).reset(request.user.pk)
 
 
 def _validate_code(code):
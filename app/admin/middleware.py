@@ -39,11 +39,8 @@ class AdminMFAMiddleware:
         if request.session.get('admin_mfa_verified'):
             return self.get_response(request)
 
-        from app.models.auth_security import MFADevice, WebAuthnCredential
-        has_totp = MFADevice.objects.filter(user=user, is_verified=True).exists()
-        has_webauthn = WebAuthnCredential.objects.filter(user=user).exists()
-
-        if has_totp or has_webauthn:
+        from app.services import auth_state
+        if auth_state.has_any_mfa(user):
             return redirect(reverse('admin_mfa:verify'))
         else:
             # No MFA configured — fallback to email OTP
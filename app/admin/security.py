@@ -33,7 +33,7 @@ class APIKeyAdmin(admin.ModelAdmin):
                    'expires_formatted', 'last_used_formatted')
     list_filter = (ExpiresFilter, 'is_active', 'created_at', 'app_name')
     search_fields = ('name', 'app_name', 'user__username', 'user__email')
-    readonly_fields = ('id', 'key', 'created_at', 'last_used')
+    readonly_fields = ('id', 'prefix', 'created_at', 'last_used', 'use_count')
     actions = ['activate_keys', 'deactivate_keys', 'extend_expiration']
     save_as = True  # Permet de dupliquer une clé existante
     
@@ -45,7 +45,7 @@ class APIKeyAdmin(admin.ModelAdmin):
                     'fields': ('name', 'app_name', 'user')
                 }),
                 (_('Détails de la clé'), {
-                    'fields': ('key', 'is_active'),
+                    'fields': ('prefix', 'is_active', 'use_count'),
                 }),
                 (_('Dates'), {
                     'fields': ('created_at', 'expires_at', 'last_used'),
@@ -73,7 +73,7 @@ class APIKeyAdmin(admin.ModelAdmin):
     def save_model(self, request, obj, form, change):
         """Génère automatiquement une nouvelle clé API lors de la création"""
         if not change:  # Création d'un nouvel objet
-            obj.key = models.APIKey.generate_key()
+            raw_key = obj.set_key()
             
             # Afficher un message à l'utilisateur avec la clé générée
             self.message_user(
@@ -83,7 +83,7 @@ class APIKeyAdmin(admin.ModelAdmin):
                     'padding: 4px 8px; border-radius: 4px; font-family: monospace;">{}</code><br>'
                     '<small style="color: #dc3545;">⚠️ Copiez cette clé maintenant car elle ne sera plus visible '
                     'entièrement par la suite.</small>',
-                    obj.key
+                    raw_key
                 ),
                 level='SUCCESS'
             )
@@ -94,7 +94,7 @@ class APIKeyAdmin(admin.ModelAdmin):
         return format_html(
             '<span style="font-family: monospace; background: #f8f9fa; padding: 3px 8px; '
             'border-radius: 3px; border: 1px solid #dee2e6;">{}</span>',
-            f"{obj.key[:8]}...{obj.key[-4:]}"
+            f"{obj.prefix}..."
         )
     masked_key.short_description = _('Clé API')
     
@@ -1,5 +1,6 @@
 from django.contrib import admin
 from django import forms
+from django.utils import timezone
 from django.utils.html import format_html
 from django.contrib import messages
 from django.core.exceptions import ValidationError
@@ -334,27 +335,27 @@ class AssignmentAdmin(AssignmentAdminMixin, admin.ModelAdmin):
     actions = ['mark_as_paid', 'mark_as_confirmed', 'mark_as_completed', 'mark_as_cancelled', 'mark_as_no_show']
 
     def mark_as_paid(self, request, queryset):
-        rows_updated = queryset.update(is_paid=True)
+        rows_updated = queryset.update(is_paid=True, updated_at=timezone.now())
         self.message_user(request, f"{rows_updated} assignment(s) successfully marked as paid.")
     mark_as_paid.short_description = "💰 Mark selected assignments as Paid"
 
     def mark_as_confirmed(self, request, queryset):
-        rows_updated = queryset.update(status='CONFIRMED')
+        rows_updated = queryset.update(status='CONFIRMED', updated_at=timezone.now())
         self.message_user(request, f"{rows_updated} assignment(s) successfully marked as confirmed.")
     mark_as_confirmed.short_description = "✅ Mark selected assignments as Confirmed"
 
     def mark_as_completed(self, request, queryset):
-        rows_updated = queryset.update(status='COMPLETED')
+        rows_updated = queryset.update(status='COMPLETED', updated_at=timezone.now())
         self.message_user(request, f"{rows_updated} assignment(s) successfully marked as completed.")
     mark_as_completed.short_description = "🏁 Mark selected assignments as Completed"
 
     def mark_as_cancelled(self, request, queryset):
-        rows_updated = queryset.update(status='CANCELLED')
+        rows_updated = queryset.update(status='CANCELLED', updated_at=timezone.now())
         self.message_user(request, f"{rows_updated} assignment(s) successfully marked as cancelled.")
     mark_as_cancelled.short_description = "❌ Mark selected assignments as Cancelled"
 
     def mark_as_no_show(self, request, queryset):
-        rows_updated = queryset.update(status='NO_SHOW')
+        rows_updated = queryset.update(status='NO_SHOW', updated_at=timezone.now())
         self.message_user(request, f"{rows_updated} assignment(s) successfully marked as No Show")
     mark_as_no_show.short_description = "⚠️ Mark selected assignments as No Show"
 
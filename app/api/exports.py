@@ -0,0 +1,281 @@
+"""
+Constant-memory CSV/XLSX export framework for viewsets.
+
+Columns are declared as ``values_list`` paths or query expressions, so joins
+and display logic are resolved in SQL and no model instance is ever built.
+Rows are read in keyset-ordered chunks (``WHERE (key) > last ORDER BY key
+LIMIT n``) rather than one cursor: MySQL's default client buffers the whole
+result set even for ``.iterator()``, while keyset chunks keep memory flat on
+every backend and never hold a long-running transaction open.
+
+Exports above ``EXPORT_BACKGROUND_THRESHOLD`` rows (or requested with
+``?background=1``) are built by a Celery task, uploaded to temporary storage
+and delivered to the requester as a notification with a download link.
+
+Query parameters understood by ``ExportMixin.export_response``:
+    export_format=csv|xlsx   (``format`` is reserved by DRF content negotiation)
+    compress=gzip            gzip the CSV (``.csv.gz``)
+    background=1             force a background export
+"""
+import csv
+import datetime
+import io
+import json
+import logging
+import tempfile
+import zlib
+
+from django.conf import settings
+from django.core.files import File
+from django.core.files.storage import storages
+from django.http import HttpRequest, QueryDict, StreamingHttpResponse
+from django.utils import timezone
+from django.utils.module_loading import import_string
+from rest_framework import status
+from rest_framework.request import Request
+from rest_framework.response import Response
+
+from app.api.pagination import keyset_filter
+from app.utils.xlsx_stream import XLSX_CONTENT_TYPE, stream_xlsx
+
+logger = logging.getLogger(__name__)
+
+EXPORT_FORMATS = ('csv', 'xlsx')
+DEFAULT_CHUNK_SIZE = 2000
+_TRUE_VALUES = ('1', 'true', 'yes')
+
+
+class ExportColumn:
+    """One export column: a header plus a ``values_list`` path or expression.
+
+    ``format`` optionally post-processes the raw value before it is written.
+    """
+
+    def __init__(self, header, source, format=None):
+        self.header = header
+        self.source = source
+        self.format = format
+
+    def __repr__(self):
+        return f'ExportColumn({self.header!r})'
+
+
+def format_value(value):
+    """Default cell formatting shared by the CSV and XLSX writers."""
+    if value is None:
+        return ''
+    if isinstance(value, bool):
+        return 'Yes' if value else 'No'
+    if isinstance(value, (datetime.datetime, datetime.date, datetime.time)):
+        return value.isoformat()
+    if isinstance(value, (dict, list)):
+        return json.dumps(value, default=str, ensure_ascii=False)
+    return value
+
+
+def single_line(value):
+    """Collapse newlines so multi-line notes stay on one spreadsheet row."""
+    return ' '.join(str(value).splitlines()) if value else ''
+
+
+# ---------------------------------------------------------------------------
+# Row source
+# ---------------------------------------------------------------------------
+def iter_rows(queryset, columns, ordering, chunk_size=DEFAULT_CHUNK_SIZE):
+    """Yield formatted row tuples in *ordering*, one keyset chunk at a time.
+
+    *ordering* must be unique and non-null (end it with ``'pk'``/``'-pk'``).
+    """
+    keys = [field.lstrip('-') for field in ordering]
+    annotations, fields = {}, []
+    for i, column in enumerate(columns):
+        if isinstance(column.source, str):
+            fields.append(column.source)
+        else:
+            alias = f'_export_{i}'
+            annotations[alias] = column.source
+            fields.append(alias)
+
+    qs = queryset.annotate(**annotations) if annotations else queryset
+    qs = qs.order_by(*ordering).values_list(*keys, *fields)
+    formatters = [column.format for column in columns]
+    width = len(keys)
+
+    last = None
+    while True:
+        page = qs if last is None else qs.filter(keyset_filter(ordering, last))
+        rows = list(page[:chunk_size])
+        for row in rows:
+            yield tuple(
+                format_value(fmt(value) if fmt else value)
+                for fmt, value in zip(formatters, row[width:])
+            )
+        if len(rows) < chunk_size:
+            return
+        last = rows[-1][:width]
+
+
+# ---------------------------------------------------------------------------
+# Writers
+# ---------------------------------------------------------------------------
+def stream_csv(headers, rows, batch_rows=500):
+    """Yield UTF-8 CSV bytes (with a BOM for Excel), fully quoted."""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer, quoting=csv.QUOTE_ALL)
+    buffer.write('\ufeff')  # UTF-8 BOM for Excel
+    writer.writerow(headers)
+    pending = 0
+    for row in rows:
+        writer.writerow(row)
+        pending += 1
+        if pending >= batch_rows:
+            yield buffer.getvalue().encode('utf-8')
+            buffer.seek(0)
+            buffer.truncate()
+            pending = 0
+    yield buffer.getvalue().encode('utf-8')
+
+
+def gzip_stream(chunks, level=6):
+    """Gzip an iterable of byte chunks on the fly."""
+    compressor = zlib.compressobj(level, zlib.DEFLATED, 31)
+    for chunk in chunks:
+        data = compressor.compress(chunk)
+        if data:
+            yield data
+    yield compressor.flush()
+
+
+def build_export(queryset, columns, ordering, export_format='csv', compress=False,
+                 sheet_name='Export', chunk_size=DEFAULT_CHUNK_SIZE):
+    """Return ``(extension, content_type, chunks)`` for an export.
+
+    *compress* only applies to CSV; XLSX is already a zip container.
+    """
+    headers = [column.header for column in columns]
+    rows = iter_rows(queryset, columns, ordering, chunk_size=chunk_size)
+    if export_format == 'xlsx':
+        return 'xlsx', XLSX_CONTENT_TYPE, stream_xlsx(headers, rows, sheet_name=sheet_name)
+    chunks = stream_csv(headers, rows)
+    if compress:
+        return 'csv.gz', 'application/gzip', gzip_stream(chunks)
+    return 'csv', 'text/csv; charset=utf-8', chunks
+
+
+# ---------------------------------------------------------------------------
+# Background delivery
+# ---------------------------------------------------------------------------
+def _storage():
+    return storages['exports']
+
+
+def _download_url(storage, key, filename):
+    expiry = getattr(settings, 'EXPORT_URL_EXPIRY', 86400)
+    if hasattr(storage, 'bucket_name'):
+        return storage.url(key, parameters={
+            'ResponseContentDisposition': f'attachment; filename="{filename}"',
+        }, expire=expiry)
+    return storage.url(key)
+
+
+def save_export(chunks, filename, owner_id):
+    """Spool *chunks* to a temp file, upload it and return ``(key, url)``.
+
+    The upload goes through the storage backend, which switches to multipart
+    for large files, so neither step holds the export in memory.
+    """
+    storage = _storage()
+    key = f"exports/{owner_id}/{timezone.now():%Y%m%d%H%M%S}-{filename}"
+    with tempfile.TemporaryFile() as fh:
+        for chunk in chunks:
+            fh.write(chunk)
+        fh.seek(0)
+        key = storage.save(key, File(fh, name=filename))
+    return key, _download_url(storage, key, filename)
+
+
+def rebuild_viewset(viewset_path, query_params, user):
+    """Instantiate *viewset_path* for an export as if *user* had requested it."""
+    django_request = HttpRequest()
+    django_request.method = 'GET'
+    django_request.GET = QueryDict(mutable=True)
+    for key, values in query_params.items():
+        django_request.GET.setlist(key, values)
+    django_request.user = user
+    request = Request(django_request)
+    request.user = user
+    viewset_class = import_string(viewset_path)
+    return viewset_class(
+        action='export', request=request, format_kwarg=None, args=(), kwargs={},
+    )
+
+
+# ---------------------------------------------------------------------------
+# Viewset mixin
+# ---------------------------------------------------------------------------
+class ExportMixin:
+    """Adds ``export_response`` to a viewset; declare columns and ordering.
+
+    ``export_ordering`` must be unique and non-null, e.g. ``('start_time', 'pk')``.
+    """
+    export_columns = ()
+    export_ordering = ('pk',)
+    export_filename = 'export'
+    export_chunk_size = DEFAULT_CHUNK_SIZE
+
+    def get_export_columns(self):
+        return self.export_columns
+
+    def get_export_queryset(self):
+        return self.filter_queryset(self.get_queryset())
+
+    def build_export(self, export_format='csv', compress=False):
+        """Return ``(filename, content_type, chunks)`` for the filtered queryset."""
+        extension, content_type, chunks = build_export(
+            self.get_export_queryset(),
+            self.get_export_columns(),
+            self.export_ordering,
+            export_format=export_format,
+            compress=compress,
+            sheet_name=self.export_filename,
+            chunk_size=self.export_chunk_size,
+        )
+        filename = f"{self.export_filename}-{timezone.now().strftime('%Y%m%d-%H%M')}.{extension}"
+        return filename, content_type, chunks
+
+    def _export_in_background(self, request):
+        if request.query_params.get('background', '').lower() in _TRUE_VALUES:
+            return True
+        threshold = getattr(settings, 'EXPORT_BACKGROUND_THRESHOLD', 0)
+        return bool(threshold) and self.get_export_queryset().count() > threshold
+
+    def export_response(self, request):
+        export_format = request.query_params.get('export_format', 'csv').lower()
+        if export_format not in EXPORT_FORMATS:
+            return Response(
+                {'detail': f"export_format must be one of: {', '.join(EXPORT_FORMATS)}."},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        compress = request.query_params.get('compress', '').lower() == 'gzip'
+
+        if self._export_in_background(request):
+            from app.tasks_exports import run_background_export
+
+            viewset_path = f'{type(self).__module__}.{type(self).__qualname__}'
+            try:
+                result = run_background_export.delay(
+                    viewset_path, dict(request.query_params.lists()), request.user.pk,
+                    export_format=export_format, compress=compress,
+                )
+                return Response(
+                    {'detail': 'Export queued. You will be notified when the file is ready.',
+                     'task_id': result.id},
+                    status=status.HTTP_202_ACCEPTED,
+                )
+            except Exception:
+                logger.warning("Celery unavailable — streaming %s export inline", viewset_path)
+
+        filename, content_type, chunks = self.build_export(export_format, compress)
+        response = StreamingHttpResponse(chunks, content_type=content_type)
+        response['Content-Disposition'] = f'attachment; filename="{filename}"'
+        return response
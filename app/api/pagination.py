@@ -1,4 +1,13 @@
-from rest_framework.pagination import PageNumberPagination
+import base64
+import binascii
+import json
+
+from django.db import connections
+from django.db.models import Q
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination, PageNumberPagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import remove_query_param, replace_query_param
 
 
 class StandardPagination(PageNumberPagination):
@@ -17,3 +26,223 @@ class SmallPagination(PageNumberPagination):
     page_size = 10
     page_size_query_param = 'page_size'
     max_page_size = 50
+
+
+def keyset_filter(ordering, values):
+    """Q selecting rows strictly after *values* in *ordering*.
+
+    ``ordering`` is a sequence of field names (``'-'`` prefix for descending)
+    whose combination is unique and non-null, e.g. ``('-timestamp', '-pk')``.
+    ``(a, b) > (x, y)`` expands to ``a > x OR (a = x AND b > y)``.
+    """
+    condition = Q()
+    for i, field in enumerate(ordering):
+        name = field.lstrip('-')
+        lookup = 'lt' if field.startswith('-') else 'gt'
+        step = Q(**{f'{name}__{lookup}': values[i]})
+        for prev_field, prev_value in zip(ordering[:i], values[:i]):
+            step &= Q(**{prev_field.lstrip('-'): prev_value})
+        condition |= step
+    return condition
+
+
+def _cursor_value(value):
+    # Full-precision ISO strings: DjangoJSONEncoder truncates to milliseconds,
+    # which would skip or repeat rows sharing a millisecond.
+    if hasattr(value, 'isoformat'):
+        return value.isoformat()
+    return str(value)
+
+
+def encode_cursor_payload(ordering, values, reverse=False):
+    """Opaque cursor for the row with *values* in *ordering*."""
+    payload = {'o': list(ordering), 'v': values}
+    if reverse:
+        payload['r'] = 1
+    raw = json.dumps(payload, default=_cursor_value, separators=(',', ':'))
+    return base64.urlsafe_b64encode(raw.encode('utf-8')).decode('ascii')
+
+
+def decode_cursor_payload(encoded, ordering):
+    """``(reverse, values)`` from a cursor issued for *ordering*. Raises ValueError."""
+    try:
+        data = json.loads(base64.urlsafe_b64decode(encoded.encode('ascii')))
+        if tuple(data['o']) != tuple(ordering) or len(data['v']) != len(ordering):
+            raise ValueError('ordering changed')
+        return bool(data.get('r')), data['v']
+    except (TypeError, KeyError, binascii.Error) as exc:
+        raise ValueError(str(exc))
+
+
+def _reverse_ordering(ordering):
+    return tuple(field[1:] if field.startswith('-') else f'-{field}' for field in ordering)
+
+
+def _row_values(row, ordering):
+    values = []
+    for field in ordering:
+        path = field.lstrip('-')
+        if isinstance(row, dict):
+            values.append(row[path])
+            continue
+        value = row
+        for attr in path.split('__'):
+            value = getattr(value, attr)
+        values.append(value)
+    return values
+
+
+def approximate_count(queryset, cap):
+    """``(count, is_estimate)`` without an unbounded ``COUNT(*)``.
+
+    Unfiltered tables use the planner's row estimate on MySQL/PostgreSQL;
+    anything else is counted exactly up to *cap* rows.
+    """
+    connection = connections[queryset.db]
+    if not queryset.query.where and connection.vendor in ('mysql', 'postgresql'):
+        table = queryset.model._meta.db_table
+        if connection.vendor == 'mysql':
+            sql = ('SELECT TABLE_ROWS FROM information_schema.TABLES '
+                   'WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = %s')
+        else:
+            sql = 'SELECT reltuples::bigint FROM pg_class WHERE relname = %s'
+        with connection.cursor() as cursor:
+            cursor.execute(sql, [table])
+            row = cursor.fetchone()
+        if row and row[0] is not None and row[0] >= 0:
+            return int(row[0]), True
+
+    count = queryset.order_by()[:cap + 1].count()
+    if count > cap:
+        return cap, True
+    return count, False
+
+
+class KeysetPagination(BasePagination):
+    """Keyset ("seek") pagination over the queryset's own ordering.
+
+    Pages are fetched with ``WHERE (ordering) > (last row) LIMIT n`` instead
+    of ``OFFSET``, so page 500 costs the same as page 1, and no ``COUNT(*)``
+    runs unless asked for with ``?count=exact`` or ``?count=approx``.
+    A ``pk`` tie-breaker is appended to the ordering; every ordering field
+    must be non-null. Cursors are opaque and tied to the ordering they were
+    issued for.
+
+    Requests carrying ``?page=`` are served by page-number pagination with
+    the same page sizes, so existing clients keep working while they move
+    to the ``next``/``previous`` links.
+    """
+    page_size = 25
+    page_size_query_param = 'page_size'
+    max_page_size = 100
+    cursor_query_param = 'cursor'
+    count_query_param = 'count'
+    legacy_page_query_param = 'page'
+    count_cap = 10000
+    invalid_cursor_message = 'Invalid cursor'
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        self.legacy = None
+        if (request.query_params.get(self.legacy_page_query_param)
+                and self.cursor_query_param not in request.query_params):
+            self.legacy = PageNumberPagination()
+            self.legacy.page_size = self.page_size
+            self.legacy.page_size_query_param = self.page_size_query_param
+            self.legacy.max_page_size = self.max_page_size
+            return self.legacy.paginate_queryset(queryset, request, view)
+
+        self.page_size = self.get_page_size(request)
+        self.ordering = self.get_ordering(queryset)
+        reverse, values = self.decode_cursor(request)
+
+        ordering = _reverse_ordering(self.ordering) if reverse else self.ordering
+        qs = queryset.order_by(*ordering)
+        if values is not None:
+            qs = qs.filter(keyset_filter(ordering, values))
+        rows = list(qs[:self.page_size + 1])
+        has_more = len(rows) > self.page_size
+        rows = rows[:self.page_size]
+        if reverse:
+            rows.reverse()
+
+        self.has_next = has_more if not reverse else True
+        self.has_previous = values is not None if not reverse else has_more
+        self.first_values = _row_values(rows[0], self.ordering) if rows else None
+        self.last_values = _row_values(rows[-1], self.ordering) if rows else None
+        self.count = self.get_count(queryset, request) if values is None else None
+        return rows
+
+    def get_paginated_response(self, data):
+        if self.legacy is not None:
+            return self.legacy.get_paginated_response(data)
+        payload = {
+            'next': self.get_next_link(),
+            'previous': self.get_previous_link(),
+            'results': data,
+        }
+        if self.count is not None:
+            payload['count'], payload['count_is_estimate'] = self.count
+        return Response(payload)
+
+    def get_page_size(self, request):
+        try:
+            size = int(request.query_params[self.page_size_query_param])
+        except (KeyError, ValueError):
+            return self.page_size
+        return min(max(size, 1), self.max_page_size)
+
+    def get_ordering(self, queryset):
+        ordering = [
+            field for field in (queryset.query.order_by or queryset.model._meta.ordering)
+            if isinstance(field, str)
+        ] or ['-pk']
+        last = ordering[-1].lstrip('-')
+        if last not in ('pk', queryset.model._meta.pk.name):
+            ordering.append('-pk' if ordering[-1].startswith('-') else 'pk')
+        return tuple(ordering)
+
+    def get_count(self, queryset, request):
+        mode = request.query_params.get(self.count_query_param)
+        if mode == 'exact':
+            return queryset.count(), False
+        if mode == 'approx':
+            return approximate_count(queryset, self.count_cap)
+        return None
+
+    # -- cursors ------------------------------------------------------------
+    def decode_cursor(self, request):
+        encoded = request.query_params.get(self.cursor_query_param)
+        if not encoded:
+            return False, None
+        try:
+            return decode_cursor_payload(encoded, self.ordering)
+        except ValueError:
+            raise NotFound(self.invalid_cursor_message)
+
+    def encode_cursor(self, values, reverse=False):
+        encoded = encode_cursor_payload(self.ordering, values, reverse)
+        url = self.request.build_absolute_uri()
+        url = remove_query_param(url, self.legacy_page_query_param)
+        url = remove_query_param(url, self.count_query_param)
+        return replace_query_param(url, self.cursor_query_param, encoded)
+
+    def get_next_link(self):
+        if not self.has_next or self.last_values is None:
+            return None
+        return self.encode_cursor(self.last_values)
+
+    def get_previous_link(self):
+        if not self.has_previous or self.first_values is None:
+            return None
+        return self.encode_cursor(self.first_values, reverse=True)
+
+
+class LargeKeysetPagination(KeysetPagination):
+    page_size = 50
+    max_page_size = 200
+
+
+class SmallKeysetPagination(KeysetPagination):
+    page_size = 10
+    max_page_size = 50
@@ -3,9 +3,11 @@ from math import ceil
 
 from rest_framework import serializers
 
+from app.api.serializers.projections import ProjectionSerializer
 from app.models import (
     Assignment, Client, Interpreter, ServiceType, Language,
 )
+from app.utils.timezone import get_timezone_for_state
 
 
 # ---------------------------------------------------------------------------
@@ -101,6 +103,79 @@ class AssignmentListSerializer(serializers.ModelSerializer):
         )
 
 
+class AssignmentListProjection(ProjectionSerializer):
+    """``AssignmentListSerializer`` output built from ``.values()`` rows.
+
+    Used by the list and kanban endpoints. The local times and timezone
+    abbreviation share one conversion per row through the prebuilt per-state
+    tzinfo table.
+    """
+
+    mirrors = AssignmentListSerializer
+    columns = (
+        'pk', 'status',
+        'client_id', 'client__company_name', 'client_name',
+        'interpreter_id', 'interpreter__user__first_name', 'interpreter__user__last_name',
+        'service_type__name', 'source_language__name', 'target_language__name',
+        'start_time', 'end_time',
+        'location', 'city', 'state', 'zip_code',
+        'interpreter_rate', 'minimum_hours', 'total_interpreter_payment',
+        'is_paid', 'created_at',
+        'gcal_sync_status', 'gcal_event_id', 'gcal_synced_at',
+    )
+    formatted = (
+        'start_time', 'end_time', 'interpreter_rate', 'total_interpreter_payment',
+        'created_at', 'gcal_synced_at',
+    )
+
+    def to_representation(self, row):
+        fmt = self.format
+        state = row['state']
+        start, end = row['start_time'], row['end_time']
+        tz = get_timezone_for_state(state)
+        local_start = start.astimezone(tz) if start else None
+
+        if row['client_id'] is not None:
+            # str(Client) is the default model repr: Client has no __str__
+            client_display = row['client__company_name'] or f"Client object ({row['client_id']})"
+        else:
+            client_display = row['client_name'] or 'N/A'
+        if row['interpreter_id'] is not None:
+            interpreter_name = (
+                f"{row['interpreter__user__first_name']} {row['interpreter__user__last_name']}".strip()
+            )
+        else:
+            interpreter_name = None
+
+        return {
+            'id': row['pk'],
+            'status': row['status'],
+            'client_display': client_display,
+            'interpreter_name': interpreter_name,
+            'interpreter_id': row['interpreter_id'],
+            'service_type_name': row['service_type__name'],
+            'source_language_name': row['source_language__name'],
+            'target_language_name': row['target_language__name'],
+            'start_time': fmt('start_time', start),
+            'end_time': fmt('end_time', end),
+            'start_time_local': local_start.isoformat() if local_start else None,
+            'end_time_local': end.astimezone(tz).isoformat() if end else None,
+            'timezone_abbr': local_start.strftime('%Z') if local_start and state else 'ET',
+            'location': row['location'],
+            'city': row['city'],
+            'state': state,
+            'zip_code': row['zip_code'],
+            'interpreter_rate': fmt('interpreter_rate', row['interpreter_rate']),
+            'minimum_hours': row['minimum_hours'],
+            'total_interpreter_payment': fmt('total_interpreter_payment', row['total_interpreter_payment']),
+            'is_paid': row['is_paid'],
+            'created_at': fmt('created_at', row['created_at']),
+            'gcal_sync_status': row['gcal_sync_status'],
+            'gcal_event_id': row['gcal_event_id'],
+            'gcal_synced_at': fmt('gcal_synced_at', row['gcal_synced_at']),
+        }
+
+
 # ---------------------------------------------------------------------------
 # Detail
 # ---------------------------------------------------------------------------
@@ -380,6 +455,35 @@ class AssignmentCalendarSerializer(serializers.ModelSerializer):
         )
 
 
+class AssignmentCalendarProjection(ProjectionSerializer):
+    """``AssignmentCalendarSerializer`` output built from ``.values()`` rows."""
+
+    mirrors = AssignmentCalendarSerializer
+    columns = (
+        'pk', 'status', 'start_time', 'end_time',
+        'client_id', 'client__company_name', 'client_name',
+        'source_language__code', 'target_language__code',
+    )
+    formatted = ('start', 'end')
+
+    def to_representation(self, row):
+        fmt = self.format
+        if row['client_id'] is not None:
+            client = row['client__company_name']
+        else:
+            client = row['client_name'] or 'N/A'
+        src = row['source_language__code'] or '?'
+        tgt = row['target_language__code'] or '?'
+        return {
+            'id': row['pk'],
+            'title': f"{client} ({src} > {tgt})",
+            'start': fmt('start', row['start_time']),
+            'end': fmt('end', row['end_time']),
+            'status': row['status'],
+            'color': STATUS_COLORS.get(row['status'], '#6B7280'),
+        }
+
+
 # ---------------------------------------------------------------------------
 # Kanban
 # ---------------------------------------------------------------------------
@@ -1,5 +1,6 @@
 from rest_framework import serializers
 
+from app.api.serializers.reference import ReferenceField
 from app.models import Assignment
 
 
@@ -62,9 +63,9 @@ class TodayMissionSerializer(serializers.ModelSerializer):
 
     interpreter_name = serializers.SerializerMethodField()
     client_display = serializers.SerializerMethodField()
-    service_type_name = serializers.StringRelatedField(source='service_type')
-    source_language_name = serializers.StringRelatedField(source='source_language')
-    target_language_name = serializers.StringRelatedField(source='target_language')
+    service_type_name = ReferenceField('service_type', source='service_type_id')
+    source_language_name = ReferenceField('language', source='source_language_id')
+    target_language_name = ReferenceField('language', source='target_language_id')
 
     class Meta:
         model = Assignment
@@ -90,7 +91,4 @@ class TodayMissionSerializer(serializers.ModelSerializer):
 
     @staticmethod
     def setup_eager_loading(queryset):
-        return queryset.select_related(
-            'interpreter__user', 'client',
-            'service_type', 'source_language', 'target_language',
-        )
+        return queryset.select_related('interpreter__user', 'client')
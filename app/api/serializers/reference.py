@@ -0,0 +1,35 @@
+"""
+Serializer fields for Language / ServiceType foreign keys, resolved from the
+reference-data registry (app.services.reference_data) instead of a join or
+a related instance per row.
+"""
+from rest_framework import serializers
+
+from app.services import reference_data
+
+_LOOKUPS = {
+    'language': reference_data.language,
+    'service_type': reference_data.service_type,
+}
+
+
+class ReferenceField(serializers.ReadOnlyField):
+    """Read-only output of a Language / ServiceType foreign key.
+
+    *source* is the ``<relation>_id`` attribute. Renders the row's name, as
+    ``StringRelatedField`` does, or with *fields* a dict of those attributes,
+    as a nested serializer does.
+    """
+
+    def __init__(self, kind, fields=None, **kwargs):
+        self.lookup = _LOOKUPS[kind]
+        self.ref_fields = fields
+        super().__init__(**kwargs)
+
+    def to_representation(self, value):
+        ref = self.lookup(value)
+        if ref is None:
+            return None
+        if self.ref_fields is None:
+            return ref.name
+        return {name: getattr(ref, name) for name in self.ref_fields}
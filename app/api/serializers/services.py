@@ -1,9 +1,11 @@
 from rest_framework import serializers
 
+from app.api.serializers.reference import ReferenceField
 from app.models import (
     ServiceType, Language, QuoteRequest, Quote, PublicQuoteRequest,
     Client, User,
 )
+from app.services import reference_data
 
 
 # ---------------------------------------------------------------------------
@@ -40,9 +42,9 @@ class QuoteRequestListSerializer(serializers.ModelSerializer):
     """Lightweight QuoteRequest for list views."""
 
     client_name = serializers.SerializerMethodField()
-    service_type_name = serializers.StringRelatedField(source='service_type')
-    source_language_name = serializers.StringRelatedField(source='source_language')
-    target_language_name = serializers.StringRelatedField(source='target_language')
+    service_type_name = ReferenceField('service_type', source='service_type_id')
+    source_language_name = ReferenceField('language', source='source_language_id')
+    target_language_name = ReferenceField('language', source='target_language_id')
 
     class Meta:
         model = QuoteRequest
@@ -60,18 +62,16 @@ class QuoteRequestListSerializer(serializers.ModelSerializer):
 
     @staticmethod
     def setup_eager_loading(queryset):
-        return queryset.select_related(
-            'client', 'service_type', 'source_language', 'target_language',
-        )
+        return queryset.select_related('client')
 
 
 class QuoteRequestDetailSerializer(serializers.ModelSerializer):
     """Full detail QuoteRequest with nested quote info."""
 
     client_name = serializers.SerializerMethodField()
-    service_type_name = serializers.StringRelatedField(source='service_type')
-    source_language_name = serializers.StringRelatedField(source='source_language')
-    target_language_name = serializers.StringRelatedField(source='target_language')
+    service_type_name = ReferenceField('service_type', source='service_type_id')
+    source_language_name = ReferenceField('language', source='source_language_id')
+    target_language_name = ReferenceField('language', source='target_language_id')
     quote = serializers.SerializerMethodField()
 
     class Meta:
@@ -107,9 +107,7 @@ class QuoteRequestDetailSerializer(serializers.ModelSerializer):
 
     @staticmethod
     def setup_eager_loading(queryset):
-        return queryset.select_related(
-            'client', 'service_type', 'source_language', 'target_language',
-        ).prefetch_related('quote')
+        return queryset.select_related('client').prefetch_related('quote')
 
 
 class QuoteRequestCreateSerializer(serializers.ModelSerializer):
@@ -170,7 +168,7 @@ class QuoteSerializer(serializers.ModelSerializer):
         return {
             'id': qr.id,
             'client_id': qr.client_id,
-            'service_type': str(qr.service_type),
+            'service_type': reference_data.service_type_name(qr.service_type_id),
             'requested_date': qr.requested_date.isoformat() if qr.requested_date else None,
             'status': qr.status,
         }
@@ -183,8 +181,7 @@ class QuoteSerializer(serializers.ModelSerializer):
     @staticmethod
     def setup_eager_loading(queryset):
         return queryset.select_related(
-            'quote_request__client', 'quote_request__service_type',
-            'created_by',
+            'quote_request__client', 'created_by',
         )
 
 
@@ -235,15 +232,9 @@ class PublicQuoteRequestSerializer(serializers.ModelSerializer):
     service_type = serializers.PrimaryKeyRelatedField(
         queryset=ServiceType.objects.filter(active=True)
     )
-    source_language_name = serializers.StringRelatedField(
-        source='source_language', read_only=True
-    )
-    target_language_name = serializers.StringRelatedField(
-        source='target_language', read_only=True
-    )
-    service_type_name = serializers.StringRelatedField(
-        source='service_type', read_only=True
-    )
+    source_language_name = ReferenceField('language', source='source_language_id')
+    target_language_name = ReferenceField('language', source='target_language_id')
+    service_type_name = ReferenceField('service_type', source='service_type_id')
 
     class Meta:
         model = PublicQuoteRequest
@@ -25,15 +25,15 @@ class APIKeySerializer(serializers.ModelSerializer):
         read_only_fields = fields
 
     def get_key_preview(self, obj):
-        return obj.key[:8] + '...' if obj.key else ''
+        return obj.prefix + '...' if obj.prefix else ''
 
     def get_is_valid(self, obj):
         return obj.is_valid()
 
 
 class APIKeyCreateSerializer(serializers.ModelSerializer):
-    """Write serializer — returns full key once on creation."""
-    key = serializers.CharField(read_only=True)
+    """Write serializer — returns full key once on creation (only its hash is stored)."""
+    key = serializers.CharField(read_only=True, source='raw_key')
 
     class Meta:
         model = APIKey
@@ -41,9 +41,11 @@ class APIKeyCreateSerializer(serializers.ModelSerializer):
         read_only_fields = ('id', 'key')
 
     def create(self, validated_data):
-        validated_data['key'] = secrets.token_hex(32)
         validated_data['user'] = self.context['request'].user
-        return super().create(validated_data)
+        api_key = APIKey(**validated_data)
+        api_key.set_key(secrets.token_hex(32))
+        api_key.save()
+        return api_key
 
 
 # ---------------------------------------------------------------------------
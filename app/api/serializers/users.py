@@ -1,5 +1,6 @@
 from rest_framework import serializers
-from django.db.models import Count, Avg, Sum, Max, Q
+from django.db.models import Sum, Max, F, Prefetch
+from django.db.models.functions import Coalesce
 import boto3
 from django.conf import settings
 import logging
@@ -7,7 +8,7 @@ import logging
 logger = logging.getLogger(__name__)
 
 from app.models import (
-    User, Client, Interpreter, InterpreterLocation,
+    User, Client, Interpreter, InterpreterLocation, InterpreterStats,
     Language, InterpreterLanguage, Assignment, Invoice,
 )
 from app.models.contracts import ContractInvitation
@@ -158,6 +159,34 @@ class ClientDetailSerializer(serializers.ModelSerializer):
 # Interpreter
 # ---------------------------------------------------------------------------
 
+def prefetch_latest_location():
+    """Prefetch each interpreter's newest location only, into ``latest_locations``.
+
+    Prefetching 'locations' would load the whole GPS history to read one row.
+    """
+    return Prefetch(
+        'locations',
+        queryset=InterpreterLocation.objects.latest_per_interpreter(),
+        to_attr='latest_locations',
+    )
+
+
+def stats_annotations():
+    """``missions_count`` / ``avg_rating`` read from the InterpreterStats row (join stats)."""
+    return {
+        'missions_count': Coalesce(F('stats__missions_completed'), 0),
+        'avg_rating': F('stats__avg_rating'),
+    }
+
+
+def _latest_location(obj):
+    """Newest InterpreterLocation of *obj*, from the prefetch when present."""
+    prefetched = getattr(obj, 'latest_locations', None)
+    if prefetched is not None:
+        return prefetched[0] if prefetched else None
+    return obj.locations.order_by('-timestamp', '-pk').first()
+
+
 class InterpreterListSerializer(serializers.ModelSerializer):
     """Lightweight interpreter for list/table views."""
 
@@ -188,15 +217,15 @@ class InterpreterListSerializer(serializers.ModelSerializer):
         return [{'id': l.id, 'name': l.name, 'code': l.code} for l in langs]
 
     def get_is_on_mission(self, obj):
-        loc = obj.locations.first()
+        loc = _latest_location(obj)
         return loc.is_on_mission if loc else False
 
     def get_lat(self, obj):
-        loc = obj.locations.first()
+        loc = _latest_location(obj)
         return float(loc.latitude) if loc else None
 
     def get_lng(self, obj):
-        loc = obj.locations.first()
+        loc = _latest_location(obj)
         return float(loc.longitude) if loc else None
 
     @staticmethod
@@ -204,15 +233,9 @@ class InterpreterListSerializer(serializers.ModelSerializer):
         """Annotate computed fields and optimise relations."""
         return (
             queryset
-            .select_related('user')
-            .prefetch_related('languages', 'locations')
-            .annotate(
-                missions_count=Count(
-                    'assignment',
-                    filter=Q(assignment__status='COMPLETED'),
-                ),
-                avg_rating=Avg('assignment__assignmentfeedback__rating'),
-            )
+            .select_related('user', 'stats')
+            .prefetch_related('languages', prefetch_latest_location())
+            .annotate(**stats_annotations())
         )
 
 
@@ -323,27 +346,21 @@ class InterpreterDetailSerializer(serializers.ModelSerializer):
         return self._mask(self._decrypt(encrypted))
 
     def get_missions_count(self, obj):
-        return Assignment.objects.filter(
-            interpreter=obj, status='COMPLETED'
-        ).count()
+        return InterpreterStats.for_interpreter(obj).missions_completed
 
     def get_avg_rating(self, obj):
-        from app.models import AssignmentFeedback
-        result = AssignmentFeedback.objects.filter(
-            assignment__interpreter=obj
-        ).aggregate(avg=Avg('rating'))
-        return result['avg']
+        return InterpreterStats.for_interpreter(obj).avg_rating
 
     def get_is_on_mission(self, obj):
-        loc = obj.locations.first()
+        loc = _latest_location(obj)
         return loc.is_on_mission if loc else False
 
     def get_lat(self, obj):
-        loc = obj.locations.first()
+        loc = _latest_location(obj)
         return float(loc.latitude) if loc else None
 
     def get_lng(self, obj):
-        loc = obj.locations.first()
+        loc = _latest_location(obj)
         return float(loc.longitude) if loc else None
 
     def get_recent_assignments(self, obj):
@@ -370,9 +387,9 @@ class InterpreterDetailSerializer(serializers.ModelSerializer):
 
     @staticmethod
     def setup_eager_loading(queryset):
-        return queryset.select_related('user', 'blocked_by').prefetch_related(
+        return queryset.select_related('user', 'blocked_by', 'stats').prefetch_related(
             'interpreterlanguage_set__language',
-            'locations',
+            prefetch_latest_location(),
         )
 
 
@@ -400,7 +417,7 @@ class InterpreterMapSerializer(serializers.ModelSerializer):
         return list(obj.languages.values_list('name', flat=True)[:5])
 
     def get_latest_location(self, obj):
-        loc = obj.locations.first()  # ordered by -timestamp
+        loc = _latest_location(obj)
         if not loc:
             return None
         return {
@@ -413,7 +430,7 @@ class InterpreterMapSerializer(serializers.ModelSerializer):
     @staticmethod
     def setup_eager_loading(queryset):
         return queryset.select_related('user').prefetch_related(
-            'languages', 'locations'
+            'languages', prefetch_latest_location()
         )
 
 
@@ -0,0 +1,169 @@
+"""
+Windowed and incremental feeds behind the assignment kanban and calendar.
+
+Kanban: one keyset-paginated column per status (``?limit=``, default 50),
+with its total ``count`` and a ``next`` cursor; ``?column=<STATUS>&cursor=``
+fetches the following page of one column. Calendar: ``start`` and ``end``
+are required and at most MAX_CALENDAR_WINDOW apart.
+
+Both accept ``?changed_since=<as_of of the previous response>`` and then
+answer with only the rows modified since (``changed``, in the endpoint's row
+format) and the ids to drop (``removed``: deleted, or no longer matching the
+filters / window). Modified rows are found through the (updated_at, id)
+index, deletions through AssignmentTombstone. The timestamp is applied with
+CHANGE_OVERLAP of slack so a row committed late by a slow transaction is not
+missed; clients merge by id, so repeats are harmless. When the delta cannot
+be trusted — older than the tombstone retention, or more than MAX_CHANGES
+rows — the answer is ``{"resync": true}`` and the client reloads the view.
+"""
+from datetime import datetime, time, timedelta
+
+from django.db.models import Count
+from django.utils import timezone
+from django.utils.dateparse import parse_date, parse_datetime
+from rest_framework.exceptions import ValidationError
+
+from app.api.pagination import decode_cursor_payload, encode_cursor_payload, keyset_filter
+from app.models import Assignment, AssignmentTombstone
+from app.utils.upsert import bulk_upsert
+
+KANBAN_STATUSES = ('PENDING', 'CONFIRMED', 'IN_PROGRESS', 'COMPLETED', 'CANCELLED', 'NO_SHOW')
+# Open work soonest first; closed columns most recent first
+KANBAN_ORDERING = {
+    status: ('-start_time', '-pk') if status in ('COMPLETED', 'CANCELLED', 'NO_SHOW') else ('start_time', 'pk')
+    for status in KANBAN_STATUSES
+}
+DEFAULT_COLUMN_LIMIT = 50
+MAX_COLUMN_LIMIT = 200
+
+MAX_CALENDAR_WINDOW = timedelta(days=62)
+
+CHANGE_OVERLAP = timedelta(seconds=30)
+MAX_CHANGES = 500
+TOMBSTONE_RETENTION = timedelta(days=7)
+
+
+# ---------------------------------------------------------------------------
+# Parameters
+# ---------------------------------------------------------------------------
+def parse_timestamp(raw, name):
+    """Aware datetime from an ISO date or date-time query parameter."""
+    value = parse_datetime(raw or '')
+    if value is None:
+        day = parse_date(raw or '')
+        if day is None:
+            raise ValidationError({name: 'Expected an ISO 8601 date or date-time.'})
+        value = datetime.combine(day, time.min)
+    if timezone.is_naive(value):
+        value = timezone.make_aware(value)
+    return value
+
+
+def parse_limit(raw):
+    if raw in (None, ''):
+        return DEFAULT_COLUMN_LIMIT
+    try:
+        return min(max(int(raw), 1), MAX_COLUMN_LIMIT)
+    except ValueError:
+        raise ValidationError({'limit': 'Expected an integer.'})
+
+
+def calendar_window(params):
+    """``(start, end)`` from the required ``start``/``end`` parameters."""
+    missing = [name for name in ('start', 'end') if not params.get(name)]
+    if missing:
+        raise ValidationError({name: 'This parameter is required.' for name in missing})
+    start = parse_timestamp(params['start'], 'start')
+    end = parse_timestamp(params['end'], 'end')
+    if end < start:
+        raise ValidationError({'end': 'Must not be before start.'})
+    if end - start > MAX_CALENDAR_WINDOW:
+        raise ValidationError({'end': f'The window may span at most {MAX_CALENDAR_WINDOW.days} days.'})
+    return start, end
+
+
+# ---------------------------------------------------------------------------
+# Kanban
+# ---------------------------------------------------------------------------
+def kanban_column(queryset, projection, status, limit, cursor=None):
+    """One page of a kanban column: ``{'results': [...], 'next': cursor | None}``."""
+    ordering = KANBAN_ORDERING[status]
+    qs = queryset.filter(status=status).order_by(*ordering)
+    if cursor:
+        try:
+            _reverse, values = decode_cursor_payload(cursor, ordering)
+        except ValueError:
+            raise ValidationError({'cursor': 'Invalid cursor.'})
+        qs = qs.filter(keyset_filter(ordering, values))
+    rows = list(projection.project(qs)[:limit + 1])
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        next_cursor = encode_cursor_payload(ordering, [rows[-1][field.lstrip('-')] for field in ordering])
+    return {'results': projection(rows, many=True).data, 'next': next_cursor}
+
+
+def kanban(queryset, projection, params):
+    """The kanban board, or one more page of a single column (``?column=&cursor=``)."""
+    as_of = timezone.now().isoformat()
+    limit = parse_limit(params.get('limit'))
+    column = params.get('column')
+    if column:
+        if column not in KANBAN_ORDERING:
+            raise ValidationError({'column': f'Expected one of {", ".join(KANBAN_STATUSES)}.'})
+        page = kanban_column(queryset, projection, column, limit, params.get('cursor'))
+        return {'as_of': as_of, 'columns': {column: page}}
+
+    counts = {
+        row['status']: row['n']
+        for row in queryset.order_by().values('status').annotate(n=Count('pk'))
+    }
+    columns = {}
+    for status in KANBAN_STATUSES:
+        if counts.get(status):
+            columns[status] = kanban_column(queryset, projection, status, limit)
+        else:
+            columns[status] = {'results': [], 'next': None}
+        columns[status]['count'] = counts.get(status, 0)
+    return {'as_of': as_of, 'columns': columns}
+
+
+# ---------------------------------------------------------------------------
+# Deltas
+# ---------------------------------------------------------------------------
+def changes(queryset, projection, since):
+    """Rows of *queryset* modified after *since*, plus ids to drop."""
+    now = timezone.now()
+    as_of = now.isoformat()
+    if now - since > TOMBSTONE_RETENTION:
+        return {'as_of': as_of, 'resync': True}
+    floor = since - CHANGE_OVERLAP
+
+    changed_ids = list(
+        Assignment.objects.filter(updated_at__gt=floor)
+        .order_by('updated_at', 'pk').values_list('pk', flat=True)[:MAX_CHANGES + 1]
+    )
+    deleted_ids = list(
+        AssignmentTombstone.objects.filter(deleted_at__gt=floor)
+        .values_list('assignment_id', flat=True)[:MAX_CHANGES + 1]
+    )
+    if len(changed_ids) + len(deleted_ids) > MAX_CHANGES:
+        return {'as_of': as_of, 'resync': True}
+
+    rows = projection(
+        projection.project(queryset.filter(pk__in=changed_ids)) if changed_ids else [], many=True,
+    ).data
+    visible = {row['id'] for row in rows}
+    removed = (set(changed_ids) | set(deleted_ids)) - visible
+    return {'as_of': as_of, 'changed': rows, 'removed': sorted(removed)}
+
+
+def record_deletion(assignment_ids):
+    """Tombstone deleted assignments and purge tombstones past the retention."""
+    now = timezone.now()
+    bulk_upsert(
+        AssignmentTombstone.objects.all(),
+        [AssignmentTombstone(assignment_id=pk, deleted_at=now) for pk in assignment_ids],
+        unique_fields=['assignment_id'], update_fields=['deleted_at'],
+    )
+    AssignmentTombstone.objects.filter(deleted_at__lt=now - TOMBSTONE_RETENTION).delete()
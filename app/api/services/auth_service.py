@@ -32,6 +32,7 @@ from app.models.auth_security import (
     LoginAttempt,
 )
 from app.models.security import AuditLog
+from app.services import auth_state
 
 logger = logging.getLogger(__name__)
 
@@ -96,21 +97,21 @@ class AuthService:
         - On success: dict with tokens + user + mfa status
         - On failure: dict with error details
         """
-        print(f"[AUTH_SERVICE] login() called with email param={email!r}")
         identifier = email.strip().lower()
-        print(f"[AUTH_SERVICE] identifier={identifier!r} after strip/lower")
         ip = get_client_ip(request)
 
-        # Check lockout
-        if LoginAttempt.is_locked_out(identifier):
+        # Check lockout (email and IP sliding windows, cache only)
+        retry_after = LoginAttempt.lockout_remaining(identifier, ip)
+        if retry_after:
+            minutes = max(1, -(-retry_after // 60))
             return {
                 "success": False,
-                "error": "Account temporarily locked due to too many failed attempts. Try again in 15 minutes.",
+                "error": f"Account temporarily locked due to too many failed attempts. Try again in {minutes} minutes.",
                 "status": 429,
+                "retry_after": retry_after,
             }
 
         if not identifier or not password:
-            print(f"[AUTH_SERVICE] EMPTY: identifier={identifier!r}, password={'(empty)' if not password else '(set)'}")
             return {
                 "success": False,
                 "error": "Email/username and password are required.",
@@ -118,18 +119,14 @@ class AuthService:
             }
 
         # Try authenticating by username first, then by email
-        print(f"[AUTH_SERVICE] Trying authenticate(username={identifier!r}) ...")
         user = authenticate(request, username=identifier, password=password)
-        print(f"[AUTH_SERVICE] authenticate by username result: {user}")
         if user is None:
             # Try to find user by email and authenticate with their username
             try:
                 user_by_email = User.objects.get(email=identifier)
-                print(f"[AUTH_SERVICE] Found user by email: {user_by_email.username}")
                 user = authenticate(request, username=user_by_email.username, password=password)
-                print(f"[AUTH_SERVICE] authenticate by email->username result: {user}")
             except User.DoesNotExist:
-                print(f"[AUTH_SERVICE] No user found with email={identifier!r}")
+                logger.debug("Login: no user with username or email %r", identifier)
 
         if user is None:
             LoginAttempt.record_attempt(identifier, ip, False, "invalid_credentials")
@@ -152,7 +149,7 @@ class AuthService:
         User.objects.filter(pk=user.pk).update(last_login_ip=ip)
 
         # Check if MFA is set up
-        has_mfa = MFADevice.objects.filter(user=user, is_verified=True).exists()
+        has_mfa = auth_state.has_totp(user)
 
         if has_mfa:
             # Return partial token (mfa_verified=False)
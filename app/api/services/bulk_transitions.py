@@ -0,0 +1,361 @@
+"""
+Set-based lifecycle transitions behind the assignment and interpreter
+``bulk-action`` endpoints.
+
+A batch is handled in a fixed number of queries, whatever its size:
+
+  1. the requested rows are read once (``SELECT … FOR UPDATE``) and every id
+     is validated in memory against the action's allowed source states;
+  2. the valid ids move with one ``UPDATE … WHERE id IN … AND status IN …``
+     (``AssignmentQuerySet.bulk_transition`` for assignments, so the grouped
+     status-email, calendar and stats handlers still run once per batch);
+  3. dependent rows — FinancialTransaction/InterpreterPayment on confirm,
+     Expense on complete, AuditLog for every transition — are written with
+     ``bulk_create``, and payment cancellations with two UPDATEs;
+  4. one Celery job per batch sends the notification emails after commit.
+
+Every requested id appears in the result: in ``succeeded``, or in
+``skipped`` / ``failed`` with a reason. The batch is one transaction: if a
+write fails, nothing moves and every valid id is reported failed.
+"""
+import logging
+import uuid
+from dataclasses import dataclass
+
+from django.db import transaction
+from django.utils import timezone
+
+from app.models import (
+    Assignment, AuditLog, Expense, FinancialTransaction, Interpreter, InterpreterPayment,
+)
+
+logger = logging.getLogger(__name__)
+
+PAYMENT_DUE_DAYS = 14
+SUSPENSION_REASON = 'Administrative Suspension'
+
+
+@dataclass(frozen=True)
+class AssignmentTransition:
+    to_status: str
+    from_statuses: tuple
+    email_type: str = None
+
+
+# Same rules as Assignment.can_be_confirmed / can_be_cancelled / can_be_completed
+ASSIGNMENT_TRANSITIONS = {
+    'confirm': AssignmentTransition(
+        Assignment.Status.CONFIRMED, (Assignment.Status.PENDING,), 'confirmed',
+    ),
+    # The interpreter is unassigned, so there is nobody to email
+    'cancel': AssignmentTransition(
+        Assignment.Status.CANCELLED, (Assignment.Status.PENDING, Assignment.Status.CONFIRMED),
+    ),
+    'complete': AssignmentTransition(
+        Assignment.Status.COMPLETED, (Assignment.Status.IN_PROGRESS, Assignment.Status.CONFIRMED),
+        'completed',
+    ),
+}
+
+
+class BulkResult:
+    """Per-id outcome of a batch, in request order."""
+
+    def __init__(self):
+        self.succeeded = []
+        self.skipped = []
+        self.failed = []
+
+    def skip(self, pk, reason):
+        self.skipped.append({'id': pk, 'reason': reason})
+
+    def fail(self, pk, reason):
+        self.failed.append({'id': pk, 'reason': reason})
+
+    def fail_all(self, ids, reason):
+        for pk in ids:
+            self.fail(pk, reason)
+
+
+def _parse_ids(raw_ids, result):
+    """Distinct integer ids from the payload; unparseable ones are failed."""
+    ids = []
+    for raw in raw_ids:
+        try:
+            pk = int(raw)
+        except (TypeError, ValueError):
+            result.fail(raw, 'Invalid id')
+            continue
+        if pk not in ids:
+            ids.append(pk)
+    return ids
+
+
+def _enqueue(task, *args):
+    """``task.delay(*args)`` once the transaction commits; a broker outage is logged."""
+    def send():
+        try:
+            task.delay(*args)
+        except Exception:
+            logger.warning("Celery unavailable — skipped task %s", task.name)
+    transaction.on_commit(send)
+
+
+def _audit_rows(model_name, action, ids, user, ip_address, changes):
+    return [
+        AuditLog(
+            user=user, action=action, model_name=model_name, object_id=str(pk),
+            changes=changes(pk), ip_address=ip_address,
+        )
+        for pk in ids
+    ]
+
+
+# ---------------------------------------------------------------------------
+# Assignments
+# ---------------------------------------------------------------------------
+def transition_assignments(action, raw_ids, user, ip_address=None):
+    """Apply *action* (a key of ASSIGNMENT_TRANSITIONS) to the assignments *raw_ids*."""
+    spec = ASSIGNMENT_TRANSITIONS[action]
+    result = BulkResult()
+    ids = _parse_ids(raw_ids, result)
+    if not ids:
+        return result
+
+    valid = []
+    try:
+        with transaction.atomic():
+            rows = {
+                row['pk']: row
+                for row in Assignment.objects.filter(pk__in=ids).select_for_update().values(
+                    'pk', 'status', 'interpreter_id', 'total_interpreter_payment',
+                )
+            }
+            for pk in ids:
+                row = rows.get(pk)
+                if row is None:
+                    result.fail(pk, 'Not found')
+                elif row['status'] not in spec.from_statuses:
+                    result.fail(pk, f"Cannot {action} in status {row['status']}")
+                else:
+                    valid.append(pk)
+            if not valid:
+                return result
+
+            values = {}
+            if action == 'cancel':
+                values['interpreter'] = None
+            elif action == 'complete':
+                values['completed_at'] = timezone.now()
+            moved = Assignment.objects.filter(pk__in=valid).bulk_transition(
+                spec.to_status, from_statuses=spec.from_statuses, **values,
+            )
+            moved_rows = [rows[pk] for pk in moved]
+
+            if action == 'confirm':
+                _create_payments(moved_rows, user)
+            elif action == 'cancel':
+                _cancel_payments(moved)
+            else:
+                _create_expenses(moved_rows)
+
+            AuditLog.objects.bulk_create(_audit_rows(
+                'Assignment', f'BULK_{action.upper()}', moved, user, ip_address,
+                lambda pk: {'old_status': rows[pk]['status'], 'new_status': spec.to_status},
+            ))
+
+            notify = [row['pk'] for row in moved_rows if row['interpreter_id']]
+            if spec.email_type and notify:
+                from app.tasks import send_assignment_emails
+                _enqueue(send_assignment_emails, notify, spec.email_type)
+    except Exception as exc:
+        logger.exception("Bulk %s failed for %d assignments", action, len(valid))
+        result.fail_all(valid, str(exc))
+        return result
+
+    moved = set(moved)
+    for pk in valid:
+        if pk in moved:
+            result.succeeded.append(pk)
+        else:
+            result.fail(pk, 'Status changed concurrently')
+    return result
+
+
+def _payable(rows):
+    return [row for row in rows if row['interpreter_id'] and row['total_interpreter_payment']]
+
+
+def _latest_payments(assignment_ids, *fields):
+    """The most recent InterpreterPayment of each assignment, as ``{assignment_id: row}``."""
+    latest = {}
+    payments = (
+        InterpreterPayment.objects.filter(assignment_id__in=assignment_ids)
+        .order_by('created_at', 'pk').values('assignment_id', *fields)
+    )
+    for payment in payments:
+        latest[payment['assignment_id']] = payment
+    return latest
+
+
+def _create_payments(rows, user):
+    """Bulk equivalent of assignment_service.create_interpreter_payment."""
+    rows = _payable(rows)
+    if not rows:
+        return
+    transactions = {
+        row['pk']: FinancialTransaction(
+            transaction_id=uuid.uuid4(), type='EXPENSE', amount=row['total_interpreter_payment'],
+            description=f"Interpreter payment for assignment #{row['pk']}", created_by=user,
+        )
+        for row in rows
+    }
+    FinancialTransaction.objects.bulk_create(transactions.values())
+    if any(txn.pk is None for txn in transactions.values()):
+        # MySQL does not return ids from a bulk INSERT: look them up by uuid
+        pks = dict(
+            FinancialTransaction.objects
+            .filter(transaction_id__in=[txn.transaction_id for txn in transactions.values()])
+            .values_list('transaction_id', 'pk')
+        )
+        for txn in transactions.values():
+            txn.pk = pks[txn.transaction_id]
+
+    due_date = timezone.now() + timezone.timedelta(days=PAYMENT_DUE_DAYS)
+    InterpreterPayment.objects.bulk_create([
+        InterpreterPayment(
+            transaction_id=transactions[row['pk']].pk, interpreter_id=row['interpreter_id'],
+            assignment_id=row['pk'], amount=row['total_interpreter_payment'],
+            payment_method='ACH', status=InterpreterPayment.Status.PENDING, scheduled_date=due_date,
+            reference_number=f"INT-{row['pk']}-{uuid.uuid4().hex[:6].upper()}",
+        )
+        for row in rows
+    ])
+
+
+def _cancel_payments(assignment_ids):
+    """Bulk equivalent of assignment_service.cancel_interpreter_payment."""
+    cancellable = [
+        payment for payment in _latest_payments(assignment_ids, 'pk', 'status', 'transaction_id').values()
+        if payment['status'] not in ('COMPLETED', 'FAILED')
+    ]
+    if not cancellable:
+        return
+    InterpreterPayment.objects.filter(pk__in=[payment['pk'] for payment in cancellable]).update(
+        status=InterpreterPayment.Status.CANCELLED,
+    )
+    Expense.objects.filter(
+        transaction_id__in=[payment['transaction_id'] for payment in cancellable],
+    ).exclude(status='PAID').update(status='REJECTED')
+
+
+def _create_expenses(rows):
+    """Bulk equivalent of assignment_service.create_expense_for_assignment."""
+    rows = _payable(rows)
+    if not rows:
+        return
+    payments = _latest_payments([row['pk'] for row in rows], 'transaction_id')
+    for row in rows:
+        if row['pk'] not in payments:
+            logger.error(
+                "No interpreter payment found for assignment %s — cannot create expense.", row['pk'],
+            )
+    rows = [row for row in rows if row['pk'] in payments]
+    existing = set(
+        Expense.objects.filter(
+            transaction_id__in=[payments[row['pk']]['transaction_id'] for row in rows],
+        ).values_list('transaction_id', flat=True)
+    )
+    now = timezone.now()
+    Expense.objects.bulk_create([
+        Expense(
+            transaction_id=payments[row['pk']]['transaction_id'], expense_type='SALARY',
+            amount=row['total_interpreter_payment'],
+            description=f"Interpreter payment expense for assignment #{row['pk']}",
+            status='PENDING', date_incurred=now,
+        )
+        for row in rows
+        if payments[row['pk']]['transaction_id'] not in existing
+    ])
+
+
+# ---------------------------------------------------------------------------
+# Interpreters
+# ---------------------------------------------------------------------------
+def _suspended(row):
+    return row['is_manually_blocked'] and row['blocked_reason'] == SUSPENSION_REASON
+
+
+# action -> (rows it applies to, reason given for the others)
+INTERPRETER_TRANSITIONS = {
+    'activate': (lambda row: not row['active'], 'Already active'),
+    'deactivate': (lambda row: row['active'], 'Already inactive'),
+    'block': (lambda row: not row['is_manually_blocked'], 'Already blocked'),
+    'unblock': (lambda row: row['is_manually_blocked'], 'Not blocked'),
+    'suspend': (lambda row: not _suspended(row), 'Already suspended'),
+}
+
+
+def transition_interpreters(action, raw_ids, user, reason='', ip_address=None):
+    """Apply *action* (a key of INTERPRETER_TRANSITIONS) to the interpreters *raw_ids*.
+
+    Interpreters already in the target state are reported in ``skipped``.
+    """
+    applies, skip_reason = INTERPRETER_TRANSITIONS[action]
+    result = BulkResult()
+    ids = _parse_ids(raw_ids, result)
+    if not ids:
+        return result
+
+    now = timezone.now()
+    values = {
+        'activate': {'active': True},
+        'deactivate': {'active': False},
+        'block': {
+            'is_manually_blocked': True, 'blocked_at': now, 'blocked_by': user,
+            'blocked_reason': reason or 'Bulk block via Admin',
+        },
+        'unblock': {
+            'is_manually_blocked': False, 'blocked_at': None, 'blocked_by': None, 'blocked_reason': None,
+        },
+        'suspend': {
+            'is_manually_blocked': True, 'blocked_at': now, 'blocked_by': user,
+            'blocked_reason': SUSPENSION_REASON,
+        },
+    }[action]
+
+    valid = []
+    try:
+        with transaction.atomic():
+            rows = {
+                row['pk']: row
+                for row in Interpreter.objects.filter(pk__in=ids).select_for_update().values(
+                    'pk', 'active', 'is_manually_blocked', 'blocked_reason',
+                )
+            }
+            for pk in ids:
+                row = rows.get(pk)
+                if row is None:
+                    result.fail(pk, 'Not found')
+                elif not applies(row):
+                    result.skip(pk, skip_reason)
+                else:
+                    valid.append(pk)
+            if not valid:
+                return result
+
+            Interpreter.objects.filter(pk__in=valid).update(**values)
+            AuditLog.objects.bulk_create(_audit_rows(
+                'Interpreter', f'BULK_{action.upper()}', valid, user, ip_address,
+                lambda pk: {'reason': reason} if reason else {},
+            ))
+            if action == 'suspend':
+                from app.tasks import send_suspension_emails
+                _enqueue(send_suspension_emails, valid, reason or 'Administrative Decision')
+    except Exception as exc:
+        logger.exception("Bulk %s failed for %d interpreters", action, len(valid))
+        result.fail_all(valid, str(exc))
+        return result
+
+    result.succeeded.extend(valid)
+    return result
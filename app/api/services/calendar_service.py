@@ -2,11 +2,13 @@
 Google Calendar service — direct API v3 integration via service account.
 
 Architecture:
-- Credentials: service account JSON from settings.GOOGLE_SERVICE_ACCOUNT_JSON
+- Credentials: service account JSON (raw or base64) via app.services.google_calendar
 - Target calendar: settings.GOOGLE_CALENDAR_ID (company operations calendar)
 - S3 remains primary storage; calendar is a scheduling / visibility layer only
 - All functions return a result dict {ok: bool, ...} — never raise to callers
 - Callers (Celery tasks) inspect ok and update Assignment.gcal_sync_status
+- Writes are requested through app.services.calendar_sync_dispatcher, which
+  debounces and coalesces them before calling sync_assignment()
 
 Setup (one-time):
 1. Create service account in Google Cloud Console
@@ -15,28 +17,13 @@ Setup (one-time):
    (Calendar Settings → Share → "Make changes to events")
 4. Set GOOGLE_CALENDAR_ID env var to the calendar's ID
 """
-import json
 import logging
 
 from django.conf import settings
 from django.utils import timezone
 
-from shared.constants import STATE_TIMEZONES, DEFAULT_TZ_NAME
-
 logger = logging.getLogger(__name__)
 
-# Google Calendar colorId mapping by assignment status
-_STATUS_COLOR = {
-    'PENDING':     '5',   # yellow / banana
-    'CONFIRMED':   '9',   # blue / blueberry
-    'IN_PROGRESS': '3',   # purple / grape
-    'COMPLETED':   '2',   # green / sage
-    'CANCELLED':   '8',   # graphite
-    'NO_SHOW':     '8',   # graphite
-}
-
-_CALENDAR_SCOPES = ['https://www.googleapis.com/auth/calendar']
-
 
 # ---------------------------------------------------------------------------
 # Internal helpers
@@ -44,138 +31,23 @@ _CALENDAR_SCOPES = ['https://www.googleapis.com/auth/calendar']
 
 def _build_calendar_service():
     """
-    Build and return an authenticated Google Calendar API v3 service object.
-
-    Reads GOOGLE_SERVICE_ACCOUNT_JSON from settings (raw JSON string),
-    creates google.oauth2.service_account.Credentials, then calls
-    googleapiclient.discovery.build('calendar', 'v3', credentials=creds).
+    Return the process-wide Google Calendar API v3 service, or None.
 
-    Returns:
-        googleapiclient Resource or None (logs error, does not raise).
+    Credentials and the event body come from app.services.google_calendar
+    (base64 or raw service-account JSON, cached client, HTTP timeout), so every
+    sync path writes identical events.
     """
-    raw_json = getattr(settings, 'GOOGLE_SERVICE_ACCOUNT_JSON', '{}')
-    calendar_id = getattr(settings, 'GOOGLE_CALENDAR_ID', '')
-
-    if not calendar_id:
-        logger.warning('GOOGLE_CALENDAR_ID is not set — calendar sync skipped')
-        return None
+    from app.services.google_calendar import _get_service
 
-    try:
-        info = json.loads(raw_json)
-    except (json.JSONDecodeError, TypeError) as exc:
-        logger.error('GOOGLE_SERVICE_ACCOUNT_JSON is invalid JSON: %s', exc)
-        return None
-
-    if not info.get('type') == 'service_account':
-        logger.warning('GOOGLE_SERVICE_ACCOUNT_JSON does not describe a service_account — skipped')
-        return None
-
-    try:
-        from google.oauth2 import service_account
-        from googleapiclient.discovery import build
-
-        creds = service_account.Credentials.from_service_account_info(
-            info,
-            scopes=_CALENDAR_SCOPES,
-        )
-        return build('calendar', 'v3', credentials=creds, cache_discovery=False)
-    except Exception as exc:
-        logger.error('Failed to build Google Calendar service: %s', exc)
-        return None
-
-
-def _tz_for_state(state: str) -> str:
-    """Return IANA timezone name for a US state code, default Eastern."""
-    return STATE_TIMEZONES.get((state or '').upper().strip(), DEFAULT_TZ_NAME)
+    service, _calendar_id = _get_service()
+    return service
 
 
 def _build_event_body(assignment) -> dict:
-    """
-    Convert an Assignment ORM instance to a Google Calendar event body dict.
-    Pure function — no I/O.
+    """Google Calendar event body for *assignment* (pure function, no I/O)."""
+    from app.services.google_calendar import _build_event_body as build_body
 
-    The extendedProperties.private.assignment_id anchors idempotency: tasks
-    can query by this property to find existing events before creating new ones.
-    """
-    tz_name = _tz_for_state(assignment.state)
-
-    # Interpreter info
-    interp_name = ''
-    interp_email = None
-    if assignment.interpreter and assignment.interpreter.user:
-        u = assignment.interpreter.user
-        interp_name = f"{u.first_name} {u.last_name}".strip() or u.email
-        interp_email = u.email
-
-    # Client info
-    if assignment.client:
-        client_name = assignment.client.company_name or str(assignment.client)
-    else:
-        client_name = assignment.client_name or 'Unspecified Client'
-
-    # Language pair
-    src = getattr(assignment.source_language, 'name', '') if assignment.source_language else ''
-    tgt = getattr(assignment.target_language, 'name', '') if assignment.target_language else ''
-    lang_pair = f"{src} → {tgt}" if src or tgt else ''
-
-    service_name = getattr(assignment.service_type, 'name', '') if assignment.service_type else ''
-
-    summary = f"[JHBridge] {service_name} — {lang_pair}"
-    if assignment.status != 'PENDING':
-        summary = f"[{assignment.status}] {service_name} — {lang_pair}"
-
-    location_parts = [p for p in [
-        assignment.location,
-        assignment.city,
-        f"{assignment.state} {assignment.zip_code}".strip() if assignment.state else '',
-    ] if p]
-    location = ', '.join(location_parts)
-
-    description_lines = [
-        f"Mission #{assignment.id}",
-        f"Status: {assignment.status}",
-        f"Client: {client_name}",
-        f"Interpreter: {interp_name}" if interp_name else 'Interpreter: Unassigned',
-        f"Languages: {lang_pair}",
-        f"Rate: ${assignment.interpreter_rate}/hr" if assignment.interpreter_rate else '',
-    ]
-    if assignment.notes:
-        description_lines.append(f"Notes: {assignment.notes[:300]}")
-    description = '\n'.join(l for l in description_lines if l)
-
-    event = {
-        'summary': summary,
-        'location': location,
-        'description': description,
-        'start': {
-            'dateTime': assignment.start_time.isoformat(),
-            'timeZone': tz_name,
-        },
-        'end': {
-            'dateTime': assignment.end_time.isoformat(),
-            'timeZone': tz_name,
-        },
-        'colorId': _STATUS_COLOR.get(assignment.status, '5'),
-        'reminders': {
-            'useDefault': False,
-            'overrides': [
-                {'method': 'popup', 'minutes': 60},
-                {'method': 'popup', 'minutes': 15},
-            ],
-        },
-        'extendedProperties': {
-            'private': {
-                'assignment_id': str(assignment.id),
-                'jhbridge': 'true',
-            },
-        },
-    }
-
-    # Add interpreter as attendee if available
-    if interp_email:
-        event['attendees'] = [{'email': interp_email, 'displayName': interp_name}]
-
-    return event
+    return build_body(assignment)
 
 
 # ---------------------------------------------------------------------------
@@ -290,9 +162,25 @@ def delete_calendar_event(event_id: str) -> dict:
         return {'ok': False, 'error': 'unknown'}
 
 
-def sync_assignment(assignment_id: int) -> dict:
+def sync_queryset():
+    """Assignments with everything the event body reads joined in."""
+    from app.models import Assignment
+
+    return Assignment.objects.select_related(
+        'client', 'client__user',
+        'interpreter', 'interpreter__user',
+        'service_type', 'source_language', 'target_language',
+    )
+
+
+def load_assignment(assignment_id: int):
+    """Fetch an assignment with everything the event body reads, or None."""
+    return sync_queryset().filter(pk=assignment_id).first()
+
+
+def sync_assignment(assignment_id: int, assignment=None) -> dict:
     """
-    High-level orchestrator called by Celery tasks.
+    High-level orchestrator called by the calendar sync dispatcher.
 
     Logic:
     - CANCELLED/NO_SHOW + has event_id → delete event
@@ -303,21 +191,16 @@ def sync_assignment(assignment_id: int) -> dict:
 
     Args:
         assignment_id: Assignment primary key.
+        assignment: Already-loaded instance (see load_assignment), if any.
 
     Returns:
         Result dict from underlying create/update/delete call.
     """
     from app.models import Assignment
 
-    try:
-        assignment = Assignment.objects.select_related(
-            'interpreter__user',
-            'service_type',
-            'source_language',
-            'target_language',
-            'client',
-        ).get(pk=assignment_id)
-    except Assignment.DoesNotExist:
+    if assignment is None:
+        assignment = load_assignment(assignment_id)
+    if assignment is None:
         logger.warning('sync_assignment: Assignment #%s not found', assignment_id)
         return {'ok': False, 'error': 'not_found'}
 
@@ -329,17 +212,20 @@ def sync_assignment(assignment_id: int) -> dict:
             result = delete_calendar_event(assignment.gcal_event_id)
             if result['ok']:
                 Assignment.objects.filter(pk=assignment_id).update(
+                    updated_at=timezone.now(),
                     gcal_sync_status=Assignment.GCalSyncStatus.DELETED,
                     gcal_event_id=None,
                     gcal_synced_at=timezone.now(),
                 )
             else:
                 Assignment.objects.filter(pk=assignment_id).update(
+                    updated_at=timezone.now(),
                     gcal_sync_status=Assignment.GCalSyncStatus.FAILED,
                 )
             return result
         else:
             Assignment.objects.filter(pk=assignment_id).update(
+                updated_at=timezone.now(),
                 gcal_sync_status=Assignment.GCalSyncStatus.SKIPPED,
             )
             return {'ok': True, 'skipped': True}
@@ -352,12 +238,14 @@ def sync_assignment(assignment_id: int) -> dict:
 
     if result['ok']:
         Assignment.objects.filter(pk=assignment_id).update(
+            updated_at=timezone.now(),
             gcal_event_id=result.get('event_id', assignment.gcal_event_id),
             gcal_sync_status=Assignment.GCalSyncStatus.SYNCED,
             gcal_synced_at=timezone.now(),
         )
     else:
         Assignment.objects.filter(pk=assignment_id).update(
+            updated_at=timezone.now(),
             gcal_sync_status=Assignment.GCalSyncStatus.FAILED,
         )
 
@@ -1,13 +1,13 @@
 """Interpreter matching and availability service."""
-from django.db.models import Q, Count, Avg
-from django.utils import timezone
+from django.db.models import F
+from django.db.models.functions import Coalesce
 from app.models import Interpreter, Assignment
 
 
 def find_available_interpreters(language=None, state=None, city=None, date=None, service_type=None):
     """Find interpreters available for a given set of criteria."""
     qs = Interpreter.objects.filter(active=True, is_manually_blocked=False)
-    qs = qs.select_related('user')
+    qs = qs.select_related('user', 'stats')
     qs = qs.prefetch_related('languages')
 
     if language:
@@ -25,9 +25,10 @@ def find_available_interpreters(language=None, state=None, city=None, date=None,
         ).values_list('interpreter_id', flat=True)
         qs = qs.exclude(id__in=busy_interpreters)
 
+    # Performance figures come from the denormalised InterpreterStats row
     qs = qs.annotate(
-        missions_count=Count('assignment', filter=Q(assignment__status='COMPLETED')),
-        avg_rating=Avg('assignment__assignmentfeedback__rating'),
+        missions_count=Coalesce(F('stats__missions_completed'), 0),
+        avg_rating=F('stats__avg_rating'),
     )
 
     return qs.distinct()
@@ -0,0 +1,171 @@
+"""Content-addressed render cache for generated PDFs (pay stubs, earnings summaries).
+
+Rendered documents are stored in the ``pdf_cache`` storage under a key derived
+from a SHA-256 of the document data plus the template version, so an unchanged
+document is never rendered twice and any change to its rows yields a new key.
+A regenerated pay stub deletes its previous render; everything else left
+behind is expired by the bucket's render-cache/ lifecycle rule.
+"""
+import hashlib
+import json
+import logging
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.files.base import ContentFile
+from django.core.files.storage import storages
+from django.http import FileResponse, HttpResponse, HttpResponseRedirect
+
+logger = logging.getLogger(__name__)
+
+# Bump a version whenever the matching ReportLab layout changes so that
+# previously cached renders are no longer served.
+PDF_TEMPLATE_VERSIONS = {
+    'paystub': 1,
+    'earnings_summary': 1,
+}
+
+POINTER_KEY = 'pdf-cache:{kind}:{owner_id}'
+
+
+def _enabled():
+    return getattr(settings, 'PDF_RENDER_CACHE_ENABLED', True)
+
+
+def _storage():
+    return storages['pdf_cache']
+
+
+def compute_fingerprint(kind, data):
+    """Return the hex SHA-256 of *data* for the given document kind."""
+    canonical = json.dumps(data, sort_keys=True, default=str, separators=(',', ':'))
+    version = PDF_TEMPLATE_VERSIONS.get(kind, 1)
+    return hashlib.sha256(f"{kind}:v{version}:{canonical}".encode('utf-8')).hexdigest()
+
+
+def build_cache_key(kind, data):
+    """Storage key for a rendered document, e.g. ``paystub/ab/ab12...ef.pdf``."""
+    digest = compute_fingerprint(kind, data)
+    return f"{kind}/{digest[:2]}/{digest}.pdf"
+
+
+def payroll_document_payload(stub):
+    """Everything ``generate_payroll_pdf`` reads from a PayrollDocument, as plain data."""
+    return {
+        'document_number': stub.document_number,
+        'document_date': stub.document_date,
+        'interpreter_name': stub.interpreter_name,
+        'interpreter_email': stub.interpreter_email,
+        'interpreter_phone': stub.interpreter_phone,
+        'interpreter_address': stub.interpreter_address,
+        'company_address': stub.company_address,
+        'company_email': stub.company_email,
+        'company_phone': stub.company_phone,
+        'services': [
+            [s.date, s.client, s.source_language, s.target_language, s.duration, s.rate]
+            for s in stub.services.all()
+        ],
+        'reimbursements': [
+            [r.date, r.description, r.reimbursement_type, r.amount]
+            for r in stub.reimbursements.all()
+        ],
+        'deductions': [
+            [d.date, d.description, d.deduction_type, d.amount]
+            for d in stub.deductions.all()
+        ],
+    }
+
+
+def _remember(kind, owner_id, key):
+    if owner_id is None:
+        return
+    pointer = POINTER_KEY.format(kind=kind, owner_id=owner_id)
+    previous = cache.get(pointer)
+    if previous and previous != key:
+        _delete_quietly(previous)
+    cache.set(pointer, key, None)
+
+
+def _delete_quietly(key):
+    try:
+        _storage().delete(key)
+    except Exception as exc:
+        logger.warning("PDF cache: could not delete %s: %s", key, exc)
+
+
+def get_or_render(kind, data, render, owner_id=None):
+    """Return the PDF bytes for *data*, rendering only on a cache miss.
+
+    Args:
+        kind: Document kind, a key of ``PDF_TEMPLATE_VERSIONS``.
+        data: JSON-serialisable payload that fully determines the rendered output.
+        render: Zero-argument callable returning a BytesIO with the PDF.
+        owner_id: Optional owning row id, used to purge stale renders on change.
+
+    Returns:
+        The PDF as bytes. Storage errors never fail the caller; the document is
+        simply rendered again.
+    """
+    if not _enabled():
+        return render().getvalue()
+
+    key = build_cache_key(kind, data)
+    try:
+        storage = _storage()
+        if storage.exists(key):
+            with storage.open(key, 'rb') as fh:
+                return fh.read()
+    except Exception as exc:
+        logger.warning("PDF cache read failed for %s: %s", key, exc)
+
+    pdf_bytes = render().getvalue()
+    try:
+        storage = _storage()
+        if not storage.exists(key):
+            storage.save(key, ContentFile(pdf_bytes))
+        _remember(kind, owner_id, key)
+    except Exception as exc:
+        logger.warning("PDF cache write failed for %s: %s", key, exc)
+    return pdf_bytes
+
+
+def pdf_response(kind, data, render, filename, owner_id=None):
+    """Build a download response for a cached PDF.
+
+    Cache hits are served by presigned redirect when ``PDF_RENDER_CACHE_REDIRECT``
+    is on, otherwise streamed from storage. Misses render, store and return bytes.
+    """
+    disposition = f'attachment; filename="{filename}"'
+    if _enabled():
+        key = build_cache_key(kind, data)
+        try:
+            storage = _storage()
+            if storage.exists(key):
+                if getattr(settings, 'PDF_RENDER_CACHE_REDIRECT', False):
+                    url = storage.url(key, parameters={
+                        'ResponseContentDisposition': disposition,
+                        'ResponseContentType': 'application/pdf',
+                    }, expire=getattr(settings, 'PDF_RENDER_CACHE_URL_EXPIRY', 300))
+                    return HttpResponseRedirect(url)
+                return FileResponse(
+                    storage.open(key, 'rb'), as_attachment=True,
+                    filename=filename, content_type='application/pdf',
+                )
+        except Exception as exc:
+            logger.warning("PDF cache lookup failed for %s: %s", key, exc)
+
+    pdf_bytes = get_or_render(kind, data, render, owner_id=owner_id)
+    response = HttpResponse(pdf_bytes, content_type='application/pdf')
+    response['Content-Disposition'] = disposition
+    return response
+
+
+def invalidate_pdf_cache(kind, owner_id):
+    """Drop the last render stored for ``(kind, owner_id)``."""
+    if not _enabled():
+        return
+    pointer = POINTER_KEY.format(kind=kind, owner_id=owner_id)
+    key = cache.get(pointer)
+    if key:
+        _delete_quietly(key)
+        cache.delete(pointer)
@@ -1,10 +1,8 @@
 """Assignment CRUD and lifecycle management (confirm, cancel, complete, reassign, etc.)."""
-import csv
 import logging
-from collections import defaultdict
 
-from django.db.models import Count, Q
-from django.http import StreamingHttpResponse
+from django.db.models import CharField, Count, Q, Value
+from django.db.models.functions import Coalesce, Concat, Trim
 from django.utils import timezone
 from django_filters.rest_framework import DjangoFilterBackend
 from rest_framework import status
@@ -14,32 +12,36 @@ from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
 from rest_framework.viewsets import ModelViewSet
 
+from app.api.exports import ExportColumn, ExportMixin, single_line
 from app.api.filters import AssignmentFilter
-from app.api.pagination import StandardPagination
+from app.api.pagination import KeysetPagination
 from app.api.permissions import IsAdminUser
 from app.api.serializers.assignments import (
+    AssignmentListProjection,
     AssignmentListSerializer,
     AssignmentDetailSerializer,
     AssignmentCreateSerializer,
     AssignmentUpdateSerializer,
-    AssignmentCalendarSerializer,
+    AssignmentCalendarProjection,
 )
+from app.api.services import assignment_feed, bulk_transitions
 from app.api.services.assignment_service import (
     create_interpreter_payment,
     cancel_interpreter_payment,
     create_expense_for_assignment,
 )
-from app.tasks_calendar import sync_assignment_to_calendar
+from app.services import calendar_sync_dispatcher
+from app.utils.timezone import day_bounds
 import app.services.assignment_email_service as email_svc
 from app.models import Assignment, Notification
 
 logger = logging.getLogger(__name__)
 
 
-class AssignmentViewSet(ModelViewSet):
+class AssignmentViewSet(ExportMixin, ModelViewSet):
     """Full CRUD plus lifecycle actions for assignments."""
     permission_classes = [IsAuthenticated, IsAdminUser]
-    pagination_class = StandardPagination
+    pagination_class = KeysetPagination
     filter_backends = [DjangoFilterBackend, SearchFilter, OrderingFilter]
     filterset_class = AssignmentFilter
     search_fields = [
@@ -52,6 +54,33 @@ class AssignmentViewSet(ModelViewSet):
     ordering_fields = ['start_time', 'created_at', 'status']
     ordering = ['-start_time']
 
+    export_filename = 'assignments'
+    export_ordering = ('start_time', 'pk')
+    export_columns = (
+        ExportColumn('ID', 'id'),
+        ExportColumn('Status', 'status'),
+        ExportColumn('Client', Coalesce('client__company_name', 'client_name', Value(''))),
+        ExportColumn('Interpreter', Trim(Concat(
+            'interpreter__user__first_name', Value(' '), 'interpreter__user__last_name',
+            output_field=CharField(),
+        ))),
+        ExportColumn('Service Type', 'service_type__name'),
+        ExportColumn('Source Language', 'source_language__name'),
+        ExportColumn('Target Language', 'target_language__name'),
+        ExportColumn('Start Time', 'start_time'),
+        ExportColumn('End Time', 'end_time'),
+        ExportColumn('Location', 'location'),
+        ExportColumn('City', 'city'),
+        ExportColumn('State', 'state'),
+        ExportColumn('ZIP', 'zip_code'),
+        ExportColumn('Rate ($/hr)', 'interpreter_rate'),
+        ExportColumn('Min Hours', 'minimum_hours'),
+        ExportColumn('Total Payment', 'total_interpreter_payment'),
+        ExportColumn('Is Paid', 'is_paid'),
+        ExportColumn('Notes', 'notes', format=single_line),
+        ExportColumn('Created At', 'created_at'),
+    )
+
     def get_queryset(self):
         return (
             Assignment.objects
@@ -67,6 +96,7 @@ class AssignmentViewSet(ModelViewSet):
         )
 
     def get_serializer_class(self):
+        # list/kanban/calendar render through projections with the same contract
         if self.action == 'list':
             return AssignmentListSerializer
         if self.action == 'create':
@@ -75,6 +105,14 @@ class AssignmentViewSet(ModelViewSet):
             return AssignmentUpdateSerializer
         return AssignmentDetailSerializer
 
+    def list(self, request, *args, **kwargs):
+        """Paginated table rows, built from ``.values()`` (AssignmentListProjection)."""
+        queryset = AssignmentListProjection.project(self.filter_queryset(self.get_queryset()))
+        page = self.paginate_queryset(queryset)
+        if page is not None:
+            return self.get_paginated_response(AssignmentListProjection(page, many=True).data)
+        return Response(AssignmentListProjection(queryset, many=True).data)
+
     # ------------------------------------------------------------------
     # Confirm  (PENDING → CONFIRMED)
     # ------------------------------------------------------------------
@@ -97,7 +135,6 @@ class AssignmentViewSet(ModelViewSet):
             except Exception as e:
                 logger.error('Failed to create interpreter payment for assignment %s: %s', pk, e)
 
-        sync_assignment_to_calendar.delay(assignment.id)
         email_svc.send_assignment_email(assignment, 'confirmed')
 
         return Response(AssignmentDetailSerializer(assignment).data)
@@ -161,7 +198,6 @@ class AssignmentViewSet(ModelViewSet):
                 logger.error('Failed to create expense for completed assignment %s: %s', pk, e)
 
         email_svc.send_assignment_email(assignment, 'completed')
-        sync_assignment_to_calendar.delay(assignment.id)  # update color to green
         return Response(AssignmentDetailSerializer(assignment).data)
 
     # ------------------------------------------------------------------
@@ -430,143 +466,69 @@ class AssignmentViewSet(ModelViewSet):
         """
         Perform a bulk lifecycle action on multiple assignments.
         Payload: { action: 'confirm' | 'cancel' | 'complete', ids: [1, 2, 3] }
+        Set-based, one transaction per batch (see bulk_transitions); every id
+        comes back in ``succeeded`` or in ``failed`` with a reason.
         """
         act = request.data.get('action')
         ids = request.data.get('ids', [])
 
-        if act not in ('confirm', 'cancel', 'complete'):
+        if act not in bulk_transitions.ASSIGNMENT_TRANSITIONS:
             return Response({'detail': 'action must be confirm, cancel, or complete.'}, status=400)
         if not ids:
             return Response({'detail': 'ids list is required.'}, status=400)
 
-        assignments = Assignment.objects.filter(pk__in=ids).select_related('interpreter__user')
-        results = {'succeeded': [], 'failed': []}
-
-        for assignment in assignments:
-            try:
-                if act == 'confirm' and assignment.can_be_confirmed():
-                    assignment.status = Assignment.Status.CONFIRMED
-                    assignment.save()
-                    if assignment.interpreter and assignment.total_interpreter_payment:
-                        create_interpreter_payment(assignment, created_by=request.user)
-                    sync_assignment_to_calendar.delay(assignment.id)
-                    email_svc.send_assignment_email(assignment, 'confirmed')
-                    results['succeeded'].append(assignment.id)
-                elif act == 'cancel' and assignment.can_be_cancelled():
-                    assignment.cancel()
-                    cancel_interpreter_payment(assignment)
-                    email_svc.send_assignment_email(assignment, 'cancelled')
-                    results['succeeded'].append(assignment.id)
-                elif act == 'complete' and assignment.can_be_completed():
-                    assignment.status = Assignment.Status.COMPLETED
-                    assignment.completed_at = timezone.now()
-                    assignment.save()
-                    if assignment.interpreter and assignment.total_interpreter_payment:
-                        create_expense_for_assignment(assignment)
-                    email_svc.send_assignment_email(assignment, 'completed')
-                    results['succeeded'].append(assignment.id)
-                else:
-                    results['failed'].append({'id': assignment.id, 'reason': f'Cannot {act} in status {assignment.status}'})
-            except Exception as e:
-                logger.error('Bulk action %s failed for assignment %s: %s', act, assignment.id, e)
-                results['failed'].append({'id': assignment.id, 'reason': str(e)})
-
-        return Response(results)
+        result = bulk_transitions.transition_assignments(
+            act, ids, request.user, ip_address=self._get_client_ip(request),
+        )
+        return Response({'succeeded': result.succeeded, 'failed': result.failed})
 
     # ------------------------------------------------------------------
-    # Export CSV
+    # Export (CSV / XLSX)
     # ------------------------------------------------------------------
     @action(detail=False, methods=['get'])
     def export(self, request):
-        """Stream filtered assignments as a CSV file."""
-        qs = self.filter_queryset(self.get_queryset()).order_by('start_time')
-
-        def stream():
-            yield '\ufeff'  # UTF-8 BOM for Excel
-            headers = [
-                'ID', 'Status', 'Client', 'Interpreter', 'Service Type',
-                'Source Language', 'Target Language',
-                'Start Time', 'End Time', 'Location', 'City', 'State', 'ZIP',
-                'Rate ($/hr)', 'Min Hours', 'Total Payment', 'Is Paid',
-                'Notes', 'Created At',
-            ]
-            yield ','.join(f'"{h}"' for h in headers) + '\r\n'
-
-            for a in qs.iterator(chunk_size=200):
-                interpreter_name = ''
-                if a.interpreter and a.interpreter.user:
-                    u = a.interpreter.user
-                    interpreter_name = f"{u.first_name} {u.last_name}".strip()
-                client_display = a.client.company_name if a.client else (a.client_name or '')
-
-                row = [
-                    str(a.id),
-                    a.status,
-                    client_display,
-                    interpreter_name,
-                    a.service_type.name if a.service_type else '',
-                    a.source_language.name if a.source_language else '',
-                    a.target_language.name if a.target_language else '',
-                    a.start_time.isoformat() if a.start_time else '',
-                    a.end_time.isoformat() if a.end_time else '',
-                    a.location or '',
-                    a.city or '',
-                    a.state or '',
-                    a.zip_code or '',
-                    str(a.interpreter_rate or ''),
-                    str(a.minimum_hours or ''),
-                    str(a.total_interpreter_payment or ''),
-                    'Yes' if a.is_paid else 'No',
-                    (a.notes or '').replace('"', '""').replace('\n', ' '),
-                    a.created_at.isoformat() if a.created_at else '',
-                ]
-                yield ','.join(f'"{v}"' for v in row) + '\r\n'
-
-        response = StreamingHttpResponse(stream(), content_type='text/csv; charset=utf-8')
-        filename = f"assignments-{timezone.now().strftime('%Y%m%d-%H%M')}.csv"
-        response['Content-Disposition'] = f'attachment; filename="{filename}"'
-        return response
+        """Stream filtered assignments as CSV/XLSX (large ranges run in the background)."""
+        return self.export_response(request)
 
     # ------------------------------------------------------------------
     # Calendar view
     # ------------------------------------------------------------------
     @action(detail=False, methods=['get'])
     def calendar(self, request):
-        """Return assignments filtered by date range for calendar display."""
-        start = request.query_params.get('start')
-        end = request.query_params.get('end')
+        """Events starting in the required ``start``–``end`` window (see assignment_feed).
 
-        qs = AssignmentCalendarSerializer.setup_eager_loading(self.get_queryset())
-        if start:
-            qs = qs.filter(start_time__gte=start)
-        if end:
-            qs = qs.filter(start_time__lte=end)
+        With ``?changed_since=`` only the window's changes since then are returned.
+        """
+        start, end = assignment_feed.calendar_window(request.query_params)
+        qs = self.get_queryset().filter(start_time__gte=start, start_time__lte=end)
 
-        qs = qs.order_by('start_time')
-        serializer = AssignmentCalendarSerializer(qs, many=True)
-        return Response(serializer.data)
+        since = request.query_params.get('changed_since')
+        if since:
+            return Response(assignment_feed.changes(
+                qs, AssignmentCalendarProjection,
+                assignment_feed.parse_timestamp(since, 'changed_since'),
+            ))
+        qs = AssignmentCalendarProjection.project(qs.order_by('start_time', 'pk'))
+        return Response(AssignmentCalendarProjection(qs, many=True).data)
 
     # ------------------------------------------------------------------
     # Kanban view
     # ------------------------------------------------------------------
     @action(detail=False, methods=['get'])
     def kanban(self, request):
-        """Group assignments by status for kanban-style display."""
-        qs = self.filter_queryset(
-            AssignmentListSerializer.setup_eager_loading(self.get_queryset())
-        ).order_by('start_time')
-
-        grouped = defaultdict(list)
-        serializer = AssignmentListSerializer(qs, many=True)
-        for item in serializer.data:
-            grouped[item['status']].append(item)
+        """Status columns, each limited and cursor-paginated (see assignment_feed).
 
-        # Ensure all statuses present even if empty
-        for s in ('PENDING', 'CONFIRMED', 'IN_PROGRESS', 'COMPLETED', 'CANCELLED', 'NO_SHOW'):
-            if s not in grouped:
-                grouped[s] = []
-
-        return Response(dict(grouped))
+        ``?column=<STATUS>&cursor=`` pages one column; ``?changed_since=``
+        returns only the assignments changed since then.
+        """
+        qs = self.filter_queryset(self.get_queryset())
+        since = request.query_params.get('changed_since')
+        if since:
+            return Response(assignment_feed.changes(
+                qs, AssignmentListProjection,
+                assignment_feed.parse_timestamp(since, 'changed_since'),
+            ))
+        return Response(assignment_feed.kanban(qs, AssignmentListProjection, request.query_params))
 
     # ------------------------------------------------------------------
     # Create / Update overrides — with audit logging
@@ -633,8 +595,6 @@ class AssignmentViewSet(ModelViewSet):
             })
         except Exception as e:
             logger.warning('Post-update audit failed for assignment %s: %s', instance.id, e)
-        # Re-sync calendar whenever an assignment is updated (time, location, interpreter may have changed)
-        sync_assignment_to_calendar.delay(instance.id)
 
     # ------------------------------------------------------------------
     # Manual Google Calendar sync
@@ -643,12 +603,17 @@ class AssignmentViewSet(ModelViewSet):
     def sync_calendar(self, request, pk=None):
         """Manually trigger a Google Calendar sync for a single assignment."""
         assignment = self.get_object()
-        sync_assignment_to_calendar.delay(assignment.id)
+        calendar_sync_dispatcher.request_sync(assignment.id, force=True)
         return Response({
             'detail': f'Calendar sync queued for assignment #{assignment.id}.',
             'gcal_sync_status': assignment.gcal_sync_status,
         })
 
+    @action(detail=False, methods=['get'], url_path='calendar-sync-metrics')
+    def calendar_sync_metrics(self, request):
+        """Calendar sync dispatcher counters and current queue depth."""
+        return Response(calendar_sync_dispatcher.get_metrics())
+
     # ------------------------------------------------------------------
     # Failure Logs  (admin-visible recent errors)
     # ------------------------------------------------------------------
@@ -715,7 +680,8 @@ class AssignmentViewSet(ModelViewSet):
             interpreter__isnull=True,
         ).count()
 
-        today_count = qs.filter(start_time__date=today).count()
+        day_start, day_end = day_bounds(today)
+        today_count = qs.filter(start_time__gte=day_start, start_time__lt=day_end).count()
 
         return Response({
             'by_status': by_status,
@@ -22,7 +22,8 @@ from app.api.services.auth_service import (
     user_payload,
 )
 from app.models import User
-from app.models.auth_security import MFADevice, WebAuthnCredential
+from app.models.auth_security import WebAuthnCredential
+from app.services import auth_state
 
 logger = logging.getLogger(__name__)
 
@@ -41,22 +42,20 @@ class LoginView(APIView):
     authentication_classes = []
 
     def post(self, request):
-        print(f"[LOGIN VIEW] ===== LOGIN REQUEST =====")
-        print(f"[LOGIN VIEW] Content-Type: {request.content_type}")
-        print(f"[LOGIN VIEW] request.data type: {type(request.data)}")
-        print(f"[LOGIN VIEW] request.data keys: {list(request.data.keys()) if hasattr(request.data, 'keys') else 'N/A'}")
-        print(f"[LOGIN VIEW] request.data: {dict(request.data)}")
         identifier = request.data.get("identifier", "") or request.data.get("email", "")
         password = request.data.get("password", "")
-        print(f"[LOGIN VIEW] Resolved identifier={identifier!r}, has_password={bool(password)}")
 
         result = AuthService.login(request, identifier, password)
-        print(f"[LOGIN VIEW] Result: success={result.get('success')}, status={result.get('status', 200)}, error={result.get('error', 'none')}")
+        logger.debug(
+            "Login for %r: success=%s status=%s", identifier, result.get("success"), result.get("status", 200),
+        )
 
         if not result["success"]:
+            headers = {"Retry-After": str(result["retry_after"])} if result.get("retry_after") else None
             return Response(
                 {"detail": result["error"]},
                 status=result["status"],
+                headers=headers,
             )
 
         response_data = {
@@ -187,8 +186,9 @@ class StepUpAuthStatusView(APIView):
     permission_classes = [IsAuthenticated]
 
     def get(self, request):
-        has_mfa = MFADevice.objects.filter(user=request.user, is_verified=True).exists()
-        has_passkeys = WebAuthnCredential.objects.filter(user=request.user).exists()
+        state = auth_state.mfa_state(request.user)
+        has_mfa = state["has_totp"]
+        has_passkeys = state["has_webauthn"]
 
         methods = ["password"]
         if has_mfa:
@@ -528,14 +528,15 @@ class MeView(APIView):
 
     def get(self, request):
         user = request.user
+        mfa = auth_state.mfa_state(user)
         data = user_payload(user)
         data.update({
             "phone": user.phone,
             "registration_complete": user.registration_complete,
             "is_dashboard_enabled": user.is_dashboard_enabled,
             "created_at": user.created_at,
-            "has_mfa": MFADevice.objects.filter(user=user, is_verified=True).exists(),
-            "has_webauthn": user.webauthn_credentials.exists(),
+            "has_mfa": mfa["has_totp"],
+            "has_webauthn": mfa["has_webauthn"],
         })
 
         # Role-specific profile
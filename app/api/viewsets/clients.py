@@ -1,10 +1,12 @@
 """Client management viewset with history, invoices, and assignments sub-resources."""
 import logging
 import secrets
+from datetime import date, datetime, time, timezone as dt_tz
 from itertools import chain
 from operator import attrgetter
 
 from django.db.models import Count, Sum, Q
+from django.utils import timezone
 from django_filters.rest_framework import DjangoFilterBackend
 from rest_framework import status
 from rest_framework.decorators import action
@@ -28,6 +30,16 @@ from app.models import (
 logger = logging.getLogger(__name__)
 
 
+def _timeline_key(entry):
+    """Sort key for history entries: invoice dates count as local midnight, undated last."""
+    value = entry.get('date')
+    if value is None:
+        return datetime.min.replace(tzinfo=dt_tz.utc)
+    if not isinstance(value, datetime) and isinstance(value, date):
+        return timezone.make_aware(datetime.combine(value, time.min))
+    return value
+
+
 class ClientViewSet(ModelViewSet):
     """Client CRUD with annotated metrics and sub-resource actions."""
     permission_classes = [IsAuthenticated, IsAdminUser]
@@ -171,7 +183,7 @@ class ClientViewSet(ModelViewSet):
 
         timeline = sorted(
             quotes + assignments + payments + invoices,
-            key=lambda x: x.get('date') or '',
+            key=_timeline_key,
             reverse=True,
         )
 
@@ -14,6 +14,8 @@ from rest_framework.response import Response
 from rest_framework.viewsets import ViewSet
 
 from app.api.permissions import IsAdminUser
+from app.services import reference_data
+from app.utils.timezone import day_bounds
 from app.models import (
     Assignment, Interpreter, QuoteRequest, Invoice,
     InterpreterPayment, Expense, OnboardingInvitation,
@@ -257,17 +259,11 @@ class DashboardViewSet(ViewSet):
         if cached is not None:
             return Response(cached)
 
-        today = timezone.now().date()
+        day_start, day_end = day_bounds(timezone.now().date())
         assignments = (
             Assignment.objects
-            .filter(start_time__date=today)
-            .select_related(
-                'interpreter__user',
-                'client',
-                'service_type',
-                'source_language',
-                'target_language',
-            )
+            .filter(start_time__gte=day_start, start_time__lt=day_end)
+            .select_related('interpreter__user', 'client')
             .order_by('start_time')
         )
 
@@ -285,9 +281,9 @@ class DashboardViewSet(ViewSet):
                 'end_time': a.end_time,
                 'interpreter': interpreter_name,
                 'client': client_display,
-                'service_type': a.service_type.name if a.service_type else '',
-                'source_language': a.source_language.name if a.source_language else '',
-                'target_language': a.target_language.name if a.target_language else '',
+                'service_type': reference_data.service_type_name(a.service_type_id),
+                'source_language': reference_data.language_name(a.source_language_id),
+                'target_language': reference_data.language_name(a.target_language_id),
                 'city': a.city,
                 'state': a.state,
             })
@@ -1,9 +1,8 @@
 """Interpreter management viewset with performance, availability, and map endpoints."""
 import logging
+from collections import defaultdict
 from datetime import timedelta
-from decimal import Decimal
 
-from django.db.models import Count, Avg, Sum, Q, Subquery, OuterRef
 from django.utils import timezone
 from django_filters.rest_framework import DjangoFilterBackend
 from rest_framework import status
@@ -16,17 +15,22 @@ from rest_framework.viewsets import GenericViewSet
 
 from app.api.filters import InterpreterFilter
 from app.api.pagination import StandardPagination
+from app.api.services import bulk_transitions
 from app.api.permissions import IsAdminUser
 from app.api.serializers.users import (
     InterpreterListSerializer,
     InterpreterDetailSerializer,
     InterpreterUpdateSerializer,
+    prefetch_latest_location,
+    stats_annotations,
 )
 from app.models import (
-    Interpreter, InterpreterLocation, Assignment, AssignmentFeedback,
+    Interpreter, InterpreterLanguage, InterpreterLocation, InterpreterStats, Assignment,
     InterpreterPayment,
 )
 from app.models.documents import InterpreterContractSignature
+from app.services import reference_data
+from app.utils.timezone import day_bounds
 
 
 def _decrypt_banking(value):
@@ -39,9 +43,25 @@ def _decrypt_banking(value):
     except Exception:
         return value
 
+
 logger = logging.getLogger(__name__)
 
 
+def _language_names(interpreter_languages, limit=None):
+    """``{interpreter id: [language names]}`` in name order, for the given
+    InterpreterLanguage rows; names come from the reference-data registry."""
+    language_ids = defaultdict(list)
+    for interpreter_id, language_id in interpreter_languages.values_list('interpreter_id', 'language_id'):
+        language_ids[interpreter_id].append(language_id)
+    return {
+        interpreter_id: [
+            reference_data.language_name(language_id)
+            for language_id in sorted(ids, key=reference_data.language_sort_key)[:limit]
+        ]
+        for interpreter_id, ids in language_ids.items()
+    }
+
+
 class InterpreterViewSet(ListModelMixin, RetrieveModelMixin, UpdateModelMixin, GenericViewSet):
     """
     Interpreter management: list, retrieve, partial_update plus custom actions
@@ -64,19 +84,10 @@ class InterpreterViewSet(ListModelMixin, RetrieveModelMixin, UpdateModelMixin, G
     def get_queryset(self):
         return (
             Interpreter.objects
-            .select_related('user')
-            .prefetch_related('languages', 'locations')   # locations needed for lat/lng/is_on_mission
-            .annotate(
-                missions_count=Count(
-                    'assignment',
-                    filter=Q(assignment__status='COMPLETED'),
-                    distinct=True,
-                ),
-                avg_rating=Avg(
-                    'assignment__assignmentfeedback__rating',
-                    filter=Q(assignment__status='COMPLETED'),
-                ),
-            )
+            .select_related('user', 'stats')
+            # newest location only, for lat/lng/is_on_mission
+            .prefetch_related('languages', prefetch_latest_location())
+            .annotate(**stats_annotations())
         )
 
     def get_serializer_class(self):
@@ -245,6 +256,8 @@ class InterpreterViewSet(ListModelMixin, RetrieveModelMixin, UpdateModelMixin, G
           send_contract | send_onboarding |
           send_reminder_1 | send_reminder_2 | send_reminder_3 |
           suspend | send_password_reset | send_message
+        The lifecycle actions (activate … unblock, suspend) are set-based
+        (see bulk_transitions) and also return per-id succeeded/skipped/failed.
         """
         from django.contrib.auth.tokens import default_token_generator
         from django.utils.http import urlsafe_base64_encode
@@ -265,35 +278,26 @@ class InterpreterViewSet(ListModelMixin, RetrieveModelMixin, UpdateModelMixin, G
         if not interpreters.exists():
             return Response({'detail': 'No matching interpreters found.'}, status=status.HTTP_404_NOT_FOUND)
 
-        results = {'success': 0, 'skipped': 0, 'failed': 0}
-
-        if action_name == 'activate':
-            updated = interpreters.update(active=True)
-            results['success'] = updated
-
-        elif action_name == 'deactivate':
-            updated = interpreters.update(active=False)
-            results['success'] = updated
-
-        elif action_name == 'block':
-            updated = interpreters.update(
-                is_manually_blocked=True,
-                blocked_at=timezone.now(),
-                blocked_by=request.user,
-                blocked_reason=reason or 'Bulk block via Admin',
+        if action_name in bulk_transitions.INTERPRETER_TRANSITIONS:
+            result = bulk_transitions.transition_interpreters(
+                action_name, ids, request.user, reason=reason,
+                ip_address=request.META.get('REMOTE_ADDR'),
             )
-            results['success'] = updated
-
-        elif action_name == 'unblock':
-            updated = interpreters.update(
-                is_manually_blocked=False,
-                blocked_at=None,
-                blocked_by=None,
-                blocked_reason=None,
-            )
-            results['success'] = updated
+            results = {
+                'success': len(result.succeeded), 'skipped': len(result.skipped), 'failed': len(result.failed),
+            }
+            logger.info(f"Bulk action '{action_name}' on {len(ids)} interpreters by {request.user.email}: {results}")
+            return Response({
+                'detail': f"Action '{action_name}' completed.",
+                'results': results,
+                'succeeded': result.succeeded,
+                'skipped': result.skipped,
+                'failed': result.failed,
+            })
 
-        elif action_name == 'send_contract':
+        results = {'success': 0, 'skipped': 0, 'failed': 0}
+
+        if action_name == 'send_contract':
             from app.models import ContractInvitation, ContractTrackingEvent
             from app.services.email_service import ContractEmailService
             for interp in interpreters:
@@ -363,21 +367,6 @@ class InterpreterViewSet(ListModelMixin, RetrieveModelMixin, UpdateModelMixin, G
                     logger.error(f"Bulk reminder_{level} failed for {interp.id}: {e}")
                     results['failed'] += 1
 
-        elif action_name == 'suspend':
-            from app.services.email_service import ContractViolationService
-            for interp in interpreters:
-                try:
-                    ContractViolationService.send_suspension_email(interp, reason or "Administrative Decision", triggered_by=request.user)
-                    interp.is_manually_blocked = True
-                    interp.blocked_reason = "Administrative Suspension"
-                    interp.blocked_by = request.user
-                    interp.blocked_at = timezone.now()
-                    interp.save(update_fields=['is_manually_blocked', 'blocked_reason', 'blocked_by', 'blocked_at'])
-                    results['success'] += 1
-                except Exception as e:
-                    logger.error(f"Bulk suspend failed for {interp.id}: {e}")
-                    results['failed'] += 1
-
         elif action_name == 'send_password_reset':
             site_url = getattr(django_settings, 'SITE_URL', 'https://portal.jhbridgetranslation.com').rstrip('/')
             for interp in interpreters:
@@ -440,13 +429,14 @@ class InterpreterViewSet(ListModelMixin, RetrieveModelMixin, UpdateModelMixin, G
     def available(self, request):
         """
         Find interpreters available for a given set of criteria.
-        Query params: language, state, city, date, service_type
+        Query params: language (id or name), state, city, date, service_type
         """
         qs = Interpreter.objects.filter(active=True, is_manually_blocked=False).select_related('user')
 
-        language_id = request.query_params.get('language')
-        if language_id:
-            qs = qs.filter(languages__id=language_id)
+        language = request.query_params.get('language')
+        if language:
+            language_id = language if language.isdigit() else reference_data.language_id(language)
+            qs = qs.filter(languages__id=language_id) if language_id else qs.none()
 
         state = request.query_params.get('state')
         if state:
@@ -463,18 +453,22 @@ class InterpreterViewSet(ListModelMixin, RetrieveModelMixin, UpdateModelMixin, G
                 from django.utils.dateparse import parse_datetime, parse_date
                 parsed_date = parse_date(date_str)
                 if parsed_date:
+                    day_start, day_end = day_bounds(parsed_date)
                     busy_ids = Assignment.objects.filter(
                         status__in=['CONFIRMED', 'IN_PROGRESS'],
-                        start_time__date=parsed_date,
+                        start_time__gte=day_start, start_time__lt=day_end,
                         interpreter__isnull=False,
                     ).values_list('interpreter_id', flat=True)
                     qs = qs.exclude(id__in=busy_ids)
             except (ValueError, TypeError):
                 pass
 
-        qs = qs.distinct()
+        interpreters = list(qs.distinct()[:100])
+        languages = _language_names(
+            InterpreterLanguage.objects.filter(interpreter_id__in=[interp.id for interp in interpreters])
+        )
         data = []
-        for interp in qs[:100]:
+        for interp in interpreters:
             data.append({
                 'id': interp.id,
                 'first_name': interp.user.first_name,
@@ -484,7 +478,7 @@ class InterpreterViewSet(ListModelMixin, RetrieveModelMixin, UpdateModelMixin, G
                 'city': interp.city,
                 'state': interp.state,
                 'hourly_rate': str(interp.hourly_rate) if interp.hourly_rate else None,
-                'languages': list(interp.languages.values_list('name', flat=True)),
+                'languages': languages.get(interp.id, []),
             })
 
         return Response(data)
@@ -496,47 +490,15 @@ class InterpreterViewSet(ListModelMixin, RetrieveModelMixin, UpdateModelMixin, G
     def performance(self, request, pk=None):
         """Performance metrics for a single interpreter."""
         interpreter = self.get_object()
-
-        assignments_qs = Assignment.objects.filter(interpreter=interpreter)
-
-        missions_completed = assignments_qs.filter(status='COMPLETED').count()
-
-        total_decided = assignments_qs.filter(
-            status__in=['CONFIRMED', 'COMPLETED', 'CANCELLED']
-        ).count()
-        accepted = assignments_qs.filter(
-            status__in=['CONFIRMED', 'COMPLETED']
-        ).count()
-        acceptance_rate = (
-            round(accepted / total_decided * 100, 1) if total_decided > 0 else 0
-        )
-
-        total_possible_show = assignments_qs.filter(
-            status__in=['COMPLETED', 'NO_SHOW']
-        ).count()
-        no_shows = assignments_qs.filter(status='NO_SHOW').count()
-        no_show_rate = (
-            round(no_shows / total_possible_show * 100, 1) if total_possible_show > 0 else 0
-        )
-
-        avg_rating = (
-            AssignmentFeedback.objects
-            .filter(assignment__interpreter=interpreter)
-            .aggregate(avg=Avg('rating'))['avg']
-        )
-
-        total_earned = (
-            InterpreterPayment.objects
-            .filter(interpreter=interpreter, status='COMPLETED')
-            .aggregate(total=Sum('amount'))['total'] or Decimal('0')
-        )
+        stats = InterpreterStats.for_interpreter(interpreter)
 
         return Response({
-            'missions_completed': missions_completed,
-            'acceptance_rate': acceptance_rate,
-            'no_show_rate': no_show_rate,
-            'avg_rating': round(avg_rating, 2) if avg_rating else None,
-            'total_earned': str(total_earned),
+            'missions_completed': stats.missions_completed,
+            'acceptance_rate': stats.acceptance_rate,
+            'no_show_rate': stats.no_show_rate,
+            'avg_rating': stats.avg_rating,
+            'total_earned': str(stats.total_earned),
+            'last_mission_date': stats.last_mission_date,
         })
 
     # ------------------------------------------------------------------
@@ -574,21 +536,11 @@ class InterpreterViewSet(ListModelMixin, RetrieveModelMixin, UpdateModelMixin, G
     @action(detail=False, methods=['get'], url_path='live-locations')
     def live_locations(self, request):
         """Latest GPS location per active interpreter."""
-        # Subquery to get the latest location per interpreter
-        latest_location = (
-            InterpreterLocation.objects
-            .filter(interpreter=OuterRef('pk'))
-            .order_by('-timestamp')
-            .values('id')[:1]
-        )
-
         locations = (
             InterpreterLocation.objects
-            .filter(
-                id__in=Subquery(latest_location),
-                interpreter__active=True,
-            )
-            .select_related('interpreter__user', 'current_assignment')
+            .latest_per_interpreter()
+            .filter(interpreter__active=True)
+            .select_related('interpreter__user')
         )
 
         data = []
@@ -616,8 +568,6 @@ class InterpreterViewSet(ListModelMixin, RetrieveModelMixin, UpdateModelMixin, G
         qs = (
             Interpreter.objects
             .filter(active=True)
-            .select_related('user')
-            .prefetch_related('languages')
             .values(
                 'id',
                 'user__first_name',
@@ -632,11 +582,12 @@ class InterpreterViewSet(ListModelMixin, RetrieveModelMixin, UpdateModelMixin, G
             )
         )
 
+        # One query for every interpreter's languages (first five by name)
+        languages = _language_names(InterpreterLanguage.objects.filter(interpreter__active=True), limit=5)
+
         data = []
         for interp in qs:
-            langs = list(
-                Interpreter.objects.get(pk=interp['id']).languages.values_list('name', flat=True)[:5]
-            )
+            langs = languages.get(interp['id'], [])
             data.append({
                 'id': interp['id'],
                 'first_name': interp['user__first_name'],
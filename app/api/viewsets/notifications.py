@@ -8,7 +8,7 @@ from rest_framework.response import Response
 from rest_framework.viewsets import GenericViewSet
 from rest_framework.mixins import ListModelMixin
 
-from app.api.pagination import SmallPagination
+from app.api.pagination import SmallKeysetPagination
 from app.api.serializers.communication import NotificationSerializer
 from app.models import Notification
 
@@ -21,7 +21,7 @@ class NotificationViewSet(ListModelMixin, GenericViewSet):
     list, mark_read (single), mark_all_read.
     """
     permission_classes = [IsAuthenticated]
-    pagination_class = SmallPagination
+    pagination_class = SmallKeysetPagination
     serializer_class = NotificationSerializer
 
     def get_queryset(self):
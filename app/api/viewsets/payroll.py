@@ -3,7 +3,6 @@ import logging
 from decimal import Decimal
 
 from django.core.mail import EmailMessage
-from django.http import HttpResponse
 from django.utils import timezone
 from django_filters.rest_framework import DjangoFilterBackend
 from rest_framework import status
@@ -25,6 +24,9 @@ from app.api.services.payroll_service import (
     generate_payroll_pdf, generate_earnings_summary_pdf,
     COMPANY_ADDRESS, COMPANY_EMAIL, COMPANY_PHONE,
 )
+from app.api.services.pdf_cache_service import (
+    get_or_render, pdf_response, payroll_document_payload,
+)
 from app.api.services.reference_service import generate_unique_reference
 from app.models import (
     InterpreterPayment, PayrollDocument, Service, Interpreter, Assignment,
@@ -254,10 +256,12 @@ class PayrollViewSet(ViewSet):
             return Response({'detail': 'Not found.'}, status=status.HTTP_404_NOT_FOUND)
 
         try:
-            pdf_buffer = generate_payroll_pdf(stub)
-            response = HttpResponse(pdf_buffer.getvalue(), content_type='application/pdf')
-            response['Content-Disposition'] = f'attachment; filename="paystub-{stub.document_number}.pdf"'
-            return response
+            return pdf_response(
+                'paystub', payroll_document_payload(stub),
+                lambda: generate_payroll_pdf(stub),
+                filename=f"paystub-{stub.document_number}.pdf",
+                owner_id=stub.pk,
+            )
         except Exception as e:
             logger.error(f"Failed to generate PDF for stub {stub_id}: {e}")
             return Response(
@@ -285,8 +289,11 @@ class PayrollViewSet(ViewSet):
 
         try:
             from app.services.email_service import PayrollEmailService
-            pdf_buffer = generate_payroll_pdf(stub)
-            ok = PayrollEmailService.send_stub(stub, pdf_buffer.getvalue())
+            pdf_bytes = get_or_render(
+                'paystub', payroll_document_payload(stub),
+                lambda: generate_payroll_pdf(stub), owner_id=stub.pk,
+            )
+            ok = PayrollEmailService.send_stub(stub, pdf_bytes)
             if not ok:
                 return Response(
                     {'detail': 'Failed to send email.'},
@@ -458,8 +465,11 @@ class PayrollViewSet(ViewSet):
         if send_now and payee_email:
             try:
                 from app.services.email_service import PayrollEmailService
-                pdf_buf = generate_payroll_pdf(stub)
-                PayrollEmailService.send_stub(stub, pdf_buf.getvalue())
+                pdf_bytes = get_or_render(
+                    'paystub', payroll_document_payload(stub),
+                    lambda: generate_payroll_pdf(stub), owner_id=stub.pk,
+                )
+                PayrollEmailService.send_stub(stub, pdf_bytes)
             except Exception as e:
                 logger.warning(f"manual_stub: email send failed: {e}")
 
@@ -551,13 +561,12 @@ class PayrollViewSet(ViewSet):
         if err:
             return err
         try:
-            pdf_buffer = generate_earnings_summary_pdf(data)
             safe_name = data['interpreter_name'].replace(' ', '_')
-            response = HttpResponse(pdf_buffer.getvalue(), content_type='application/pdf')
-            response['Content-Disposition'] = (
-                f'attachment; filename="earnings-summary-{safe_name}-{data["period_label"]}.pdf"'
+            return pdf_response(
+                'earnings_summary', data,
+                lambda: generate_earnings_summary_pdf(data),
+                filename=f"earnings-summary-{safe_name}-{data['period_label']}.pdf",
             )
-            return response
         except Exception as e:
             logger.error(f"Failed to generate earnings summary PDF: {e}")
             return Response({'detail': 'Failed to generate PDF.'}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
@@ -571,7 +580,9 @@ class PayrollViewSet(ViewSet):
         if not data['interpreter_email']:
             return Response({'detail': 'No email address for this interpreter.'}, status=status.HTTP_400_BAD_REQUEST)
         try:
-            pdf_buffer = generate_earnings_summary_pdf(data)
+            pdf_bytes = get_or_render(
+                'earnings_summary', data, lambda: generate_earnings_summary_pdf(data),
+            )
             safe_name = data['interpreter_name'].replace(' ', '_')
             filename = f"earnings-summary-{safe_name}-{data['period_label']}.pdf"
             email = EmailMessage(
@@ -586,7 +597,7 @@ class PayrollViewSet(ViewSet):
                 from_email='payroll@jhbridgetranslation.com',
                 to=[data['interpreter_email']],
             )
-            email.attach(filename, pdf_buffer.getvalue(), 'application/pdf')
+            email.attach(filename, pdf_bytes, 'application/pdf')
             email.send(fail_silently=False)
             return Response({'detail': f"Earnings summary sent to {data['interpreter_email']}."})
         except Exception as e:
@@ -41,12 +41,7 @@ class QuoteRequestViewSet(ListModelMixin, RetrieveModelMixin, CreateModelMixin,
     def get_queryset(self):
         return (
             QuoteRequest.objects
-            .select_related(
-                'client__user',
-                'service_type',
-                'source_language',
-                'target_language',
-            )
+            .select_related('client__user')
             .all()
         )
 
@@ -117,11 +112,7 @@ class QuoteViewSet(ListModelMixin, GenericViewSet):
     def get_queryset(self):
         return (
             Quote.objects
-            .select_related(
-                'quote_request__client__user',
-                'quote_request__service_type',
-                'created_by',
-            )
+            .select_related('quote_request__client__user', 'created_by')
             .all()
         )
 
@@ -174,7 +165,7 @@ class PublicQuoteRequestViewSet(ListModelMixin, GenericViewSet):
     def get_queryset(self):
         return (
             PublicQuoteRequest.objects
-            .select_related('service_type', 'source_language', 'target_language', 'processed_by')
+            .select_related('processed_by')
             .all()
         )
 
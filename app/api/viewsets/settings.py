@@ -98,10 +98,10 @@ class APIKeyViewSet(ModelViewSet):
     def rotate(self, request, pk=None):
         """Generate a new key value, invalidating the old one."""
         api_key = self.get_object()
-        api_key.key = secrets.token_hex(32)
-        api_key.save(update_fields=['key'])
+        raw_key = api_key.set_key(secrets.token_hex(32))
+        api_key.save(update_fields=['prefix', 'key_hash'])
         return Response({
             'id': str(api_key.id),
-            'key': api_key.key,
+            'key': raw_key,
             'detail': 'Key rotated. Store it now — it will not be shown again.',
         })
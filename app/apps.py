@@ -9,4 +9,5 @@ class AppConfig(AppConfig):
         try:
             import app.signals  # Import des signals
         except ImportError:
-            pass
\ No newline at end of file
+            pass
+        import app.services.task_metrics  # noqa: F401  (compteurs Celery par file)
\ No newline at end of file
@@ -0,0 +1,9 @@
+"""
+Query-count and latency regression suite for the DRF API.
+
+dataset   deterministic synthetic data at a named scale
+scenarios the GET endpoints to replay, discovered from the router
+runner    measurement, baseline comparison and reports
+
+Run it with ``python manage.py benchmark_api``.
+"""
@@ -0,0 +1,236 @@
+"""
+Deterministic synthetic dataset for the API benchmark suite.
+
+``generate(scale)`` fills an empty database with users, interpreters (with
+languages and GPS history), clients, assignments spread over the past and
+coming months, and the finance rows hanging off them (interpreter payments,
+expenses, client payments, invoices), plus quote requests, audit entries and
+notifications. Everything goes through ``bulk_create`` so no signal, email or
+Celery task fires, and a fixed random seed makes two runs identical.
+"""
+import random
+from dataclasses import dataclass
+from datetime import timedelta
+from decimal import Decimal
+
+from django.contrib.auth.hashers import make_password
+from django.utils import timezone
+
+from app.models import (
+    Assignment, AuditLog, Client, ClientPayment, EmailLog, Expense, FinancialTransaction,
+    Interpreter, InterpreterLanguage, InterpreterLocation, InterpreterPayment, Invoice, Language,
+    Notification, QuoteRequest, ServiceType, User,
+)
+from app.services import interpreter_stats, reference_data
+
+BATCH_SIZE = 2000
+SEED = 2026
+ADMIN_USERNAME = 'bench-admin'
+
+STATES = ('MA', 'NY', 'CA', 'TX', 'FL', 'IL', 'WA', 'GA', 'PA', 'NJ')
+CITIES = ('Boston', 'New York', 'Los Angeles', 'Houston', 'Miami', 'Chicago', 'Seattle', 'Atlanta')
+LANGUAGES = (
+    ('English', 'en'), ('Spanish', 'es'), ('French', 'fr'), ('Portuguese', 'pt'), ('Haitian Creole', 'ht'),
+    ('Mandarin', 'zh'), ('Arabic', 'ar'), ('Russian', 'ru'), ('Vietnamese', 'vi'), ('Cape Verdean', 'kea'),
+)
+SERVICE_TYPES = ('Legal', 'Medical', 'Conference', 'Community', 'Remote')
+# Open work in the future, closed work in the past
+PAST_STATUSES = ('COMPLETED', 'COMPLETED', 'COMPLETED', 'CANCELLED', 'NO_SHOW')
+FUTURE_STATUSES = ('PENDING', 'CONFIRMED', 'CONFIRMED', 'IN_PROGRESS')
+
+
+@dataclass(frozen=True)
+class Scale:
+    interpreters: int
+    clients: int
+    assignments: int
+    locations_per_interpreter: int
+
+
+SCALES = {
+    'tiny': Scale(interpreters=20, clients=10, assignments=300, locations_per_interpreter=2),
+    'small': Scale(interpreters=300, clients=100, assignments=10_000, locations_per_interpreter=5),
+    'full': Scale(interpreters=3000, clients=1000, assignments=100_000, locations_per_interpreter=10),
+}
+
+
+def _insert(model, objects):
+    """bulk_create *objects* and make sure each one has its pk afterwards."""
+    created = model.objects.bulk_create(objects, batch_size=BATCH_SIZE)
+    if created and created[0].pk is None:
+        # MySQL returns no ids from a bulk INSERT; on a fresh table they are the last N
+        pks = list(model.objects.order_by('-pk').values_list('pk', flat=True)[:len(created)])
+        for obj, pk in zip(created, reversed(pks)):
+            obj.pk = pk
+    return created
+
+
+def generate(scale):
+    """Populate an empty database at *scale* (a key of SCALES); returns row counts per model."""
+    size = SCALES[scale]
+    rng = random.Random(SEED)
+    now = timezone.now()
+    password = make_password('benchmark')
+
+    admin = _insert(User, [User(
+        username=ADMIN_USERNAME, email='admin@bench.local', password=password, role='ADMIN',
+        is_staff=True, is_superuser=True,
+    )])[0]
+    languages = _insert(Language, [Language(name=name, code=code) for name, code in LANGUAGES])
+    service_types = _insert(ServiceType, [
+        ServiceType(name=name, description='', base_rate=Decimal('50'), cancellation_policy='')
+        for name in SERVICE_TYPES
+    ])
+
+    # Interpreters with two to four languages and a GPS trail each
+    interpreter_users = _insert(User, [
+        User(
+            username=f'bench-interpreter-{n}', email=f'interpreter{n}@bench.local', password=password,
+            role='INTERPRETER', first_name=f'Interp{n}', last_name='Bench',
+        )
+        for n in range(size.interpreters)
+    ])
+    interpreters = _insert(Interpreter, [
+        Interpreter(
+            user=user, address=f'{n} Main St', city=rng.choice(CITIES), state=rng.choice(STATES),
+            zip_code='02101', active=rng.random() > 0.1, is_manually_blocked=rng.random() < 0.03,
+            radius_of_service=rng.choice((10, 25, 50)), hourly_rate=Decimal(rng.randint(35, 80)),
+        )
+        for n, user in enumerate(interpreter_users)
+    ])
+    _insert(InterpreterLanguage, [
+        InterpreterLanguage(
+            interpreter=interpreter, language=language, proficiency='FLUENT', is_primary=index == 0,
+        )
+        for interpreter in interpreters
+        for index, language in enumerate(rng.sample(languages, rng.randint(2, 4)))
+    ])
+    _insert(InterpreterLocation, [
+        InterpreterLocation(
+            interpreter=interpreter, latitude=42.36 + rng.uniform(-2, 2), longitude=-71.06 + rng.uniform(-2, 2),
+            accuracy=rng.uniform(3, 30),
+        )
+        for interpreter in interpreters
+        for _ in range(size.locations_per_interpreter)
+    ])
+
+    client_users = _insert(User, [
+        User(username=f'bench-client-{n}', email=f'client{n}@bench.local', password=password, role='CLIENT')
+        for n in range(size.clients)
+    ])
+    clients = _insert(Client, [
+        Client(
+            user=user, company_name=f'Bench Client {n}', address=f'{n} Court St',
+            city=rng.choice(CITIES), state=rng.choice(STATES), zip_code='02101',
+            preferred_language=rng.choice(languages),
+        )
+        for n, user in enumerate(client_users)
+    ])
+
+    # Assignments from six months back to two months ahead
+    assignments = []
+    for n in range(size.assignments):
+        start = now + timedelta(hours=rng.randint(-180 * 24, 60 * 24))
+        status = rng.choice(PAST_STATUSES if start < now else FUTURE_STATUSES)
+        source, target = rng.sample(languages, 2)
+        assignments.append(Assignment(
+            interpreter=rng.choice(interpreters) if status != 'CANCELLED' and rng.random() > 0.1 else None,
+            client=rng.choice(clients) if rng.random() > 0.2 else None,
+            client_name='' if n % 5 else f'Walk-in {n}',
+            service_type=rng.choice(service_types), source_language=source, target_language=target,
+            start_time=start, end_time=start + timedelta(hours=rng.choice((1, 2, 3, 4))),
+            location='Courthouse', city=rng.choice(CITIES), state=rng.choice(STATES), zip_code='02101',
+            interpreter_rate=Decimal('40'), total_interpreter_payment=Decimal('80'), status=status,
+            completed_at=start + timedelta(hours=2) if status == 'COMPLETED' else None,
+            is_paid=status == 'COMPLETED' and rng.random() > 0.3,
+        ))
+    assignments = _insert(Assignment, assignments)
+
+    # Finance: a payment per staffed confirmed/completed mission, an expense per
+    # completed one, a client payment and an invoice per completed client mission
+    paid = [a for a in assignments if a.interpreter_id and a.status in ('CONFIRMED', 'COMPLETED')]
+    transactions = _insert(FinancialTransaction, [
+        FinancialTransaction(
+            type='EXPENSE', amount=a.total_interpreter_payment,
+            description=f'Interpreter payment for assignment #{a.pk}', created_by=admin,
+        )
+        for a in paid
+    ])
+    _insert(InterpreterPayment, [
+        InterpreterPayment(
+            transaction=txn, interpreter_id=a.interpreter_id, assignment=a, amount=a.total_interpreter_payment,
+            payment_method='ACH', status='COMPLETED' if a.is_paid else 'PENDING',
+            scheduled_date=a.start_time + timedelta(days=14),
+            processed_date=a.start_time + timedelta(days=14) if a.is_paid else None,
+            reference_number=f'BENCH-{a.pk}',
+        )
+        for a, txn in zip(paid, transactions)
+    ])
+    _insert(Expense, [
+        Expense(
+            transaction=txn, expense_type='SALARY', amount=a.total_interpreter_payment,
+            description=f'Interpreter payment expense for assignment #{a.pk}',
+            status='PAID' if a.is_paid else 'PENDING', date_incurred=a.start_time,
+        )
+        for a, txn in zip(paid, transactions)
+        if a.status == 'COMPLETED'
+    ])
+    billed = [a for a in assignments if a.client_id and a.status == 'COMPLETED']
+    income = _insert(FinancialTransaction, [
+        FinancialTransaction(type='INCOME', amount=Decimal('120'), description=f'Client payment #{a.pk}',
+                             created_by=admin)
+        for a in billed
+    ])
+    _insert(ClientPayment, [
+        ClientPayment(
+            transaction=txn, client_id=a.client_id, assignment=a, amount=Decimal('120'),
+            total_amount=Decimal('120'), payment_method='ACH',
+            status='COMPLETED' if rng.random() > 0.2 else 'PENDING', invoice_number=f'BENCH-CP-{a.pk}',
+        )
+        for a, txn in zip(billed, income)
+    ])
+    _insert(Invoice, [
+        Invoice(
+            invoice_number=f'BENCH-INV-{a.pk}', client_id=a.client_id, subtotal=Decimal('120'),
+            total=Decimal('120'), status=rng.choice(('SENT', 'PAID', 'PAID', 'DRAFT')),
+            issued_date=a.start_time.date(), due_date=(a.start_time + timedelta(days=30)).date(),
+            created_by=admin,
+        )
+        for a in billed[::4]
+    ])
+
+    _insert(QuoteRequest, [
+        QuoteRequest(
+            client=rng.choice(clients), service_type=rng.choice(service_types),
+            requested_date=now + timedelta(days=rng.randint(1, 60)), duration=120, location='Office',
+            city=rng.choice(CITIES), state=rng.choice(STATES), zip_code='02101',
+            source_language=languages[0], target_language=rng.choice(languages[1:]),
+            status=rng.choice(('PENDING', 'PENDING', 'QUOTED', 'ACCEPTED')),
+        )
+        for _ in range(max(size.assignments // 20, 1))
+    ])
+    _insert(EmailLog, [
+        EmailLog(
+            gmail_id=f'bench-{n}', from_email=f'sender{n % 50}@example.com', subject=f'Request {n}',
+            received_at=now - timedelta(minutes=n * 7), is_processed=n % 4 != 0,
+            category=rng.choice(('INTERPRETATION', 'QUOTE', 'PAYMENT', 'OTHER', None)),
+        )
+        for n in range(max(size.assignments // 10, 1))
+    ])
+    _insert(AuditLog, [
+        AuditLog(user=admin, action='UPDATED', model_name='Assignment', object_id=str(a.pk),
+                 changes={'status': a.status})
+        for a in assignments[::2]
+    ])
+    _insert(Notification, [
+        Notification(recipient=admin, type='SYSTEM', title=f'Notice {n}', content='Benchmark', read=n % 3 == 0)
+        for n in range(200)
+    ])
+
+    interpreter_stats.rebuild()
+    reference_data.invalidate()  # bulk_create sends no post_save
+    return {
+        model.__name__: model.objects.count()
+        for model in (User, Interpreter, InterpreterLocation, Client, Assignment, InterpreterPayment,
+                      Expense, ClientPayment, Invoice, QuoteRequest, EmailLog, AuditLog)
+    }
@@ -0,0 +1,177 @@
+"""
+Measure the benchmark scenarios and compare them with the checked-in baseline.
+
+Each scenario is requested once to warm up, then ``repeat`` times with the
+cache cleared before every call (so cached KPIs cannot hide their queries).
+The best wall time is kept, together with the largest query count, and one
+extra call under ``tracemalloc`` gives the peak Python memory of the request.
+
+``compare`` applies TOLERANCE to every metric: query counts are exact signals
+and get a small absolute margin, wall time and memory depend on the machine
+and only regress past a ratio *and* a floor.
+"""
+import json
+import time
+import tracemalloc
+from dataclasses import asdict, dataclass
+from pathlib import Path
+
+from django.core.cache import cache
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+BASELINE_PATH = Path(__file__).with_name('baseline.json')
+
+
+@dataclass(frozen=True)
+class Tolerance:
+    queries: int = 2
+    time_ratio: float = 2.0
+    time_floor_ms: float = 25.0
+    memory_ratio: float = 1.5
+    memory_floor_kb: float = 256.0
+
+
+TOLERANCE = Tolerance()
+
+
+@dataclass(frozen=True)
+class Measurement:
+    name: str
+    status: int
+    queries: int
+    time_ms: float
+    peak_kb: float
+
+
+@dataclass(frozen=True)
+class Regression:
+    name: str
+    metric: str
+    baseline: float
+    measured: float
+    limit: float
+
+    def __str__(self):
+        return f'{self.name}: {self.metric} {self.measured:g} > {self.limit:g} (baseline {self.baseline:g})'
+
+
+def measure(client, scenario, repeat=3):
+    """Run *scenario* with the authenticated test *client* and return its Measurement."""
+    client.get(scenario.url, scenario.params)
+    timings, queries = [], 0
+    for _ in range(repeat):
+        cache.clear()
+        with CaptureQueriesContext(connection) as captured:
+            started = time.perf_counter()
+            response = client.get(scenario.url, scenario.params)
+            timings.append(time.perf_counter() - started)
+        queries = max(queries, len(captured))
+
+    cache.clear()
+    tracemalloc.start()
+    try:
+        client.get(scenario.url, scenario.params)
+        _current, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    return Measurement(
+        name=scenario.name, status=response.status_code, queries=queries,
+        time_ms=round(min(timings) * 1000, 1), peak_kb=round(peak / 1024, 1),
+    )
+
+
+def run(client, scenarios, repeat=3):
+    """Measurements for *scenarios*; a view that raises is recorded as its 500, not re-raised."""
+    client.raise_request_exception = False
+    return [measure(client, scenario, repeat) for scenario in scenarios]
+
+
+# ---------------------------------------------------------------------------
+# Baseline
+# ---------------------------------------------------------------------------
+def load_baseline(scale, vendor, path=BASELINE_PATH):
+    """``{scenario name: metrics}`` recorded for *scale* on *vendor*, or ``{}``."""
+    if not path.exists():
+        return {}
+    return json.loads(path.read_text()).get(scale, {}).get(vendor, {})
+
+
+def save_baseline(results, scale, vendor, path=BASELINE_PATH):
+    """Replace the *scale*/*vendor* section of the baseline file with *results*."""
+    baseline = json.loads(path.read_text()) if path.exists() else {}
+    baseline.setdefault(scale, {})[vendor] = {
+        result.name: {key: value for key, value in asdict(result).items() if key != 'name'}
+        for result in results
+    }
+    path.write_text(json.dumps(baseline, indent=2, sort_keys=True) + '\n')
+
+
+def _limit(base, ratio, floor):
+    return max(base * ratio, base + floor)
+
+
+def compare(results, baseline, tolerance=TOLERANCE):
+    """Regressions of *results* against *baseline*; scenarios missing from it are not compared."""
+    regressions = []
+    for result in results:
+        if result.status >= 500:
+            regressions.append(Regression(result.name, 'status', 0, result.status, 499))
+        base = baseline.get(result.name)
+        if base is None:
+            continue
+        if result.status != base['status'] and result.status < 500:
+            regressions.append(Regression(result.name, 'status', base['status'], result.status, base['status']))
+        checks = (
+            ('queries', base['queries'] + tolerance.queries),
+            ('time_ms', _limit(base['time_ms'], tolerance.time_ratio, tolerance.time_floor_ms)),
+            ('peak_kb', _limit(base['peak_kb'], tolerance.memory_ratio, tolerance.memory_floor_kb)),
+        )
+        for metric, limit in checks:
+            measured = getattr(result, metric)
+            if measured > limit:
+                regressions.append(Regression(result.name, metric, base[metric], measured, round(limit, 1)))
+    return regressions
+
+
+# ---------------------------------------------------------------------------
+# Report
+# ---------------------------------------------------------------------------
+def _delta(measured, base):
+    if base is None:
+        return 'new'
+    return f'{measured - base:+g}'
+
+
+def format_report(results, baseline, regressions):
+    """Plain-text table of every scenario with its change against the baseline."""
+    regressed = {regression.name for regression in regressions}
+    width = max([len(result.name) for result in results] + [8])
+    lines = [
+        f'{"scenario":<{width}}  status  queries (Δ)   time ms (Δ)        peak KB (Δ)',
+    ]
+    for result in results:
+        base = baseline.get(result.name, {})
+        lines.append(
+            f'{result.name:<{width}}  {result.status:>6}  '
+            f'{result.queries:>4} ({_delta(result.queries, base.get("queries")):>4})  '
+            f'{result.time_ms:>8.1f} ({_delta(result.time_ms, base.get("time_ms")):>7})  '
+            f'{result.peak_kb:>9.1f} ({_delta(result.peak_kb, base.get("peak_kb")):>8})'
+            + ('  REGRESSION' if result.name in regressed else '')
+        )
+    missing = sorted(set(baseline) - {result.name for result in results})
+    if missing:
+        lines.append(f'Not run (in baseline): {", ".join(missing)}')
+    lines.append(f'{len(results)} scenarios, {len(regressions)} regressions')
+    lines.extend(f'  {regression}' for regression in regressions)
+    return '\n'.join(lines)
+
+
+def json_report(results, regressions, scale, vendor):
+    return {
+        'scale': scale,
+        'vendor': vendor,
+        'results': [asdict(result) for result in results],
+        'regressions': [asdict(regression) for regression in regressions],
+    }
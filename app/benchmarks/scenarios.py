@@ -0,0 +1,134 @@
+"""
+The API requests the benchmark suite replays.
+
+Scenarios are discovered from the DRF router rather than listed by hand, so a
+new viewset or GET action is benchmarked as soon as it is registered: every
+``list``, every ``retrieve`` whose model the dataset seeds, and every GET
+extra action, plus the dashboard routes that live outside the router.
+
+Endpoints that stream files (exports, PDFs), need a step-up session
+(banking) or read data the dataset does not seed are in SKIP; the ones that
+need query parameters get them from PARAMS.
+"""
+from dataclasses import dataclass, field
+from datetime import timedelta
+
+from django.urls import reverse
+from django.utils import timezone
+
+from app.api.urls import router
+from app.models import (
+    Assignment, Client, Interpreter, Invoice, Language, QuoteRequest, ServiceType,
+)
+
+DASHBOARD_ROUTES = (
+    'dashboard-kpis', 'dashboard-alerts', 'dashboard-revenue-chart', 'dashboard-today-missions',
+    'dashboard-payroll-kpis', 'dashboard-quote-pipeline',
+)
+
+# basename -> model whose first row is used for detail routes
+DETAIL_MODELS = {
+    'assignment': Assignment,
+    'interpreter': Interpreter,
+    'client': Client,
+    'quote-request': QuoteRequest,
+    'service-type': ServiceType,
+    'language': Language,
+}
+
+# url name -> (kwarg, model) for extra actions with a regex path argument
+PATH_KWARGS = {
+    'finance-invoice-detail': ('invoice_id', Invoice),
+}
+
+SKIP = {
+    'assignment-export', 'audit-log-export',
+    'payroll-earnings-summary-pdf', 'payroll-stub-pdf', 'payroll-stub-detail',
+    'interpreter-banking',
+    'public-quote-list',
+    'marketing-analytics-list',  # analytics actions only: the viewset has no serializer
+}
+
+
+def _first_pk(model):
+    return model.objects.order_by('pk').values_list('pk', flat=True).first()
+
+
+def _window(days):
+    now = timezone.now()
+    return (now - timedelta(days=days)).isoformat(), (now + timedelta(days=days)).isoformat()
+
+
+def _calendar_params():
+    start, end = _window(14)
+    return {'start': start, 'end': end}
+
+
+def _conflict_params():
+    start, end = _window(7)
+    return {'interpreter_id': _first_pk(Interpreter), 'start_time': start, 'end_time': end}
+
+
+def _earnings_params():
+    return {'interpreter_id': _first_pk(Interpreter), 'year': timezone.localdate().year}
+
+
+# url name -> callable returning the query string (evaluated after seeding)
+PARAMS = {
+    'assignment-calendar': _calendar_params,
+    'assignment-check-conflict': _conflict_params,
+    'payroll-earnings-summary': _earnings_params,
+}
+
+# Filtered variants of hot list endpoints, benchmarked in addition to the plain call
+VARIANTS = (
+    ('assignment-list', 'status', lambda: {'status': 'CONFIRMED'}),
+    ('assignment-list', 'search', lambda: {'search': 'Walk-in'}),
+    ('interpreter-list', 'state', lambda: {'state': 'MA'}),
+    ('interpreter-available', 'state', lambda: {'state': 'MA'}),
+    ('audit-log-list', 'model', lambda: {'model_name': 'Assignment'}),
+)
+
+
+@dataclass(frozen=True)
+class Scenario:
+    name: str
+    url: str
+    params: dict = field(default_factory=dict)
+
+
+def _route_names():
+    """``(url name, detail model or None)`` for every GET route the router exposes."""
+    for _prefix, viewset, basename in router.registry:
+        model = DETAIL_MODELS.get(basename)
+        if hasattr(viewset, 'list'):
+            yield f'{basename}-list', None
+        if hasattr(viewset, 'retrieve') and model:
+            yield f'{basename}-detail', model
+        for extra in viewset.get_extra_actions():
+            if 'get' in extra.mapping and (not extra.detail or model):
+                yield f'{basename}-{extra.url_name}', model if extra.detail else None
+
+
+def discover():
+    """Every benchmarked request against the current database, sorted by name."""
+    scenarios = []
+    for name, model in [(name, None) for name in DASHBOARD_ROUTES] + list(_route_names()):
+        if name in SKIP:
+            continue
+        kwargs = {}
+        if model:
+            kwargs['pk'] = _first_pk(model)
+        elif name in PATH_KWARGS:
+            kwarg, model = PATH_KWARGS[name]
+            kwargs[kwarg] = _first_pk(model)
+        if None in kwargs.values():
+            continue
+        url = reverse(f'api:{name}', kwargs=kwargs)
+        params = PARAMS[name]() if name in PARAMS else {}
+        scenarios.append(Scenario(name, url, params))
+        scenarios.extend(
+            Scenario(f'{name}[{label}]', url, build())
+            for base, label, build in VARIANTS if base == name
+        )
+    return sorted(scenarios, key=lambda scenario: scenario.name)
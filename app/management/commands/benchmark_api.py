@@ -0,0 +1,104 @@
+"""
+Management command: query-count and latency regression benchmark for the DRF API.
+
+Creates a throw-away test database on the configured backend (SQLite or
+MySQL, nothing else is needed: the cache is forced to local memory and no
+request enqueues Celery work), fills it with the deterministic dataset of
+app.benchmarks.dataset at the requested scale, replays every GET endpoint
+discovered from the router as an admin, and records per request the number
+of SQL queries, the best wall time and the peak Python memory.
+
+The results are compared with app/benchmarks/baseline.json (per scale and
+database vendor) within app.benchmarks.runner.TOLERANCE; the command exits
+non-zero if any endpoint regressed or answered with a 5xx.
+
+Usage:
+    python manage.py benchmark_api                      # tiny scale, compare
+    python manage.py benchmark_api --scale full --repeat 5 --report bench.json
+    python manage.py benchmark_api --only assignment --only dashboard
+    python manage.py benchmark_api --scale small --update-baseline
+"""
+import json
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test.utils import override_settings
+from rest_framework.test import APIClient
+
+from app.benchmarks import dataset, runner, scenarios
+from app.models import User
+
+LOCMEM_CACHES = {
+    'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache', 'LOCATION': 'benchmark-api'},
+}
+
+
+class Command(BaseCommand):
+    help = 'Benchmark query counts, latency and memory of the API endpoints against a baseline'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--scale', choices=sorted(dataset.SCALES), default='tiny',
+                            help='Dataset size (default: tiny)')
+        parser.add_argument('--repeat', type=int, default=3,
+                            help='Timed runs per endpoint; the best is reported (default: 3)')
+        parser.add_argument('--only', action='append', default=[],
+                            help='Only run scenarios whose name contains this text (repeatable)')
+        parser.add_argument('--report', help='Also write the results as JSON to this path')
+        parser.add_argument('--update-baseline', action='store_true',
+                            help='Record the results as the new baseline instead of comparing')
+
+    def handle(self, *args, **options):
+        if options['repeat'] < 1:
+            raise CommandError('--repeat must be at least 1')
+        scale, vendor = options['scale'], connection.vendor
+
+        with override_settings(CACHES=LOCMEM_CACHES, ALLOWED_HOSTS=['testserver']):
+            old_name = connection.creation.create_test_db(verbosity=0, autoclobber=True, serialize=False)
+            try:
+                results = self._run(scale, options)
+            finally:
+                connection.creation.destroy_test_db(old_name, verbosity=0)
+
+        if options['update_baseline']:
+            runner.save_baseline(results, scale, vendor)
+            self.stdout.write(self.style.SUCCESS(
+                f'Baseline for {scale}/{vendor} updated ({len(results)} scenarios)'
+            ))
+            return
+
+        baseline = runner.load_baseline(scale, vendor)
+        if options['only']:
+            names = {result.name for result in results}
+            baseline = {name: metrics for name, metrics in baseline.items() if name in names}
+        regressions = runner.compare(results, baseline)
+        self.stdout.write(runner.format_report(results, baseline, regressions))
+        if options['report']:
+            with open(options['report'], 'w') as report:
+                json.dump(runner.json_report(results, regressions, scale, vendor), report, indent=2)
+        if not baseline:
+            self.stdout.write(self.style.WARNING(
+                f'No baseline for {scale}/{vendor}: run with --update-baseline to record one'
+            ))
+        if regressions:
+            raise CommandError(f'{len(regressions)} regressions against the {scale}/{vendor} baseline')
+
+    def _run(self, scale, options):
+        self.stdout.write(f'Generating the {scale} dataset...')
+        started = time.perf_counter()
+        counts = dataset.generate(scale)
+        self.stdout.write(
+            f'  {", ".join(f"{count} {model}" for model, count in counts.items())} '
+            f'in {time.perf_counter() - started:.1f}s'
+        )
+
+        selected = [
+            scenario for scenario in scenarios.discover()
+            if not options['only'] or any(text in scenario.name for text in options['only'])
+        ]
+        if not selected:
+            raise CommandError('No scenario matches --only')
+        client = APIClient()
+        client.force_authenticate(User.objects.get(username=dataset.ADMIN_USERNAME))
+        self.stdout.write(f'Running {len(selected)} scenarios, best of {options["repeat"]}...')
+        return runner.run(client, selected, options['repeat'])
@@ -0,0 +1,100 @@
+"""
+Management command: measure API-key validations per second.
+
+Creates temporary keys for a user, then validates a mix of valid and unknown
+keys through ``APIKeyValidator`` three ways:
+
+    uncached   prefix lookup + constant-time hash check on every call
+    cold       in-process caches cleared first (misses fill them)
+    warm       cached results (one auth-state version read per hit)
+
+Usage counters are flushed once at the end, as the background flush would.
+The temporary keys are deleted afterwards.
+
+Usage:
+    python manage.py benchmark_api_keys
+    python manage.py benchmark_api_keys --keys 500 --validations 100000
+    python manage.py benchmark_api_keys --user admin --invalid-ratio 0.5
+"""
+import random
+import time
+from unittest.mock import patch
+
+from django.core.management.base import BaseCommand, CommandError
+
+from app.models import APIKey, User
+from app.services import api_keys
+from app.utils.api_auth import APIKeyValidator
+
+BENCHMARK_APP = 'benchmark'
+
+
+class Command(BaseCommand):
+    help = 'Benchmark API-key validation throughput'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--user', help='Username owning the temporary keys (default: first superuser)')
+        parser.add_argument('--keys', type=int, default=100, help='Temporary keys to create (default: 100)')
+        parser.add_argument('--validations', type=int, default=20000,
+                            help='Validations per mode (default: 20000)')
+        parser.add_argument('--invalid-ratio', type=float, default=0.1,
+                            help='Share of unknown keys presented (default: 0.1)')
+
+    def handle(self, *args, **options):
+        if options['keys'] < 1 or options['validations'] < 1:
+            raise CommandError('--keys and --validations must be positive')
+        user = self._user(options['user'])
+
+        raw_keys = []
+        rows = []
+        for n in range(options['keys']):
+            api_key = APIKey(user=user, name=f'benchmark-{n}', app_name=BENCHMARK_APP)
+            raw_keys.append(api_key.set_key())
+            rows.append(api_key)
+        APIKey.objects.bulk_create(rows)
+
+        rng = random.Random(0)
+        presented = [
+            APIKey.generate_key() if rng.random() < options['invalid_ratio'] else rng.choice(raw_keys)
+            for _ in range(options['validations'])
+        ]
+        try:
+            self.stdout.write(f'{options["keys"]} keys, {len(presented)} validations per mode, '
+                              f'{options["invalid_ratio"]:.0%} unknown')
+            # No background flush thread while measuring
+            with patch.object(api_keys, '_schedule_flush'):
+                self._measure('uncached', presented, self._uncached)
+                api_keys.clear_caches()
+                self._measure('cold', presented, APIKeyValidator.get_user_from_key)
+                self._measure('warm', presented, APIKeyValidator.get_user_from_key)
+            started = time.perf_counter()
+            flushed = api_keys.flush_usage()
+            self.stdout.write(f'usage flush: {flushed} keys in {(time.perf_counter() - started) * 1000:.1f}ms')
+        finally:
+            deleted, _ = APIKey.objects.filter(user=user, app_name=BENCHMARK_APP,
+                                               name__startswith='benchmark-').delete()
+            api_keys.clear_caches()
+            self.stdout.write(f'Removed {deleted} temporary keys')
+
+    def _user(self, username):
+        if username:
+            user = User.objects.filter(username=username).first()
+        else:
+            user = User.objects.filter(is_superuser=True).order_by('pk').first()
+        if user is None:
+            raise CommandError('No user to own the keys: pass --user')
+        return user
+
+    @staticmethod
+    def _uncached(raw_key):
+        api_key = api_keys.find_key(raw_key)
+        return api_key.user if api_key is not None and api_key.is_valid() else None
+
+    def _measure(self, label, presented, validate):
+        started = time.perf_counter()
+        accepted = sum(1 for raw_key in presented if validate(raw_key) is not None)
+        elapsed = time.perf_counter() - started
+        self.stdout.write(
+            f'  {label:<9} {len(presented) / elapsed:>12,.0f} validations/s '
+            f'({elapsed / len(presented) * 1e6:.1f}µs each, {accepted} accepted)'
+        )
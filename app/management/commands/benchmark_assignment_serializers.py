@@ -0,0 +1,110 @@
+"""
+Management command: compare ModelSerializer and projection serializer throughput.
+
+Serializes the same assignments through AssignmentListSerializer /
+AssignmentCalendarSerializer (model instances + select_related) and through
+their ``.values()`` projections, timing query plus serialization, and
+reports rows/s for each path. The field contracts are identical, so the
+difference is pure serialization overhead.
+
+Usage:
+    python manage.py benchmark_assignment_serializers --seed 10000
+    python manage.py benchmark_assignment_serializers --repeat 5
+"""
+import time
+from datetime import timedelta
+from decimal import Decimal
+
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+
+from app.api.serializers.assignments import (
+    AssignmentCalendarProjection, AssignmentCalendarSerializer,
+    AssignmentListProjection, AssignmentListSerializer,
+)
+from app.models import Assignment, Language, ServiceType
+
+BENCHMARK_LOCATION = 'BENCHMARK_SERIALIZERS'
+SEED_BATCH = 5000
+STATES = ('MA', 'CA', 'TX', 'NY', 'FL', 'IL', 'WA', 'HI')
+STATUSES = ('PENDING', 'CONFIRMED', 'IN_PROGRESS', 'COMPLETED', 'CANCELLED', 'NO_SHOW')
+
+
+class Command(BaseCommand):
+    help = 'Benchmark assignment list/calendar serialization: ModelSerializer vs projection'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--seed', type=int, default=0,
+                            help='Insert this many synthetic assignments first (removed afterwards)')
+        parser.add_argument('--repeat', type=int, default=3,
+                            help='Runs per path; the best is reported (default: 3)')
+
+    def handle(self, *args, **options):
+        if options['repeat'] < 1:
+            raise CommandError('--repeat must be at least 1')
+        if options['seed']:
+            self._seed(options['seed'])
+
+        try:
+            total = Assignment.objects.count()
+            if not total:
+                raise CommandError('No assignments to serialize: pass --seed N')
+            self.stdout.write(f'{total} assignments, best of {options["repeat"]} run(s)')
+            queryset = Assignment.objects.order_by('start_time', 'pk')
+            self._compare('list', options['repeat'], total,
+                          lambda: AssignmentListSerializer(
+                              AssignmentListSerializer.setup_eager_loading(queryset), many=True).data,
+                          lambda: AssignmentListProjection(
+                              AssignmentListProjection.project(queryset), many=True).data)
+            self._compare('calendar', options['repeat'], total,
+                          lambda: AssignmentCalendarSerializer(
+                              AssignmentCalendarSerializer.setup_eager_loading(queryset), many=True).data,
+                          lambda: AssignmentCalendarProjection(
+                              AssignmentCalendarProjection.project(queryset), many=True).data)
+        finally:
+            if options['seed']:
+                deleted, _ = Assignment.objects.filter(location=BENCHMARK_LOCATION).delete()
+                self.stdout.write(f'Removed {deleted} seeded rows')
+
+    def _seed(self, count):
+        self.stdout.write(f'Seeding {count} assignments...')
+        service_type = ServiceType.objects.order_by('pk').first() or ServiceType.objects.create(
+            name='Benchmark', description='', base_rate=Decimal('50'), cancellation_policy='',
+        )
+        languages = list(Language.objects.order_by('pk')[:2])
+        while len(languages) < 2:
+            languages.append(Language.objects.create(
+                name=f'Benchmark {len(languages)}', code=f'b{len(languages)}',
+            ))
+        start = timezone.now()
+        # bulk_create: no post_save side effects (emails, calendar sync)
+        for offset in range(0, count, SEED_BATCH):
+            Assignment.objects.bulk_create([
+                Assignment(
+                    service_type=service_type, source_language=languages[0],
+                    target_language=languages[1],
+                    start_time=start + timedelta(hours=n), end_time=start + timedelta(hours=n + 2),
+                    location=BENCHMARK_LOCATION, city='Boston', state=STATES[n % len(STATES)],
+                    zip_code='02101', interpreter_rate=Decimal('40'),
+                    total_interpreter_payment=Decimal('80'), status=STATUSES[n % len(STATUSES)],
+                    client_name=f'Client {n}',
+                )
+                for n in range(offset, min(offset + SEED_BATCH, count))
+            ])
+
+    def _compare(self, name, repeat, total, model_path, projection_path):
+        model = self._best(model_path, repeat)
+        projection = self._best(projection_path, repeat)
+        self.stdout.write(
+            f'  {name:<9} ModelSerializer {total / model:>10,.0f} rows/s  '
+            f'projection {total / projection:>10,.0f} rows/s  ({model / projection:.1f}x)'
+        )
+
+    @staticmethod
+    def _best(serialize, repeat):
+        timings = []
+        for _ in range(repeat):
+            started = time.perf_counter()
+            serialize()
+            timings.append(time.perf_counter() - started)
+        return min(timings)
@@ -0,0 +1,122 @@
+"""
+Management command: per-queue Celery backlog, workers and task latency.
+
+Backlog comes from the broker, in-flight work from ``celery inspect``
+(active/reserved per worker) and latency from the counters recorded by
+app.services.task_metrics.
+
+Usage:
+    python manage.py celery_queues
+    python manage.py celery_queues --json
+    python manage.py celery_queues --profiles   # worker command per queue
+    python manage.py celery_queues --reset      # zero the latency counters
+"""
+import json
+
+from django.core.management.base import BaseCommand
+
+from app.services.task_metrics import get_queue_metrics, reset_queue_metrics
+from config import celery_topology
+from config.celery import app as celery_app
+
+
+def queue_backlog(queues):
+    """``{queue: messages waiting}`` from the broker; None if unreachable."""
+    from kombu.exceptions import ChannelError
+
+    backlog = {}
+    try:
+        with celery_app.connection_for_read() as conn:
+            channel = conn.default_channel
+            for queue in queues:
+                try:
+                    backlog[queue] = channel.queue_declare(queue=queue, passive=True).message_count
+                except ChannelError:
+                    backlog[queue] = 0  # never declared: nothing waiting
+    except Exception:
+        return {queue: None for queue in queues}
+    return backlog
+
+
+def worker_load(queues, timeout=1.0):
+    """``{queue: {'workers', 'active', 'reserved'}}`` from ``celery inspect``."""
+    load = {queue: {'workers': 0, 'active': 0, 'reserved': 0} for queue in queues}
+    try:
+        inspect = celery_app.control.inspect(timeout=timeout)
+        consumers = inspect.active_queues() or {}
+        active = inspect.active() or {}
+        reserved = inspect.reserved() or {}
+    except Exception:
+        return load
+
+    for worker_queues in consumers.values():
+        for queue in worker_queues:
+            if queue['name'] in load:
+                load[queue['name']]['workers'] += 1
+    for field, by_worker in (('active', active), ('reserved', reserved)):
+        for tasks in by_worker.values():
+            for task in tasks:
+                queue = (task.get('delivery_info') or {}).get('routing_key')
+                if queue in load:
+                    load[queue][field] += 1
+    return load
+
+
+class Command(BaseCommand):
+    help = 'Report per-queue Celery backlog, workers and task latency'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--json', action='store_true', help='Print JSON instead of a table')
+        parser.add_argument('--profiles', action='store_true',
+                            help='Print the worker command line for each queue')
+        parser.add_argument('--reset', action='store_true', help='Zero the latency counters')
+        parser.add_argument('--timeout', type=float, default=1.0,
+                            help='Seconds to wait for worker replies (default: 1)')
+
+    def handle(self, *args, **options):
+        queues = list(celery_topology.QUEUES)
+
+        if options['profiles']:
+            for queue in queues:
+                self.stdout.write(f'{queue}: {celery_topology.worker_command(queue)}')
+            return
+        if options['reset']:
+            reset_queue_metrics(queues)
+            self.stdout.write(self.style.SUCCESS('Queue metrics reset'))
+            return
+
+        backlog = queue_backlog(queues)
+        load = worker_load(queues, options['timeout'])
+        metrics = get_queue_metrics(queues)
+        report = {
+            queue: {'backlog': backlog[queue], **load[queue], **metrics[queue]}
+            for queue in queues
+        }
+
+        if options['json']:
+            self.stdout.write(json.dumps(report, indent=2))
+            return
+
+        self.stdout.write(
+            f'{"queue":<10} {"backlog":>8} {"workers":>8} {"active":>7} {"reserved":>9} '
+            f'{"done":>8} {"failed":>7} {"wait avg":>9} {"wait max":>9} {"run avg":>9}'
+        )
+        for queue, row in report.items():
+            self.stdout.write(
+                f'{queue:<10} {_cell(row["backlog"]):>8} {row["workers"]:>8} {row["active"]:>7} '
+                f'{row["reserved"]:>9} {row["succeeded"]:>8} {row["failed"]:>7} '
+                f'{_ms(row["wait_ms_avg"]):>9} {_ms(row["wait_ms_max"] or None):>9} '
+                f'{_ms(row["run_ms_avg"]):>9}'
+            )
+        if all(row['backlog'] is None for row in report.values()):
+            self.stderr.write(self.style.WARNING('Broker unreachable — backlog unknown'))
+
+
+def _cell(value):
+    return '?' if value is None else value
+
+
+def _ms(value):
+    if value is None:
+        return '-'
+    return f'{value / 1000:.1f}s' if value >= 1000 else f'{value}ms'
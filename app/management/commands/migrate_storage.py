@@ -0,0 +1,153 @@
+"""
+Management command: migrate objects between S3-compatible buckets.
+
+Copies with a concurrent worker pool and streaming multipart uploads, records
+progress in a local SQLite checkpoint so an interrupted run resumes where it
+stopped, and verifies size/ETag of every copy.
+
+Usage:
+    python manage.py migrate_storage --dry-run
+    python manage.py migrate_storage --workers 16
+    python manage.py migrate_storage --source-bucket old --dest-bucket new \\
+        --dest-endpoint http://localhost:9000      # e.g. a local MinIO
+
+Defaults read the Backblaze B2 source from B2_* env vars (as in
+scripts/migration/migrate_b2_to_s3.py) and route keys to the production
+buckets by prefix.
+"""
+import json
+import os
+
+import boto3
+from django.core.management.base import BaseCommand, CommandError
+
+from app.services.storage_migration import (
+    DEFAULT_PART_SIZE, CheckpointManifest, plan_migration, run_migration, summarize_plan,
+)
+
+# Key prefix -> destination bucket (first match wins)
+BUCKET_MAPPING = {
+    'signatures/': 'jhbridge-signatures-prod',
+    'interpreter_contracts/': 'jhbridge-contracts-prod',
+    'contracts/': 'jhbridge-contracts-prod',
+    'documents/': 'jhbridge-documents-prod',
+    'payment_proofs/': 'jhbridge-documents-prod',
+    'interpreter_payment_proofs/': 'jhbridge-documents-prod',
+    'receipts/': 'jhbridge-documents-prod',
+    'company_logos/': 'jhbridge-email-assets',
+    'interpreter_profiles/': 'jhbridge-documents-prod',
+}
+DEFAULT_BUCKET = 'jhbridge-documents-prod'
+
+
+class Command(BaseCommand):
+    help = 'Parallel, resumable object migration between S3-compatible buckets'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--source-bucket', default=os.getenv('B2_BUCKET_NAME'),
+                            help='Source bucket (default: $B2_BUCKET_NAME)')
+        parser.add_argument('--source-endpoint', default=os.getenv('B2_ENDPOINT_URL'),
+                            help='Source endpoint URL (default: $B2_ENDPOINT_URL)')
+        parser.add_argument('--dest-endpoint', default=None,
+                            help='Destination endpoint URL (default: AWS)')
+        parser.add_argument('--dest-bucket', default=None,
+                            help='Send every object to this bucket instead of the prefix mapping')
+        parser.add_argument('--mapping', default=None,
+                            help='JSON file of {"prefix/": "bucket"} overriding the built-in mapping')
+        parser.add_argument('--prefix', default='', help='Only migrate keys under this prefix')
+        parser.add_argument('--workers', type=int, default=8, help='Concurrent copies (default: 8)')
+        parser.add_argument('--part-size-mb', type=int, default=DEFAULT_PART_SIZE // (1024 * 1024),
+                            help='Multipart part size in MB (default: 16, minimum 5)')
+        parser.add_argument('--manifest', default='storage_migration.sqlite3',
+                            help='Checkpoint file (default: storage_migration.sqlite3)')
+        parser.add_argument('--no-retry-failed', action='store_true',
+                            help='Skip objects that failed in a previous run')
+        parser.add_argument('--no-etag-check', action='store_true',
+                            help='Only verify sizes (for SSE-KMS destinations)')
+        parser.add_argument('--dry-run', action='store_true',
+                            help='Plan and report without copying anything')
+
+    def handle(self, *args, **options):
+        source_bucket = options['source_bucket']
+        if not source_bucket:
+            raise CommandError('No source bucket: pass --source-bucket or set B2_BUCKET_NAME')
+        if options['part_size_mb'] < 5:
+            raise CommandError('--part-size-mb must be at least 5')
+
+        mapping, default_bucket = self._mapping(options)
+        source = self._source_client(options['source_endpoint'])
+        dest = self._dest_client(options['dest_endpoint'])
+        manifest = CheckpointManifest(options['manifest'])
+
+        try:
+            plan = plan_migration(
+                source, source_bucket, mapping, default_bucket, manifest,
+                prefix=options['prefix'], retry_failed=not options['no_retry_failed'],
+            )
+            self._report_plan(plan, manifest)
+            if options['dry_run'] or not plan:
+                return
+
+            summary = run_migration(
+                source, source_bucket, dest, plan, manifest,
+                workers=options['workers'],
+                part_size=options['part_size_mb'] * 1024 * 1024,
+                verify_etag=not options['no_etag_check'],
+                progress=self._report_object,
+            )
+        finally:
+            manifest.close()
+
+        self.stdout.write('\n' + '=' * 60)
+        self.stdout.write(self.style.SUCCESS(
+            f"Done: {summary['done']} copied, {summary['skipped']} already present, "
+            f"{summary['failed']} failed"
+        ))
+        self.stdout.write(
+            f"{summary['bytes'] / (1024 * 1024):.1f} MB in {summary['seconds']:.1f}s "
+            f"({summary['mb_per_s']:.2f} MB/s)"
+        )
+        if summary['failed']:
+            self.stdout.write(self.style.WARNING('Rerun the command to retry failed objects.'))
+
+    def _mapping(self, options):
+        if options['dest_bucket']:
+            return {}, options['dest_bucket']
+        if options['mapping']:
+            with open(options['mapping'], encoding='utf-8') as fh:
+                return json.load(fh), DEFAULT_BUCKET
+        return BUCKET_MAPPING, DEFAULT_BUCKET
+
+    def _source_client(self, endpoint):
+        return boto3.client(
+            's3',
+            endpoint_url=endpoint,
+            aws_access_key_id=os.getenv('B2_ACCESS_KEY_ID') or os.getenv('B2_KEY_ID'),
+            aws_secret_access_key=os.getenv('B2_SECRET_ACCESS_KEY') or os.getenv('B2_APPLICATION_KEY'),
+        )
+
+    def _dest_client(self, endpoint):
+        return boto3.client(
+            's3',
+            endpoint_url=endpoint,
+            region_name=os.getenv('AWS_S3_REGION_NAME', 'us-east-1'),
+            aws_access_key_id=os.getenv('AWS_KEY_ID') or os.getenv('AWS_ACCESS_KEY_ID'),
+            aws_secret_access_key=os.getenv('AWS_KEY_SECRET') or os.getenv('AWS_SECRET_ACCESS_KEY'),
+        )
+
+    def _report_plan(self, plan, manifest):
+        previous = manifest.counts()
+        if previous:
+            self.stdout.write(f"Checkpoint: {previous}")
+        total = sum(item['size'] for item in plan)
+        self.stdout.write(f"Plan: {len(plan)} objects, {total / (1024 * 1024):.1f} MB to migrate")
+        for bucket, entry in sorted(summarize_plan(plan).items()):
+            self.stdout.write(
+                f"  -> {bucket}: {entry['objects']} objects, {entry['bytes'] / (1024 * 1024):.1f} MB"
+            )
+
+    def _report_object(self, item, status, error):
+        if error is not None:
+            self.stdout.write(self.style.ERROR(f"  [FAILED] {item['key']}: {error}"))
+        elif status == 'done':
+            self.stdout.write(f"  [OK] {item['key']} -> {item['target_bucket']}")
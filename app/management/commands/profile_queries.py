@@ -0,0 +1,123 @@
+"""
+Management command: EXPLAIN the registered hot queries and flag full scans.
+
+Runs every query in app.services.query_profile.HOT_QUERIES (dashboard,
+viewset and agent-tool predicates) through ``EXPLAIN`` on the configured
+database and lists the tables each one reads with a full scan. On a small
+database the planner may prefer a scan anyway; ``--seed N`` inserts N
+synthetic rows into the large tables first, inside a transaction that is
+rolled back at the end.
+
+Usage:
+    python manage.py profile_queries
+    python manage.py profile_queries --seed 50000 --plans
+    python manage.py profile_queries --strict    # exit non-zero on any full scan
+"""
+from datetime import timedelta
+from decimal import Decimal
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.utils import timezone
+
+from app.models import (
+    Assignment, EmailLog, Expense, FinancialTransaction, Invoice, Language, ServiceType, User,
+)
+from app.services import query_profile
+
+SEED_BATCH = 5000
+STATUSES = ('PENDING', 'CONFIRMED', 'IN_PROGRESS', 'COMPLETED', 'CANCELLED', 'NO_SHOW')
+
+
+class _Rollback(Exception):
+    pass
+
+
+class Command(BaseCommand):
+    help = 'EXPLAIN the hot dashboard/viewset/agent queries and flag full table scans'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--seed', type=int, default=0,
+                            help='Insert this many synthetic rows per large table first (rolled back)')
+        parser.add_argument('--plans', action='store_true', help='Print each query plan')
+        parser.add_argument('--strict', action='store_true',
+                            help='Fail if any query reads a table with a full scan')
+
+    def handle(self, *args, **options):
+        try:
+            with transaction.atomic():
+                if options['seed']:
+                    self._seed(options['seed'])
+                report = query_profile.profile()
+                raise _Rollback
+        except _Rollback:
+            pass
+
+        flagged = 0
+        for entry in report:
+            scans = entry['full_scans']
+            flagged += bool(scans)
+            status = self.style.ERROR(f'FULL SCAN {", ".join(scans)}') if scans else self.style.SUCCESS('ok')
+            self.stdout.write(f'{entry["source"]:<32} {entry["name"]:<30} {status}')
+            if options['plans']:
+                for line in entry['plan'].splitlines():
+                    self.stdout.write(f'    {line}')
+        self.stdout.write(f'{len(report)} queries, {flagged} with full scans')
+        if flagged and options['strict']:
+            raise CommandError(f'{flagged} queries read a table with a full scan')
+
+    def _seed(self, count):
+        self.stdout.write(f'Seeding {count} rows per table (rolled back afterwards)...')
+        now = timezone.now()
+        service_type = ServiceType.objects.order_by('pk').first() or ServiceType.objects.create(
+            name='Profile', description='', base_rate=Decimal('50'), cancellation_policy='',
+        )
+        languages = list(Language.objects.order_by('pk')[:2])
+        while len(languages) < 2:
+            languages.append(Language.objects.create(
+                name=f'Profile {len(languages)}', code=f'p{len(languages)}',
+            ))
+        user = User.objects.order_by('pk').first() or User.objects.create_user(
+            username='profile_queries', email='profile_queries@example.com',
+        )
+        for offset in range(0, count, SEED_BATCH):
+            batch = range(offset, min(offset + SEED_BATCH, count))
+            Assignment.objects.bulk_create([
+                Assignment(
+                    service_type=service_type, source_language=languages[0], target_language=languages[1],
+                    start_time=now + timedelta(hours=n - count // 2),
+                    end_time=now + timedelta(hours=n - count // 2 + 2),
+                    location='Profile', city='Boston', state='MA', zip_code='02101',
+                    interpreter_rate=Decimal('40'), status=STATUSES[n % len(STATUSES)],
+                )
+                for n in batch
+            ])
+            EmailLog.objects.bulk_create([
+                EmailLog(
+                    gmail_id=f'profile-{n}', from_email='profile@example.com', subject='Profile',
+                    received_at=now - timedelta(minutes=n), is_processed=n % 10 != 0,
+                    category='OTHER' if n % 3 else None,
+                )
+                for n in batch
+            ])
+            Invoice.objects.bulk_create([
+                Invoice(
+                    invoice_number=f'PROFILE-{n}', subtotal=Decimal('100'), total=Decimal('100'),
+                    status='PAID' if n % 5 else 'SENT', due_date=(now - timedelta(days=n % 90)).date(),
+                    created_by=user,
+                )
+                for n in batch
+            ])
+            transactions = FinancialTransaction.objects.bulk_create([
+                FinancialTransaction(type='EXPENSE', amount=Decimal('10'), description='Profile', created_by=user)
+                for _ in batch
+            ])
+            if transactions and transactions[0].pk is None:
+                transactions = FinancialTransaction.objects.filter(description='Profile').order_by('-pk')[:len(batch)]
+            Expense.objects.bulk_create([
+                Expense(
+                    transaction=txn, expense_type='OTHER', amount=Decimal('10'), description='Profile',
+                    status='PAID' if n % 4 else 'PENDING', date_incurred=now - timedelta(days=n % 365),
+                )
+                for n, txn in zip(batch, transactions)
+            ])
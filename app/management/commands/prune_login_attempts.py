@@ -0,0 +1,43 @@
+"""
+Management command: delete login attempts past the retention period.
+
+The audit rows are not needed for lockouts (those use cache counters), so
+they are kept for LOGIN_ATTEMPT_RETENTION_DAYS (default 90) only.
+
+Usage:
+    python manage.py prune_login_attempts
+    python manage.py prune_login_attempts --days 30
+    python manage.py prune_login_attempts --dry-run
+"""
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+
+from app.models import LoginAttempt
+from app.tasks_security import retention_days
+
+
+class Command(BaseCommand):
+    help = 'Delete login attempts older than the retention period'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--days', type=int, default=None,
+                            help='Keep this many days (default: LOGIN_ATTEMPT_RETENTION_DAYS)')
+        parser.add_argument('--batch-size', type=int, default=5000,
+                            help='Rows deleted per statement (default: 5000)')
+        parser.add_argument('--dry-run', action='store_true', help='Only count what would be deleted')
+
+    def handle(self, *args, **options):
+        days = retention_days() if options['days'] is None else options['days']
+        if days < 1:
+            raise CommandError('--days must be at least 1')
+        cutoff = timezone.now() - timedelta(days=days)
+
+        if options['dry_run']:
+            count = LoginAttempt.objects.filter(timestamp__lt=cutoff).count()
+            self.stdout.write(f'{count} login attempt(s) older than {days} days would be deleted')
+            return
+
+        deleted = LoginAttempt.prune(cutoff, batch_size=options['batch_size'])
+        self.stdout.write(self.style.SUCCESS(f'Deleted {deleted} login attempt(s) older than {days} days'))
@@ -0,0 +1,33 @@
+"""
+Management command: recompute InterpreterStats rows from the source tables.
+
+Signals keep the rows current; run this nightly to repair rows changed by
+bulk updates or raw SQL, or for specific interpreters after a data fix.
+
+Usage:
+    python manage.py rebuild_interpreter_stats
+    python manage.py rebuild_interpreter_stats --interpreter 12 --interpreter 15
+    python manage.py rebuild_interpreter_stats --batch-size 200
+"""
+from django.core.management.base import BaseCommand, CommandError
+
+from app.services import interpreter_stats
+
+
+class Command(BaseCommand):
+    help = 'Recompute denormalised interpreter performance stats'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--interpreter', type=int, action='append', dest='interpreters',
+                            help='Only this interpreter id (repeatable)')
+        parser.add_argument('--batch-size', type=int, default=500,
+                            help='Interpreters per refresh (default: 500)')
+
+    def handle(self, *args, **options):
+        if options['batch_size'] < 1:
+            raise CommandError('--batch-size must be at least 1')
+        if options['interpreters']:
+            count = interpreter_stats.refresh(options['interpreters'])
+        else:
+            count = interpreter_stats.rebuild(batch_size=options['batch_size'])
+        self.stdout.write(self.style.SUCCESS(f'Rebuilt stats for {count} interpreter(s)'))
@@ -0,0 +1,92 @@
+"""
+Django Management Command: Restore Database from an S3 backup
+
+Streams a run written by ``backup_to_s3`` back into the database. Incremental
+runs are restored on top of the full backup they were taken against.
+
+Usage:
+    python manage.py restore_from_s3                 # latest run
+    python manage.py restore_from_s3 --run 20260301_020000_000000
+    python manage.py restore_from_s3 --models app.language app.servicetype
+"""
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from app.management.commands.backup_to_s3 import init_s3_client
+from app.services.backup_engine import DEFAULT_PREFIX, load_latest_manifest, run_restore
+
+
+class Command(BaseCommand):
+    help = 'Restore the database from a streamed S3 backup'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--bucket',
+            type=str,
+            default='jhbridge-mysql-backups',
+            help='S3 bucket name (default: jhbridge-mysql-backups)',
+        )
+        parser.add_argument(
+            '--prefix',
+            type=str,
+            default=DEFAULT_PREFIX,
+            help=f'S3 key prefix (default: {DEFAULT_PREFIX})',
+        )
+        parser.add_argument(
+            '--run',
+            type=str,
+            help='Run id to restore (default: latest)',
+        )
+        parser.add_argument(
+            '--models',
+            nargs='+',
+            help='Only restore these models (app_label.model_name)',
+        )
+        parser.add_argument(
+            '--no-input',
+            action='store_true',
+            help='Do not prompt for confirmation',
+        )
+
+    def handle(self, *args, **options):
+        client = init_s3_client()
+        bucket = options['bucket']
+        prefix = options['prefix']
+
+        run_id = options['run']
+        if not run_id:
+            latest = load_latest_manifest(client, bucket, prefix)
+            if latest is None:
+                raise CommandError(f'No backups found in s3://{bucket}/{prefix}/')
+            run_id = latest['run_id']
+
+        if not options['no_input']:
+            answer = input(f'Restore run {run_id} into the current database? [y/N] ')
+            if answer.strip().lower() != 'y':
+                self.stdout.write('Aborted.')
+                return
+
+        started = time.perf_counter()
+        try:
+            results = run_restore(
+                client, bucket, run_id, prefix=prefix,
+                models=set(options['models']) if options['models'] else None,
+                progress=self._report_table,
+            )
+        except Exception as e:
+            raise CommandError(f'Restore failed: {e}')
+
+        elapsed = time.perf_counter() - started
+        rows = sum(r['rows'] for r in results)
+        self.stdout.write(self.style.SUCCESS(
+            f'\nRestored {rows} rows from run {run_id} in {elapsed:.2f}s'
+        ))
+
+    def _report_table(self, result):
+        if not result['rows']:
+            return
+        self.stdout.write(
+            f"  [{result['run_id']}] {result['model']}: {result['rows']} rows "
+            f"({result['mb_per_s']:.2f} MB/s)"
+        )
@@ -0,0 +1,50 @@
+import hashlib
+
+from django.db import migrations, models
+
+
+def hash_existing_keys(apps, schema_editor):
+    """Existing keys keep working: the hash is taken over the same raw value."""
+    APIKey = apps.get_model('app', 'APIKey')
+    keys = list(APIKey.objects.only('pk', 'key'))
+    for api_key in keys:
+        api_key.prefix = api_key.key[:8]
+        api_key.key_hash = hashlib.sha256(api_key.key.encode('utf-8')).hexdigest()
+    APIKey.objects.bulk_update(keys, ['prefix', 'key_hash'], batch_size=500)
+
+
+class Migration(migrations.Migration):
+    # The plaintext column is dropped: rolling back cannot restore the keys.
+
+    dependencies = [
+        ('app', '0043_login_attempt_timestamp_default'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='apikey',
+            name='prefix',
+            field=models.CharField(db_index=True, default='', editable=False, max_length=8),
+            preserve_default=False,
+        ),
+        migrations.AddField(
+            model_name='apikey',
+            name='key_hash',
+            field=models.CharField(editable=False, max_length=64, null=True),
+        ),
+        migrations.AddField(
+            model_name='apikey',
+            name='use_count',
+            field=models.PositiveBigIntegerField(default=0, editable=False),
+        ),
+        migrations.RunPython(hash_existing_keys, migrations.RunPython.noop),
+        migrations.RemoveField(
+            model_name='apikey',
+            name='key',
+        ),
+        migrations.AlterField(
+            model_name='apikey',
+            name='key_hash',
+            field=models.CharField(editable=False, max_length=64, unique=True),
+        ),
+    ]
@@ -0,0 +1,41 @@
+# Generated by Django 5.2.18 on 2026-10-19 15:37
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+def build_stats(apps, schema_editor):
+    from app.services.interpreter_stats import rebuild
+    rebuild(using=schema_editor.connection.alias, apps=apps)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('app', '0044_apikey_hashed_keys'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='InterpreterStats',
+            fields=[
+                ('interpreter', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='stats', serialize=False, to='app.interpreter')),
+                ('missions_completed', models.PositiveIntegerField(default=0)),
+                ('missions_accepted', models.PositiveIntegerField(default=0)),
+                ('missions_cancelled', models.PositiveIntegerField(default=0)),
+                ('missions_no_show', models.PositiveIntegerField(default=0)),
+                ('acceptance_rate', models.FloatField(default=0)),
+                ('no_show_rate', models.FloatField(default=0)),
+                ('avg_rating', models.FloatField(blank=True, null=True)),
+                ('ratings_count', models.PositiveIntegerField(default=0)),
+                ('total_earned', models.DecimalField(decimal_places=2, default=0, max_digits=12)),
+                ('last_mission_date', models.DateTimeField(blank=True, null=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'verbose_name_plural': 'interpreter stats',
+                'db_table': 'app_interpreter_stats',
+            },
+        ),
+        migrations.RunPython(build_stats, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,32 @@
+# Generated by Django 5.2.18 on 2026-10-19 15:52
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('app', '0045_interpreter_stats'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='AssignmentTombstone',
+            fields=[
+                ('assignment_id', models.BigIntegerField(primary_key=True, serialize=False)),
+                ('deleted_at', models.DateTimeField(db_index=True, default=django.utils.timezone.now)),
+            ],
+            options={
+                'db_table': 'app_assignment_tombstone',
+            },
+        ),
+        migrations.AddIndex(
+            model_name='assignment',
+            index=models.Index(fields=['status', 'start_time', 'id'], name='app_assignm_status_96a331_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='assignment',
+            index=models.Index(fields=['updated_at', 'id'], name='app_assignm_updated_fa3bbf_idx'),
+        ),
+    ]
@@ -0,0 +1,49 @@
+# Generated by Django 5.2.18 on 2026-10-19 16:04
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('app', '0046_assignment_feed_indexes'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='assignment',
+            index=models.Index(fields=['status', 'created_at'], name='app_assignm_status_1d7a3a_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='assignment',
+            index=models.Index(fields=['client', 'status'], name='app_assignm_client__80d1e7_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='clientpayment',
+            index=models.Index(fields=['status', 'payment_date'], name='app_clientp_status_05fcc7_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='emaillog',
+            index=models.Index(fields=['is_processed', 'received_at'], name='app_emaillo_is_proc_ca169d_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='emaillog',
+            index=models.Index(fields=['category', 'received_at'], name='app_emaillo_categor_6fa63f_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='expense',
+            index=models.Index(fields=['status', 'date_incurred'], name='app_expense_status_103bff_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='interpreter',
+            index=models.Index(fields=['active', 'is_manually_blocked', 'state'], name='app_interpr_active_aad76f_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='invoice',
+            index=models.Index(fields=['status', 'due_date'], name='app_invoice_status_a151dc_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='quoterequest',
+            index=models.Index(fields=['status', 'created_at'], name='app_quotere_status_95a298_idx'),
+        ),
+    ]
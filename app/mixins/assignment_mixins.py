@@ -13,7 +13,6 @@ from app.api.services.assignment_service import (
     create_interpreter_payment as svc_create_payment,
     cancel_interpreter_payment as svc_cancel_payment,
     create_expense_for_assignment,
-    add_assignment_to_google_calendar,
 )
 import app.services.assignment_email_service as email_svc
 
@@ -78,7 +77,8 @@ class AssignmentAdminMixin:
         """Gère les changements de statut et délègue au service partagé.
 
         Règles de paiement :
-        - CONFIRMED → crée InterpreterPayment (PENDING) + push Google Calendar
+        - CONFIRMED → crée InterpreterPayment (PENDING) ; le push Google Calendar
+                      passe par le signal post_save (dispatcher débouncé)
         - COMPLETED → crée seulement l'Expense ; le paiement reste PENDING
                       (l'admin change le statut manuellement)
         - CANCELLED → annule paiement + dépense existants
@@ -86,7 +86,6 @@ class AssignmentAdminMixin:
         try:
             if obj.status == 'CONFIRMED' and old_status != 'CONFIRMED':
                 svc_create_payment(obj, request.user)
-                add_assignment_to_google_calendar(obj.id)
 
             elif obj.status == 'COMPLETED' and old_status != 'COMPLETED':
                 # Payment stays PENDING — admin controls payout manually
@@ -1,6 +1,6 @@
-from .users import User, Client, Interpreter, InterpreterLocation
+from .users import User, Client, Interpreter, InterpreterLocation, InterpreterStats
 from .languages import Language, Languagee, InterpreterLanguage
-from .services import ServiceType, QuoteRequest, Quote, Assignment, PublicQuoteRequest
+from .services import ServiceType, QuoteRequest, Quote, Assignment, AssignmentTombstone, PublicQuoteRequest
 from .communication import ContactMessage, Notification, NotificationPreference, AssignmentNotification, AssignmentFeedback, EmailLog
 from .finance import FinancialTransaction, ClientPayment, InterpreterPayment, Payment, Expense, Reimbursement, Deduction, PayrollDocument, Service, Invoice
 from .security import AuditLog, APIKey, PGPKey
@@ -17,11 +17,11 @@ from .agent import AgentQueueItem, AgentAuditLog
 
 __all__ = [
     # Users & Profiles
-    'User', 'Client', 'Interpreter', 'InterpreterLocation',
+    'User', 'Client', 'Interpreter', 'InterpreterLocation', 'InterpreterStats',
     # Languages
     'Language', 'Languagee', 'InterpreterLanguage',
     # Services & Assignments
-    'ServiceType', 'QuoteRequest', 'Quote', 'Assignment', 'PublicQuoteRequest',
+    'ServiceType', 'QuoteRequest', 'Quote', 'Assignment', 'AssignmentTombstone', 'PublicQuoteRequest',
     # Communication
     'ContactMessage', 'Notification', 'NotificationPreference', 'AssignmentNotification', 'AssignmentFeedback', 'EmailLog',
     # Finance
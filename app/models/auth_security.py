@@ -6,8 +6,12 @@ import secrets
 from django.db import models
 from django.conf import settings
 from django.utils import timezone
+from django.utils.dateparse import parse_datetime
 import uuid
 
+from app.services import rate_limiter
+from app.services.rate_limiter import SlidingWindowLimiter
+
 
 class MFADevice(models.Model):
     """
@@ -154,10 +158,17 @@ class TrustedDevice(models.Model):
 
 class LoginAttempt(models.Model):
     """
-    Tracks login attempts for brute-force protection.
-    After MAX_ATTEMPTS failures in LOCKOUT_WINDOW, the account is locked for LOCKOUT_DURATION.
+    Audit trail of login attempts.
+
+    Brute-force protection does not read this table: failures are counted in
+    cache sliding windows per email and per IP (app.services.rate_limiter),
+    and MAX_ATTEMPTS failures for an email (MAX_ATTEMPTS_PER_IP for an IP)
+    within LOCKOUT_WINDOW lock it for LOCKOUT_DURATION. Rows are written by
+    a Celery task off the request path and pruned after
+    LOGIN_ATTEMPT_RETENTION_DAYS (``prune()``).
     """
     MAX_ATTEMPTS = 5
+    MAX_ATTEMPTS_PER_IP = 30
     LOCKOUT_WINDOW = timezone.timedelta(minutes=15)
     LOCKOUT_DURATION = timezone.timedelta(minutes=15)
 
@@ -165,7 +176,8 @@ class LoginAttempt(models.Model):
     ip_address = models.GenericIPAddressField(null=True, blank=True)
     success = models.BooleanField(default=False)
     failure_reason = models.CharField(max_length=50, blank=True, default="")
-    timestamp = models.DateTimeField(auto_now_add=True)
+    # Set by the caller: rows are persisted asynchronously, after the attempt
+    timestamp = models.DateTimeField(default=timezone.now)
 
     class Meta:
         db_table = 'app_login_attempt'
@@ -176,21 +188,75 @@ class LoginAttempt(models.Model):
         ]
 
     @classmethod
-    def is_locked_out(cls, email: str) -> bool:
-        """Check if the email is currently locked out due to too many failed attempts."""
-        cutoff = timezone.now() - cls.LOCKOUT_WINDOW
-        recent_failures = cls.objects.filter(
-            email=email.lower(),
-            success=False,
-            timestamp__gte=cutoff
-        ).count()
-        return recent_failures >= cls.MAX_ATTEMPTS
+    def email_limiter(cls):
+        return SlidingWindowLimiter(
+            'login-email', cls.MAX_ATTEMPTS,
+            cls.LOCKOUT_WINDOW.total_seconds(), cls.LOCKOUT_DURATION.total_seconds(),
+        )
 
     @classmethod
-    def record_attempt(cls, email: str, ip: str, success: bool, reason: str = ""):
-        cls.objects.create(
-            email=email.lower(),
-            ip_address=ip,
-            success=success,
-            failure_reason=reason,
+    def ip_limiter(cls):
+        return SlidingWindowLimiter(
+            'login-ip', cls.MAX_ATTEMPTS_PER_IP,
+            cls.LOCKOUT_WINDOW.total_seconds(), cls.LOCKOUT_DURATION.total_seconds(),
         )
+
+    @classmethod
+    def lockout_remaining(cls, email: str, ip: str = None) -> int:
+        """Seconds until the email (or IP) may try again; 0 if not locked. One cache read."""
+        return rate_limiter.retry_after(
+            (cls.email_limiter(), (email or '').lower()),
+            (cls.ip_limiter(), ip),
+        )
+
+    @classmethod
+    def is_locked_out(cls, email: str, ip: str = None) -> bool:
+        """Check if the email (or IP) is currently locked out due to too many failed attempts."""
+        return cls.lockout_remaining(email, ip) > 0
+
+    @classmethod
+    def record_attempt(cls, email: str, ip: str, success: bool, reason: str = ""):
+        """Count the attempt against the lockout windows and queue its audit row."""
+        email = email.lower()
+        if success:
+            cls.email_limiter().reset(email)
+        else:
+            cls.email_limiter().hit(email)
+            cls.ip_limiter().hit(ip)
+
+        attempt = {
+            'email': email,
+            'ip_address': ip,
+            'success': success,
+            'failure_reason': reason,
+            'timestamp': timezone.now().isoformat(),
+        }
+        try:
+            from app.tasks_security import persist_login_attempts
+            persist_login_attempts.delay([attempt])
+        except Exception:
+            cls.persist([attempt])
+
+    @classmethod
+    def persist(cls, attempts):
+        """Insert attempt dicts as produced by ``record_attempt``."""
+        rows = []
+        for attempt in attempts:
+            attempt = dict(attempt)
+            if isinstance(attempt.get('timestamp'), str):
+                attempt['timestamp'] = parse_datetime(attempt['timestamp'])
+            rows.append(cls(**attempt))
+        return cls.objects.bulk_create(rows)
+
+    @classmethod
+    def prune(cls, older_than, batch_size=5000):
+        """Delete attempts before *older_than* in batches. Returns the number deleted."""
+        deleted = 0
+        while True:
+            ids = list(
+                cls.objects.filter(timestamp__lt=older_than)
+                .order_by('timestamp').values_list('pk', flat=True)[:batch_size]
+            )
+            if not ids:
+                return deleted
+            deleted += cls.objects.filter(pk__in=ids).delete()[0]
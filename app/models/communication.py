@@ -36,6 +36,9 @@ class Notification(models.Model):
 
     class Meta:
         db_table = 'app_notification'
+        indexes = [
+            models.Index(fields=['recipient', 'created_at', 'id']),  # keyset pagination
+        ]
 
 class NotificationPreference(models.Model):
     user = models.OneToOneField('User', on_delete=models.CASCADE, related_name='notification_preferences')
@@ -192,4 +195,11 @@ class EmailLog(models.Model):
     linked_onboarding = models.ForeignKey('OnboardingInvitation', on_delete=models.SET_NULL, null=True, blank=True)
     
     has_attachments = models.BooleanField(default=False)
-    created_at = models.DateTimeField(auto_now_add=True)
\ No newline at end of file
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['received_at', 'id']),  # keyset pagination (inbox)
+            models.Index(fields=['is_processed', 'received_at']),  # emails à traiter
+            models.Index(fields=['category', 'received_at']),  # filtre par catégorie
+        ]
@@ -100,6 +100,9 @@ class ClientPayment(models.Model):
 
     class Meta:
         db_table = 'app_clientpayment'
+        indexes = [
+            models.Index(fields=['status', 'payment_date']),  # revenus du mois
+        ]
 
 class InterpreterPayment(models.Model):
     """Gestion des paiements aux interprètes"""
@@ -223,7 +226,9 @@ class InterpreterPayment(models.Model):
             # Cascade: mark the linked assignment as paid
             if self.assignment_id:
                 try:
-                    self.assignment.__class__.objects.filter(pk=self.assignment_id).update(is_paid=True)
+                    self.assignment.__class__.objects.filter(pk=self.assignment_id).update(
+                        is_paid=True, updated_at=timezone.now(),
+                    )
                 except Exception:
                     pass
             return True
@@ -294,6 +299,9 @@ class Expense(models.Model):
 
     class Meta:
         db_table = 'app_expense'
+        indexes = [
+            models.Index(fields=['status', 'date_incurred']),  # dépenses du mois
+        ]
 
 class PayrollDocument(models.Model):
     # Company Information
@@ -438,4 +446,9 @@ class Invoice(models.Model):
     
     # Tracking relances
     last_reminder_sent = models.DateTimeField(null=True, blank=True)
-    reminder_count = models.IntegerField(default=0)
\ No newline at end of file
+    reminder_count = models.IntegerField(default=0)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['status', 'due_date']),  # factures en retard
+        ]
@@ -1,3 +1,7 @@
+import hashlib
+import hmac
+import secrets
+
 from django.db import models
 from django.conf import settings
 import uuid
@@ -14,10 +18,20 @@ class AuditLog(models.Model):
     
     class Meta:
         db_table = 'app_auditlog'
+        indexes = [
+            models.Index(fields=['timestamp', 'id']),  # keyset pagination/export
+        ]
         
 class APIKey(models.Model):
-    """Modèle pour gérer les clés API"""
-    
+    """Modèle pour gérer les clés API
+
+    La clé en clair n'est jamais stockée : seulement ses 8 premiers
+    caractères (``prefix``, indexé, pour la recherche) et son SHA-256
+    (``key_hash``, comparé en temps constant). Voir app.services.api_keys.
+    """
+
+    PREFIX_LENGTH = 8
+
     id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
     user = models.ForeignKey(
         settings.AUTH_USER_MODEL, 
@@ -26,11 +40,13 @@ class APIKey(models.Model):
     )
     name = models.CharField(max_length=100, help_text="Nom pour identifier cette clé API")
     app_name = models.CharField(max_length=100, help_text="Nom de l'application utilisant cette clé API")
-    key = models.CharField(max_length=64, unique=True, db_index=True)
+    prefix = models.CharField(max_length=PREFIX_LENGTH, db_index=True, editable=False)
+    key_hash = models.CharField(max_length=64, unique=True, editable=False)
     created_at = models.DateTimeField(auto_now_add=True)
     expires_at = models.DateTimeField(null=True, blank=True)
     is_active = models.BooleanField(default=True)
     last_used = models.DateTimeField(null=True, blank=True)
+    use_count = models.PositiveBigIntegerField(default=0, editable=False)
     
     class Meta:
         verbose_name = "Clé API"
@@ -39,7 +55,7 @@ class APIKey(models.Model):
         db_table = 'app_apikey'
     
     def __str__(self):
-        return f"{self.name} ({self.key[:8]}...)"
+        return f"{self.name} ({self.prefix}...)"
     
     def is_valid(self):
         """Vérifie si la clé API est valide (active et non expirée)"""
@@ -53,11 +69,31 @@ class APIKey(models.Model):
         """Marque la clé comme utilisée en mettant à jour le timestamp de dernière utilisation"""
         self.last_used = timezone.now()
         self.save(update_fields=['last_used'])
+
+    @staticmethod
+    def hash_key(raw_key):
+        return hashlib.sha256(raw_key.encode('utf-8')).hexdigest()
+
+    def set_key(self, raw_key=None):
+        """Remplace la clé (nouvelle si *raw_key* est None) et retourne la clé en clair.
+
+        La clé en clair reste disponible dans ``raw_key`` sur cette instance
+        seulement, pour être montrée une seule fois.
+        """
+        raw_key = raw_key or self.generate_key()
+        self.prefix = raw_key[:self.PREFIX_LENGTH]
+        self.key_hash = self.hash_key(raw_key)
+        self.raw_key = raw_key
+        return raw_key
+
+    def verify(self, raw_key):
+        """Compare *raw_key* au hash stocké en temps constant."""
+        return hmac.compare_digest(self.key_hash, self.hash_key(raw_key))
     
     @classmethod
     def generate_key(cls):
         """Génère une nouvelle clé API unique"""
-        return uuid.uuid4().hex + uuid.uuid4().hex  # 64 caractères
+        return secrets.token_hex(32)  # 64 caractères
 
 class PGPKey(models.Model):
     """
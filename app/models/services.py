@@ -1,4 +1,4 @@
-from django.db import models
+from django.db import models, transaction
 from django.utils.translation import gettext_lazy as _
 from django.core.exceptions import ValidationError
 from django.utils import timezone
@@ -61,6 +61,9 @@ class QuoteRequest(models.Model):
 
     class Meta:
         db_table = 'app_quoterequest'
+        indexes = [
+            models.Index(fields=['status', 'created_at']),  # demandes en attente
+        ]
 
 class Quote(models.Model):
     class Status(models.TextChoices):
@@ -93,6 +96,43 @@ class Quote(models.Model):
     class Meta:
         db_table = 'app_quote'
 
+class AssignmentQuerySet(models.QuerySet):
+    def bulk_transition(self, to_status, from_statuses=None, **values):
+        """Move every assignment in this queryset to *to_status* with one UPDATE.
+
+        Only rows currently in *from_statuses* (default: any other status) are
+        changed; *values* are extra columns set in the same statement. No
+        post_save fires: side-effect handlers receive the whole batch as one
+        grouped change list after commit (see app.services.assignment_events).
+
+        Returns the ids that changed status, in id order.
+        """
+        from app.services.assignment_events import AssignmentChange, record_many
+
+        fields = ['status', *values]
+        with transaction.atomic(using=self.db):
+            qs = self.exclude(status=to_status)
+            if from_statuses is not None:
+                qs = qs.filter(status__in=list(from_statuses))
+            rows = list(qs.select_for_update().order_by('pk').values('pk', *fields))
+            if not rows:
+                return []
+            ids = [row['pk'] for row in rows]
+            new_values = {'status': to_status, **values}
+            self.model._base_manager.using(self.db).filter(pk__in=ids).update(
+                updated_at=timezone.now(), **new_values,
+            )
+            record_many([
+                AssignmentChange(row['pk'], changes={
+                    field: (row[field], getattr(new_values[field], 'pk', new_values[field]))
+                    for field in fields
+                    if row[field] != getattr(new_values[field], 'pk', new_values[field])
+                })
+                for row in rows
+            ], using=self.db)
+        return ids
+
+
 class Assignment(models.Model):
     class Status(models.TextChoices):
         PENDING = ASSIGNMENT_PENDING, _('Pending')  # Assigné à un interprète, en attente de confirmation
@@ -112,6 +152,8 @@ class Assignment(models.Model):
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
         self._original_status = self.status if self.pk else None
+        # Valeurs chargées, pour le diff champ par champ (tracked_changes)
+        self._loaded_values = self._tracked_values() if self.pk else {}
 
     # Relations existantes
     quote = models.OneToOneField(Quote, on_delete=models.PROTECT, null=True, blank=True)
@@ -164,11 +206,18 @@ class Assignment(models.Model):
     )
     gcal_synced_at  = models.DateTimeField(null=True, blank=True)
 
+    objects = AssignmentQuerySet.as_manager()
+
     class Meta:
         ordering = ['-created_at']
         indexes = [
             models.Index(fields=['status', 'interpreter', 'start_time']),
             models.Index(fields=['created_at']),
+            models.Index(fields=['start_time', 'id']),  # keyset pagination/export
+            models.Index(fields=['status', 'start_time', 'id']),  # kanban columns
+            models.Index(fields=['updated_at', 'id']),  # changed_since feeds
+            models.Index(fields=['status', 'created_at']),  # dashboard KPIs (30 derniers jours)
+            models.Index(fields=['client', 'status']),  # missions par client
         ]
         db_table = 'app_assignment'
 
@@ -189,8 +238,43 @@ class Assignment(models.Model):
             self.client_email = None
             self.client_phone = None
 
+        # updated_at alimente les flux ?changed_since : toujours l'écrire
+        update_fields = kwargs.get('update_fields')
+        if update_fields and 'updated_at' not in update_fields:
+            kwargs['update_fields'] = [*update_fields, 'updated_at']
+
         super().save(*args, **kwargs)
         self._original_status = self.status
+        self._loaded_values.update(self._tracked_values(kwargs.get('update_fields')))
+
+    def refresh_from_db(self, *args, **kwargs):
+        super().refresh_from_db(*args, **kwargs)
+        self._loaded_values.update(self._tracked_values(kwargs.get('fields')))
+
+    def _tracked_values(self, fields=None):
+        """Loaded (non-deferred) concrete field values, keyed by attname."""
+        loaded = self.__dict__
+        return {
+            f.attname: loaded[f.attname]
+            for f in self._meta.concrete_fields
+            if f.attname in loaded and (fields is None or f.name in fields or f.attname in fields)
+        }
+
+    def tracked_changes(self, update_fields=None):
+        """``{field name: (old, new)}`` for fields changed since load or last save.
+
+        Foreign keys compare by id; auto_now timestamps are ignored.
+        """
+        loaded = self.__dict__
+        changes = {}
+        for f in self._meta.concrete_fields:
+            if getattr(f, 'auto_now', False) or f.attname not in self._loaded_values:
+                continue
+            if update_fields is not None and f.name not in update_fields and f.attname not in update_fields:
+                continue
+            if f.attname in loaded and loaded[f.attname] != self._loaded_values[f.attname]:
+                changes[f.name] = (self._loaded_values[f.attname], loaded[f.attname])
+        return changes
 
     def can_be_confirmed(self):
         """Vérifie si l'assignment peut être confirmé"""
@@ -251,6 +335,19 @@ class Assignment(models.Model):
             return self.client_name
         return "Unspecified Client"
 
+class AssignmentTombstone(models.Model):
+    """Trace d'une mission supprimée, pour les flux ?changed_since (kanban, calendrier).
+
+    Écrite par le signal post_delete ; les traces plus vieilles que
+    TOMBSTONE_RETENTION sont purgées au fil des suppressions, et un client
+    plus en retard que cela doit recharger la vue complète.
+    """
+    assignment_id = models.BigIntegerField(primary_key=True)
+    deleted_at = models.DateTimeField(default=timezone.now, db_index=True)
+
+    class Meta:
+        db_table = 'app_assignment_tombstone'
+
 class PublicQuoteRequest(models.Model):
     # Contact Information
     full_name = models.CharField(max_length=100)
@@ -1,4 +1,5 @@
 from django.db import models
+from django.db.models.functions import RowNumber
 from django.contrib.auth.models import AbstractUser
 from django.utils.translation import gettext_lazy as _
 import uuid
@@ -162,6 +163,9 @@ class Interpreter(models.Model):
 
     class Meta:
         db_table = 'app_interpreter'
+        indexes = [
+            models.Index(fields=['active', 'is_manually_blocked', 'state']),  # interprètes disponibles
+        ]
     
     def __str__(self):
         if self.user:
@@ -178,6 +182,21 @@ class Interpreter(models.Model):
     
 # app/models/users.py — AJOUTER
 
+class InterpreterLocationQuerySet(models.QuerySet):
+    def latest_per_interpreter(self):
+        """Only the newest row of each interpreter.
+
+        Rows are numbered newest first per interpreter and filtered to the
+        first. Django applies that filter around the query, so filters added
+        later (a prefetch's ``interpreter__in``) still limit the rows numbered
+        to the interpreters asked for, read through the (interpreter,
+        -timestamp) index.
+        """
+        return self.annotate(
+            recency=models.Window(RowNumber(), partition_by='interpreter', order_by=('-timestamp', '-pk')),
+        ).filter(recency=1)
+
+
 class InterpreterLocation(models.Model):
     interpreter = models.ForeignKey('Interpreter', on_delete=models.CASCADE, related_name='locations')
     
@@ -189,7 +208,9 @@ class InterpreterLocation(models.Model):
     current_assignment = models.ForeignKey('Assignment', on_delete=models.SET_NULL, null=True, blank=True)
     
     timestamp = models.DateTimeField(auto_now_add=True)
-    
+
+    objects = InterpreterLocationQuerySet.as_manager()
+
     class Meta:
         db_table = 'app_interpreter_location'
         ordering = ['-timestamp']
@@ -197,4 +218,40 @@ class InterpreterLocation(models.Model):
             models.Index(fields=['interpreter', '-timestamp']),
         ]
         # On ne garde que la dernière position
-        # Les positions historiques sont purgées par un Celery task
\ No newline at end of file
+        # Les positions historiques sont purgées par un Celery task
+
+
+class InterpreterStats(models.Model):
+    """Statistiques de performance dénormalisées : une ligne par interprète.
+
+    Recalculées pour les interprètes touchés à chaque changement d'Assignment,
+    d'AssignmentFeedback ou d'InterpreterPayment (après commit), et en entier
+    chaque nuit — voir app.services.interpreter_stats.
+    """
+    interpreter = models.OneToOneField(
+        'Interpreter', on_delete=models.CASCADE, primary_key=True, related_name='stats',
+    )
+    missions_completed = models.PositiveIntegerField(default=0)
+    missions_accepted = models.PositiveIntegerField(default=0)   # CONFIRMED + COMPLETED
+    missions_cancelled = models.PositiveIntegerField(default=0)
+    missions_no_show = models.PositiveIntegerField(default=0)
+    acceptance_rate = models.FloatField(default=0)  # % accepted / (accepted + cancelled)
+    no_show_rate = models.FloatField(default=0)     # % no-show / (completed + no-show)
+    avg_rating = models.FloatField(null=True, blank=True)  # feedback on any of their assignments
+    ratings_count = models.PositiveIntegerField(default=0)
+    total_earned = models.DecimalField(max_digits=12, decimal_places=2, default=0)  # COMPLETED payments
+    last_mission_date = models.DateTimeField(null=True, blank=True)  # latest completed start_time
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        db_table = 'app_interpreter_stats'
+        verbose_name_plural = 'interpreter stats'
+
+    @classmethod
+    def for_interpreter(cls, interpreter):
+        """The stats row of *interpreter*, or an unsaved all-zero row if none yet."""
+        try:
+            return interpreter.stats
+        except AttributeError:
+            # RelatedObjectDoesNotExist, re-raised as AttributeError by Interpreter.__getattr__
+            return cls(interpreter=interpreter)
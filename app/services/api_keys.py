@@ -0,0 +1,236 @@
+"""
+API-key verification: prefix lookup, constant-time hash check, in-process
+caches and batched usage counters.
+
+Keys are never stored in clear (see ``APIKey``): a presented key is looked up
+by its indexed 8-character ``prefix`` and each candidate's ``key_hash`` is
+compared with ``hmac.compare_digest``.
+
+Results are kept per process in two small LRU caches with a TTL, keyed by
+the key's SHA-256 (which is also ``key_hash``): one for valid keys and one
+for unknown ones, so a flood of bad keys cannot evict the good ones. A hit
+costs one cache read — the owner's auth-state version
+(app.services.auth_state) — so revoking or rotating a key takes effect in
+every process at once; the TTL bounds anything the version does not cover.
+
+Each use bumps an in-memory counter; counts and ``last_used`` are written for
+all keys in one UPDATE at most every API_KEY_USAGE_FLUSH_SECONDS (default 60)
+from a background thread, and at exit.
+
+``python manage.py benchmark_api_keys`` reports validations per second.
+"""
+import atexit
+import copy
+import logging
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.db.models import Case, F, Value, When
+from django.utils import timezone
+
+from app.services import auth_state
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CACHE_SIZE = 1024
+DEFAULT_CACHE_TTL = 30
+
+
+class TTLCache:
+    """Thread-safe LRU mapping whose entries expire after *ttl* seconds."""
+
+    def __init__(self, maxsize=DEFAULT_CACHE_SIZE, ttl=DEFAULT_CACHE_TTL, clock=time.monotonic):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.clock = clock
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._data)
+
+    def get(self, key):
+        with self._lock:
+            item = self._data.get(key)
+            if item is None:
+                return None
+            expires, value = item
+            if expires <= self.clock():
+                del self._data[key]
+                return None
+            self._data.move_to_end(key)
+            return value
+
+    def set(self, key, value):
+        with self._lock:
+            self._data[key] = (self.clock() + self.ttl, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def pop(self, key):
+        with self._lock:
+            self._data.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+
+def _setting(name, default):
+    return getattr(settings, name, default)
+
+
+_valid = TTLCache(_setting('API_KEY_CACHE_SIZE', DEFAULT_CACHE_SIZE),
+                  _setting('API_KEY_CACHE_TTL', DEFAULT_CACHE_TTL))
+_invalid = TTLCache(_setting('API_KEY_CACHE_SIZE', DEFAULT_CACHE_SIZE),
+                    _setting('API_KEY_CACHE_TTL', DEFAULT_CACHE_TTL))
+
+_usage = {}
+_usage_lock = threading.Lock()
+_last_flush = time.monotonic()
+_flush_executor = None
+
+
+# ---------------------------------------------------------------------------
+# Lookup
+# ---------------------------------------------------------------------------
+def find_key(raw_key):
+    """The ``APIKey`` matching *raw_key* (any state), or None. Hits the database."""
+    from app.models import APIKey
+
+    candidates = APIKey.objects.select_related('user').filter(
+        prefix=raw_key[:APIKey.PREFIX_LENGTH],
+    )
+    # Every candidate is compared so timing does not depend on which matched
+    found = None
+    for candidate in candidates:
+        if candidate.verify(raw_key) and found is None:
+            found = candidate
+    return found
+
+
+def _load(raw_key, digest):
+    api_key = find_key(raw_key)
+    if api_key is None:
+        _invalid.set(digest, True)
+        return None
+    entry = {
+        'key_id': api_key.pk,
+        'user': api_key.user,
+        'is_active': api_key.is_active,
+        'expires_at': api_key.expires_at,
+        'version': auth_state.get_version(api_key.user_id),
+    }
+    _valid.set(digest, entry)
+    return entry
+
+
+def resolve(raw_key):
+    """Owner of *raw_key* if it is active and unexpired, else None."""
+    from app.models import APIKey
+
+    if not raw_key:
+        return None
+    digest = APIKey.hash_key(raw_key)
+    if _invalid.get(digest):
+        return None
+    entry = _valid.get(digest)
+    if entry is None or entry['version'] != auth_state.get_version(entry['user'].pk):
+        entry = _load(raw_key, digest)
+        if entry is None:
+            return None
+
+    if not entry['is_active']:
+        return None
+    if entry['expires_at'] and entry['expires_at'] < timezone.now():
+        return None
+    record_use(entry['key_id'])
+    # A copy per request: views may modify request.user
+    return copy.copy(entry['user'])
+
+
+def forget(api_key):
+    """Drop this process's cached result for *api_key* (saved or deleted)."""
+    _valid.pop(api_key.key_hash)
+    _invalid.pop(api_key.key_hash)
+
+
+def clear_caches():
+    _valid.clear()
+    _invalid.clear()
+
+
+# ---------------------------------------------------------------------------
+# Usage counters
+# ---------------------------------------------------------------------------
+def record_use(key_id, when=None):
+    """Count one use of *key_id*; persisted by the next flush."""
+    global _last_flush
+    when = when or timezone.now()
+    with _usage_lock:
+        count, _last = _usage.get(key_id, (0, None))
+        _usage[key_id] = (count + 1, when)
+        due = time.monotonic() - _last_flush >= _setting('API_KEY_USAGE_FLUSH_SECONDS', 60)
+        if due:
+            _last_flush = time.monotonic()
+    if due:
+        _schedule_flush()
+
+
+def _schedule_flush():
+    global _flush_executor
+    with _usage_lock:
+        if _flush_executor is None:
+            _flush_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='apikey-usage')
+    _flush_executor.submit(_flush_in_thread)
+
+
+def _flush_in_thread():
+    from django.db import close_old_connections
+    close_old_connections()
+    try:
+        flush_usage()
+    except Exception:
+        logger.exception("API key usage flush failed")
+    finally:
+        close_old_connections()
+
+
+def flush_usage():
+    """Add pending use counts and ``last_used`` in one UPDATE. Returns the row count."""
+    from app.models import APIKey
+
+    with _usage_lock:
+        pending = dict(_usage)
+        _usage.clear()
+    if not pending:
+        return 0
+    try:
+        return APIKey.objects.filter(pk__in=list(pending)).update(
+            use_count=F('use_count') + Case(
+                *[When(pk=key_id, then=Value(count)) for key_id, (count, _used) in pending.items()],
+                default=Value(0),
+            ),
+            last_used=Case(
+                *[When(pk=key_id, then=Value(used)) for key_id, (_count, used) in pending.items()],
+                default=F('last_used'),
+            ),
+        )
+    except Exception:
+        with _usage_lock:
+            for key_id, (count, used) in pending.items():
+                current, _last = _usage.get(key_id, (0, used))
+                _usage[key_id] = (current + count, _last)
+        raise
+
+
+@atexit.register
+def _flush_at_exit():
+    try:
+        flush_usage()
+    except Exception:
+        logger.debug("API key usage not flushed at exit")
@@ -0,0 +1,144 @@
+"""
+Change-aware dispatch of Assignment side effects.
+
+Assignment keeps a snapshot of the fields it was loaded with, so every save
+yields a field-level diff (``Assignment.tracked_changes()``). The single
+Assignment post_save receiver in app.signals turns that diff into an
+``AssignmentChange`` and hands it to ``record()``; saves that changed nothing
+are dropped there.
+
+Handlers register with ``@on_assignment_change(fields=...)`` and only see
+changes touching those fields (plus creations, unless ``on_create=False``).
+They receive a *list* of changes:
+
+  - ``on_commit=True`` (default) handlers run once per transaction, after it
+    commits, with every change made inside it merged per assignment — ten
+    saves of one row become one change, a bulk_transition of 200 rows
+    arrives as one list. Outside a transaction they run immediately.
+  - ``on_commit=False`` handlers run inside the save, for work that must
+    commit or roll back with it (e.g. related rows).
+
+A handler that raises is logged and does not stop the others. Changes made
+in a savepoint that is later rolled back may still be delivered (when the
+transaction's batch was started before it), so deferred handlers should
+re-read the database rather than trust ``change.instance``.
+"""
+import logging
+
+from django.db import DEFAULT_DB_ALIAS, transaction
+
+from app.utils.transactions import batch_on_commit
+
+logger = logging.getLogger(__name__)
+
+_handlers = []
+
+
+class AssignmentChange:
+    """One assignment's creation or field changes: ``{field: (old, new)}``."""
+
+    __slots__ = ('assignment_id', 'created', 'changes', 'instance')
+
+    def __init__(self, assignment_id, created=False, changes=None, instance=None):
+        self.assignment_id = assignment_id
+        self.created = created
+        self.changes = changes or {}
+        self.instance = instance
+
+    def __repr__(self):
+        return f'<AssignmentChange #{self.assignment_id} created={self.created} {sorted(self.changes)}>'
+
+    def changed(self, *fields):
+        return any(field in self.changes for field in fields)
+
+    def merge(self, later):
+        """Fold a later change to the same assignment into this one."""
+        self.created = self.created or later.created
+        for field, (old, new) in later.changes.items():
+            first = self.changes.get(field, (old, new))[0]
+            if first == new:
+                self.changes.pop(field, None)
+            else:
+                self.changes[field] = (first, new)
+        if later.instance is not None:
+            self.instance = later.instance
+
+
+def on_assignment_change(fields=None, on_create=True, on_commit=True):
+    """Register a handler for Assignment changes.
+
+    *fields*: names the handler cares about (None: any change; an empty
+    tuple: creations only).
+    """
+    interest = frozenset(fields) if fields is not None else None
+
+    def register(func):
+        _handlers.append((func, interest, on_create, on_commit))
+        return func
+    return register
+
+
+def _wants(interest, on_create, change):
+    if change.created:
+        return on_create
+    return interest is None or not interest.isdisjoint(change.changes)
+
+
+def _run(changes, deferred):
+    for func, interest, on_create, on_commit in _handlers:
+        if on_commit != deferred:
+            continue
+        selected = [change for change in changes if _wants(interest, on_create, change)]
+        if not selected:
+            continue
+        try:
+            func(selected)
+        except Exception:
+            logger.exception("Assignment change handler %s failed", func.__name__)
+
+
+def coalesce(changes):
+    """Merge changes per assignment, keeping first-seen order."""
+    merged = {}
+    for change in changes:
+        if change.assignment_id in merged:
+            merged[change.assignment_id].merge(change)
+        else:
+            merged[change.assignment_id] = AssignmentChange(
+                change.assignment_id, change.created, dict(change.changes), change.instance,
+            )
+    return [change for change in merged.values() if change.created or change.changes]
+
+
+class _CommitBuffer:
+    def __init__(self):
+        self.changes = []
+
+    def flush(self):
+        _run(coalesce(self.changes), deferred=True)
+
+
+def record_many(changes, using=DEFAULT_DB_ALIAS):
+    """Dispatch *changes* (a list of AssignmentChange) as one batch."""
+    changes = [change for change in changes if change.created or change.changes]
+    if not changes:
+        return
+    _run(changes, deferred=False)
+
+    changes = [
+        change for change in changes
+        if any(on_commit and _wants(interest, on_create, change)
+               for _func, interest, on_create, on_commit in _handlers)
+    ]
+    if not changes:
+        return
+    if not transaction.get_connection(using).in_atomic_block:
+        _run(coalesce(changes), deferred=True)
+        return
+    batch_on_commit('assignment_changes', _CommitBuffer, using=using).changes.extend(changes)
+
+
+def record(instance, created, update_fields=None, using=DEFAULT_DB_ALIAS):
+    """Dispatch the diff of one Assignment save."""
+    changes = {} if created else instance.tracked_changes(update_fields)
+    record_many([AssignmentChange(instance.pk, created, changes, instance)], using=using)
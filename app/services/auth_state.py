@@ -0,0 +1,85 @@
+"""
+Cached authentication state: MFA capability per user, and the per-user
+version API-key lookups are checked against (app.services.api_keys).
+
+The admin MFA middleware and the login flow ask the same question on every
+request ("does this user have TOTP or a passkey?"). The answer is cached in
+the default cache (Redis in production) under a per-user version:
+
+    auth-state:version:<user id>          bumped on any MFA device, passkey,
+                                          API key or user change
+    auth-state:user:<user id>:<version>   {'has_totp', 'has_webauthn'}
+
+Invalidation never deletes user entries: bumping the version makes every
+entry read at the old one unreachable, so a reader racing a change can only
+ever store stale state under a version nobody asks for. The receivers in
+app.signals bump the version when the row is saved and again when the
+transaction commits; user saves limited to ``BOOKKEEPING_USER_FIELDS`` (the
+last_login write on every login) leave it alone.
+"""
+import logging
+
+from django.core.cache import cache
+from django.db import transaction
+
+logger = logging.getLogger(__name__)
+
+VERSION_KEY = 'auth-state:version:{}'
+USER_KEY = 'auth-state:user:{}:{}'
+
+STATE_TTL = 60 * 60
+
+# User columns no cached state depends on
+BOOKKEEPING_USER_FIELDS = frozenset({'last_login', 'last_login_ip', 'updated_at'})
+
+
+# ---------------------------------------------------------------------------
+# Versions
+# ---------------------------------------------------------------------------
+def get_version(user_id):
+    return cache.get(VERSION_KEY.format(user_id)) or 0
+
+
+def bump_version(user_id):
+    """Invalidate every cached entry for *user_id*."""
+    key = VERSION_KEY.format(user_id)
+    try:
+        cache.add(key, 0, None)
+        cache.incr(key)
+    except Exception:
+        logger.warning("Auth state for user #%s could not be invalidated", user_id)
+
+
+def invalidate(user_id):
+    """Bump now (for reads in this transaction) and again once it commits."""
+    if user_id is None:
+        return
+    bump_version(user_id)
+    transaction.on_commit(lambda: bump_version(user_id))
+
+
+# ---------------------------------------------------------------------------
+# MFA capability
+# ---------------------------------------------------------------------------
+def mfa_state(user):
+    """``{'has_totp': bool, 'has_webauthn': bool}`` for *user*."""
+    version = get_version(user.pk)
+    key = USER_KEY.format(user.pk, version)
+    state = cache.get(key)
+    if state is None:
+        from app.models.auth_security import MFADevice, WebAuthnCredential
+        state = {
+            'has_totp': MFADevice.objects.filter(user=user, is_verified=True).exists(),
+            'has_webauthn': WebAuthnCredential.objects.filter(user=user).exists(),
+        }
+        cache.set(key, state, STATE_TTL)
+    return state
+
+
+def has_totp(user):
+    return mfa_state(user)['has_totp']
+
+
+def has_any_mfa(user):
+    state = mfa_state(user)
+    return state['has_totp'] or state['has_webauthn']
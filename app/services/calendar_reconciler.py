@@ -0,0 +1,490 @@
+"""
+Batched reconciliation between assignments and the Google Calendar.
+
+The database is the source of truth. A run lists calendar events — in full,
+or incrementally from the last ``nextSyncToken`` — indexes them by the
+``extendedProperties.private.assignment_id`` every event carries, diffs them
+against assignments in bulk and applies the resulting creates, updates and
+deletes through the Calendar batch endpoint, up to 50 requests per HTTP call.
+
+Drift repaired:
+  - events edited or deleted by hand on the calendar
+  - assignments never pushed, or whose last push failed
+  - duplicate events for one assignment, and events whose assignment is gone
+  - gcal_event_id values that point at the wrong (or a vanished) event
+
+Batches are paced by an AIMD limiter: the request rate creeps up while Google
+accepts batches and halves as soon as a sub-request is rate limited; those
+sub-requests are retried in a later batch. Events created by a run that dies
+before the database is updated are tagged with their assignment id, so the
+next full run links them instead of creating duplicates.
+
+The sync token lives in the default cache. If it is evicted, or Google
+expires it (410 Gone), the next run falls back to a full listing.
+"""
+import logging
+import time
+from datetime import timedelta
+
+from django.core.cache import cache
+from django.db.models import Q
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+
+logger = logging.getLogger(__name__)
+
+BATCH_LIMIT = 50            # Calendar API maximum per batch request
+LIST_PAGE_SIZE = 2500       # Calendar API maximum per events.list page
+MAX_ROUNDS = 6
+DEFAULT_SCOPE_DAYS = 90
+SYNC_TOKEN_KEY = 'gcal-reconcile:sync-token:{}'
+LOCK_KEY = 'gcal-reconcile:lock:{}'
+LOCK_SECONDS = 60 * 60
+
+ACTION_CREATE = 'create'
+ACTION_UPDATE = 'update'
+ACTION_DELETE = 'delete'
+ACTION_LINK = 'link'        # database-only: point gcal_event_id at an existing event
+
+LIVE_STATUSES = ('PENDING', 'CONFIRMED', 'IN_PROGRESS', 'COMPLETED')
+TERMINAL_STATUSES = ('CANCELLED', 'NO_SHOW')
+_COMPARED_FIELDS = ('summary', 'location', 'description', 'colorId')
+
+
+class SyncTokenExpired(Exception):
+    """Raised when Google no longer accepts a stored sync token (HTTP 410)."""
+
+
+def _http_status(exc):
+    status = getattr(getattr(exc, 'resp', None), 'status', None)
+    try:
+        return int(status)
+    except (TypeError, ValueError):
+        return None
+
+
+def _is_rate_limited(exc):
+    status = _http_status(exc)
+    if status == 429:
+        return True
+    return status == 403 and 'ratelimitexceeded' in str(exc).lower().replace(' ', '')
+
+
+def _is_transient(exc):
+    status = _http_status(exc)
+    return status is None or status >= 500 or _is_rate_limited(exc)
+
+
+# ---------------------------------------------------------------------------
+# Rate limiting
+# ---------------------------------------------------------------------------
+class AdaptiveRateLimiter:
+    """Additive-increase / multiplicative-decrease pacing of API requests.
+
+    ``wait(n)`` blocks until *n* more requests fit under the current rate
+    (requests per second). Call ``success()`` after a clean batch and
+    ``throttled()`` after one Google pushed back on.
+    """
+
+    def __init__(self, rate=5.0, min_rate=0.5, max_rate=10.0, step=0.5,
+                 clock=time.monotonic, sleep=time.sleep):
+        self.rate = rate
+        self.min_rate = min_rate
+        self.max_rate = max_rate
+        self.step = step
+        self._clock = clock
+        self._sleep = sleep
+        self._next_at = None
+
+    def wait(self, requests=1):
+        now = self._clock()
+        if self._next_at is not None and self._next_at > now:
+            self._sleep(self._next_at - now)
+            now = self._next_at
+        self._next_at = now + requests / self.rate
+
+    def success(self):
+        self.rate = min(self.max_rate, self.rate + self.step)
+
+    def throttled(self):
+        self.rate = max(self.min_rate, self.rate / 2)
+
+
+# ---------------------------------------------------------------------------
+# Listing
+# ---------------------------------------------------------------------------
+def list_events(service, calendar_id, sync_token=None, limiter=None):
+    """Return ``(events, next_sync_token)`` for the whole calendar.
+
+    With *sync_token*, only events changed since that token are returned,
+    deleted ones included as ``status == 'cancelled'`` tombstones.
+    """
+    kwargs = {'calendarId': calendar_id, 'maxResults': LIST_PAGE_SIZE, 'showDeleted': True}
+    if sync_token:
+        kwargs['syncToken'] = sync_token
+    events = []
+    while True:
+        if limiter is not None:
+            limiter.wait()
+        try:
+            page = service.events().list(**kwargs).execute()
+        except Exception as exc:
+            if sync_token and _http_status(exc) == 410:
+                raise SyncTokenExpired(str(exc)) from exc
+            raise
+        events.extend(page.get('items', []))
+        if not page.get('nextPageToken'):
+            return events, page.get('nextSyncToken')
+        kwargs['pageToken'] = page['nextPageToken']
+
+
+def event_assignment_id(event):
+    """Assignment id an event was created for, or None for foreign events."""
+    private = (event.get('extendedProperties') or {}).get('private') or {}
+    try:
+        return int(private.get('assignment_id'))
+    except (TypeError, ValueError):
+        return None
+
+
+def index_events(events):
+    """Split listed events into ``({assignment_id: [live events]}, {cancelled event ids})``."""
+    live, cancelled = {}, set()
+    for event in events:
+        if event.get('status') == 'cancelled':
+            cancelled.add(event['id'])
+            continue
+        assignment_id = event_assignment_id(event)
+        if assignment_id is not None:
+            live.setdefault(assignment_id, []).append(event)
+    return live, cancelled
+
+
+# ---------------------------------------------------------------------------
+# Diffing
+# ---------------------------------------------------------------------------
+def _instant(moment):
+    value = parse_datetime((moment or {}).get('dateTime') or '')
+    return value.timestamp() if value is not None else None
+
+
+def event_matches(event, body):
+    """True when the calendar *event* already shows what *body* would write."""
+    for field in _COMPARED_FIELDS:
+        if (event.get(field) or '').strip() != (body.get(field) or '').strip():
+            return False
+    for edge in ('start', 'end'):
+        remote, wanted = event.get(edge) or {}, body[edge]
+        if _instant(remote) != _instant(wanted) or remote.get('timeZone') != wanted['timeZone']:
+            return False
+    return True
+
+
+def _op(action, assignment_id, event_id=None, body=None):
+    return {'action': action, 'assignment_id': assignment_id, 'event_id': event_id, 'body': body}
+
+
+def plan_assignment(assignment, events, force=False):
+    """Calendar operations that bring *events* in line with one assignment.
+
+    *events* are the live calendar events tagged with its id. An event known
+    only by id (``{'id': ...}``, from an incremental run) never matches, so it
+    is rewritten. Returns ``(ops, body)``; *body* is None for terminal
+    assignments.
+    """
+    from app.services.google_calendar import _build_event_body
+
+    if assignment.status in TERMINAL_STATUSES:
+        return [_op(ACTION_DELETE, assignment.pk, event['id']) for event in events], None
+
+    body = _build_event_body(assignment)
+    keep = next((e for e in events if e['id'] == assignment.gcal_event_id), None)
+    if keep is None and events:
+        keep = events[0]
+    ops = [_op(ACTION_DELETE, assignment.pk, e['id']) for e in events if e is not keep]
+    if keep is None:
+        ops.append(_op(ACTION_CREATE, assignment.pk, body=body))
+    elif force or not event_matches(keep, body):
+        ops.append(_op(ACTION_UPDATE, assignment.pk, keep['id'], body))
+    elif keep['id'] != assignment.gcal_event_id or assignment.gcal_sync_status != 'SYNCED':
+        ops.append(_op(ACTION_LINK, assignment.pk, keep['id'], body))
+    return ops, body
+
+
+def _needs_entry(assignment, ops):
+    if ops or assignment.status not in TERMINAL_STATUSES:
+        return True
+    return bool(assignment.gcal_event_id) or assignment.gcal_sync_status not in ('DELETED', 'SKIPPED')
+
+
+def _load_assignments(queryset, ids, chunk_size=500):
+    ids = list(ids)
+    loaded = {}
+    for start in range(0, len(ids), chunk_size):
+        loaded.update(queryset.in_bulk(ids[start:start + chunk_size]))
+    return loaded
+
+
+def build_plan(live, cancelled, incremental, since, statuses=LIVE_STATUSES,
+               force=False, prune=True):
+    """Diff indexed calendar events against assignments.
+
+    Returns a list of ``{'assignment', 'assignment_id', 'ops', 'body'}``
+    entries, one per assignment that was looked at (``assignment`` is None
+    for orphaned events).
+    """
+    from app.api.services.calendar_service import sync_queryset
+
+    base = sync_queryset()
+    if incremental:
+        # Remote side: what changed on the calendar. Local side: what never
+        # reached it or failed to.
+        scope = base.filter(
+            Q(gcal_event_id__in=cancelled)
+            | Q(gcal_sync_status__in=('PENDING', 'FAILED'), start_time__gte=since,
+                status__in=tuple(statuses) + TERMINAL_STATUSES)
+        )
+    else:
+        scope = base.filter(start_time__gte=since).filter(
+            Q(status__in=statuses) | Q(gcal_event_id__gt='')
+        )
+    assignments = {a.pk: a for a in scope}
+    assignments.update(_load_assignments(base, set(live) - set(assignments)))
+
+    entries = []
+    for assignment_id in sorted(set(assignments) | set(live)):
+        assignment = assignments.get(assignment_id)
+        events = list(live.get(assignment_id, ()))
+        if assignment is None:
+            ops = [_op(ACTION_DELETE, assignment_id, e['id']) for e in events] if prune else []
+            if ops:
+                entries.append({'assignment': None, 'assignment_id': assignment_id,
+                                'ops': ops, 'body': None})
+            continue
+        stored = assignment.gcal_event_id
+        if incremental and stored and stored not in cancelled and all(e['id'] != stored for e in events):
+            events.append({'id': stored})
+        ops, body = plan_assignment(assignment, events, force=force)
+        if _needs_entry(assignment, ops):
+            entries.append({'assignment': assignment, 'assignment_id': assignment_id,
+                            'ops': ops, 'body': body})
+    return entries
+
+
+# ---------------------------------------------------------------------------
+# Applying
+# ---------------------------------------------------------------------------
+def _build_request(events, calendar_id, op):
+    if op['action'] == ACTION_CREATE:
+        return events.insert(calendarId=calendar_id, body=op['body'], sendUpdates='none')
+    if op['action'] == ACTION_UPDATE:
+        return events.update(calendarId=calendar_id, eventId=op['event_id'],
+                             body=op['body'], sendUpdates='none')
+    return events.delete(calendarId=calendar_id, eventId=op['event_id'], sendUpdates='none')
+
+
+def _run_batch(service, calendar_id, chunk):
+    """Send *chunk* as one batch request; returns ``[(response, exception)]`` in order."""
+    outcomes = {}
+
+    def collect(request_id, response, exception):
+        outcomes[request_id] = (response, exception)
+
+    batch = service.new_batch_http_request(callback=collect)
+    events = service.events()
+    for index, op in enumerate(chunk):
+        batch.add(_build_request(events, calendar_id, op), request_id=str(index))
+    try:
+        batch.execute()
+    except Exception as exc:
+        logger.warning('Google Calendar batch of %s failed: %s', len(chunk), exc)
+        return [(None, exc)] * len(chunk)
+    missing = RuntimeError('no response in batch')
+    return [outcomes.get(str(index), (None, missing)) for index in range(len(chunk))]
+
+
+def execute_ops(service, calendar_id, ops, limiter, batch_size=BATCH_LIMIT, max_rounds=MAX_ROUNDS):
+    """Apply *ops* in batches, marking each with ``ok`` and ``response``/``error``.
+
+    Rate-limited and transient failures are retried in later rounds; an
+    update whose event is gone becomes a create. Returns the number of
+    batch calls made.
+    """
+    batch_size = max(1, min(batch_size, BATCH_LIMIT))
+    pending = []
+    for op in ops:
+        if op['action'] == ACTION_LINK:
+            op['ok'] = True
+        else:
+            pending.append(op)
+
+    batches = 0
+    rounds = 0
+    while pending:
+        rounds += 1
+        retry = []
+        for start in range(0, len(pending), batch_size):
+            chunk = pending[start:start + batch_size]
+            limiter.wait(len(chunk))
+            batches += 1
+            throttled = False
+            for op, (response, exc) in zip(chunk, _run_batch(service, calendar_id, chunk)):
+                if exc is None:
+                    op['ok'], op['response'] = True, response or {}
+                    continue
+                status = _http_status(exc)
+                if op['action'] == ACTION_DELETE and status in (404, 410):
+                    op['ok'] = True
+                elif op['action'] == ACTION_UPDATE and status in (404, 410):
+                    op['action'], op['event_id'] = ACTION_CREATE, None
+                    retry.append(op)
+                elif _is_transient(exc) and rounds < max_rounds:
+                    throttled = throttled or _is_rate_limited(exc) or status is None
+                    retry.append(op)
+                else:
+                    op['ok'], op['error'] = False, str(exc)
+                    logger.error('Calendar %s for assignment #%s failed: %s',
+                                 op['action'], op['assignment_id'], exc)
+            if throttled:
+                limiter.throttled()
+            else:
+                limiter.success()
+        pending = retry
+    return batches
+
+
+def _finalize(entry, now):
+    """Set the gcal_* fields implied by an applied entry; True if they changed."""
+    assignment = entry['assignment']
+    ops = entry['ops']
+    current = (assignment.gcal_event_id, assignment.gcal_sync_status)
+
+    if assignment.status in TERMINAL_STATUSES:
+        if any(not op.get('ok') for op in ops):
+            wanted = (assignment.gcal_event_id, 'FAILED')
+        else:
+            wanted = (None, 'DELETED' if ops or assignment.gcal_event_id else 'SKIPPED')
+    else:
+        main = next((op for op in ops if op['action'] != ACTION_DELETE), None)
+        if main is None:
+            return False
+        if not main.get('ok'):
+            wanted = (assignment.gcal_event_id, 'FAILED')
+        else:
+            wanted = ((main.get('response') or {}).get('id') or main['event_id'], 'SYNCED')
+
+    if wanted == current:
+        return False
+    assignment.gcal_event_id, assignment.gcal_sync_status = wanted
+    if wanted[1] != 'FAILED':
+        assignment.gcal_synced_at = now
+    # bulk_update skips auto_now; ?changed_since feeds render the sync status
+    assignment.updated_at = now
+    return True
+
+
+def _record(entries):
+    """Persist entry outcomes in bulk and prime the sync dispatcher's fingerprints."""
+    from app.models import Assignment
+    from app.services.calendar_sync_dispatcher import body_fingerprint, remember_pushed
+
+    now = timezone.now()
+    changed, fingerprints = [], {}
+    for entry in entries:
+        if entry['assignment'] is None:
+            continue
+        if _finalize(entry, now):
+            changed.append(entry['assignment'])
+        if entry['body'] is not None and all(op.get('ok') for op in entry['ops']):
+            fingerprints[entry['assignment_id']] = body_fingerprint(entry['body'])
+    Assignment.objects.bulk_update(
+        changed, ['gcal_event_id', 'gcal_sync_status', 'gcal_synced_at', 'updated_at'], batch_size=500,
+    )
+    remember_pushed(fingerprints)
+    return len(changed)
+
+
+# ---------------------------------------------------------------------------
+# Entry point
+# ---------------------------------------------------------------------------
+def reconcile(service=None, calendar_id=None, since=None, statuses=LIVE_STATUSES,
+              full=False, force=False, prune=True, dry_run=False, limiter=None,
+              batch_size=BATCH_LIMIT):
+    """Bring the calendar in line with assignments; returns a stats dict.
+
+    Incremental unless *full* is set or no usable sync token is stored.
+    *since* bounds which unsynced assignments get created (default: 90 days
+    back); events already on the calendar are reconciled whatever their date.
+    *force* rewrites every event in scope, *prune* deletes events whose
+    assignment no longer exists, and *dry_run* plans without writing.
+    """
+    if service is None:
+        from app.services.google_calendar import _get_service
+        service, calendar_id = _get_service()
+        if service is None:
+            return {'ok': False, 'error': 'not_configured'}
+    limiter = limiter or AdaptiveRateLimiter()
+    since = since or timezone.now() - timedelta(days=DEFAULT_SCOPE_DAYS)
+
+    lock_key = LOCK_KEY.format(calendar_id)
+    if not dry_run and not cache.add(lock_key, 1, LOCK_SECONDS):
+        return {'ok': False, 'error': 'busy'}
+    try:
+        return _reconcile(service, calendar_id, since, statuses, full or force, force,
+                          prune, dry_run, limiter, batch_size)
+    finally:
+        if not dry_run:
+            cache.delete(lock_key)
+
+
+def _reconcile(service, calendar_id, since, statuses, full, force, prune, dry_run,
+               limiter, batch_size):
+    started = time.perf_counter()
+    token_key = SYNC_TOKEN_KEY.format(calendar_id)
+    token = None if full else cache.get(token_key)
+    try:
+        events, next_token = list_events(service, calendar_id, token, limiter)
+    except SyncTokenExpired:
+        logger.info('Calendar sync token expired — running a full reconciliation')
+        token = None
+        events, next_token = list_events(service, calendar_id, None, limiter)
+
+    live, cancelled = index_events(events)
+    entries = build_plan(live, cancelled, incremental=bool(token), since=since,
+                         statuses=statuses, force=force, prune=prune)
+    ops = [op for entry in entries for op in entry['ops']]
+
+    stats = {
+        'ok': True,
+        'mode': 'incremental' if token else 'full',
+        'listed': len(events),
+        'assignments': sum(1 for entry in entries if entry['assignment'] is not None),
+        'unchanged': sum(1 for entry in entries if entry['assignment'] is not None and not entry['ops']),
+        'batches': 0,
+        'failed': 0,
+    }
+    for action in (ACTION_CREATE, ACTION_UPDATE, ACTION_DELETE, ACTION_LINK):
+        stats[_stat_name(action)] = 0
+
+    if dry_run:
+        for op in ops:
+            stats[_stat_name(op['action'])] += 1
+        stats['dry_run'] = True
+        return stats
+
+    stats['batches'] = execute_ops(service, calendar_id, ops, limiter, batch_size)
+    for op in ops:
+        if op.get('ok'):
+            stats[_stat_name(op['action'])] += 1
+        else:
+            stats['failed'] += 1
+    stats['saved'] = _record(entries)
+    if next_token:
+        cache.set(token_key, next_token, None)
+    stats['elapsed'] = round(time.perf_counter() - started, 2)
+    logger.info('Calendar reconciliation: %s', stats)
+    return stats
+
+
+def _stat_name(action):
+    return action + 'd' if action.endswith('e') else action + 'ed'
@@ -0,0 +1,206 @@
+"""
+Single, debounced entry point for pushing assignments to Google Calendar.
+
+Every writer — the Assignment post_save signal, viewset actions, the Django
+admin and the FastAPI service (through the DRF ``sync-calendar`` action) —
+calls ``request_sync()``. Requests for the same assignment inside the
+debounce window collapse into one ``sync_assignment_to_calendar`` task on the
+calendar worker, which re-reads the assignment and pushes only its latest
+state. A fingerprint of the last event body Google accepted turns saves that
+change nothing on the calendar into no-ops.
+
+State lives in the default cache (Redis in production) so coalescing works
+across web and worker processes:
+    gcal-sync:pending:<id>   set while a flush is queued (``cache.add`` is the lock)
+    gcal-sync:pushed:<id>    fingerprint of the last pushed event body
+    gcal-sync:metrics:<name> counters reported by ``get_metrics()``
+
+When Celery is unreachable, flushes run on a single in-process worker thread
+instead of one thread per save, each waiting out the same debounce first.
+"""
+import hashlib
+import json
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.core.cache import cache
+
+logger = logging.getLogger(__name__)
+
+PENDING_KEY = 'gcal-sync:pending:{}'
+PUSHED_KEY = 'gcal-sync:pushed:{}'
+METRIC_KEY = 'gcal-sync:metrics:{}'
+METRICS = ('requested', 'coalesced', 'enqueued', 'pushed', 'noop', 'failed', 'depth')
+
+# A lost task must not block an assignment forever
+PENDING_GRACE_SECONDS = 300
+PUSHED_TTL = 60 * 60 * 24 * 30
+
+_local_executor = None
+_local_lock = threading.Lock()
+
+
+def is_configured():
+    """True when a calendar ID and service-account key are set."""
+    if not getattr(settings, 'GOOGLE_CALENDAR_ID', ''):
+        return False
+    return bool(
+        getattr(settings, 'GOOGLE_SERVICE_ACCOUNT_JSON_B64', '')
+        or getattr(settings, 'GOOGLE_SERVICE_ACCOUNT_JSON', '{}') not in ('', '{}')
+    )
+
+
+def _debounce_seconds():
+    return getattr(settings, 'GCAL_SYNC_DEBOUNCE_SECONDS', 5)
+
+
+def _incr(name, delta=1):
+    key = METRIC_KEY.format(name)
+    try:
+        cache.add(key, 0, None)
+        cache.incr(key, delta)
+    except Exception:
+        logger.debug("Calendar sync metric %s not recorded", name)
+
+
+# ---------------------------------------------------------------------------
+# Producer side
+# ---------------------------------------------------------------------------
+def request_sync(assignment_id, force=False):
+    """Queue a debounced calendar push for *assignment_id*.
+
+    Returns True if a new flush was scheduled, False if the request joined
+    one already pending (or the calendar is not configured). *force* drops
+    the pushed fingerprint so the next flush writes even if nothing changed.
+    """
+    if not is_configured():
+        return False
+    _incr('requested')
+    if force:
+        cache.delete(PUSHED_KEY.format(assignment_id))
+
+    debounce = _debounce_seconds()
+    if not cache.add(PENDING_KEY.format(assignment_id), 1, debounce + PENDING_GRACE_SECONDS):
+        _incr('coalesced')
+        return False
+
+    _incr('enqueued')
+    _incr('depth')
+    try:
+        from app.tasks_calendar import sync_assignment_to_calendar
+        sync_assignment_to_calendar.apply_async(args=[assignment_id], countdown=debounce)
+    except Exception:
+        logger.warning(
+            "Celery unavailable — running calendar sync for Assignment #%s on the local worker",
+            assignment_id,
+        )
+        _get_local_executor().submit(_run_local, assignment_id, time.monotonic() + debounce)
+    return True
+
+
+def _get_local_executor():
+    # One thread: the cached Google API client is not thread-safe
+    global _local_executor
+    with _local_lock:
+        if _local_executor is None:
+            _local_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='gcal-sync')
+        return _local_executor
+
+
+def _run_local(assignment_id, not_before=0.0):
+    # Deadlines are queued in order, so waiting here never delays later flushes
+    delay = not_before - time.monotonic()
+    if delay > 0:
+        time.sleep(delay)
+    from django.db import close_old_connections
+    close_old_connections()
+    try:
+        flush(assignment_id)
+    except Exception:
+        logger.exception("Local calendar sync crashed for Assignment #%s", assignment_id)
+    finally:
+        close_old_connections()
+
+
+# ---------------------------------------------------------------------------
+# Consumer side
+# ---------------------------------------------------------------------------
+def body_fingerprint(body):
+    """Content version of a Google Calendar event body."""
+    payload = json.dumps(body, sort_keys=True, default=str)
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+def event_fingerprint(assignment):
+    """Content version of the event Google would receive for *assignment*."""
+    from app.services.google_calendar import _build_event_body
+
+    return body_fingerprint(_build_event_body(assignment))
+
+
+def remember_pushed(fingerprints):
+    """Record ``{assignment_id: fingerprint}`` pushed by another writer (e.g. reconciliation)."""
+    if fingerprints:
+        cache.set_many(
+            {PUSHED_KEY.format(pk): value for pk, value in fingerprints.items()}, PUSHED_TTL,
+        )
+
+
+def _is_noop(assignment, fingerprint):
+    from app.models import Assignment
+
+    if assignment.status in (Assignment.Status.CANCELLED, Assignment.Status.NO_SHOW):
+        return not assignment.gcal_event_id and assignment.gcal_sync_status in (
+            Assignment.GCalSyncStatus.DELETED, Assignment.GCalSyncStatus.SKIPPED,
+        )
+    return (
+        bool(assignment.gcal_event_id)
+        and assignment.gcal_sync_status == Assignment.GCalSyncStatus.SYNCED
+        and cache.get(PUSHED_KEY.format(assignment.pk)) == fingerprint
+    )
+
+
+def flush(assignment_id):
+    """Push the latest state of one assignment; returns a calendar_service result dict."""
+    from app.api.services.calendar_service import load_assignment, sync_assignment
+    from app.models import Assignment
+
+    # Release the slot first: saves from here on schedule a fresh flush
+    if cache.delete(PENDING_KEY.format(assignment_id)):
+        try:
+            cache.decr(METRIC_KEY.format('depth'))
+        except ValueError:
+            pass
+
+    assignment = load_assignment(assignment_id)
+    if assignment is None:
+        return {'ok': False, 'error': 'not_found'}
+
+    terminal = assignment.status in (Assignment.Status.CANCELLED, Assignment.Status.NO_SHOW)
+    fingerprint = None if terminal else event_fingerprint(assignment)
+    if _is_noop(assignment, fingerprint):
+        _incr('noop')
+        return {'ok': True, 'skipped': True, 'reason': 'unchanged'}
+
+    result = sync_assignment(assignment_id, assignment=assignment)
+    if result.get('ok'):
+        _incr('pushed')
+        if fingerprint is not None:
+            cache.set(PUSHED_KEY.format(assignment_id), fingerprint, PUSHED_TTL)
+    else:
+        _incr('failed')
+    return result
+
+
+def get_metrics():
+    """Counters since the cache was last cleared, plus current queue depth."""
+    values = cache.get_many([METRIC_KEY.format(name) for name in METRICS])
+    metrics = {name: values.get(METRIC_KEY.format(name), 0) for name in METRICS}
+    metrics['depth'] = max(0, metrics['depth'])
+    executor = _local_executor
+    metrics['local_backlog'] = executor._work_queue.qsize() if executor is not None else 0
+    metrics['debounce_seconds'] = _debounce_seconds()
+    return metrics
@@ -27,8 +27,10 @@ Setup (one-time):
 
        GOOGLE_CALENDAR_ID=your.email@gmail.com
 
-All functions run in a background thread so they never block HTTP responses.
-Errors are caught and logged, never raised to the caller.
+This module owns the API client and the event body. Writes are requested via
+app.services.calendar_sync_dispatcher and performed by
+app.api.services.calendar_service on the calendar worker, so HTTP responses
+never wait on Google.
 """
 import base64
 import json
@@ -36,7 +38,6 @@ import logging
 import threading
 
 from django.conf import settings
-from django.utils import timezone
 
 from shared.constants import tz_for_state
 
@@ -54,6 +55,14 @@ _STATUS_COLOR = {
 
 _TERMINAL_STATUSES = {'CANCELLED', 'NO_SHOW'}
 
+# Assignment fields _build_event_body reads; saves touching none of them
+# leave the calendar event unchanged
+CALENDAR_EVENT_FIELDS = (
+    'status', 'start_time', 'end_time', 'service_type', 'source_language', 'target_language',
+    'client', 'client_name', 'client_email', 'client_phone', 'interpreter',
+    'location', 'city', 'state', 'zip_code', 'interpreter_rate', 'notes', 'special_requirements',
+)
+
 # HTTP timeout for Google API calls (seconds)
 _API_TIMEOUT = 10
 
@@ -250,183 +259,15 @@ def _build_event_body(assignment):
 
 
 # ---------------------------------------------------------------------------
-# Public API — called from signals via background thread
+# Public API
 # ---------------------------------------------------------------------------
 
 def schedule_sync(assignment_pk):
-    """Schedule a calendar sync in a background daemon thread.
+    """Request a debounced calendar sync for *assignment_pk* (non-blocking).
 
-    This is the main entry point called from signals. It:
-    - Returns immediately (non-blocking for the HTTP response)
-    - Runs the actual Google API call in a background thread
-    - Re-fetches the assignment from DB inside the thread (thread-safe ORM usage)
+    Kept for existing callers; all pushes go through the calendar sync
+    dispatcher, which coalesces repeated requests and runs them on the
+    calendar worker instead of spawning a thread per save.
     """
-    service, _ = _get_service()
-    if service is None:
-        return  # Calendar not configured — skip without spawning a thread
-
-    thread = threading.Thread(
-        target=_sync_worker,
-        args=(assignment_pk,),
-        daemon=True,
-        name=f"gcal-sync-{assignment_pk}",
-    )
-    thread.start()
-
-
-def _sync_worker(assignment_pk):
-    """Background worker: re-fetch assignment and sync to Google Calendar.
-
-    Runs in a daemon thread. All exceptions are caught — never crashes.
-    """
-    try:
-        from django.db import close_old_connections
-        close_old_connections()
-
-        from app.models import Assignment
-        assignment = (
-            Assignment.objects
-            .select_related(
-                'client', 'client__user',
-                'interpreter', 'interpreter__user',
-                'service_type', 'source_language', 'target_language',
-            )
-            .filter(pk=assignment_pk)
-            .first()
-        )
-
-        if assignment is None:
-            logger.warning("Calendar sync: Assignment #%s not found", assignment_pk)
-            return
-
-        # Validate required fields
-        if not assignment.start_time or not assignment.end_time:
-            logger.debug("Calendar sync skipped: Assignment #%s has no start/end time", assignment_pk)
-            _mark_sync_status(assignment, 'SKIPPED')
-            return
-
-        _do_sync(assignment)
-
-    except Exception:
-        logger.exception("Calendar sync thread crashed for Assignment #%s", assignment_pk)
-    finally:
-        try:
-            from django.db import close_old_connections
-            close_old_connections()
-        except Exception:
-            pass
-
-
-def _do_sync(assignment):
-    """Actual sync logic — create, update, or delete the calendar event."""
-    service, calendar_id = _get_service()
-    if service is None:
-        return
-
-    try:
-        if assignment.status in _TERMINAL_STATUSES:
-            _handle_terminal(service, calendar_id, assignment)
-        elif assignment.gcal_event_id:
-            _update_event(service, calendar_id, assignment)
-        else:
-            _create_event(service, calendar_id, assignment)
-    except Exception:
-        logger.exception("Calendar sync error for Assignment #%s", assignment.pk)
-        _mark_sync_status(assignment, 'FAILED')
-
-
-def _create_event(service, calendar_id, assignment):
-    body = _build_event_body(assignment)
-    event = service.events().insert(
-        calendarId=calendar_id,
-        body=body,
-        sendUpdates='none',
-    ).execute()
-
-    event_id = event.get('id', '')
-    logger.info("Created calendar event %s for Assignment #%s", event_id, assignment.pk)
-
-    from app.models import Assignment
-    Assignment.objects.filter(pk=assignment.pk).update(
-        gcal_event_id=event_id,
-        gcal_sync_status='SYNCED',
-        gcal_synced_at=timezone.now(),
-    )
-
-
-def _update_event(service, calendar_id, assignment):
-    body = _build_event_body(assignment)
-    try:
-        service.events().update(
-            calendarId=calendar_id,
-            eventId=assignment.gcal_event_id,
-            body=body,
-            sendUpdates='none',
-        ).execute()
-    except Exception as exc:
-        # If event was deleted from Google Calendar, re-create it
-        if _is_not_found(exc):
-            logger.info(
-                "Calendar event %s not found (deleted?), re-creating for Assignment #%s",
-                assignment.gcal_event_id, assignment.pk,
-            )
-            _create_event(service, calendar_id, assignment)
-            return
-        raise
-
-    logger.info("Updated calendar event %s for Assignment #%s", assignment.gcal_event_id, assignment.pk)
-
-    from app.models import Assignment
-    Assignment.objects.filter(pk=assignment.pk).update(
-        gcal_sync_status='SYNCED',
-        gcal_synced_at=timezone.now(),
-    )
-
-
-def _handle_terminal(service, calendar_id, assignment):
-    """Delete event for cancelled / no-show assignments."""
-    if assignment.gcal_event_id:
-        try:
-            service.events().delete(
-                calendarId=calendar_id,
-                eventId=assignment.gcal_event_id,
-                sendUpdates='none',
-            ).execute()
-            logger.info("Deleted calendar event %s for Assignment #%s", assignment.gcal_event_id, assignment.pk)
-        except Exception:
-            logger.warning("Could not delete calendar event %s — may already be deleted", assignment.gcal_event_id)
-
-        from app.models import Assignment
-        Assignment.objects.filter(pk=assignment.pk).update(
-            gcal_sync_status='DELETED',
-            gcal_synced_at=timezone.now(),
-        )
-    else:
-        from app.models import Assignment
-        Assignment.objects.filter(pk=assignment.pk).update(
-            gcal_sync_status='SKIPPED',
-        )
-
-
-def _mark_sync_status(assignment, status):
-    """Utility to mark sync status without triggering signals."""
-    try:
-        from app.models import Assignment
-        Assignment.objects.filter(pk=assignment.pk).update(
-            gcal_sync_status=status,
-        )
-    except Exception:
-        logger.exception("Failed to update gcal_sync_status for Assignment #%s", assignment.pk)
-
-
-def _is_not_found(exc):
-    """Check if a Google API exception is a 404 Not Found."""
-    try:
-        from googleapiclient.errors import HttpError
-        return isinstance(exc, HttpError) and exc.resp.status == 404
-    except ImportError:
-        return False
-
-
-# Keep backward compat — old name still works if called directly
-sync_assignment_to_calendar = _do_sync
+    from app.services.calendar_sync_dispatcher import request_sync
+    request_sync(assignment_pk)
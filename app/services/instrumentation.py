@@ -0,0 +1,89 @@
+"""
+Django hooks for the request instrumentation of shared/instrumentation.py.
+
+``install()`` (called once by RequestInstrumentationMiddleware) applies the
+INSTRUMENTATION_* settings, times outbound HTTP (Google API clients, Resend,
+calls to the FastAPI service) and counts hits and misses of every configured
+cache backend. ``capture_queries()`` times the SQL of one request through
+``connection.execute_wrapper`` on each database alias.
+"""
+import functools
+import time
+from contextlib import ExitStack, contextmanager
+from urllib.parse import urlsplit
+
+from django.conf import settings
+from django.core.cache import caches
+from django.core.cache.backends.base import BaseCache
+from django.db import connections
+
+from shared import instrumentation
+
+_MISSING = object()
+
+
+def _query_wrapper(execute, sql, params, many, context):
+    started = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        instrumentation.record_query(time.perf_counter() - started, sql)
+
+
+@contextmanager
+def capture_queries():
+    """Record every SQL statement run inside the block, on all database aliases."""
+    with ExitStack() as stack:
+        for connection in connections.all():
+            stack.enter_context(connection.execute_wrapper(_query_wrapper))
+        yield
+
+
+def _instrument_cache_class(cls):
+    if cls.__dict__.get('_instrumented'):
+        return
+    original_get = cls.get
+    original_get_many = cls.get_many
+
+    @functools.wraps(original_get)
+    def get(self, key, default=None, version=None):
+        value = original_get(self, key, _MISSING, version=version)
+        hit = value is not _MISSING
+        instrumentation.record_cache(hit)
+        return value if hit else default
+
+    @functools.wraps(original_get_many)
+    def get_many(self, keys, version=None):
+        keys = list(keys)
+        found = original_get_many(self, keys, version=version)
+        instrumentation.record_cache(True, len(found))
+        instrumentation.record_cache(False, len(keys) - len(found))
+        return found
+
+    cls.get = get
+    # BaseCache.get_many goes through get(): only native implementations count here
+    if original_get_many is not BaseCache.get_many:
+        cls.get_many = get_many
+    cls._instrumented = True
+
+
+def instrument_caches():
+    """Count hits and misses on the backend class of every configured cache."""
+    for alias in settings.CACHES:
+        _instrument_cache_class(type(caches[alias]))
+
+
+def install():
+    targets = {}
+    fastapi_host = urlsplit(settings.FASTAPI_BASE_URL).hostname
+    if fastapi_host:
+        targets[fastapi_host.lower()] = 'fastapi'
+    instrumentation.configure(
+        slow_request_ms=settings.INSTRUMENTATION_SLOW_REQUEST_MS,
+        slow_query_ms=settings.INSTRUMENTATION_SLOW_QUERY_MS,
+        profile_sample_rate=settings.INSTRUMENTATION_PROFILE_SAMPLE_RATE,
+        profile_dir=settings.INSTRUMENTATION_PROFILE_DIR,
+        targets=targets,
+    )
+    instrumentation.install_http_hooks()
+    instrument_caches()
@@ -0,0 +1,176 @@
+"""
+Maintenance of ``InterpreterStats`` — one denormalised performance row per
+interpreter, read by the interpreter list/detail/performance endpoints, the
+matching service and the FastAPI agent tools instead of aggregating over
+assignment history on every request.
+
+Rows are refreshed per interpreter, never adjusted by deltas: ``refresh(ids)``
+recomputes the touched interpreters from the source tables with three grouped
+aggregate queries (assignments, feedback, payments) however many ids it gets,
+then upserts the rows in one statement. The receivers in app.signals collect
+the affected interpreter ids and refresh them once per transaction, after
+commit.
+
+Writes that bypass signals (``QuerySet.update``, raw SQL) are caught by the
+nightly ``rebuild()`` — ``rebuild_interpreter_stats`` task or
+``python manage.py rebuild_interpreter_stats``.
+"""
+import logging
+from decimal import Decimal
+
+from django.apps import apps as global_apps
+from django.db import DEFAULT_DB_ALIAS, transaction
+from django.db.models import Avg, Count, Max, Q, Sum
+
+from app.utils.transactions import batch_on_commit
+from app.utils.upsert import bulk_upsert
+
+logger = logging.getLogger(__name__)
+
+ACCEPTED = ('CONFIRMED', 'COMPLETED')
+
+STAT_FIELDS = (
+    'missions_completed', 'missions_accepted', 'missions_cancelled', 'missions_no_show',
+    'acceptance_rate', 'no_show_rate', 'avg_rating', 'ratings_count',
+    'total_earned', 'last_mission_date',
+)
+
+
+def _rate(part, whole):
+    return round(part / whole * 100, 1) if whole else 0
+
+
+def compute(interpreter_ids, using=DEFAULT_DB_ALIAS, apps=global_apps):
+    """``{interpreter id: {field: value}}`` for *interpreter_ids*, from the source tables.
+
+    *apps* lets migrations pass their historical app registry.
+    """
+    Assignment = apps.get_model('app', 'Assignment')
+    AssignmentFeedback = apps.get_model('app', 'AssignmentFeedback')
+    InterpreterPayment = apps.get_model('app', 'InterpreterPayment')
+
+    ids = list(interpreter_ids)
+    stats = {
+        pk: {
+            'missions_completed': 0, 'missions_accepted': 0, 'missions_cancelled': 0,
+            'missions_no_show': 0, 'avg_rating': None, 'ratings_count': 0,
+            'total_earned': Decimal('0'), 'last_mission_date': None,
+        }
+        for pk in ids
+    }
+    if not ids:
+        return stats
+
+    assignments = (
+        Assignment.objects.using(using)
+        .filter(interpreter_id__in=ids)
+        .values('interpreter_id')
+        .annotate(
+            completed=Count('pk', filter=Q(status='COMPLETED')),
+            accepted=Count('pk', filter=Q(status__in=ACCEPTED)),
+            cancelled=Count('pk', filter=Q(status='CANCELLED')),
+            no_show=Count('pk', filter=Q(status='NO_SHOW')),
+            last_mission=Max('start_time', filter=Q(status='COMPLETED')),
+        )
+        .order_by()
+    )
+    for row in assignments:
+        stats[row['interpreter_id']].update(
+            missions_completed=row['completed'], missions_accepted=row['accepted'],
+            missions_cancelled=row['cancelled'], missions_no_show=row['no_show'],
+            last_mission_date=row['last_mission'],
+        )
+
+    ratings = (
+        AssignmentFeedback.objects.using(using)
+        .filter(assignment__interpreter_id__in=ids)
+        .values('assignment__interpreter_id')
+        .annotate(avg=Avg('rating'), count=Count('pk'))
+        .order_by()
+    )
+    for row in ratings:
+        stats[row['assignment__interpreter_id']].update(
+            avg_rating=round(row['avg'], 2) if row['avg'] is not None else None,
+            ratings_count=row['count'],
+        )
+
+    earnings = (
+        InterpreterPayment.objects.using(using)
+        .filter(interpreter_id__in=ids, status='COMPLETED')
+        .values('interpreter_id')
+        .annotate(total=Sum('amount'))
+        .order_by()
+    )
+    for row in earnings:
+        stats[row['interpreter_id']]['total_earned'] = row['total'] or Decimal('0')
+
+    for values in stats.values():
+        values['acceptance_rate'] = _rate(
+            values['missions_accepted'], values['missions_accepted'] + values['missions_cancelled'],
+        )
+        values['no_show_rate'] = _rate(
+            values['missions_no_show'], values['missions_completed'] + values['missions_no_show'],
+        )
+    return stats
+
+
+def refresh(interpreter_ids, using=DEFAULT_DB_ALIAS, apps=global_apps):
+    """Recompute and upsert the stats rows of *interpreter_ids*. Returns the count."""
+    Interpreter = apps.get_model('app', 'Interpreter')
+    InterpreterStats = apps.get_model('app', 'InterpreterStats')
+
+    ids = {pk for pk in interpreter_ids if pk is not None}
+    if not ids:
+        return 0
+    # Interpreters deleted meanwhile have no row to write
+    ids = set(Interpreter.objects.using(using).filter(pk__in=ids).values_list('pk', flat=True))
+    rows = [
+        InterpreterStats(interpreter_id=pk, **values)
+        for pk, values in compute(ids, using=using, apps=apps).items()
+    ]
+    bulk_upsert(
+        InterpreterStats.objects.using(using), rows,
+        unique_fields=['interpreter'], update_fields=[*STAT_FIELDS, 'updated_at'],
+    )
+    return len(rows)
+
+
+def rebuild(batch_size=500, using=DEFAULT_DB_ALIAS, apps=global_apps):
+    """Recompute every interpreter's row (nightly consistency pass). Returns the count."""
+    Interpreter = apps.get_model('app', 'Interpreter')
+
+    ids = list(Interpreter.objects.using(using).order_by('pk').values_list('pk', flat=True))
+    done = 0
+    for start in range(0, len(ids), batch_size):
+        done += refresh(ids[start:start + batch_size], using=using, apps=apps)
+    return done
+
+
+# ---------------------------------------------------------------------------
+# Per-transaction batching
+# ---------------------------------------------------------------------------
+class _PendingRefresh:
+    def __init__(self, using):
+        self.using = using
+        self.ids = set()
+
+    def flush(self):
+        try:
+            refresh(self.ids, using=self.using)
+        except Exception:
+            logger.exception("Interpreter stats refresh failed for %s", sorted(self.ids))
+
+
+def schedule_refresh(interpreter_ids, using=DEFAULT_DB_ALIAS):
+    """Refresh *interpreter_ids* once the current transaction commits (now if none)."""
+    ids = {pk for pk in interpreter_ids if pk is not None}
+    if not ids:
+        return
+    if not transaction.get_connection(using).in_atomic_block:
+        pending = _PendingRefresh(using)
+        pending.ids = ids
+        pending.flush()
+        return
+    pending = batch_on_commit('interpreter_stats', lambda: _PendingRefresh(using), using=using)
+    pending.ids |= ids
+
@@ -0,0 +1,148 @@
+"""
+Registry of hot query predicates and their EXPLAIN plans.
+
+Each ``HotQuery`` rebuilds, as a Django queryset, the filter one dashboard,
+viewset or agent tool runs on every request. ``adk.*`` entries mirror the
+SQLAlchemy statements in services/db/queries.py (same table, same
+predicates), since those only run on the FastAPI side.
+
+``profile()`` runs ``EXPLAIN`` on each one and reports the tables the
+database reads in full: SQLite ``SCAN <table>`` (also when it walks a whole
+index for the ordering), PostgreSQL ``Seq Scan``, MySQL ``access_type: ALL``.
+The indexes added in migration 0047 come from that report;
+``python manage.py profile_queries`` prints it.
+
+On SQLite, Django writes ``filter(active=True)`` as a bare ``WHERE active``,
+which SQLite cannot match to an index, so the indexes that start with a
+boolean column still show a scan there. MySQL compares ``active = 1`` and
+PostgreSQL indexes bare booleans, so both use the composite indexes.
+"""
+import json
+import re
+from dataclasses import dataclass
+from datetime import timedelta
+from typing import Callable
+
+from django.db import connections
+from django.utils import timezone
+
+from app.models import (
+    Assignment, ClientPayment, EmailLog, Expense, Interpreter, InterpreterPayment, Invoice, QuoteRequest,
+)
+from app.utils.timezone import day_bounds
+
+OPEN_STATUSES = ('PENDING', 'CONFIRMED', 'IN_PROGRESS')
+
+
+@dataclass(frozen=True)
+class HotQuery:
+    name: str
+    source: str
+    build: Callable
+
+
+def _today():
+    return day_bounds(timezone.localdate())
+
+
+def _month_start():
+    return timezone.now().replace(day=1, hour=0, minute=0, second=0, microsecond=0)
+
+
+HOT_QUERIES = (
+    # Dashboard KPIs / alerts / today
+    HotQuery('active_assignments', 'dashboard.kpis',
+             lambda: Assignment.objects.filter(status__in=OPEN_STATUSES).order_by()),
+    HotQuery('assignment_decisions_30d', 'dashboard.kpis',
+             lambda: Assignment.objects.filter(
+                 status='CONFIRMED', created_at__gte=timezone.now() - timedelta(days=30)).order_by()),
+    HotQuery('available_interpreters', 'dashboard.kpis',
+             lambda: Interpreter.objects.filter(active=True, is_manually_blocked=False)),
+    HotQuery('pending_quote_requests', 'dashboard.kpis',
+             lambda: QuoteRequest.objects.filter(status='PENDING')),
+    HotQuery('mtd_revenue', 'dashboard.kpis',
+             lambda: ClientPayment.objects.filter(status='COMPLETED', payment_date__gte=_month_start())),
+    HotQuery('mtd_expenses', 'dashboard.kpis',
+             lambda: Expense.objects.filter(
+                 status__in=['APPROVED', 'PAID'], date_incurred__gte=_month_start())),
+    HotQuery('unresolved_emails', 'dashboard.kpis',
+             lambda: EmailLog.objects.filter(is_processed=False)),
+    HotQuery('unassigned_assignments', 'dashboard.alerts',
+             lambda: Assignment.objects.filter(status='PENDING', interpreter__isnull=True)
+             .order_by('start_time')),
+    HotQuery('overdue_invoices', 'dashboard.alerts',
+             lambda: Invoice.objects.filter(status='SENT', due_date__lt=timezone.localdate())
+             .order_by('due_date')),
+    HotQuery('pending_interpreter_payments', 'dashboard.alerts',
+             lambda: InterpreterPayment.objects.filter(status='PENDING').order_by('scheduled_date')),
+    HotQuery('today_missions', 'dashboard.today_missions',
+             lambda: Assignment.objects.filter(
+                 start_time__gte=_today()[0], start_time__lt=_today()[1]).order_by('start_time')),
+    # Viewsets
+    HotQuery('client_completed_missions', 'clients.list',
+             lambda: Assignment.objects.filter(client_id=1, status='COMPLETED').order_by()),
+    HotQuery('interpreters_in_state', 'interpreters.available',
+             lambda: Interpreter.objects.filter(active=True, is_manually_blocked=False, state='MA')),
+    HotQuery('busy_interpreters', 'interpreters.available',
+             lambda: Assignment.objects.filter(
+                 status__in=['CONFIRMED', 'IN_PROGRESS'],
+                 start_time__gte=_today()[0], start_time__lt=_today()[1],
+             ).order_by().values('interpreter_id')),
+    HotQuery('emails_by_category', 'emails.list',
+             lambda: EmailLog.objects.filter(category='QUOTE').order_by('-received_at', '-id')),
+    # FastAPI agent tools (services/db/queries.py)
+    HotQuery('unprocessed_emails', 'adk.get_unprocessed_emails',
+             lambda: EmailLog.objects.filter(is_processed=False).order_by('-received_at')),
+    HotQuery('unclassified_emails', 'adk.get_unclassified_emails',
+             lambda: EmailLog.objects.filter(category__isnull=True).order_by('-received_at')),
+    HotQuery('assignments_today', 'adk.get_active_assignments_today',
+             lambda: Assignment.objects.filter(
+                 status__in=OPEN_STATUSES,
+                 start_time__gte=_today()[0], start_time__lte=_today()[1],
+             ).order_by('start_time')),
+    HotQuery('pending_requests', 'adk.get_pending_quote_requests',
+             lambda: QuoteRequest.objects.filter(status='PENDING').order_by('-created_at')),
+)
+
+
+_SQLITE_SCAN = re.compile(r'\bSCAN (?:TABLE )?(?!CONSTANT ROW)(\w+)')
+_POSTGRES_SCAN = re.compile(r'Seq Scan on (\w+)')
+
+
+def _mysql_scans(node, found):
+    if isinstance(node, dict):
+        if node.get('access_type') == 'ALL' and node.get('table_name'):
+            found.append(node['table_name'])
+        for value in node.values():
+            _mysql_scans(value, found)
+    elif isinstance(node, list):
+        for value in node:
+            _mysql_scans(value, found)
+    return found
+
+
+def explain(queryset):
+    """``(plan text, [tables read with a full scan])`` for *queryset*."""
+    vendor = connections[queryset.db].vendor
+    if vendor == 'mysql':
+        plan = queryset.explain(format='JSON')
+        return plan, sorted(set(_mysql_scans(json.loads(plan), [])))
+    plan = queryset.explain()
+    pattern = _POSTGRES_SCAN if vendor == 'postgresql' else _SQLITE_SCAN
+    return plan, sorted({match.group(1) for line in plan.splitlines() for match in pattern.finditer(line)})
+
+
+def profile(queries=HOT_QUERIES):
+    """One ``{'name', 'source', 'table', 'plan', 'full_scans'}`` dict per registered query."""
+    report = []
+    for query in queries:
+        queryset = query.build()
+        plan, scans = explain(queryset)
+        report.append({
+            'name': query.name,
+            'source': query.source,
+            'table': queryset.model._meta.db_table,
+            'plan': plan,
+            'full_scans': scans,
+        })
+    return report
@@ -0,0 +1,139 @@
+"""
+Cache-backed sliding-window rate limiting and lockouts.
+
+Each limiter counts hits per identity (an email, an IP, a user id) in two
+fixed buckets of ``window`` seconds and weights the previous bucket by how
+much of it still overlaps the sliding window:
+
+    estimate = previous * (1 - elapsed / window) + current
+
+which is within a few percent of an exact sliding log at the cost of two
+integers per identity. Reaching ``limit`` writes a lock key that expires on
+its own after ``lockout`` seconds, so checking a lockout is a single cache
+read — no database query, whatever the attack volume.
+
+Counters live in the default cache (Redis in production), so every web
+process shares them; ``cache.incr`` is an atomic INCR there, which makes
+``hit()`` a check-and-increment without a read-modify-write race:
+
+    ratelimit:<scope>:<bucket>:<identity hash>   hits in one window bucket
+    ratelimit:<scope>:lock:<identity hash>       epoch seconds the lock ends
+
+Identities are hashed so keys stay short and emails are not stored in the
+cache in clear.
+"""
+import hashlib
+import logging
+import math
+import time
+
+from django.core.cache import cache
+
+logger = logging.getLogger(__name__)
+
+BUCKET_KEY = 'ratelimit:{}:{}:{}'
+LOCK_KEY = 'ratelimit:{}:lock:{}'
+
+
+def _digest(identity):
+    return hashlib.sha256(str(identity).strip().lower().encode('utf-8')).hexdigest()[:32]
+
+
+class SlidingWindowLimiter:
+    """At most *limit* hits per *window* seconds, then a *lockout* second lock."""
+
+    def __init__(self, scope, limit, window, lockout=None, clock=time.time):
+        self.scope = scope
+        self.limit = limit
+        self.window = int(window)
+        self.lockout = int(lockout if lockout is not None else window)
+        self.clock = clock
+
+    def __repr__(self):
+        return f'<SlidingWindowLimiter {self.scope} {self.limit}/{self.window}s>'
+
+    def lock_key(self, identity):
+        return LOCK_KEY.format(self.scope, _digest(identity))
+
+    def _bucket_keys(self, identity, now):
+        digest = _digest(identity)
+        bucket = int(now // self.window)
+        return (BUCKET_KEY.format(self.scope, bucket, digest),
+                BUCKET_KEY.format(self.scope, bucket - 1, digest))
+
+    def _estimate(self, current, previous, now):
+        overlap = 1 - (now % self.window) / self.window
+        return previous * overlap + current
+
+    def _incr(self, key):
+        # A bucket outlives its own window so it can serve as "previous"
+        try:
+            cache.add(key, 0, self.window * 2)
+            return cache.incr(key)
+        except ValueError:
+            # Expired between add and incr
+            cache.add(key, 0, self.window * 2)
+            return cache.incr(key)
+
+    def hit(self, identity):
+        """Count one hit. Returns ``(locked, remaining)``.
+
+        Crossing the limit starts the lockout; hits while locked still count,
+        so a lock that expires mid-burst is renewed by the next hit.
+        """
+        if not identity:
+            return False, self.limit
+        now = self.clock()
+        current_key, previous_key = self._bucket_keys(identity, now)
+        try:
+            current = self._incr(current_key)
+            previous = cache.get(previous_key) or 0
+        except Exception:
+            logger.warning("Rate limiter %s unavailable; hit not counted", self.scope)
+            return False, self.limit
+
+        estimate = self._estimate(current, previous, now)
+        if estimate >= self.limit:
+            cache.add(self.lock_key(identity), now + self.lockout, self.lockout)
+            return True, 0
+        return False, max(0, self.limit - math.ceil(estimate))
+
+    def attempts(self, identity):
+        """Current sliding-window estimate for *identity* (rounded up)."""
+        now = self.clock()
+        current_key, previous_key = self._bucket_keys(identity, now)
+        values = cache.get_many([current_key, previous_key])
+        return math.ceil(self._estimate(values.get(current_key, 0), values.get(previous_key, 0), now))
+
+    def retry_after(self, identity):
+        """Seconds left on *identity*'s lock, 0 when not locked."""
+        return retry_after((self, identity))
+
+    def is_locked(self, identity):
+        return self.retry_after(identity) > 0
+
+    def reset(self, identity):
+        """Forget *identity*'s hits and lock (e.g. after a successful login)."""
+        if not identity:
+            return
+        now = self.clock()
+        cache.delete_many([*self._bucket_keys(identity, now), self.lock_key(identity)])
+
+
+def retry_after(*checks):
+    """Longest remaining lock over ``(limiter, identity)`` pairs, in one cache read."""
+    keys = {
+        limiter.lock_key(identity): limiter
+        for limiter, identity in checks if identity
+    }
+    if not keys:
+        return 0
+    try:
+        locks = cache.get_many(list(keys))
+    except Exception:
+        logger.warning("Rate limiter unavailable; lockouts not enforced")
+        return 0
+    remaining = 0
+    for key, until in locks.items():
+        remaining = max(remaining, math.ceil(until - keys[key].clock()))
+    return remaining
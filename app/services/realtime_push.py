@@ -0,0 +1,128 @@
+"""
+Push events from Django to the FastAPI WebSocket layer.
+
+Events are published as plain JSON on the Redis channels the FastAPI
+workers listen to (shared.constants REALTIME_REDIS_CHANNELS); every worker
+forwards them to its own sockets. A top-level ``recipient_id`` addresses an
+event to one user, so a new ``Notification`` row reaches its recipient's
+open tabs instead of waiting for the next poll. Created and status-changed
+assignments are published on ``assignment-updates`` after their transaction
+commits, for the kanban sockets.
+
+Events on the replayable channels (assignment and email updates) are first
+appended to the channel's bounded Redis Stream, whose entry id becomes the
+event's ``event_id``, so clients reconnecting with ``?since=`` can replay
+them (services/realtime/event_log.py).
+
+Publishing is best effort: without REALTIME_REDIS_URL, or when Redis is
+down, events are dropped and clients fall back to polling.
+"""
+import json
+import logging
+
+from django.conf import settings
+from django.db import transaction
+
+from shared.constants import (
+    REALTIME_REDIS_CHANNELS, REALTIME_REPLAYABLE_CHANNELS, REALTIME_STREAM_KEY,
+)
+
+logger = logging.getLogger(__name__)
+
+_client = None
+
+
+def _redis():
+    global _client
+    if _client is None:
+        import redis
+        _client = redis.Redis.from_url(
+            settings.REALTIME_REDIS_URL, decode_responses=True,
+            socket_connect_timeout=1, socket_timeout=1,
+        )
+    return _client
+
+
+def publish(channel, event):
+    """Publish *event* to the WebSocket *channel*. Returns False if not sent."""
+    if not getattr(settings, 'REALTIME_REDIS_URL', ''):
+        return False
+    try:
+        client = _redis()
+        if channel in REALTIME_REPLAYABLE_CHANNELS:
+            event_id = client.xadd(
+                REALTIME_STREAM_KEY.format(channel), {'event': json.dumps(event, default=str)},
+                maxlen=settings.REALTIME_STREAM_MAXLEN, approximate=True,
+            )
+            event = {**event, 'event_id': event_id}
+        client.publish(REALTIME_REDIS_CHANNELS[channel], json.dumps(event, default=str))
+    except Exception as exc:
+        logger.warning("Realtime publish on %s failed: %s", channel, exc)
+        return False
+    return True
+
+
+def notification_event(notification):
+    return {
+        'type': 'NOTIFICATION',
+        'recipient_id': str(notification.recipient_id),
+        'payload': {
+            'id': notification.pk,
+            'type': notification.type,
+            'title': notification.title,
+            'content': notification.content,
+            'link': notification.link,
+            'read': notification.read,
+            'created_at': notification.created_at.isoformat() if notification.created_at else None,
+        },
+    }
+
+
+def push_notification(notification):
+    """Send a Notification to its recipient's sockets once the row is committed."""
+    event = notification_event(notification)
+    transaction.on_commit(lambda: publish('notifications', event))
+
+
+# Status-specific event types (services/realtime/events.py EventType)
+ASSIGNMENT_STATUS_EVENTS = {
+    'CONFIRMED': 'ASSIGNMENT_CONFIRMED',
+    'CANCELLED': 'ASSIGNMENT_CANCELLED',
+    'COMPLETED': 'ASSIGNMENT_COMPLETED',
+}
+
+
+def assignment_event(change, status, interpreter_id):
+    if change.created:
+        event_type = 'ASSIGNMENT_CREATED'
+    else:
+        event_type = ASSIGNMENT_STATUS_EVENTS.get(status, 'ASSIGNMENT_STATUS_CHANGED')
+    return {
+        'type': event_type,
+        'payload': {
+            'id': change.assignment_id,
+            'assignment_id': change.assignment_id,
+            'interpreter_id': interpreter_id,
+            'status': status,
+            'previous_status': change.changes['status'][0] if change.changed('status') else None,
+        },
+    }
+
+
+def push_assignment_changes(changes):
+    """Publish one ``assignment-updates`` event per committed change.
+
+    Rows are re-read, as the change may come from a rolled-back savepoint;
+    assignments deleted since are skipped.
+    """
+    if not getattr(settings, 'REALTIME_REDIS_URL', ''):
+        return
+    from app.models import Assignment
+
+    current = Assignment.objects.filter(
+        pk__in=[change.assignment_id for change in changes],
+    ).values_list('pk', 'status', 'interpreter_id')
+    rows = {pk: (status, interpreter_id) for pk, status, interpreter_id in current}
+    for change in changes:
+        if change.assignment_id in rows:
+            publish('assignment-updates', assignment_event(change, *rows[change.assignment_id]))
@@ -0,0 +1,214 @@
+"""
+Process-wide registry of the reference data: languages, service types and
+the state -> timezone table.
+
+Language and ServiceType rows change a few times a year, yet their names are
+read on nearly every request (serializers, dashboards, interpreter
+matching). Each process keeps one snapshot of both tables and resolves names
+and ids from it instead of joining or lazy-loading the rows. Snapshots are
+shared through the default cache (Redis in production) under a version:
+
+    reference-data:version      bumped on any Language / ServiceType change
+    reference-data:<version>    the rows of both tables
+
+A process compares its snapshot with the shared version at most every
+VERSION_CHECK_SECONDS and reloads it when they differ. The receivers in
+app.signals bump the version when a row is saved (admin included) and again
+when the transaction commits, as for app.services.auth_state. The FastAPI
+service follows the same version (services/db/reference.py).
+
+An id missing from the snapshot (a row created by another process within
+the check interval) triggers one reload, at most every MISS_RELOAD_SECONDS.
+A snapshot older than MAX_AGE_SECONDS is reread from the tables, and the
+version bumped if they changed, in case a bump was lost with the cache.
+
+State lookups are the prebuilt tzinfo table of app.utils.timezone.
+"""
+import logging
+import time
+from typing import NamedTuple
+
+from django.core.cache import cache
+from django.db import transaction
+
+from app.utils.timezone import get_timezone_for_state
+from shared.constants import REFERENCE_DATA_VERSION_KEY
+
+logger = logging.getLogger(__name__)
+
+VERSION_KEY = REFERENCE_DATA_VERSION_KEY
+DATA_KEY = 'reference-data:{}'
+
+DATA_TTL = 60 * 60 * 24
+VERSION_CHECK_SECONDS = 5
+# Bounds staleness if the shared cache loses the version key
+MAX_AGE_SECONDS = 60 * 10
+# A snapshot younger than this is not reloaded for an unknown id
+MISS_RELOAD_SECONDS = 1
+
+
+class LanguageRef(NamedTuple):
+    id: int
+    name: str
+    code: str
+    is_active: bool
+
+
+class ServiceTypeRef(NamedTuple):
+    id: int
+    name: str
+    active: bool
+
+
+class Registry:
+    """One snapshot of the reference tables; lookups never query."""
+
+    def __init__(self, version, languages, service_types):
+        self.version = version
+        # languages arrive in Language.Meta.ordering (name) order
+        self.languages = {ref.id: ref for ref in languages}
+        self.service_types = {ref.id: ref for ref in service_types}
+        self.language_ids = {ref.name.lower(): ref.id for ref in languages}
+        self.service_type_ids = {ref.name.lower(): ref.id for ref in service_types}
+        self.language_rank = {ref.id: rank for rank, ref in enumerate(languages)}
+        self.loaded_at = self.checked_at = time.monotonic()
+
+
+_registry = None
+
+
+# ---------------------------------------------------------------------------
+# Versions
+# ---------------------------------------------------------------------------
+def get_version():
+    return cache.get(VERSION_KEY)
+
+
+def bump_version():
+    """Make every process reload its snapshot."""
+    try:
+        cache.add(VERSION_KEY, 0, None)
+        cache.incr(VERSION_KEY)
+    except Exception:
+        logger.warning("Reference data could not be invalidated")
+
+
+def _drop_and_bump():
+    global _registry
+    _registry = None
+    bump_version()
+
+
+def invalidate():
+    """Drop this process's snapshot and bump now, and again once the transaction commits."""
+    _drop_and_bump()
+    transaction.on_commit(_drop_and_bump)
+
+
+# ---------------------------------------------------------------------------
+# Snapshot
+# ---------------------------------------------------------------------------
+def _load(version, refresh=False):
+    key = DATA_KEY.format(version)
+    rows = None if refresh else cache.get(key)
+    if rows is None:
+        from app.models import Language, ServiceType
+        rows = (
+            list(Language.objects.values_list('id', 'name', 'code', 'is_active')),
+            list(ServiceType.objects.order_by('name', 'pk').values_list('id', 'name', 'active')),
+        )
+        cache.set(key, rows, DATA_TTL)
+    languages, service_types = rows
+    return Registry(
+        version,
+        [LanguageRef(*row) for row in languages],
+        [ServiceTypeRef(*row) for row in service_types],
+    )
+
+
+def get_registry():
+    """The current snapshot, revalidated against the shared version every few seconds."""
+    global _registry
+    registry = _registry
+    now = time.monotonic()
+    if registry is not None and now - registry.checked_at < VERSION_CHECK_SECONDS:
+        return registry
+
+    version = get_version()
+    if registry is not None and version is None:
+        # The shared cache lost the key (flush, eviction): publish ours
+        cache.add(VERSION_KEY, registry.version, None)
+        version = registry.version
+    if registry is not None and version == registry.version:
+        if now - registry.loaded_at < MAX_AGE_SECONDS:
+            registry.checked_at = now
+            return registry
+        # The shared rows under this version may be as old as ours: reread
+        # the tables, and make every process follow if they moved on
+        _registry = _load(version, refresh=True)
+        if (_registry.languages, _registry.service_types) != (registry.languages, registry.service_types):
+            bump_version()
+            _registry = _load(get_version() or 0)
+        return _registry
+
+    _registry = _load(version or 0)
+    return _registry
+
+
+def _find(table, key):
+    registry = get_registry()
+    found = getattr(registry, table).get(key)
+    if found is None and key is not None and time.monotonic() - registry.loaded_at >= MISS_RELOAD_SECONDS:
+        found = getattr(_reload(), table).get(key)
+    return found
+
+
+def _reload():
+    global _registry
+    version = get_version() or 0
+    # Same version: the shared rows are the ones that missed, read the tables
+    _registry = _load(version, refresh=_registry is not None and version == _registry.version)
+    return _registry
+
+
+# ---------------------------------------------------------------------------
+# Lookups
+# ---------------------------------------------------------------------------
+def language(language_id):
+    """``LanguageRef`` of *language_id*, or None."""
+    return _find('languages', language_id)
+
+
+def language_name(language_id):
+    ref = language(language_id)
+    return ref.name if ref else ''
+
+
+def language_id(name):
+    """Id of the language called *name* (case-insensitive), or None."""
+    return _find('language_ids', (name or '').strip().lower() or None)
+
+
+def language_sort_key(language_id):
+    """Position of *language_id* in language name order (unknown ids last)."""
+    return get_registry().language_rank.get(language_id, float('inf'))
+
+
+def service_type(service_type_id):
+    """``ServiceTypeRef`` of *service_type_id*, or None."""
+    return _find('service_types', service_type_id)
+
+
+def service_type_name(service_type_id):
+    ref = service_type(service_type_id)
+    return ref.name if ref else ''
+
+
+def service_type_id(name):
+    """Id of the service type called *name* (case-insensitive), or None."""
+    return _find('service_type_ids', (name or '').strip().lower() or None)
+
+
+def timezone_for_state(state):
+    """tzinfo of a US state abbreviation (Eastern when unknown)."""
+    return get_timezone_for_state(state)
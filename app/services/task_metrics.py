@@ -0,0 +1,125 @@
+"""
+Per-queue Celery task counters and queue latency.
+
+Producers stamp every message with ``published_at``; workers record how
+long it waited before starting (from its ETA when it had a countdown), how
+long it ran and how it ended. Counters live in the default cache (Redis in
+production) so web and worker processes add to the same numbers:
+
+    celery-metrics:<queue>:<field>
+
+Read them with ``get_queue_metrics()`` or ``python manage.py celery_queues``.
+"""
+import logging
+import time
+
+from celery.signals import after_task_publish, before_task_publish, task_postrun, task_prerun
+from django.core.cache import cache
+from django.utils.dateparse import parse_datetime
+
+logger = logging.getLogger(__name__)
+
+METRIC_KEY = 'celery-metrics:{}:{}'
+FIELDS = (
+    'published', 'started', 'succeeded', 'failed', 'retried',
+    'wait_ms_total', 'wait_ms_max', 'run_ms_total',
+)
+PUBLISHED_HEADER = 'published_at'
+
+_started = {}
+
+
+def _incr(queue, field, delta=1):
+    key = METRIC_KEY.format(queue, field)
+    try:
+        cache.add(key, 0, None)
+        cache.incr(key, delta)
+    except Exception:
+        logger.debug("Task metric %s not recorded", key)
+
+
+def _raise_max(queue, field, value):
+    key = METRIC_KEY.format(queue, field)
+    try:
+        if value > (cache.get(key) or 0):
+            cache.set(key, value, None)
+    except Exception:
+        logger.debug("Task metric %s not recorded", key)
+
+
+def _queue_of(request):
+    delivery = getattr(request, 'delivery_info', None) or {}
+    return delivery.get('routing_key') or delivery.get('exchange') or 'default'
+
+
+def _ready_at(request):
+    """Epoch seconds from which *request* could run: publish time or later ETA."""
+    published = getattr(request, PUBLISHED_HEADER, None)
+    if published is None:
+        return None
+    eta = getattr(request, 'eta', None)
+    if eta:
+        eta = parse_datetime(eta) if isinstance(eta, str) else eta
+        if eta is not None:
+            return max(float(published), eta.timestamp())
+    return float(published)
+
+
+@before_task_publish.connect
+def _stamp_published(sender=None, headers=None, **kwargs):
+    if headers is not None:
+        headers.setdefault(PUBLISHED_HEADER, time.time())
+
+
+@after_task_publish.connect
+def _count_published(sender=None, routing_key=None, **kwargs):
+    _incr(routing_key or 'default', 'published')
+
+
+@task_prerun.connect
+def _record_start(task_id=None, task=None, **kwargs):
+    request = task.request
+    if getattr(request, 'is_eager', False):
+        return
+    queue = _queue_of(request)
+    now = time.time()
+    _started[task_id] = (queue, now)
+    _incr(queue, 'started')
+    ready_at = _ready_at(request)
+    if ready_at is not None:
+        wait_ms = max(0, int((now - ready_at) * 1000))
+        _incr(queue, 'wait_ms_total', wait_ms)
+        _raise_max(queue, 'wait_ms_max', wait_ms)
+
+
+@task_postrun.connect
+def _record_end(task_id=None, state=None, **kwargs):
+    started = _started.pop(task_id, None)
+    if started is None:
+        return
+    queue, at = started
+    _incr(queue, 'run_ms_total', int((time.time() - at) * 1000))
+    if state == 'SUCCESS':
+        _incr(queue, 'succeeded')
+    elif state == 'RETRY':
+        _incr(queue, 'retried')
+    else:
+        _incr(queue, 'failed')
+
+
+def get_queue_metrics(queues):
+    """``{queue: {field: value, 'wait_ms_avg': ..., 'run_ms_avg': ...}}``."""
+    keys = [METRIC_KEY.format(queue, field) for queue in queues for field in FIELDS]
+    values = cache.get_many(keys)
+    metrics = {}
+    for queue in queues:
+        row = {field: values.get(METRIC_KEY.format(queue, field), 0) for field in FIELDS}
+        row['wait_ms_avg'] = row['wait_ms_total'] // row['started'] if row['started'] else None
+        finished = row['succeeded'] + row['failed'] + row['retried']
+        row['run_ms_avg'] = row['run_ms_total'] // finished if finished else None
+        metrics[queue] = row
+    return metrics
+
+
+def reset_queue_metrics(queues):
+    cache.delete_many([METRIC_KEY.format(queue, field) for queue in queues for field in FIELDS])
@@ -1,10 +1,21 @@
 # signals.py
 import logging
 
-from django.db.models.signals import post_save
+from django.db import DEFAULT_DB_ALIAS
+from django.db.models.signals import post_delete, post_save
 from django.dispatch import receiver
 
-from .models import User, QuoteRequest, Quote, Assignment, AssignmentNotification
+from .models import (
+    User, QuoteRequest, Quote, Assignment, AssignmentNotification,
+    PayrollDocument, Service, Reimbursement, Deduction,
+    APIKey, MFADevice, WebAuthnCredential, Notification,
+    AssignmentFeedback, InterpreterPayment, Language, ServiceType,
+)
+from .services import (
+    api_keys, assignment_events, auth_state, interpreter_stats, realtime_push, reference_data,
+)
+from .services.assignment_events import on_assignment_change
+from .services.google_calendar import CALENDAR_EVENT_FIELDS
 
 logger = logging.getLogger(__name__)
 
@@ -22,12 +33,21 @@ def _safe_celery_delay(task_func, *args):
 
 
 @receiver(post_save, sender=Assignment)
-def create_assignment_notification(sender, instance, created, **kwargs):
-    if created and instance.interpreter and instance.status == Assignment.Status.PENDING:
-        try:
-            AssignmentNotification.create_for_new_assignment(instance)
-        except Exception:
-            logger.exception("Failed to create assignment notification for Assignment #%s", instance.pk)
+def dispatch_assignment_changes(sender, instance, created, update_fields=None, using=None, **kwargs):
+    """Seul receiver Assignment : diff calculé une fois, puis handlers intéressés."""
+    assignment_events.record(instance, created, update_fields, using=using or DEFAULT_DB_ALIAS)
+
+
+@on_assignment_change(fields=(), on_commit=False)
+def create_assignment_notification(changes):
+    """Notify the interpreter of a new PENDING assignment (same transaction)."""
+    for change in changes:
+        instance = change.instance
+        if instance.interpreter and instance.status == Assignment.Status.PENDING:
+            try:
+                AssignmentNotification.create_for_new_assignment(instance)
+            except Exception:
+                logger.exception("Failed to create assignment notification for Assignment #%s", instance.pk)
 
 
 @receiver(post_save, sender=Quote)
@@ -38,25 +58,32 @@ def handle_quote_status_change(sender, instance, created, **kwargs):
             _safe_celery_delay(send_quote_status_email, instance.id)
 
 
-@receiver(post_save, sender=Assignment)
-def handle_assignment_status_change(sender, instance, created, **kwargs):
-    from .tasks import send_assignment_status_email
-    if created or instance.status != instance._original_status:
-        _safe_celery_delay(send_assignment_status_email, instance.id)
+@on_assignment_change(fields=('status',))
+def handle_assignment_status_change(changes):
+    """One status-email job per transaction, whatever the number of assignments."""
+    from .tasks import send_assignment_status_email, send_assignment_status_emails
+    ids = [change.assignment_id for change in changes]
+    if len(ids) == 1:
+        _safe_celery_delay(send_assignment_status_email, ids[0])
+    else:
+        _safe_celery_delay(send_assignment_status_emails, ids)
 
 
-@receiver(post_save, sender=Assignment)
-def sync_assignment_to_google_calendar(sender, instance, **kwargs):
-    """Sync assignment to Google Calendar after transaction commit (non-blocking)."""
-    from django.db import transaction
-    from .services.google_calendar import schedule_sync
-    pk = instance.pk
-    def _on_commit():
+@on_assignment_change(fields=CALENDAR_EVENT_FIELDS)
+def sync_assignment_to_google_calendar(changes):
+    """Request a debounced Google Calendar sync once the transaction commits."""
+    from .services.calendar_sync_dispatcher import request_sync
+    for change in changes:
         try:
-            schedule_sync(pk)
+            request_sync(change.assignment_id)
         except Exception:
-            logger.exception("Google Calendar sync failed for Assignment #%s", pk)
-    transaction.on_commit(_on_commit)
+            logger.exception("Google Calendar sync failed for Assignment #%s", change.assignment_id)
+
+
+@on_assignment_change(fields=('status',))
+def push_assignment_updates(changes):
+    """Kanban sockets (/ws/assignment-updates) get created and status-changed assignments."""
+    realtime_push.push_assignment_changes(changes)
 
 
 @receiver(post_save, sender=QuoteRequest)
@@ -71,3 +98,97 @@ def send_welcome_email_on_creation(sender, instance, created, **kwargs):
     from .tasks import send_welcome_email
     if created:
         _safe_celery_delay(send_welcome_email, instance.id)
+
+
+@receiver([post_save, post_delete], sender=PayrollDocument)
+@receiver([post_save, post_delete], sender=Service)
+@receiver([post_save, post_delete], sender=Reimbursement)
+@receiver([post_save, post_delete], sender=Deduction)
+def invalidate_paystub_pdf_cache(sender, instance, **kwargs):
+    """Purge the cached pay stub render once a stub or one of its lines changes."""
+    from django.db import transaction
+    from .api.services.pdf_cache_service import invalidate_pdf_cache
+    payroll_id = instance.pk if sender is PayrollDocument else instance.payroll_id
+    if payroll_id is None:
+        return
+    def _on_commit():
+        try:
+            invalidate_pdf_cache('paystub', payroll_id)
+        except Exception:
+            logger.exception("PDF cache invalidation failed for PayrollDocument #%s", payroll_id)
+    transaction.on_commit(_on_commit)
+
+
+@receiver([post_save, post_delete], sender=User)
+@receiver([post_save, post_delete], sender=MFADevice)
+@receiver([post_save, post_delete], sender=WebAuthnCredential)
+@receiver([post_save, post_delete], sender=APIKey)
+def invalidate_auth_state(sender, instance, update_fields=None, **kwargs):
+    """Bump the owner's auth-state version (MFA capability, API keys, cached user)."""
+    if sender is User and update_fields and update_fields <= auth_state.BOOKKEEPING_USER_FIELDS:
+        return
+    user_id = instance.pk if sender is User else instance.user_id
+    auth_state.invalidate(user_id)
+    if sender is APIKey:
+        api_keys.forget(instance)
+
+
+@receiver([post_save, post_delete], sender=Language)
+@receiver([post_save, post_delete], sender=ServiceType)
+def invalidate_reference_data(sender, instance, **kwargs):
+    """Every process reloads its language / service type registry."""
+    reference_data.invalidate()
+
+
+@receiver(post_save, sender=Notification)
+def push_new_notification(sender, instance, created, **kwargs):
+    """Pousse la notification au destinataire via WebSocket (après commit)."""
+    if created:
+        realtime_push.push_notification(instance)
+
+
+@on_assignment_change(fields=('status', 'interpreter', 'start_time'))
+def refresh_interpreter_stats(changes):
+    """Recalcule les stats des interprètes quittés ou rejoints (une fois par transaction)."""
+    interpreter_ids = {
+        change.changes['interpreter'][0] for change in changes if 'interpreter' in change.changes
+    }
+    interpreter_ids.update(
+        Assignment.objects
+        .filter(pk__in=[change.assignment_id for change in changes])
+        .values_list('interpreter_id', flat=True)
+    )
+    interpreter_stats.refresh(interpreter_ids)
+
+
+@receiver(post_delete, sender=Assignment)
+@receiver([post_save, post_delete], sender=InterpreterPayment)
+def refresh_interpreter_stats_for_row(sender, instance, using=None, **kwargs):
+    """Recalcule les stats de l'interprète après suppression de mission ou changement de paiement."""
+    interpreter_stats.schedule_refresh([instance.interpreter_id], using=using or DEFAULT_DB_ALIAS)
+
+
+@receiver([post_save, post_delete], sender=AssignmentFeedback)
+def refresh_interpreter_stats_for_feedback(sender, instance, using=None, **kwargs):
+    """Recalcule la note moyenne de l'interprète évalué."""
+    interpreter_id = (
+        Assignment.objects.using(using or DEFAULT_DB_ALIAS)
+        .filter(pk=instance.assignment_id)
+        .values_list('interpreter_id', flat=True)
+        .first()
+    )
+    interpreter_stats.schedule_refresh([interpreter_id], using=using or DEFAULT_DB_ALIAS)
+
+
+@receiver(post_delete, sender=Assignment)
+def tombstone_deleted_assignment(sender, instance, **kwargs):
+    """Garde la trace de la suppression pour les flux kanban/calendrier ?changed_since."""
+    from django.db import transaction
+    from .api.services import assignment_feed
+
+    try:
+        # Savepoint : un échec ici ne doit pas annuler la suppression
+        with transaction.atomic():
+            assignment_feed.record_deletion([instance.pk])
+    except Exception:
+        logger.exception("Tombstone failed for Assignment #%s", instance.pk)
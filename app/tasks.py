@@ -281,3 +281,31 @@ def send_assignment_status_email(assignment_id):
 
     except Exception as e:
         logger.error("Error sending assignment status email: %s", e)
+
+
+@shared_task
+def send_assignment_status_emails(assignment_ids):
+    """Send status emails for a batch of assignments changed in one transaction."""
+    for assignment_id in assignment_ids:
+        send_assignment_status_email(assignment_id)
+
+
+@shared_task
+def send_assignment_emails(assignment_ids, email_type):
+    """Send one lifecycle email type to the interpreters of a batch of assignments."""
+    from .models import Assignment
+    from .services.assignment_email_service import send_assignment_email
+    assignments = Assignment.objects.filter(pk__in=assignment_ids).select_related(
+        'interpreter__user', 'service_type', 'source_language', 'target_language', 'client__user',
+    )
+    for assignment in assignments:
+        send_assignment_email(assignment, email_type)
+
+
+@shared_task
+def send_suspension_emails(interpreter_ids, reason):
+    """Send the account suspension email to a batch of interpreters."""
+    from .models import Interpreter
+    from .services.email_service import ContractViolationService
+    for interpreter in Interpreter.objects.filter(pk__in=interpreter_ids).select_related('user'):
+        ContractViolationService.send_suspension_email(interpreter, reason)
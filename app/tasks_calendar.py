@@ -5,6 +5,11 @@ All calendar I/O is offloaded here so Django request/response cycles
 are never blocked by network calls to the Google Calendar API.
 
 Queue: 'calendar'  (configure in config/celery.py if separate worker desired)
+Per-assignment syncs are requested through
+app.services.calendar_sync_dispatcher.request_sync(), which debounces and
+coalesces them before scheduling sync_assignment_to_calendar.
+reconcile_calendar repairs drift between assignments and the calendar in
+batches; schedule it periodically.
 Retry policy:
   - rate_limited  → exponential back-off (60s, 120s, 240s, 480s, 960s)
   - unknown error → linear back-off (60s each)
@@ -23,15 +28,16 @@ logger = logging.getLogger(__name__)
     max_retries=5,
     default_retry_delay=60,
     acks_late=True,
+    rate_limit='5/s',
     name='app.tasks_calendar.sync_assignment_to_calendar',
 )
 def sync_assignment_to_calendar(self, assignment_id: int):
     """
-    Push or update one assignment's Google Calendar event.
+    Push the latest state of one assignment's Google Calendar event.
 
-    Triggered after any status-changing action on an assignment:
-    confirm, start, complete, cancel, no_show, update.
-    Also called manually via the sync-calendar viewset action.
+    Scheduled by the calendar sync dispatcher once per debounce window,
+    whatever the number of saves/actions in between. Skips the API call when
+    the event body is unchanged since the last successful push.
 
     Retry logic:
     - 'rate_limited': exponential back-off capped at attempt 5
@@ -39,10 +45,10 @@ def sync_assignment_to_calendar(self, assignment_id: int):
     - 'not_found':    log warning, do NOT retry
     - 'unknown':      linear 60s retry
     """
-    from app.api.services.calendar_service import sync_assignment
+    from app.services.calendar_sync_dispatcher import flush
 
     try:
-        result = sync_assignment(assignment_id)
+        result = flush(assignment_id)
     except Exception as exc:
         logger.error(
             'Unexpected exception in sync_assignment_to_calendar #%s: %s',
@@ -151,3 +157,33 @@ def bulk_backfill_calendar(self, batch_size: int = 50, offset: int = 0):
     )
 
     return {'queued': queued, 'next_offset': offset + batch_size}
+
+
+@shared_task(
+    bind=True,
+    max_retries=3,
+    acks_late=True,
+    name='app.tasks_calendar.reconcile_calendar',
+)
+def reconcile_calendar(self, full: bool = False):
+    """
+    Reconcile Google Calendar with assignments (see app.services.calendar_reconciler).
+
+    Incremental by default: only events changed since the previous run's sync
+    token, plus assignments whose last push never landed, are diffed. Meant to
+    be scheduled periodically (e.g. every 15 minutes with Celery beat).
+
+    Args:
+        full: List and diff the whole calendar instead.
+    """
+    from app.services.calendar_reconciler import reconcile
+
+    try:
+        stats = reconcile(full=full)
+    except Exception as exc:
+        logger.error('Calendar reconciliation failed: %s', exc, exc_info=True)
+        raise self.retry(exc=exc, countdown=300)
+
+    if not stats.get('ok'):
+        logger.info('Calendar reconciliation skipped: %s', stats.get('error'))
+    return stats
@@ -0,0 +1,60 @@
+"""
+Celery tasks for large CSV/XLSX exports.
+
+Exports too big to stream inside a request are rebuilt here from the
+original query parameters, uploaded to temporary storage (24h lifecycle) and
+delivered to the requester as a SYSTEM notification with a download link.
+"""
+import logging
+
+from celery import shared_task
+
+logger = logging.getLogger(__name__)
+
+
+@shared_task(
+    bind=True,
+    max_retries=2,
+    default_retry_delay=60,
+    acks_late=True,
+    name='app.tasks_exports.run_background_export',
+)
+def run_background_export(self, viewset_path: str, query_params: dict, user_id: int,
+                          export_format: str = 'csv', compress: bool = False):
+    """Build a viewset export off-request and notify *user_id* when it is ready."""
+    from django.conf import settings
+
+    from app.api.exports import rebuild_viewset, save_export
+    from app.models import Notification, User
+
+    try:
+        user = User.objects.get(pk=user_id)
+    except User.DoesNotExist:
+        logger.warning("run_background_export: user %s not found", user_id)
+        return None
+
+    try:
+        viewset = rebuild_viewset(viewset_path, query_params, user)
+        filename, _content_type, chunks = viewset.build_export(export_format, compress)
+        key, url = save_export(chunks, filename, user_id)
+    except Exception as exc:
+        logger.error("Background export %s failed: %s", viewset_path, exc, exc_info=True)
+        if self.request.retries >= self.max_retries:
+            Notification.objects.create(
+                recipient=user,
+                type=Notification.Type.SYSTEM,
+                title='Export failed',
+                content=f'Your export could not be generated: {exc}',
+            )
+            return None
+        raise self.retry(exc=exc)
+
+    hours = getattr(settings, 'EXPORT_URL_EXPIRY', 86400) // 3600
+    Notification.objects.create(
+        recipient=user,
+        type=Notification.Type.SYSTEM,
+        title=f'Export ready: {filename}',
+        content=f'Your export is ready. The download link expires in {hours}h:\n{url}',
+    )
+    logger.info("Background export %s stored at %s", viewset_path, key)
+    return key
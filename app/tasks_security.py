@@ -0,0 +1,52 @@
+"""
+Celery tasks for the login-attempt audit trail.
+
+Lockouts are enforced from cache counters (app.services.rate_limiter); the
+``app_login_attempt`` rows written here are for auditing only, so a login
+never waits on the INSERT. ``prune_login_attempts`` enforces
+LOGIN_ATTEMPT_RETENTION_DAYS; schedule it daily (Celery beat) or run
+``python manage.py prune_login_attempts`` from cron.
+"""
+import logging
+from datetime import timedelta
+
+from celery import shared_task
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_RETENTION_DAYS = 90
+
+
+def retention_days():
+    from django.conf import settings
+    return getattr(settings, 'LOGIN_ATTEMPT_RETENTION_DAYS', DEFAULT_RETENTION_DAYS)
+
+
+@shared_task(
+    bind=True,
+    max_retries=3,
+    default_retry_delay=30,
+    name='app.tasks_security.persist_login_attempts',
+)
+def persist_login_attempts(self, attempts):
+    """Insert login attempts recorded by ``LoginAttempt.record_attempt``."""
+    from app.models import LoginAttempt
+
+    try:
+        return len(LoginAttempt.persist(attempts))
+    except Exception as exc:
+        logger.warning("Could not persist %s login attempt(s): %s", len(attempts), exc)
+        raise self.retry(exc=exc)
+
+
+@shared_task(name='app.tasks_security.prune_login_attempts')
+def prune_login_attempts(days=None):
+    """Delete login attempts older than the retention period."""
+    from django.utils import timezone
+
+    from app.models import LoginAttempt
+
+    days = retention_days() if days is None else days
+    deleted = LoginAttempt.prune(timezone.now() - timedelta(days=days))
+    logger.info("Pruned %s login attempt(s) older than %s days", deleted, days)
+    return deleted
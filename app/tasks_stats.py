@@ -0,0 +1,23 @@
+"""
+Celery tasks for denormalised statistics (app.services.interpreter_stats).
+
+Rows are kept current by the signal receivers in app.signals;
+``rebuild_interpreter_stats`` recomputes every row to catch writes that
+bypass signals. Schedule it nightly (Celery beat) or run
+``python manage.py rebuild_interpreter_stats`` from cron.
+"""
+import logging
+
+from celery import shared_task
+
+logger = logging.getLogger(__name__)
+
+
+@shared_task(name='app.tasks_stats.rebuild_interpreter_stats')
+def rebuild_interpreter_stats(batch_size=500):
+    """Recompute the stats row of every interpreter."""
+    from app.services import interpreter_stats
+
+    count = interpreter_stats.rebuild(batch_size=batch_size)
+    logger.info("Rebuilt stats for %s interpreter(s)", count)
+    return count
@@ -0,0 +1,63 @@
+"""Shared fixtures for the app test cases.
+
+``FixtureMixin`` patches out the welcome email every new user would queue
+and creates the users, interpreters, reference rows and assignments most
+tests start from. Assignments go through ``bulk_create``, so they are saved
+without their post_save side effects.
+"""
+from decimal import Decimal
+from unittest.mock import patch
+
+from rest_framework.test import APIClient
+
+from app.models import Assignment, Interpreter, Language, ServiceType, User
+
+
+class FixtureMixin:
+    """Mix into a ``TestCase`` before it; ``setUp`` overrides call ``super().setUp()``."""
+
+    def setUp(self):
+        super().setUp()
+        welcome = patch('app.tasks.send_welcome_email')
+        welcome.start()
+        self.addCleanup(welcome.stop)
+
+    def create_user(self, username, **fields):
+        fields.setdefault('email', f'{username}@example.com')
+        return User.objects.create_user(username=username, password='pw', **fields)
+
+    def create_admin(self, username='admin'):
+        return self.create_user(username, role='ADMIN')
+
+    def api_client(self, user):
+        client = APIClient()
+        client.force_authenticate(user)
+        return client
+
+    def create_interpreter(self, username='interp', **user_fields):
+        user = self.create_user(username, role='INTERPRETER', **user_fields)
+        return Interpreter.objects.create(
+            user=user, address='1 Main St', city='Boston', state='MA', zip_code='02101',
+        )
+
+    def create_reference_data(self):
+        """Set ``service_type``, ``en`` and ``fr`` for :meth:`bulk_assignments`."""
+        self.service_type = ServiceType.objects.create(
+            name='Legal', description='', base_rate=Decimal('50'), cancellation_policy='',
+        )
+        self.en = Language.objects.create(name='English', code='en')
+        self.fr = Language.objects.create(name='French', code='fr')
+
+    def bulk_assignments(self, variants, **common):
+        """One English > French assignment per dict of fields in *variants*.
+
+        *common* applies to every row; a variant's own fields take precedence.
+        """
+        defaults = dict(
+            service_type=self.service_type, source_language=self.en, target_language=self.fr,
+            location='Court', city='Boston', state='MA', zip_code='02101',
+            interpreter_rate=Decimal('40'),
+        )
+        return Assignment.objects.bulk_create([
+            Assignment(**{**defaults, **common, **fields}) for fields in variants
+        ])
@@ -0,0 +1,123 @@
+"""Tests for app/services/api_keys.py — hashed API-key lookup, caches and usage counters."""
+from datetime import timedelta
+from unittest.mock import patch
+
+from django.core.cache import cache
+from django.test import SimpleTestCase, TestCase
+from django.utils import timezone
+
+from app.models import APIKey
+from app.services import api_keys
+from app.services.api_keys import TTLCache
+from app.tests.factories import FixtureMixin
+from app.utils.api_auth import APIKeyValidator
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class TTLCacheTest(SimpleTestCase):
+
+    def test_evicts_least_recently_used(self):
+        lru = TTLCache(maxsize=2, ttl=60)
+        lru.set('a', 1)
+        lru.set('b', 2)
+        lru.get('a')
+        lru.set('c', 3)
+
+        self.assertEqual((lru.get('a'), lru.get('b'), lru.get('c')), (1, None, 3))
+
+    def test_entries_expire(self):
+        clock = FakeClock()
+        lru = TTLCache(maxsize=2, ttl=30, clock=clock)
+        lru.set('a', 1)
+        clock.now = 31
+
+        self.assertIsNone(lru.get('a'))
+        self.assertEqual(len(lru), 0)
+
+
+class APIKeyLookupTest(FixtureMixin, TestCase):
+
+    def setUp(self):
+        super().setUp()
+        cache.clear()
+        api_keys.clear_caches()
+        self.user = self.create_user('ci')
+        self.api_key = APIKey(user=self.user, name='CI', app_name='ci')
+        self.raw = self.api_key.set_key()
+        self.api_key.save()
+
+    def _resolve(self, raw):
+        with patch.object(api_keys, '_schedule_flush'):
+            return APIKeyValidator.get_user_from_key(raw)
+
+    def test_only_prefix_and_hash_are_stored(self):
+        stored = APIKey.objects.get(pk=self.api_key.pk)
+        self.assertEqual(stored.prefix, self.raw[:8])
+        self.assertNotIn(self.raw, (stored.prefix, stored.key_hash))
+        self.assertTrue(stored.verify(self.raw))
+        self.assertFalse(stored.verify(self.raw[:-1] + 'x'))
+
+    def test_cached_hit_and_miss_need_no_query(self):
+        self.assertEqual(self._resolve(self.raw), self.user)
+        self.assertIsNone(self._resolve('f' * 64))
+
+        with self.assertNumQueries(0):
+            self.assertEqual(self._resolve(self.raw), self.user)
+            self.assertIsNone(self._resolve('f' * 64))
+
+    def test_shared_prefix_is_disambiguated_by_hash(self):
+        twin = APIKey(user=self.user, name='Twin', app_name='ci')
+        twin_raw = twin.set_key(self.raw[:8] + 'a' * 56)
+        twin.save()
+
+        self.assertEqual(api_keys.find_key(twin_raw).pk, twin.pk)
+        self.assertEqual(api_keys.find_key(self.raw).pk, self.api_key.pk)
+        self.assertIsNone(api_keys.find_key(self.raw[:8] + 'b' * 56))
+
+    def test_rotation_and_revocation_apply_at_once(self):
+        self._resolve(self.raw)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            new_raw = self.api_key.set_key()
+            self.api_key.save(update_fields=['prefix', 'key_hash'])
+        self.assertIsNone(self._resolve(self.raw))
+        self.assertEqual(self._resolve(new_raw), self.user)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.api_key.expires_at = timezone.now() - timedelta(minutes=1)
+            self.api_key.save()
+        self.assertIsNone(self._resolve(new_raw))
+
+    def test_usage_is_flushed_in_one_update(self):
+        other = APIKey(user=self.user, name='B', app_name='b')
+        other_raw = other.set_key()
+        other.save()
+        for _ in range(3):
+            self._resolve(self.raw)
+        self._resolve(other_raw)
+
+        with self.assertNumQueries(1):
+            self.assertEqual(api_keys.flush_usage(), 2)
+
+        counts = dict(APIKey.objects.values_list('name', 'use_count'))
+        self.assertEqual(counts, {'CI': 3, 'B': 1})
+        self.assertFalse(APIKey.objects.filter(last_used__isnull=True).exists())
+        self.assertEqual(api_keys.flush_usage(), 0)
+
+    def test_flush_is_scheduled_once_per_interval(self):
+        with self.settings(API_KEY_USAGE_FLUSH_SECONDS=0), \
+                patch.object(api_keys, '_schedule_flush') as schedule:
+            api_keys.record_use(self.api_key.pk)
+        schedule.assert_called_once_with()
+
+        with patch.object(api_keys, '_schedule_flush') as schedule:
+            api_keys.record_use(self.api_key.pk)
+        schedule.assert_not_called()
+        api_keys.flush_usage()
@@ -0,0 +1,118 @@
+"""Tests for app/services/assignment_events.py — change-aware Assignment side effects."""
+from datetime import timedelta
+from unittest.mock import patch
+
+from django.db import transaction
+from django.test import TestCase
+from django.utils import timezone
+
+from app.models import Assignment
+from app.tests.factories import FixtureMixin
+
+
+@patch('app.services.calendar_sync_dispatcher.request_sync')
+@patch('app.tasks.send_assignment_status_emails')
+@patch('app.tasks.send_assignment_status_email')
+class AssignmentEventsTest(FixtureMixin, TestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.create_reference_data()
+        start = timezone.now() + timedelta(days=2)
+        self.ids = [a.pk for a in self.bulk_assignments(
+            [{'status': status} for status in ('PENDING', 'PENDING', 'PENDING', 'COMPLETED')],
+            start_time=start, end_time=start + timedelta(hours=2),
+        )]
+
+    def _save(self, assignment, **fields):
+        for name, value in fields.items():
+            setattr(assignment, name, value)
+        assignment.save()
+
+    def test_diff_is_relative_to_last_save(self, email, emails, sync):
+        assignment = Assignment.objects.get(pk=self.ids[0])
+        assignment.notes = 'Bring ID'
+        self.assertEqual(assignment.tracked_changes(), {'notes': (None, 'Bring ID')})
+
+        with self.captureOnCommitCallbacks(execute=True):
+            assignment.save()
+
+        self.assertEqual(assignment.tracked_changes(), {})
+
+    def test_unrelated_field_save_has_no_side_effects(self, email, emails, sync):
+        assignment = Assignment.objects.get(pk=self.ids[0])
+
+        with self.captureOnCommitCallbacks(execute=True) as callbacks:
+            self._save(assignment, is_paid=True)
+            self._save(assignment)
+
+        self.assertEqual(callbacks, [])
+        email.delay.assert_not_called()
+        sync.assert_not_called()
+
+    def test_calendar_fields_sync_without_email(self, email, emails, sync):
+        assignment = Assignment.objects.get(pk=self.ids[0])
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self._save(assignment, location='Courthouse, room 4')
+
+        sync.assert_called_once_with(assignment.pk)
+        email.delay.assert_not_called()
+
+    def test_saves_in_one_transaction_are_coalesced(self, email, emails, sync):
+        assignment = Assignment.objects.get(pk=self.ids[0])
+
+        with self.captureOnCommitCallbacks(execute=True) as callbacks:
+            with transaction.atomic():
+                self._save(assignment, status='CONFIRMED')
+                self._save(assignment, notes='Parking in back')
+                self._save(assignment, status='IN_PROGRESS')
+
+        self.assertEqual(len(callbacks), 1)
+        email.delay.assert_called_once_with(assignment.pk)
+        sync.assert_called_once_with(assignment.pk)
+
+    def test_rolled_back_transaction_starts_a_new_batch(self, email, emails, sync):
+        rolled_back, committed = Assignment.objects.filter(pk__in=self.ids[:2]).order_by('pk')
+
+        with self.captureOnCommitCallbacks(execute=True) as callbacks:
+            with self.assertRaises(RuntimeError), transaction.atomic():
+                self._save(rolled_back, status='CONFIRMED')
+                raise RuntimeError
+            self._save(committed, status='CONFIRMED')
+
+        self.assertEqual(len(callbacks), 1)
+        email.delay.assert_called_once_with(committed.pk)
+
+    def test_reverted_change_is_dropped(self, email, emails, sync):
+        assignment = Assignment.objects.get(pk=self.ids[0])
+
+        with self.captureOnCommitCallbacks(execute=True):
+            with transaction.atomic():
+                self._save(assignment, status='CANCELLED')
+                self._save(assignment, status='PENDING')
+
+        email.delay.assert_not_called()
+        sync.assert_not_called()
+
+    def test_bulk_transition_is_one_update_and_one_grouped_event(self, email, emails, sync):
+        with self.captureOnCommitCallbacks(execute=True):
+            with self.assertNumQueries(4):  # savepoint, locked select, update, release
+                moved = Assignment.objects.filter(pk__in=self.ids).bulk_transition(
+                    Assignment.Status.CONFIRMED, from_statuses=[Assignment.Status.PENDING],
+                )
+
+        self.assertEqual(moved, self.ids[:3])
+        self.assertEqual(
+            list(Assignment.objects.filter(pk__in=self.ids).order_by('pk').values_list('status', flat=True)),
+            ['CONFIRMED', 'CONFIRMED', 'CONFIRMED', 'COMPLETED'],
+        )
+        emails.delay.assert_called_once_with(self.ids[:3])
+        email.delay.assert_not_called()
+        self.assertEqual(sync.call_count, 3)
+
+    def test_bulk_transition_with_nothing_to_move(self, email, emails, sync):
+        moved = Assignment.objects.filter(pk=self.ids[3]).bulk_transition(
+            Assignment.Status.CONFIRMED, from_statuses=[Assignment.Status.PENDING],
+        )
+        self.assertEqual(moved, [])
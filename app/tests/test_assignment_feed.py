@@ -0,0 +1,187 @@
+"""Windowed kanban/calendar feeds and their ?changed_since deltas."""
+from datetime import timedelta
+from unittest.mock import patch
+
+from django.contrib.admin import site
+from django.core.cache import cache
+from django.db import connection
+from django.db.models import QuerySet
+from django.test import RequestFactory, TestCase
+from django.utils import timezone
+
+from app.admin import AssignmentAdmin
+from app.api.services import assignment_feed
+from app.models import Assignment, AssignmentTombstone
+from app.services.calendar_reconciler import reconcile
+from app.tests.factories import FixtureMixin
+from app.tests.test_calendar_reconciler import FakeCalendar, _limiter
+
+
+@patch('app.services.calendar_sync_dispatcher.request_sync')
+@patch('app.tasks.send_assignment_status_emails')
+@patch('app.tasks.send_assignment_status_email')
+class AssignmentFeedTest(FixtureMixin, TestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.client = self.api_client(self.create_admin())
+        self.create_reference_data()
+        self.now = timezone.now()
+
+    def _create(self, status, count, days=1):
+        created = self.bulk_assignments([
+            dict(start_time=self.now + timedelta(days=days, hours=n),
+                 end_time=self.now + timedelta(days=days, hours=n + 1), client_name=f'{status} {n}')
+            for n in range(count)
+        ], status=status)
+        return [assignment.pk for assignment in created]
+
+    def _age(self, seconds):
+        """Pretend every row was last touched *seconds* ago."""
+        Assignment.objects.update(updated_at=self.now - timedelta(seconds=seconds))
+
+    def test_kanban_columns_are_limited_and_paginated(self, *mocks):
+        pending = self._create('PENDING', 5)
+        self._create('COMPLETED', 3, days=-10)
+
+        with self.assertNumQueries(3):  # counts + two non-empty columns
+            board = self.client.get('/api/v1/assignments/kanban/', {'limit': 2}).data
+        columns = board['columns']
+
+        self.assertEqual(list(columns), list(assignment_feed.KANBAN_STATUSES))
+        self.assertEqual((columns['PENDING']['count'], columns['COMPLETED']['count']), (5, 3))
+        self.assertEqual([row['id'] for row in columns['PENDING']['results']], pending[:2])
+        self.assertEqual(columns['IN_PROGRESS'], {'results': [], 'next': None, 'count': 0})
+
+        seen = []
+        cursor = columns['PENDING']['next']
+        while cursor:
+            page = self.client.get('/api/v1/assignments/kanban/', {
+                'column': 'PENDING', 'cursor': cursor, 'limit': 2,
+            }).data['columns']['PENDING']
+            seen += [row['id'] for row in page['results']]
+            cursor = page['next']
+        self.assertEqual(seen, pending[2:])
+
+    def test_closed_columns_show_most_recent_first(self, *mocks):
+        completed = self._create('COMPLETED', 3, days=-10)
+
+        columns = self.client.get('/api/v1/assignments/kanban/').data['columns']
+
+        self.assertEqual([row['id'] for row in columns['COMPLETED']['results']], completed[::-1])
+
+    def test_calendar_requires_a_bounded_window(self, *mocks):
+        self._create('CONFIRMED', 2)
+
+        self.assertEqual(self.client.get('/api/v1/assignments/calendar/').status_code, 400)
+        too_wide = self.client.get('/api/v1/assignments/calendar/', {
+            'start': '2026-01-01', 'end': '2026-06-01',
+        })
+        self.assertEqual(too_wide.status_code, 400)
+
+        window = {
+            'start': (self.now - timedelta(days=1)).isoformat(),
+            'end': (self.now + timedelta(days=3)).isoformat(),
+        }
+        self.assertEqual(len(self.client.get('/api/v1/assignments/calendar/', window).data), 2)
+
+    def test_changed_since_returns_only_touched_rows(self, *mocks):
+        first, second, third = self._create('PENDING', 3)
+        self._age(3600)
+        since = (self.now - timedelta(minutes=10)).isoformat()
+
+        assignment = Assignment.objects.get(pk=first)
+        assignment.status = 'CONFIRMED'
+        assignment.save(update_fields=['status'])
+        Assignment.objects.filter(pk=second).delete()
+
+        delta = self.client.get('/api/v1/assignments/kanban/', {'changed_since': since}).data
+
+        self.assertEqual([(row['id'], row['status']) for row in delta['changed']], [(first, 'CONFIRMED')])
+        self.assertEqual(delta['removed'], [second])
+        self.assertTrue(AssignmentTombstone.objects.filter(assignment_id=second).exists())
+
+    def test_tombstone_upserts_without_conflict_target_on_mysql(self, *mocks):
+        with patch.object(connection.features, 'supports_update_conflicts_with_target', False), \
+                patch.object(QuerySet, 'bulk_create') as bulk_create:
+            assignment_feed.record_deletion([1])
+
+        _, kwargs = bulk_create.call_args
+        self.assertTrue(kwargs['update_conflicts'])
+        self.assertNotIn('unique_fields', kwargs)
+
+    def test_failed_tombstone_does_not_undo_the_delete(self, *mocks):
+        pk, = self._create('PENDING', 1)
+
+        with patch.object(assignment_feed, 'record_deletion', side_effect=RuntimeError), \
+                self.assertLogs('app.signals', 'ERROR'):
+            Assignment.objects.filter(pk=pk).delete()
+
+        self.assertFalse(Assignment.objects.filter(pk=pk).exists())
+
+    def test_changed_rows_outside_filters_are_removed(self, *mocks):
+        pending, = self._create('PENDING', 1)
+        self._age(3600)
+        since = (self.now - timedelta(minutes=10)).isoformat()
+        Assignment.objects.filter(pk=pending).bulk_transition('CANCELLED')
+
+        delta = self.client.get('/api/v1/assignments/kanban/', {
+            'changed_since': since, 'status': 'PENDING',
+        }).data
+
+        self.assertEqual((delta['changed'], delta['removed']), ([], [pending]))
+
+    def test_calendar_delta_is_limited_to_the_window(self, *mocks):
+        inside, = self._create('CONFIRMED', 1, days=1)
+        outside, = self._create('CONFIRMED', 1, days=30)
+        since = (self.now - timedelta(minutes=10)).isoformat()
+
+        delta = self.client.get('/api/v1/assignments/calendar/', {
+            'start': self.now.isoformat(), 'end': (self.now + timedelta(days=7)).isoformat(),
+            'changed_since': since,
+        }).data
+
+        self.assertEqual([event['id'] for event in delta['changed']], [inside])
+        self.assertEqual(delta['removed'], [outside])
+
+    def test_stale_or_large_deltas_ask_for_resync(self, *mocks):
+        self._create('PENDING', 3)
+        stale = (self.now - assignment_feed.TOMBSTONE_RETENTION - timedelta(hours=1)).isoformat()
+
+        self.assertTrue(self.client.get('/api/v1/assignments/kanban/', {'changed_since': stale}).data['resync'])
+        with patch.object(assignment_feed, 'MAX_CHANGES', 2):
+            delta = self.client.get('/api/v1/assignments/kanban/', {
+                'changed_since': (self.now - timedelta(minutes=1)).isoformat(),
+            }).data
+        self.assertTrue(delta['resync'])
+
+    def test_save_with_update_fields_bumps_updated_at(self, *mocks):
+        pk, = self._create('PENDING', 1)
+        self._age(3600)
+
+        assignment = Assignment.objects.get(pk=pk)
+        assignment.notes = 'Bring ID'
+        assignment.save(update_fields=['notes'])
+
+        assignment.refresh_from_db()
+        self.assertGreaterEqual(assignment.updated_at, self.now)
+
+    def test_reconciler_and_admin_writes_reach_the_delta(self, *mocks):
+        cache.clear()
+        synced, = self._create('CONFIRMED', 1)
+        paid, _ = self._create('COMPLETED', 2, days=-10)
+        self._age(3600)
+        since = (self.now - timedelta(minutes=10)).isoformat()
+
+        reconcile(FakeCalendar(), 'ops@example.com', since=self.now - timedelta(days=1),
+                  full=True, limiter=_limiter())
+        admin = AssignmentAdmin(Assignment, site)
+        with patch.object(admin, 'message_user'):
+            admin.mark_as_paid(RequestFactory().post('/'), Assignment.objects.filter(pk=paid))
+
+        delta = self.client.get('/api/v1/assignments/kanban/', {'changed_since': since}).data
+
+        self.assertEqual(
+            {row['id']: (row['gcal_sync_status'], row['is_paid']) for row in delta['changed']},
+            {synced: ('SYNCED', None), paid: ('PENDING', True)},
+        )
@@ -0,0 +1,88 @@
+"""Projection serializers must reproduce the ModelSerializer output they replace."""
+from datetime import timedelta
+from decimal import Decimal
+
+from django.core.management import call_command
+from django.test import TestCase
+from django.utils import timezone
+
+from app.api.serializers.assignments import (
+    AssignmentCalendarProjection, AssignmentCalendarSerializer,
+    AssignmentListProjection, AssignmentListSerializer,
+)
+from app.models import Assignment, Client
+from app.tests.factories import FixtureMixin
+
+
+class AssignmentProjectionTest(FixtureMixin, TestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.admin = self.create_admin()
+        interpreter = self.create_interpreter(first_name='Ana', last_name='')
+        clients = [
+            Client.objects.create(
+                user=self.create_user(f'c{n}'),
+                company_name=name, address='2 Main St', city='Boston', state='MA', zip_code='02101',
+            )
+            for n, name in enumerate(('Acme Legal', ''))
+        ]
+        self.create_reference_data()
+        start = timezone.now().replace(microsecond=123456)
+        variants = [
+            dict(interpreter=interpreter, client=clients[0], state='CA', status='CONFIRMED',
+                 total_interpreter_payment=Decimal('120.5'), gcal_synced_at=start),
+            dict(client=clients[1], state='', status='PENDING', is_paid=True),
+            dict(client_name='Walk-in', state='zz', status='COMPLETED'),
+            dict(state='HI', status='CANCELLED'),
+        ]
+        self.bulk_assignments([
+            dict(fields, start_time=start + timedelta(days=n), end_time=start + timedelta(days=n, hours=2))
+            for n, fields in enumerate(variants)
+        ])
+        self.client = self.api_client(self.admin)
+
+    def _compare(self, serializer, projection):
+        queryset = Assignment.objects.order_by('start_time')
+        expected = serializer(queryset, many=True).data
+        actual = projection(projection.project(queryset), many=True).data
+        self.assertEqual(len(actual), 4)
+        for old, new in zip(expected, actual):
+            self.assertEqual(list(new), list(old))
+            self.assertEqual(new, dict(old))
+
+    def test_list_projection_matches_model_serializer(self):
+        self._compare(AssignmentListSerializer, AssignmentListProjection)
+
+    def test_calendar_projection_matches_model_serializer(self):
+        self._compare(AssignmentCalendarSerializer, AssignmentCalendarProjection)
+
+    def test_list_endpoint_is_one_query_per_page(self):
+        with self.assertNumQueries(1):
+            response = self.client.get('/api/v1/assignments/', {'page_size': 2})
+
+        self.assertEqual(len(response.data['results']), 2)
+        response = self.client.get(response.data['next'])
+        self.assertEqual(len(response.data['results']), 2)
+        self.assertIsNone(response.data['next'])
+
+    def test_kanban_and_calendar_use_projections(self):
+        with self.assertNumQueries(5):  # status counts + one query per non-empty column
+            columns = self.client.get('/api/v1/assignments/kanban/').data['columns']
+        window = {
+            'start': (timezone.now() - timedelta(days=1)).isoformat(),
+            'end': (timezone.now() + timedelta(days=7)).isoformat(),
+        }
+        with self.assertNumQueries(1):
+            calendar = self.client.get('/api/v1/assignments/calendar/', window).data
+
+        unnamed = Client.objects.get(company_name='')
+        self.assertEqual([row['client_display'] for row in columns['PENDING']['results']],
+                         [f'Client object ({unnamed.pk})'])
+        self.assertEqual(columns['IN_PROGRESS']['results'], [])
+        self.assertEqual([event['title'] for event in calendar][2], 'Walk-in (en > fr)')
+
+    def test_benchmark_command_runs(self):
+        call_command('benchmark_assignment_serializers', seed=20, repeat=1, stdout=open('/dev/null', 'w'))
+
+        self.assertEqual(Assignment.objects.count(), 4)
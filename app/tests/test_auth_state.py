@@ -0,0 +1,59 @@
+"""Tests for app/services/auth_state.py — cached MFA capability."""
+from django.contrib.auth.models import update_last_login
+from django.core.cache import cache
+from django.test import RequestFactory, TestCase
+
+from app.admin.middleware import AdminMFAMiddleware
+from app.models.auth_security import MFADevice
+from app.services import auth_state
+from app.tests.factories import FixtureMixin
+
+
+class AuthStateTest(FixtureMixin, TestCase):
+
+    def setUp(self):
+        super().setUp()
+        cache.clear()
+        self.user = self.create_user('staff', is_staff=True)
+
+    def _admin_redirect(self):
+        request = RequestFactory().get('/admin/app/assignment/')
+        request.user = self.user
+        request.session = {}
+        return AdminMFAMiddleware(lambda request: None)(request)['Location']
+
+    def test_middleware_reuses_mfa_state(self):
+        self.assertIn('email-otp', self._admin_redirect())
+        with self.assertNumQueries(0):
+            self.assertIn('email-otp', self._admin_redirect())
+
+    def test_new_device_invalidates_mfa_state(self):
+        self.assertFalse(auth_state.has_totp(self.user))
+
+        with self.captureOnCommitCallbacks(execute=True):
+            MFADevice.objects.create(user=self.user, secret='S' * 32, is_verified=True)
+
+        self.assertTrue(auth_state.has_totp(self.user))
+        self.assertIn('verify', self._admin_redirect())
+
+    def test_bump_hides_entries_read_at_old_version(self):
+        version = auth_state.get_version(self.user.pk)
+        cache.set(auth_state.USER_KEY.format(self.user.pk, version),
+                  {'has_totp': True, 'has_webauthn': False})
+        self.assertTrue(auth_state.has_totp(self.user))
+
+        auth_state.bump_version(self.user.pk)
+
+        self.assertFalse(auth_state.has_totp(self.user))
+
+    def test_last_login_save_keeps_version(self):
+        version = auth_state.get_version(self.user.pk)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            update_last_login(None, self.user)
+        self.assertEqual(auth_state.get_version(self.user.pk), version)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.user.is_active = False
+            self.user.save(update_fields=['is_active', 'updated_at'])
+        self.assertGreater(auth_state.get_version(self.user.pk), version)
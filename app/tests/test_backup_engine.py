@@ -0,0 +1,175 @@
+"""Tests for app/services/backup_engine.py — streamed export and restore."""
+import gzip
+import io
+import json
+from datetime import timedelta
+
+from django.test import TestCase
+from django.utils import timezone
+
+from app.models import ContactMessage, Language, Lead, User
+from app.services.backup_engine import (
+    BackupError, export_table, restore_table, run_backup, run_restore,
+)
+from app.tests.factories import FixtureMixin
+
+
+class FakeS3:
+    """Minimal in-memory stand-in for the boto3 S3 client calls used by the engine."""
+
+    def __init__(self):
+        self.objects = {}
+        self.uploads = {}
+        self.part_calls = 0
+
+    def put_object(self, Bucket, Key, Body, **kwargs):
+        self.objects[Key] = bytes(Body)
+
+    def get_object(self, Bucket, Key):
+        if Key not in self.objects:
+            raise KeyError(Key)
+        return {'Body': io.BytesIO(self.objects[Key])}
+
+    def create_multipart_upload(self, Bucket, Key, **kwargs):
+        upload_id = f"upload-{len(self.uploads)}"
+        self.uploads[upload_id] = []
+        return {'UploadId': upload_id}
+
+    def upload_part(self, Bucket, Key, UploadId, PartNumber, Body):
+        self.part_calls += 1
+        self.uploads[UploadId].append(Body)
+        return {'ETag': f'"etag-{PartNumber}"'}
+
+    def complete_multipart_upload(self, Bucket, Key, UploadId, MultipartUpload):
+        self.objects[Key] = b''.join(self.uploads.pop(UploadId))
+
+    def abort_multipart_upload(self, Bucket, Key, UploadId):
+        self.uploads.pop(UploadId, None)
+
+
+class ExportTableTest(TestCase):
+
+    def setUp(self):
+        for i in range(50):
+            Language.objects.create(name=f'Lang {i}', code=f'l{i}')
+        self.s3 = FakeS3()
+
+    def test_streams_gzipped_jsonl(self):
+        entry = export_table(self.s3, 'bucket', 'b/app.language.jsonl.gz', Language)
+
+        lines = gzip.decompress(self.s3.objects['b/app.language.jsonl.gz']).splitlines()
+        self.assertEqual(len(lines), 50)
+        self.assertEqual(json.loads(lines[0])['model'], 'app.language')
+        self.assertEqual(entry['rows'], 50)
+        self.assertEqual(entry['watermark']['field'], 'id')
+
+    def test_uses_multipart_for_large_tables(self):
+        export_table(self.s3, 'bucket', 'k', Language, part_size=64, compresslevel=1)
+        self.assertGreater(self.s3.part_calls, 1)
+        self.assertEqual(len(gzip.decompress(self.s3.objects['k']).splitlines()), 50)
+
+    def test_incremental_only_ships_rows_past_watermark(self):
+        for days, name in ((2, 'Older'), (1, 'Old')):
+            lead = Lead.objects.create(company_name=name, contact_name='A', email='a@example.com',
+                                       source='OTHER')
+            Lead.objects.filter(pk=lead.pk).update(updated_at=timezone.now() - timedelta(days=days))
+        first = export_table(self.s3, 'bucket', 'full', Lead)
+        Lead.objects.create(company_name='New', contact_name='B', email='b@example.com', source='OTHER')
+
+        entry = export_table(self.s3, 'bucket', 'incr', Lead, since=first['watermark'])
+
+        # Inclusive: the row at the watermark itself is shipped again
+        lines = gzip.decompress(self.s3.objects['incr']).splitlines()
+        self.assertEqual(entry['rows'], 2)
+        self.assertEqual({json.loads(line)['fields']['company_name'] for line in lines}, {'Old', 'New'})
+
+    def test_incremental_exports_tables_without_updated_at_in_full(self):
+        first = export_table(self.s3, 'bucket', 'full', Language)
+        Language.objects.filter(code='l0').update(name='Renamed')
+
+        entry = export_table(self.s3, 'bucket', 'incr', Language, since=first['watermark'])
+
+        self.assertEqual(entry['rows'], 50)
+
+    def test_restore_round_trip(self):
+        entry = export_table(self.s3, 'bucket', 'k', Language)
+        Language.objects.all().delete()
+
+        rows = restore_table(self.s3, 'bucket', entry)
+
+        self.assertEqual(rows, 50)
+        self.assertEqual(Language.objects.count(), 50)
+
+    def test_restore_rejects_checksum_mismatch(self):
+        entry = export_table(self.s3, 'bucket', 'k', Language)
+        entry['sha256'] = '0' * 64
+        with self.assertRaises(BackupError):
+            restore_table(self.s3, 'bucket', entry)
+
+
+class RunBackupTest(FixtureMixin, TestCase):
+
+    def setUp(self):
+        super().setUp()
+        Language.objects.create(name='French', code='fr')
+        self.s3 = FakeS3()
+
+    def test_incremental_run_builds_on_latest_manifest(self):
+        full = run_backup(self.s3, 'bucket', exclude_apps=['contenttypes', 'sessions'], workers=1)
+        self.assertEqual(full['mode'], 'full')
+
+        Language.objects.create(name='Spanish', code='es')
+        incr = run_backup(self.s3, 'bucket', exclude_apps=['contenttypes', 'sessions'],
+                          incremental=True, workers=1)
+
+        self.assertEqual(incr['mode'], 'incremental')
+        self.assertEqual(incr['base_run_id'], full['run_id'])
+        language = next(t for t in incr['tables'] if t['model'] == 'app.language')
+        self.assertEqual(language['rows'], 2)
+
+    def test_incremental_becomes_full_once_chain_is_complete(self):
+        full = run_backup(self.s3, 'bucket', exclude_apps=['contenttypes', 'sessions'], workers=1)
+        incr = run_backup(self.s3, 'bucket', exclude_apps=['contenttypes', 'sessions'],
+                          incremental=True, workers=1, max_incrementals=1)
+        again = run_backup(self.s3, 'bucket', exclude_apps=['contenttypes', 'sessions'],
+                           incremental=True, workers=1, max_incrementals=1)
+
+        self.assertEqual((incr['mode'], incr['full_run_id'], incr['chain_length']),
+                         ('incremental', full['run_id'], 1))
+        self.assertEqual((again['mode'], again['base_run_id'], again['chain_length']), ('full', None, 0))
+
+    def test_restore_rejects_chain_with_missing_base(self):
+        full = run_backup(self.s3, 'bucket', exclude_apps=['contenttypes', 'sessions'], workers=1)
+        incr = run_backup(self.s3, 'bucket', exclude_apps=['contenttypes', 'sessions'],
+                          incremental=True, workers=1)
+        del self.s3.objects[f"backups/{full['run_id']}/manifest.json"]
+
+        with self.assertRaisesRegex(BackupError, 'base run'):
+            run_restore(self.s3, 'bucket', incr['run_id'])
+
+    def test_restore_applies_chain(self):
+        full = run_backup(self.s3, 'bucket', exclude_apps=['contenttypes', 'sessions'], workers=1)
+        Language.objects.all().delete()
+
+        results = run_restore(self.s3, 'bucket', full['run_id'], models={'app.language'})
+
+        self.assertEqual(sum(r['rows'] for r in results), 1)
+        self.assertTrue(Language.objects.filter(code='fr').exists())
+
+    def test_restore_fills_natural_key_references_to_later_tables(self):
+        staff = self.create_user('staff')
+        ContactMessage.objects.create(name='Cy', email='cy@example.com', subject='Hi', message='Hello',
+                                      processed_by=staff)
+        # The message references its user by natural key and is applied first
+        tables = [
+            export_table(self.s3, 'bucket', 'run/message', ContactMessage),
+            export_table(self.s3, 'bucket', 'run/user', User),
+        ]
+        self.s3.put_object(Bucket='bucket', Key='backups/run/manifest.json',
+                           Body=json.dumps({'run_id': 'run', 'tables': tables}).encode())
+        ContactMessage.objects.all().delete()
+        User.objects.all().delete()
+
+        run_restore(self.s3, 'bucket', 'run', models={'app.contactmessage', 'app.user'})
+
+        self.assertEqual(ContactMessage.objects.get().processed_by.username, 'staff')
@@ -0,0 +1,105 @@
+"""API benchmark suite: dataset, scenario discovery, baseline comparison."""
+import json
+import math
+import tempfile
+from pathlib import Path
+
+from django.db import connection
+from django.test import SimpleTestCase, TestCase
+from rest_framework.test import APIClient
+
+from app.benchmarks import dataset, runner, scenarios
+from app.benchmarks.runner import Measurement, Tolerance
+from app.models import InterpreterLanguage, User
+
+# Only query counts and status codes are compared in tests: timings depend on the machine
+QUERIES_ONLY = Tolerance(time_ratio=math.inf, memory_ratio=math.inf)
+
+
+class BenchmarkSuiteTest(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.counts = dataset.generate('tiny')
+
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(User.objects.get(username=dataset.ADMIN_USERNAME))
+
+    def test_dataset_matches_the_scale(self):
+        scale = dataset.SCALES['tiny']
+        self.assertEqual(self.counts['Interpreter'], scale.interpreters)
+        self.assertEqual(self.counts['Assignment'], scale.assignments)
+        self.assertEqual(
+            self.counts['InterpreterLocation'], scale.interpreters * scale.locations_per_interpreter,
+        )
+        self.assertGreater(self.counts['InterpreterPayment'], 0)
+
+    def test_discovers_router_and_dashboard_endpoints(self):
+        names = {scenario.name for scenario in scenarios.discover()}
+
+        self.assertTrue({
+            'dashboard-kpis', 'assignment-list', 'assignment-detail', 'assignment-calendar',
+            'interpreter-map', 'interpreter-performance', 'finance-invoice-detail', 'payroll-payments',
+        } <= names)
+        self.assertFalse(names & scenarios.SKIP)
+
+    def test_query_counts_match_the_baseline(self):
+        baseline = runner.load_baseline('tiny', connection.vendor)
+        if not baseline:
+            self.skipTest(f'no tiny baseline for {connection.vendor}')
+
+        results = runner.run(self.client, scenarios.discover(), repeat=1)
+
+        self.assertEqual([result.name for result in results if result.status >= 500], [])
+        self.assertEqual([str(r) for r in runner.compare(results, baseline, QUERIES_ONLY)], [])
+
+    def test_map_reads_languages_in_one_query(self):
+        scenario = next(s for s in scenarios.discover() if s.name == 'interpreter-map')
+        interpreter = self.client.get(scenario.url).data[0]
+
+        with self.assertNumQueries(2):
+            self.client.get(scenario.url)
+        expected = sorted(
+            InterpreterLanguage.objects.filter(interpreter_id=interpreter['id'])
+            .values_list('language__name', flat=True)
+        )[:5]
+        self.assertEqual(interpreter['languages'], expected)
+
+
+class CompareTest(SimpleTestCase):
+    baseline = {'a-list': {'status': 200, 'queries': 3, 'time_ms': 10.0, 'peak_kb': 100.0}}
+
+    def _measure(self, **overrides):
+        values = {'name': 'a-list', 'status': 200, 'queries': 3, 'time_ms': 10.0, 'peak_kb': 100.0}
+        values.update(overrides)
+        return Measurement(**values)
+
+    def test_within_tolerance(self):
+        # +2 queries, time under the 25 ms floor, memory under the 256 KB floor
+        result = self._measure(queries=5, time_ms=34.0, peak_kb=350.0)
+        self.assertEqual(runner.compare([result], self.baseline), [])
+
+    def test_each_metric_regresses_past_its_limit(self):
+        result = self._measure(queries=6, time_ms=36.0, peak_kb=357.0)
+        regressions = runner.compare([result], self.baseline)
+        self.assertEqual(
+            [(r.metric, r.limit) for r in regressions],
+            [('queries', 5), ('time_ms', 35.0), ('peak_kb', 356.0)],
+        )
+
+    def test_server_errors_and_status_changes(self):
+        regressions = runner.compare(
+            [self._measure(status=404), self._measure(name='new-list', status=500)], self.baseline,
+        )
+        self.assertEqual([(r.name, r.metric) for r in regressions], [('a-list', 'status'), ('new-list', 'status')])
+
+    def test_baseline_round_trip_keeps_other_sections(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = Path(tmp) / 'baseline.json'
+            path.write_text(json.dumps({'full': {'mysql': {'x': {}}}}))
+
+            runner.save_baseline([self._measure()], 'tiny', 'sqlite', path=path)
+
+            self.assertEqual(runner.load_baseline('tiny', 'sqlite', path=path), self.baseline)
+            self.assertEqual(runner.load_baseline('full', 'mysql', path=path), {'x': {}})
@@ -0,0 +1,175 @@
+"""Set-based bulk-action endpoints for assignments and interpreters."""
+from datetime import timedelta
+from decimal import Decimal
+from unittest.mock import patch
+
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from app.models import Assignment, AuditLog, Expense, Interpreter, InterpreterPayment
+from app.tests.factories import FixtureMixin
+
+
+@patch('app.services.calendar_sync_dispatcher.request_sync')
+@patch('app.tasks.send_assignment_status_emails')
+@patch('app.tasks.send_assignment_status_email')
+@patch('app.tasks.send_assignment_emails')
+class AssignmentBulkActionTest(FixtureMixin, TestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.client = self.api_client(self.create_admin())
+        self.interpreter = self.create_interpreter()
+        self.create_reference_data()
+
+    def _create(self, status, count):
+        start = timezone.now() + timedelta(days=1)
+        created = self.bulk_assignments([
+            dict(start_time=start + timedelta(hours=n), end_time=start + timedelta(hours=n + 1))
+            for n in range(count)
+        ], interpreter=self.interpreter, total_interpreter_payment=Decimal('80'), status=status)
+        return [assignment.pk for assignment in created]
+
+    def _post(self, action, ids):
+        response = self.client.post('/api/v1/assignments/bulk-action/', {
+            'action': action, 'ids': ids,
+        }, format='json')
+        self.assertEqual(response.status_code, 200)
+        return response.data
+
+    def _bulk(self, action, ids):
+        with self.captureOnCommitCallbacks(execute=True):
+            return self._post(action, ids)
+
+    def test_confirm_reports_every_id_and_creates_payments(self, send_emails, *mocks):
+        pending = self._create('PENDING', 3)
+        completed, = self._create('COMPLETED', 1)
+
+        result = self._bulk('confirm', pending + [completed, 999999])
+
+        self.assertEqual(result['succeeded'], pending)
+        self.assertEqual(result['failed'], [
+            {'id': completed, 'reason': 'Cannot confirm in status COMPLETED'},
+            {'id': 999999, 'reason': 'Not found'},
+        ])
+        self.assertEqual(Assignment.objects.filter(status='CONFIRMED').count(), 3)
+        payments = InterpreterPayment.objects.filter(assignment_id__in=pending)
+        self.assertEqual(
+            sorted(payments.values_list('assignment_id', 'status', 'transaction__amount')),
+            [(pk, 'PENDING', Decimal('80')) for pk in pending],
+        )
+        self.assertEqual(AuditLog.objects.filter(action='BULK_CONFIRM').count(), 3)
+        send_emails.delay.assert_called_once_with(pending, 'confirmed')
+
+    def test_query_count_does_not_grow_with_the_batch(self, *mocks):
+        small = self._create('PENDING', 2)
+        large = self._create('PENDING', 20)
+
+        # after-commit handlers (stats, emails) are not run here
+        with CaptureQueriesContext(connection) as small_queries:
+            self._post('confirm', small)
+        with CaptureQueriesContext(connection) as large_queries:
+            self._post('confirm', large)
+
+        self.assertEqual(len(large_queries), len(small_queries))
+        self.assertEqual(InterpreterPayment.objects.count(), 22)
+
+    def test_payments_link_without_returned_ids(self, *mocks):
+        # MySQL: bulk_create leaves pk unset
+        pending = self._create('PENDING', 2)
+
+        with patch.object(type(connection.features), 'can_return_rows_from_bulk_insert', False):
+            self._bulk('confirm', pending)
+
+        self.assertEqual(
+            InterpreterPayment.objects.filter(
+                assignment_id__in=pending, transaction__description__startswith='Interpreter payment',
+            ).count(),
+            2,
+        )
+
+    def test_cancel_unassigns_and_cancels_payments(self, send_emails, *mocks):
+        confirmed = self._create('PENDING', 2)
+        self._bulk('confirm', confirmed)
+        send_emails.reset_mock()
+        paid = InterpreterPayment.objects.get(assignment_id=confirmed[1])
+        paid.status = 'COMPLETED'
+        paid.processed_date = timezone.now()
+        paid.save()
+
+        result = self._bulk('cancel', confirmed)
+
+        self.assertEqual(result['succeeded'], confirmed)
+        self.assertFalse(Assignment.objects.filter(pk__in=confirmed, interpreter__isnull=False).exists())
+        self.assertEqual(
+            list(InterpreterPayment.objects.filter(assignment_id__in=confirmed)
+                 .order_by('assignment_id').values_list('status', flat=True)),
+            ['CANCELLED', 'COMPLETED'],
+        )
+        send_emails.delay.assert_not_called()
+
+    def test_complete_creates_one_expense_per_payment(self, send_emails, *mocks):
+        assignments = self._create('PENDING', 3)
+        self._bulk('confirm', assignments[:2])
+        Assignment.objects.filter(pk=assignments[2]).update(status='CONFIRMED')
+
+        result = self._bulk('complete', assignments)
+
+        self.assertEqual(result['succeeded'], assignments)
+        self.assertEqual(Expense.objects.filter(status='PENDING', expense_type='SALARY').count(), 2)
+        self.assertFalse(Assignment.objects.filter(pk__in=assignments, completed_at__isnull=True).exists())
+        send_emails.delay.assert_called_with(assignments, 'completed')
+
+    def test_failed_write_rolls_back_the_batch(self, *mocks):
+        pending = self._create('PENDING', 2)
+
+        with patch('app.api.services.bulk_transitions._create_payments', side_effect=RuntimeError('boom')):
+            result = self._bulk('confirm', pending)
+
+        self.assertEqual(result['succeeded'], [])
+        self.assertEqual(result['failed'], [{'id': pk, 'reason': 'boom'} for pk in pending])
+        self.assertEqual(Assignment.objects.filter(status='PENDING').count(), 2)
+
+
+@patch('app.tasks.send_suspension_emails')
+class InterpreterBulkActionTest(FixtureMixin, TestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.admin = self.create_admin()
+        self.client = self.api_client(self.admin)
+        self.interpreters = [self.create_interpreter(f'i{n}') for n in range(3)]
+        self.ids = [interpreter.pk for interpreter in self.interpreters]
+
+    def _bulk(self, action, ids, **extra):
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.post('/api/v1/interpreters/bulk-action/', {
+                'action': action, 'ids': ids, **extra,
+            }, format='json')
+        self.assertEqual(response.status_code, 200)
+        return response.data
+
+    def test_block_skips_interpreters_already_blocked(self, send_emails):
+        Interpreter.objects.filter(pk=self.ids[0]).update(is_manually_blocked=True)
+
+        data = self._bulk('block', self.ids, reason='Late twice')
+
+        self.assertEqual(data['results'], {'success': 2, 'skipped': 1, 'failed': 0})
+        self.assertEqual(data['succeeded'], self.ids[1:])
+        self.assertEqual(data['skipped'], [{'id': self.ids[0], 'reason': 'Already blocked'}])
+        blocked = Interpreter.objects.get(pk=self.ids[1])
+        self.assertEqual((blocked.blocked_reason, blocked.blocked_by_id), ('Late twice', self.admin.pk))
+        self.assertEqual(AuditLog.objects.filter(action='BULK_BLOCK', model_name='Interpreter').count(), 2)
+
+    def test_suspend_is_one_update_and_one_email_job(self, send_emails):
+        with self.assertNumQueries(6):  # exists, savepoint, select, update, audit insert, release
+            data = self._bulk('suspend', self.ids, reason='Contract breach')
+
+        self.assertEqual(data['succeeded'], self.ids)
+        self.assertEqual(
+            Interpreter.objects.filter(is_manually_blocked=True, blocked_reason='Administrative Suspension').count(),
+            3,
+        )
+        send_emails.delay.assert_called_once_with(self.ids, 'Contract breach')
@@ -0,0 +1,259 @@
+"""Tests for app/services/calendar_reconciler.py — batched calendar reconciliation."""
+import itertools
+from datetime import timedelta
+from types import SimpleNamespace
+
+from django.core.cache import cache
+from django.test import SimpleTestCase, TestCase
+from django.utils import timezone
+
+from app.models import Assignment
+from app.services.calendar_reconciler import AdaptiveRateLimiter, reconcile
+from app.tests.factories import FixtureMixin
+
+
+class _HttpError(Exception):
+    def __init__(self, status, reason=''):
+        super().__init__(f'<HttpError {status} returned "{reason}">')
+        self.resp = SimpleNamespace(status=status)
+
+
+class _Request:
+    def __init__(self, run):
+        self._run = run
+
+    def execute(self):
+        return self._run()
+
+
+class _Batch:
+    def __init__(self, calendar, callback):
+        self._calendar = calendar
+        self._callback = callback
+        self._requests = []
+
+    def add(self, request, request_id=None, callback=None):
+        assert len(self._requests) < 50, 'Calendar batches are limited to 50 requests'
+        self._requests.append((request_id, request))
+
+    def execute(self):
+        self._calendar.batch_sizes.append(len(self._requests))
+        for request_id, request in self._requests:
+            if self._calendar.rate_limit_next:
+                self._calendar.rate_limit_next -= 1
+                self._callback(request_id, None, _HttpError(403, 'Rate Limit Exceeded'))
+                continue
+            try:
+                self._callback(request_id, request.execute(), None)
+            except _HttpError as exc:
+                self._callback(request_id, None, exc)
+
+
+class FakeCalendar:
+    """In-memory Calendar API v3: events(), batch requests and sync tokens."""
+
+    def __init__(self):
+        self.events_by_id = {}
+        self.changed_at = {}
+        self.version = 0
+        self.ids = itertools.count(1)
+        self.batch_sizes = []
+        self.rate_limit_next = 0
+        self.sync_tokens_valid = True
+
+    # -- service surface --------------------------------------------------
+    def events(self):
+        return self
+
+    def new_batch_http_request(self, callback=None):
+        return _Batch(self, callback)
+
+    def list(self, calendarId, syncToken=None, pageToken=None, **kwargs):
+        def run():
+            since = 0
+            if syncToken:
+                if not self.sync_tokens_valid:
+                    raise _HttpError(410, 'Sync token is no longer valid')
+                since = int(syncToken.split('-')[1])
+            items = [dict(self.events_by_id[eid]) for eid, at in self.changed_at.items() if at > since]
+            if not syncToken:
+                items = [e for e in items if e['status'] != 'cancelled']
+            return {'items': items, 'nextSyncToken': f'tok-{self.version}'}
+        return _Request(run)
+
+    def insert(self, calendarId, body, sendUpdates=None):
+        return _Request(lambda: self.put(f'evt-{next(self.ids)}', body))
+
+    def update(self, calendarId, eventId, body, sendUpdates=None):
+        def run():
+            self._live(eventId)
+            return self.put(eventId, body)
+        return _Request(run)
+
+    def delete(self, calendarId, eventId, sendUpdates=None):
+        def run():
+            self._live(eventId)
+            self._touch(eventId, {'id': eventId, 'status': 'cancelled'})
+        return _Request(run)
+
+    # -- helpers ----------------------------------------------------------
+    def put(self, event_id, body):
+        return self._touch(event_id, dict(body, id=event_id, status='confirmed'))
+
+    def live_for(self, assignment_id):
+        return [
+            e for e in self.events_by_id.values()
+            if e['status'] != 'cancelled'
+            and e['extendedProperties']['private']['assignment_id'] == str(assignment_id)
+        ]
+
+    def _live(self, event_id):
+        if self.events_by_id.get(event_id, {}).get('status', 'cancelled') == 'cancelled':
+            raise _HttpError(404, 'Not Found')
+
+    def _touch(self, event_id, event):
+        self.version += 1
+        self.events_by_id[event_id] = event
+        self.changed_at[event_id] = self.version
+        return dict(event)
+
+
+def _limiter():
+    return AdaptiveRateLimiter(clock=lambda: 0.0, sleep=lambda seconds: None)
+
+
+class ReconcileTest(FixtureMixin, TestCase):
+
+    def setUp(self):
+        super().setUp()
+        cache.clear()
+        self.calendar = FakeCalendar()
+        self.create_reference_data()
+        self.start = timezone.now() + timedelta(days=1)
+
+    def _assignment(self, **fields):
+        return self.bulk_assignments(
+            [fields], start_time=self.start, end_time=self.start + timedelta(hours=2),
+            status=Assignment.Status.CONFIRMED,
+        )[0]
+
+    def _run(self, **kwargs):
+        kwargs.setdefault('limiter', _limiter())
+        return reconcile(self.calendar, 'ops@example.com',
+                         since=timezone.now() - timedelta(days=1), **kwargs)
+
+    def test_backfill_creates_events_in_batches(self):
+        assignments = [self._assignment() for _ in range(120)]
+
+        stats = self._run(full=True)
+
+        self.assertEqual((stats['created'], stats['failed']), (120, 0))
+        self.assertEqual(self.calendar.batch_sizes, [50, 50, 20])
+        for assignment in assignments:
+            assignment.refresh_from_db()
+            self.assertEqual(assignment.gcal_sync_status, Assignment.GCalSyncStatus.SYNCED)
+            self.assertEqual(self.calendar.live_for(assignment.pk)[0]['id'], assignment.gcal_event_id)
+
+    def test_incremental_run_without_changes_makes_no_writes(self):
+        self._assignment()
+        self._run(full=True)
+
+        stats = self._run()
+
+        self.assertEqual(stats['mode'], 'incremental')
+        self.assertEqual((stats['created'], stats['updated'], stats['batches']), (0, 0, 0))
+
+    def test_repairs_drift_made_on_the_calendar(self):
+        edited, removed = self._assignment(), self._assignment()
+        self._run(full=True)
+        edited.refresh_from_db()
+        removed.refresh_from_db()
+        event = self.calendar.events_by_id[edited.gcal_event_id]
+        self.calendar.put(edited.gcal_event_id, dict(event, summary='Moved by hand'))
+        self.calendar.delete('ops', removed.gcal_event_id).execute()
+
+        stats = self._run()
+
+        self.assertEqual((stats['updated'], stats['created']), (1, 1))
+        self.assertNotEqual(self.calendar.live_for(edited.pk)[0]['summary'], 'Moved by hand')
+        removed.refresh_from_db()
+        self.assertEqual(self.calendar.live_for(removed.pk)[0]['id'], removed.gcal_event_id)
+
+    def test_removes_duplicates_orphans_and_cancelled(self):
+        kept, cancelled = self._assignment(), self._assignment()
+        self._run(full=True)
+        kept.refresh_from_db()
+        cancelled.refresh_from_db()
+        body = self.calendar.events_by_id[kept.gcal_event_id]
+        self.calendar.put('evt-dupe', body)
+        self.calendar.put('evt-orphan', dict(body, extendedProperties={'private': {'assignment_id': '999999'}}))
+        Assignment.objects.filter(pk=cancelled.pk).update(status=Assignment.Status.CANCELLED)
+
+        stats = self._run(full=True)
+
+        self.assertEqual(stats['deleted'], 3)
+        self.assertEqual([e['id'] for e in self.calendar.live_for(kept.pk)], [kept.gcal_event_id])
+        self.assertEqual(self.calendar.live_for(999999), [])
+        cancelled.refresh_from_db()
+        self.assertEqual(cancelled.gcal_sync_status, Assignment.GCalSyncStatus.DELETED)
+        self.assertIsNone(cancelled.gcal_event_id)
+
+    def test_links_events_created_by_an_interrupted_run(self):
+        assignment = self._assignment()
+        self._run(full=True)
+        Assignment.objects.filter(pk=assignment.pk).update(
+            gcal_event_id=None, gcal_sync_status=Assignment.GCalSyncStatus.PENDING,
+        )
+
+        stats = self._run(full=True)
+
+        self.assertEqual((stats['linked'], stats['created']), (1, 0))
+        self.assertEqual(len(self.calendar.live_for(assignment.pk)), 1)
+
+    def test_rate_limited_requests_are_retried_slower(self):
+        for _ in range(10):
+            self._assignment()
+        self.calendar.rate_limit_next = 4
+        limiter = _limiter()
+
+        stats = self._run(full=True, limiter=limiter)
+
+        self.assertEqual((stats['created'], stats['failed']), (10, 0))
+        self.assertEqual(self.calendar.batch_sizes, [10, 4])
+        self.assertEqual(limiter.rate, 3.0)
+
+    def test_expired_sync_token_falls_back_to_full_listing(self):
+        self._assignment()
+        self._run(full=True)
+        self.calendar.sync_tokens_valid = False
+
+        stats = self._run()
+
+        self.assertEqual(stats['mode'], 'full')
+        self.assertTrue(stats['ok'])
+
+    def test_dry_run_writes_nothing(self):
+        assignment = self._assignment()
+
+        stats = self._run(full=True, dry_run=True)
+
+        self.assertEqual(stats['created'], 1)
+        self.assertEqual(self.calendar.batch_sizes, [])
+        assignment.refresh_from_db()
+        self.assertEqual(assignment.gcal_sync_status, Assignment.GCalSyncStatus.PENDING)
+
+
+class AdaptiveRateLimiterTest(SimpleTestCase):
+
+    def test_paces_requests_and_backs_off(self):
+        now, slept = [0.0], []
+        limiter = AdaptiveRateLimiter(rate=10.0, clock=lambda: now[0], sleep=slept.append)
+
+        limiter.wait(50)
+        limiter.wait(50)
+        self.assertEqual(slept, [5.0])
+
+        limiter.throttled()
+        self.assertEqual(limiter.rate, 5.0)
+        limiter.success()
+        self.assertEqual(limiter.rate, 5.5)
@@ -0,0 +1,109 @@
+"""Tests for app/services/calendar_sync_dispatcher.py — debounced calendar pushes."""
+from unittest.mock import MagicMock, patch
+
+from django.core.cache import cache
+from django.test import SimpleTestCase, override_settings
+
+from app.services import calendar_sync_dispatcher as dispatcher
+
+CONFIGURED = dict(
+    GOOGLE_CALENDAR_ID='ops@example.com',
+    GOOGLE_SERVICE_ACCOUNT_JSON='{"type": "service_account"}',
+    GCAL_SYNC_DEBOUNCE_SECONDS=5,
+)
+
+
+def _mock_assignment(status='CONFIRMED', event_id='evt-1', sync_status='SYNCED'):
+    assignment = MagicMock()
+    assignment.pk = 7
+    assignment.status = status
+    assignment.gcal_event_id = event_id
+    assignment.gcal_sync_status = sync_status
+    return assignment
+
+
+@override_settings(**CONFIGURED)
+class RequestSyncTest(SimpleTestCase):
+
+    def setUp(self):
+        cache.clear()
+
+    @override_settings(GOOGLE_CALENDAR_ID='')
+    def test_not_configured_is_a_no_op(self):
+        with patch('app.tasks_calendar.sync_assignment_to_calendar') as task:
+            self.assertFalse(dispatcher.request_sync(7))
+        task.apply_async.assert_not_called()
+
+    @patch('app.tasks_calendar.sync_assignment_to_calendar')
+    def test_requests_within_window_coalesce(self, task):
+        scheduled = [dispatcher.request_sync(7) for _ in range(3)]
+
+        self.assertEqual(scheduled, [True, False, False])
+        task.apply_async.assert_called_once_with(args=[7], countdown=5)
+        metrics = dispatcher.get_metrics()
+        self.assertEqual((metrics['requested'], metrics['coalesced'], metrics['depth']), (3, 2, 1))
+
+    @patch('app.services.calendar_sync_dispatcher._get_local_executor')
+    @patch('app.tasks_calendar.sync_assignment_to_calendar')
+    def test_falls_back_to_bounded_local_worker(self, task, get_executor):
+        task.apply_async.side_effect = ConnectionError('broker down')
+
+        with patch.object(dispatcher.time, 'monotonic', return_value=100.0):
+            dispatcher.request_sync(7)
+            dispatcher.request_sync(7)
+
+        get_executor.return_value.submit.assert_called_once_with(dispatcher._run_local, 7, 105.0)
+
+    @patch('app.services.calendar_sync_dispatcher.flush')
+    def test_local_worker_waits_out_the_debounce(self, flush):
+        with patch.object(dispatcher.time, 'monotonic', return_value=100.0), \
+                patch.object(dispatcher.time, 'sleep') as sleep:
+            dispatcher._run_local(7, 105.0)
+
+        sleep.assert_called_once_with(5.0)
+        flush.assert_called_once_with(7)
+
+
+@override_settings(**CONFIGURED)
+class FlushTest(SimpleTestCase):
+
+    def setUp(self):
+        cache.clear()
+
+    def _flush(self, assignment, fingerprint='fp-1'):
+        with patch('app.api.services.calendar_service.load_assignment', return_value=assignment), \
+                patch('app.api.services.calendar_service.sync_assignment',
+                      return_value={'ok': True, 'event_id': 'evt-1'}) as sync, \
+                patch.object(dispatcher, 'event_fingerprint', return_value=fingerprint):
+            result = dispatcher.flush(7)
+        return result, sync
+
+    @patch('app.tasks_calendar.sync_assignment_to_calendar')
+    def test_flush_releases_pending_slot(self, _task):
+        dispatcher.request_sync(7)
+        self._flush(_mock_assignment())
+        self.assertTrue(dispatcher.request_sync(7))
+
+    def test_unchanged_event_is_not_pushed_twice(self):
+        _result, sync = self._flush(_mock_assignment())
+        sync.assert_called_once()
+
+        result, sync = self._flush(_mock_assignment())
+        sync.assert_not_called()
+        self.assertEqual(result['reason'], 'unchanged')
+
+    def test_changed_event_is_pushed(self):
+        self._flush(_mock_assignment(), fingerprint='fp-1')
+        _result, sync = self._flush(_mock_assignment(), fingerprint='fp-2')
+        sync.assert_called_once()
+
+    def test_force_drops_fingerprint(self):
+        self._flush(_mock_assignment())
+        with patch('app.tasks_calendar.sync_assignment_to_calendar'):
+            dispatcher.request_sync(7, force=True)
+        _result, sync = self._flush(_mock_assignment())
+        sync.assert_called_once()
+
+    def test_cancelled_without_event_is_a_no_op(self):
+        _result, sync = self._flush(_mock_assignment('CANCELLED', None, 'DELETED'))
+        sync.assert_not_called()
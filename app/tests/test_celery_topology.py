@@ -0,0 +1,96 @@
+"""Tests for config/celery_topology.py and app/services/task_metrics.py."""
+import io
+import time
+from types import SimpleNamespace
+from unittest.mock import patch
+
+from django.core.cache import cache
+from django.core.management import call_command
+from django.test import SimpleTestCase
+
+from app.services import task_metrics
+from config import celery_topology
+from config.celery import app as celery_app
+
+
+def _route(task_name):
+    route = celery_app.amqp.router.route({}, task_name)
+    return route['queue'].name, route.get('priority')
+
+
+class TopologyTest(SimpleTestCase):
+
+    def test_tasks_are_routed_by_kind(self):
+        self.assertEqual(_route('app.tasks.send_assignment_status_email')[0], 'emails')
+        self.assertEqual(_route('app.tasks_calendar.sync_assignment_to_calendar')[0], 'calendar')
+        self.assertEqual(_route('app.tasks_exports.run_background_export')[0], 'reports')
+        self.assertEqual(_route('config.celery.debug_task')[0], 'default')
+
+    def test_bulk_calendar_work_yields_to_single_syncs(self):
+        self.assertEqual(_route('app.tasks_calendar.bulk_backfill_calendar'),
+                         ('calendar', celery_topology.PRIORITY_BULK))
+        self.assertEqual(_route('app.tasks_calendar.reconcile_calendar'),
+                         ('calendar', celery_topology.PRIORITY_LOW))
+
+    def test_queue_defaults_do_not_override_decorator_options(self):
+        import app.tasks  # noqa: F401
+        import app.tasks_calendar  # noqa: F401
+
+        email = celery_app.tasks['app.tasks.send_assignment_status_email']
+        self.assertEqual((email.rate_limit, email.time_limit), ('10/s', 60))
+        self.assertFalse(email.acks_late)
+
+        calendar = celery_app.tasks['app.tasks_calendar.sync_assignment_to_calendar']
+        self.assertEqual(calendar.rate_limit, '5/s')
+        self.assertTrue(calendar.reject_on_worker_lost)
+
+    def test_worker_command_reflects_profile(self):
+        command = celery_topology.worker_command('reports')
+        self.assertIn('-Q reports', command)
+        self.assertIn('--prefetch-multiplier=1', command)
+        self.assertIn('--max-tasks-per-child=20', command)
+
+
+class TaskMetricsTest(SimpleTestCase):
+
+    def setUp(self):
+        cache.clear()
+
+    def _run_task(self, task_id, queue, waited, state):
+        request = SimpleNamespace(delivery_info={'routing_key': queue}, eta=None,
+                                  published_at=time.time() - waited)
+        task_metrics._record_start(task_id=task_id, task=SimpleNamespace(request=request))
+        task_metrics._record_end(task_id=task_id, state=state)
+
+    def test_wait_time_and_outcomes_are_counted_per_queue(self):
+        self._run_task('a', 'emails', waited=2, state='SUCCESS')
+        self._run_task('b', 'emails', waited=4, state='FAILURE')
+        self._run_task('c', 'calendar', waited=0, state='RETRY')
+
+        metrics = task_metrics.get_queue_metrics(['emails', 'calendar'])
+
+        emails = metrics['emails']
+        self.assertEqual((emails['started'], emails['succeeded'], emails['failed']), (2, 1, 1))
+        self.assertGreaterEqual(emails['wait_ms_avg'], 3000)
+        self.assertGreaterEqual(emails['wait_ms_max'], 4000)
+        self.assertEqual(metrics['calendar']['retried'], 1)
+
+    def test_publish_stamps_header(self):
+        headers = {}
+        task_metrics._stamp_published(headers=headers)
+        self.assertAlmostEqual(headers['published_at'], time.time(), delta=5)
+
+    @patch('app.management.commands.celery_queues.worker_load')
+    @patch('app.management.commands.celery_queues.queue_backlog')
+    def test_command_reports_every_queue(self, backlog, load):
+        queues = list(celery_topology.QUEUES)
+        backlog.return_value = {queue: 3 for queue in queues}
+        load.return_value = {queue: {'workers': 1, 'active': 0, 'reserved': 0} for queue in queues}
+        self._run_task('a', 'emails', waited=1, state='SUCCESS')
+        out = io.StringIO()
+
+        call_command('celery_queues', stdout=out)
+
+        lines = out.getvalue().splitlines()
+        self.assertEqual([line.split()[0] for line in lines[1:]], queues)
+        self.assertTrue(lines[2].startswith('emails'))
@@ -0,0 +1,123 @@
+"""Request instrumentation middleware, /metrics and the Django hooks."""
+import dataclasses
+import os
+import tempfile
+
+import requests
+from django.core.cache import cache
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient
+
+from app.models import Language
+from app.services import instrumentation as django_instrumentation
+from app.tests.factories import FixtureMixin
+from shared import instrumentation
+
+
+class _FakeAdapter(requests.adapters.BaseAdapter):
+    def send(self, request, **kwargs):
+        response = requests.Response()
+        response.status_code = 202
+        response.url = request.url
+        return response
+
+    def close(self):
+        pass
+
+
+class InstrumentationTest(FixtureMixin, TestCase):
+
+    def setUp(self):
+        super().setUp()
+        saved = dataclasses.replace(instrumentation.config)
+        self.addCleanup(lambda: instrumentation.configure(**dataclasses.asdict(saved)))
+        self.admin = self.create_admin()
+        self.api = self.api_client(self.admin)
+        Language.objects.create(name='French', code='fr')
+
+    def test_server_timing_reports_the_request_queries(self):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.api.get('/api/v1/languages/')
+
+        self.assertEqual(response.status_code, 200)
+        self.assertIn(f'desc="{len(queries)} queries"', response['Server-Timing'])
+        self.assertRegex(response['Server-Timing'], r'^db;dur=[\d.]+;.*total;dur=[\d.]+$')
+
+    @override_settings(METRICS_TOKEN='scrape-me')
+    def test_metrics_count_requests_by_url_name(self):
+        before = instrumentation.REQUESTS.value(method='GET', route='api:language-list', status='200')
+        self.api.get('/api/v1/languages/')
+
+        response = self.client.get('/metrics', HTTP_AUTHORIZATION='Bearer scrape-me')
+
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response['Content-Type'].startswith('text/plain; version=0.0.4'))
+        self.assertEqual(
+            instrumentation.REQUESTS.value(method='GET', route='api:language-list', status='200'), before + 1,
+        )
+        body = response.content.decode()
+        self.assertIn('http_requests_total{method="GET",route="api:language-list",status="200"}', body)
+        self.assertIn('# TYPE http_request_duration_seconds histogram', body)
+
+    @override_settings(METRICS_TOKEN='scrape-me')
+    def test_metrics_token(self):
+        self.assertEqual(self.client.get('/metrics').status_code, 401)
+        self.assertEqual(self.client.get('/metrics', HTTP_AUTHORIZATION='Bearer guess').status_code, 401)
+        self.assertEqual(
+            self.client.get('/metrics', HTTP_AUTHORIZATION='Bearer scrape-me').status_code, 200,
+        )
+
+    @override_settings(METRICS_TOKEN='')
+    def test_metrics_are_not_served_without_a_token(self):
+        self.assertEqual(self.client.get('/metrics').status_code, 404)
+
+    def test_cache_hits_and_misses(self):
+        django_instrumentation.instrument_caches()
+        cache.set('instrumented', 0)
+        stats, token = instrumentation.begin()
+        try:
+            self.assertEqual(cache.get('instrumented'), 0)  # a falsy value is still a hit
+            self.assertEqual(cache.get('absent', 'default'), 'default')
+            self.assertEqual(cache.get_many(['instrumented', 'absent']), {'instrumented': 0})
+        finally:
+            instrumentation.end(token)
+
+        self.assertEqual((stats.cache_hits, stats.cache_misses), (2, 2))
+
+    @override_settings(INSTRUMENTATION_SLOW_QUERY_MS=0)
+    def test_slow_queries_are_logged_without_parameters(self):
+        with self.assertLogs('shared.instrumentation', 'WARNING') as logs:
+            self.api.get('/api/v1/languages/', {'search': 'secret-term'})
+
+        self.assertTrue(any('Slow query' in line for line in logs.output))
+        self.assertFalse(any('secret-term' in line for line in logs.output))
+
+    def test_sampled_slow_request_is_profiled(self):
+        with tempfile.TemporaryDirectory() as profile_dir, self.settings(
+            INSTRUMENTATION_PROFILE_SAMPLE_RATE=1.0, INSTRUMENTATION_SLOW_REQUEST_MS=0,
+            INSTRUMENTATION_PROFILE_DIR=profile_dir,
+        ):
+            # the middleware applies the settings when the client loads it
+            with self.assertLogs('shared.instrumentation', 'WARNING'):
+                APIClient().get('/api/v1/languages/')
+
+            dumps = os.listdir(profile_dir)
+            self.assertEqual(len(dumps), 1)
+            self.assertIn('api-language-list', dumps[0])
+
+    def test_outbound_calls_are_timed_by_target(self):
+        instrumentation.install_http_hooks()
+        session = requests.Session()
+        session.mount('https://', _FakeAdapter())
+        before = instrumentation.OUTBOUND_REQUESTS.value(target='resend', status='202')
+
+        stats, token = instrumentation.begin()
+        try:
+            session.post('https://api.resend.com/emails', json={})
+        finally:
+            instrumentation.end(token)
+
+        self.assertEqual(stats.http_count, 1)
+        self.assertEqual(instrumentation.OUTBOUND_REQUESTS.value(target='resend', status='202'), before + 1)
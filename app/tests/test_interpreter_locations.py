@@ -0,0 +1,107 @@
+"""Latest-location projection for interpreter list/detail (no GPS history load)."""
+from datetime import timedelta
+
+from django.db import connection
+from django.db.models.signals import post_init
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from app.models import InterpreterLocation
+from app.tests.factories import FixtureMixin
+
+
+class LatestLocationTest(FixtureMixin, TestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.client = self.api_client(self.create_admin())
+        self.interpreters = [self.create_interpreter(f'i{n}') for n in range(3)]
+        self.now = timezone.now()
+
+    def _record(self, points_each):
+        """Add *points_each* positions per interpreter; the newest is on a mission at lat 42.<n>."""
+        rows = []
+        for n, interpreter in enumerate(self.interpreters):
+            for age in range(points_each, 0, -1):
+                rows.append(InterpreterLocation(
+                    interpreter=interpreter, latitude=40 + age, longitude=-71,
+                    is_on_mission=False,
+                ))
+            rows.append(InterpreterLocation(
+                interpreter=interpreter, latitude=float(f'42.{n}'), longitude=-71, is_on_mission=True,
+            ))
+        InterpreterLocation.objects.bulk_create(rows)
+        # auto_now_add stamps one time; spread history so the newest row is unambiguous
+        for age, location in enumerate(InterpreterLocation.objects.order_by('-pk')):
+            InterpreterLocation.objects.filter(pk=location.pk).update(
+                timestamp=self.now - timedelta(seconds=age if location.is_on_mission else 1000 + age),
+            )
+
+    def _list(self):
+        loaded = []
+
+        def count(sender, instance, **kwargs):
+            loaded.append(instance)
+
+        post_init.connect(count, sender=InterpreterLocation)
+        try:
+            with self.assertNumQueries(4) as ctx:  # count, page, languages, latest locations
+                response = self.client.get('/api/v1/interpreters/')
+        finally:
+            post_init.disconnect(count, sender=InterpreterLocation)
+        self.assertEqual(response.status_code, 200)
+        return response.data['results'], len(loaded), len(ctx.captured_queries)
+
+    def test_list_loads_one_location_per_interpreter_as_history_grows(self):
+        self._record(points_each=2)
+        results, small_loaded, small_queries = self._list()
+        self._record(points_each=50)
+        results, big_loaded, big_queries = self._list()
+
+        self.assertEqual((small_loaded, big_loaded), (3, 3))
+        self.assertEqual(small_queries, big_queries)
+        by_id = {row['id']: row for row in results}
+        for n, interpreter in enumerate(self.interpreters):
+            self.assertEqual(by_id[interpreter.pk]['lat'], float(f'42.{n}'))
+            self.assertTrue(by_id[interpreter.pk]['is_on_mission'])
+
+    def test_interpreter_without_history(self):
+        results, loaded, _ = self._list()
+        self.assertEqual(loaded, 0)
+        self.assertEqual({(row['lat'], row['is_on_mission']) for row in results}, {(None, False)})
+
+    def test_detail_and_live_locations_use_newest_row(self):
+        self._record(points_each=5)
+        interpreter = self.interpreters[1]
+
+        detail = self.client.get(f'/api/v1/interpreters/{interpreter.pk}/').data
+        live = self.client.get('/api/v1/interpreters/live-locations/').data
+
+        self.assertEqual(detail['lat'], 42.1)
+        self.assertEqual(len(live), 3)
+        self.assertEqual({row['latitude'] for row in live}, {42.0, 42.1, 42.2})
+
+    def test_prefetch_numbers_only_the_requested_interpreters_rows(self):
+        # Interpreters outside the request must not cost a lookup each
+        self.interpreters += [self.create_interpreter(f'other{n}') for n in range(40)]
+        self._record(points_each=3)
+
+        with CaptureQueriesContext(connection) as ctx:
+            detail = self.client.get(f'/api/v1/interpreters/{self.interpreters[1].pk}/').data
+        sql, = [q['sql'] for q in ctx.captured_queries if 'app_interpreter_location' in q['sql']]
+        with connection.cursor() as cursor:
+            cursor.execute(f'EXPLAIN QUERY PLAN {sql}')
+            plan = [row[-1] for row in cursor.fetchall()]
+
+        self.assertEqual(detail['lat'], 42.1)
+        self.assertTrue(any(
+            step.startswith('SEARCH app_interpreter_location USING INDEX') and '(interpreter_id=?)' in step
+            for step in plan
+        ), plan)
+        # Only the window's derived tables are scanned, no interpreter or location table
+        table_scans = [
+            step for step in plan
+            if step.startswith('SCAN') and step != 'SCAN qualify' and not step.startswith('SCAN (subquery')
+        ]
+        self.assertEqual(table_scans, [], plan)
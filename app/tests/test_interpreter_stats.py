@@ -0,0 +1,200 @@
+"""Denormalised InterpreterStats: signal-driven refresh, nightly rebuild, API reads."""
+from datetime import timedelta
+from decimal import Decimal
+from unittest.mock import patch
+
+from django.core.management import call_command
+from django.db import connection, transaction
+from django.db.models import QuerySet
+from django.test import TestCase
+from django.utils import timezone
+
+from app.models import (
+    Assignment, AssignmentFeedback, FinancialTransaction, InterpreterPayment, InterpreterStats,
+)
+from app.services import interpreter_stats
+from app.tests.factories import FixtureMixin
+
+
+@patch('app.services.calendar_sync_dispatcher.request_sync')
+@patch('app.tasks.send_assignment_status_emails')
+@patch('app.tasks.send_assignment_status_email')
+class InterpreterStatsTest(FixtureMixin, TestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.admin = self.create_admin()
+        self.interpreters = [self.create_interpreter(f'i{n}') for n in range(2)]
+        self.create_reference_data()
+        self.start = timezone.now() - timedelta(days=3)
+
+    def _assignments(self, interpreter, *statuses):
+        created = self.bulk_assignments([
+            dict(status=status, start_time=self.start + timedelta(hours=n),
+                 end_time=self.start + timedelta(hours=n + 1))
+            for n, status in enumerate(statuses)
+        ], interpreter=interpreter)
+        # Re-read so saves can diff
+        return list(Assignment.objects.filter(pk__in=[a.pk for a in created]).order_by('pk'))
+
+    def _stats(self, interpreter):
+        return InterpreterStats.objects.get(interpreter=interpreter)
+
+    def test_compute_aggregates_every_source_table(self, *mocks):
+        interpreter = self.interpreters[0]
+        done, _, _, _ = self._assignments(interpreter, 'COMPLETED', 'CONFIRMED', 'CANCELLED', 'NO_SHOW')
+        AssignmentFeedback.objects.bulk_create([
+            AssignmentFeedback(assignment=done, rating=4, created_by=self.admin),
+        ])
+
+        stats = interpreter_stats.compute([interpreter.pk])[interpreter.pk]
+
+        self.assertEqual(
+            (stats['missions_completed'], stats['missions_accepted'],
+             stats['missions_cancelled'], stats['missions_no_show']),
+            (1, 2, 1, 1),
+        )
+        self.assertEqual((stats['acceptance_rate'], stats['no_show_rate']), (66.7, 50.0))
+        self.assertEqual((stats['avg_rating'], stats['ratings_count']), (4, 1))
+        self.assertEqual(stats['last_mission_date'], done.start_time)
+
+    def test_avg_rating_counts_feedback_on_any_status(self, *mocks):
+        interpreter = self.interpreters[0]
+        done, cancelled = self._assignments(interpreter, 'COMPLETED', 'CANCELLED')
+        AssignmentFeedback.objects.bulk_create([
+            AssignmentFeedback(assignment=done, rating=5, created_by=self.admin),
+            AssignmentFeedback(assignment=cancelled, rating=2, created_by=self.admin),
+        ])
+
+        stats = interpreter_stats.compute([interpreter.pk])[interpreter.pk]
+
+        # Same population as the per-request Avg() the row replaced
+        self.assertEqual((stats['avg_rating'], stats['ratings_count']), (3.5, 2))
+
+    def test_refresh_upserts_without_conflict_target_on_mysql(self, *mocks):
+        interpreter = self.interpreters[0]
+        features = connection.features
+        with patch.object(features, 'supports_update_conflicts_with_target', False), \
+                patch.object(QuerySet, 'bulk_create') as bulk_create:
+            interpreter_stats.refresh([interpreter.pk])
+
+        _, kwargs = bulk_create.call_args
+        self.assertTrue(kwargs['update_conflicts'])
+        self.assertNotIn('unique_fields', kwargs)
+
+    def test_status_change_refreshes_once_after_commit(self, *mocks):
+        interpreter = self.interpreters[0]
+        first, second = self._assignments(interpreter, 'CONFIRMED', 'CONFIRMED')
+
+        with self.captureOnCommitCallbacks(execute=True):
+            for assignment in (first, second):
+                assignment.status = 'COMPLETED'
+                assignment.save()
+            self.assertFalse(InterpreterStats.objects.filter(interpreter=interpreter).exists())
+
+        self.assertEqual(self._stats(interpreter).missions_completed, 2)
+
+    def test_rolled_back_transaction_starts_a_new_batch(self, *mocks):
+        first, second = self.interpreters
+
+        with patch.object(interpreter_stats, 'refresh') as refresh:
+            with self.captureOnCommitCallbacks(execute=True) as callbacks:
+                with self.assertRaises(RuntimeError), transaction.atomic():
+                    interpreter_stats.schedule_refresh([first.pk])
+                    raise RuntimeError
+                interpreter_stats.schedule_refresh([second.pk])
+
+        self.assertEqual(len(callbacks), 1)
+        refresh.assert_called_once_with({second.pk}, using='default')
+
+    def test_reassignment_refreshes_both_interpreters(self, *mocks):
+        old, new = self.interpreters
+        assignment, = self._assignments(old, 'COMPLETED')
+        interpreter_stats.refresh([old.pk])
+
+        with self.captureOnCommitCallbacks(execute=True):
+            assignment.interpreter = new
+            assignment.save()
+
+        self.assertEqual(self._stats(old).missions_completed, 0)
+        self.assertEqual(self._stats(new).missions_completed, 1)
+
+    def test_bulk_transition_refreshes_touched_interpreters(self, *mocks):
+        for interpreter in self.interpreters:
+            self._assignments(interpreter, 'CONFIRMED')
+
+        with self.captureOnCommitCallbacks(execute=True):
+            Assignment.objects.all().bulk_transition('COMPLETED')
+
+        for interpreter in self.interpreters:
+            self.assertEqual(self._stats(interpreter).missions_completed, 1)
+
+    def test_feedback_refresh(self, *mocks):
+        interpreter = self.interpreters[0]
+        assignment, = self._assignments(interpreter, 'COMPLETED')
+
+        with self.captureOnCommitCallbacks(execute=True):
+            AssignmentFeedback.objects.create(assignment=assignment, rating=5, created_by=self.admin)
+        self.assertEqual(self._stats(interpreter).avg_rating, 5)
+
+    def test_feedback_delete_refresh(self, *mocks):
+        interpreter = self.interpreters[0]
+        assignment, = self._assignments(interpreter, 'COMPLETED')
+        AssignmentFeedback.objects.bulk_create([
+            AssignmentFeedback(assignment=assignment, rating=2, created_by=self.admin),
+        ])
+        interpreter_stats.refresh([interpreter.pk])
+
+        with self.captureOnCommitCallbacks(execute=True):
+            AssignmentFeedback.objects.all().delete()
+
+        self.assertIsNone(self._stats(interpreter).avg_rating)
+
+    def test_payment_refresh(self, *mocks):
+        interpreter = self.interpreters[0]
+        assignment, = self._assignments(interpreter, 'COMPLETED')
+
+        with self.captureOnCommitCallbacks(execute=True):
+            InterpreterPayment.objects.create(
+                transaction=FinancialTransaction.objects.create(
+                    type='EXPENSE', amount=Decimal('80'), description='Mission', created_by=self.admin,
+                ),
+                interpreter=interpreter, assignment=assignment, amount=Decimal('80'),
+                payment_method='ACH', status='COMPLETED', scheduled_date=timezone.now(),
+                processed_date=timezone.now(), reference_number='PAY-1',
+            )
+
+        self.assertEqual(self._stats(interpreter).total_earned, Decimal('80'))
+
+    def test_rebuild_repairs_writes_that_bypass_signals(self, *mocks):
+        interpreter = self.interpreters[0]
+        self._assignments(interpreter, 'CONFIRMED', 'CONFIRMED')
+        interpreter_stats.rebuild()
+        Assignment.objects.update(status='COMPLETED')
+        self.assertEqual(self._stats(interpreter).missions_completed, 0)
+
+        call_command('rebuild_interpreter_stats', batch_size=1, stdout=open('/dev/null', 'w'))
+
+        self.assertEqual(self._stats(interpreter).missions_completed, 2)
+        self.assertEqual(InterpreterStats.objects.count(), len(self.interpreters))
+
+    def test_endpoints_read_the_stats_row(self, *mocks):
+        interpreter = self.interpreters[0]
+        self._assignments(interpreter, *['COMPLETED'] * 5)
+        interpreter_stats.rebuild()
+        client = self.api_client(self.admin)
+
+        with self.assertNumQueries(3):  # interpreter joined to stats, languages, latest location
+            response = client.get(f'/api/v1/interpreters/{interpreter.pk}/performance/')
+        self.assertEqual(response.data['missions_completed'], 5)
+
+        response = client.get('/api/v1/interpreters/')
+        by_id = {row['id']: row for row in response.data['results']}
+        self.assertEqual(by_id[interpreter.pk]['missions_count'], 5)
+        self.assertEqual(by_id[self.interpreters[1].pk]['missions_count'], 0)
+
+    def test_missing_row_reads_as_zero(self, *mocks):
+        stats = InterpreterStats.for_interpreter(self.interpreters[0])
+
+        self.assertTrue(stats._state.adding)
+        self.assertEqual((stats.missions_completed, stats.avg_rating), (0, None))
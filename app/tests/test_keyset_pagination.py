@@ -0,0 +1,74 @@
+"""Tests for app/api/pagination.py — KeysetPagination."""
+from django.test import TestCase
+from rest_framework.exceptions import NotFound
+from rest_framework.request import Request
+from rest_framework.test import APIRequestFactory
+
+from app.api.pagination import KeysetPagination, approximate_count
+from app.models import AuditLog
+
+
+class _Pagination(KeysetPagination):
+    page_size = 3
+
+
+def _request(url):
+    return Request(APIRequestFactory().get(url))
+
+
+class KeysetPaginationTest(TestCase):
+
+    def setUp(self):
+        for i in range(8):
+            AuditLog.objects.create(action=f'A{i}', model_name='M', object_id=str(i), changes={})
+        self.qs = AuditLog.objects.order_by('-timestamp')
+
+    def _page(self, url):
+        paginator = _Pagination()
+        rows = paginator.paginate_queryset(self.qs, _request(url))
+        return paginator, [r.action for r in rows], paginator.get_paginated_response([]).data
+
+    def test_walks_all_pages_with_next_links(self):
+        seen, url = [], '/audit/'
+        while url:
+            _paginator, actions, data = self._page(url)
+            seen.extend(actions)
+            url = data['next']
+        self.assertEqual(seen, [f'A{i}' for i in range(7, -1, -1)])
+
+    def test_previous_link_returns_prior_page(self):
+        _p, first, data = self._page('/audit/')
+        _p, _second, data = self._page(data['next'])
+        _p, back, data = self._page(data['previous'])
+        self.assertEqual(back, first)
+        self.assertIsNone(data['previous'])
+
+    def test_deep_page_query_has_no_offset_or_count(self):
+        _p, _actions, data = self._page('/audit/')
+        paginator = _Pagination()
+        with self.assertNumQueries(1) as ctx:
+            paginator.paginate_queryset(self.qs, _request(data['next']))
+        sql = ctx.captured_queries[0]['sql'].upper()
+        self.assertNotIn('OFFSET', sql)
+        self.assertNotIn('COUNT(', sql)
+
+    def test_count_is_opt_in(self):
+        _p, _a, data = self._page('/audit/')
+        self.assertNotIn('count', data)
+        _p, _a, data = self._page('/audit/?count=exact')
+        self.assertEqual((data['count'], data['count_is_estimate']), (8, False))
+
+    def test_cursor_from_other_ordering_is_rejected(self):
+        _p, _a, data = self._page('/audit/')
+        self.qs = AuditLog.objects.order_by('action')
+        with self.assertRaises(NotFound):
+            self._page(data['next'])
+
+    def test_page_param_keeps_page_number_response(self):
+        _p, actions, data = self._page('/audit/?page=2')
+        self.assertEqual(actions, ['A4', 'A3', 'A2'])
+        self.assertEqual(data['count'], 8)
+
+    def test_approximate_count_is_capped(self):
+        self.assertEqual(approximate_count(AuditLog.objects.filter(model_name='M'), 5), (5, True))
+        self.assertEqual(approximate_count(AuditLog.objects.filter(action='A1'), 5), (1, False))
@@ -0,0 +1,83 @@
+"""Tests for app/api/services/pdf_cache_service.py — content-addressed PDF cache."""
+import io
+from unittest.mock import MagicMock
+
+from django.core.cache import cache
+from django.test import SimpleTestCase, override_settings
+
+from app.api.services.pdf_cache_service import (
+    build_cache_key, compute_fingerprint, get_or_render, invalidate_pdf_cache, pdf_response,
+)
+
+IN_MEMORY_STORAGES = {
+    'default': {'BACKEND': 'django.core.files.storage.InMemoryStorage'},
+    'staticfiles': {'BACKEND': 'django.contrib.staticfiles.storage.StaticFilesStorage'},
+    'pdf_cache': {'BACKEND': 'django.core.files.storage.InMemoryStorage'},
+}
+
+
+class FingerprintTest(SimpleTestCase):
+    """Keys depend on the data and the template version only."""
+
+    def test_key_order_does_not_matter(self):
+        self.assertEqual(
+            compute_fingerprint('paystub', {'a': 1, 'b': 2}),
+            compute_fingerprint('paystub', {'b': 2, 'a': 1}),
+        )
+
+    def test_data_change_changes_key(self):
+        self.assertNotEqual(
+            build_cache_key('paystub', {'amount': '10.00'}),
+            build_cache_key('paystub', {'amount': '10.01'}),
+        )
+
+    def test_kind_is_part_of_key(self):
+        key = build_cache_key('earnings_summary', {'x': 1})
+        self.assertTrue(key.startswith('earnings_summary/'))
+        self.assertTrue(key.endswith('.pdf'))
+
+
+@override_settings(STORAGES=IN_MEMORY_STORAGES, PDF_RENDER_CACHE_ENABLED=True)
+class GetOrRenderTest(SimpleTestCase):
+    """Repeat requests for the same data skip rendering."""
+
+    def setUp(self):
+        cache.clear()
+
+    def test_second_call_is_served_from_storage(self):
+        render = MagicMock(return_value=io.BytesIO(b'%PDF-1.4 one'))
+
+        first = get_or_render('paystub', {'n': 1}, render, owner_id=7)
+        second = get_or_render('paystub', {'n': 1}, render, owner_id=7)
+
+        self.assertEqual(first, b'%PDF-1.4 one')
+        self.assertEqual(second, b'%PDF-1.4 one')
+        render.assert_called_once()
+
+    def test_invalidate_forces_rerender(self):
+        render = MagicMock(side_effect=lambda: io.BytesIO(b'%PDF-1.4'))
+
+        get_or_render('paystub', {'n': 2}, render, owner_id=8)
+        invalidate_pdf_cache('paystub', 8)
+        get_or_render('paystub', {'n': 2}, render, owner_id=8)
+
+        self.assertEqual(render.call_count, 2)
+
+    def test_cache_hit_streams_from_storage(self):
+        render = MagicMock(return_value=io.BytesIO(b'%PDF-1.4 stream'))
+        get_or_render('paystub', {'n': 3}, render)
+
+        response = pdf_response('paystub', {'n': 3}, render, filename='paystub-X.pdf')
+
+        self.assertEqual(b''.join(response.streaming_content), b'%PDF-1.4 stream')
+        self.assertIn('paystub-X.pdf', response['Content-Disposition'])
+        render.assert_called_once()
+
+    @override_settings(PDF_RENDER_CACHE_ENABLED=False)
+    def test_disabled_always_renders(self):
+        render = MagicMock(side_effect=lambda: io.BytesIO(b'%PDF-1.4'))
+
+        get_or_render('paystub', {'n': 4}, render)
+        get_or_render('paystub', {'n': 4}, render)
+
+        self.assertEqual(render.call_count, 2)
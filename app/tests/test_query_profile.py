@@ -0,0 +1,47 @@
+"""EXPLAIN-based hot query report and the indexes derived from it."""
+import json
+from io import StringIO
+
+from django.core.management import call_command
+from django.test import SimpleTestCase, TestCase
+
+from app.models import Assignment, EmailLog
+from app.services import query_profile
+from app.tests.factories import FixtureMixin
+
+# Bare boolean predicates: SQLite-only scans (see query_profile)
+SQLITE_BOOLEAN_SCANS = {
+    'available_interpreters', 'interpreters_in_state', 'unresolved_emails', 'unprocessed_emails',
+}
+
+
+class QueryProfileTest(FixtureMixin, TestCase):
+
+    def test_hot_queries_use_an_index(self):
+        report = query_profile.profile()
+
+        flagged = {entry['name'] for entry in report if entry['full_scans']}
+        self.assertEqual(flagged, SQLITE_BOOLEAN_SCANS)
+
+    def test_command_seeds_inside_a_rolled_back_transaction(self):
+        out = StringIO()
+        call_command('profile_queries', seed=30, stdout=out)
+
+        self.assertIn(f'{len(query_profile.HOT_QUERIES)} queries, 4 with full scans', out.getvalue())
+        self.assertFalse(Assignment.objects.exists())
+        self.assertFalse(EmailLog.objects.exists())
+
+
+class PlanParsingTest(SimpleTestCase):
+
+    def test_sqlite_scan_lines(self):
+        plan = '2 0 0 SCAN app_invoice\n4 0 0 SEARCH app_client USING INTEGER PRIMARY KEY (rowid=?)'
+        self.assertEqual(query_profile._SQLITE_SCAN.findall(plan), ['app_invoice'])
+        self.assertEqual(query_profile._SQLITE_SCAN.findall('3 0 0 SCAN CONSTANT ROW'), [])
+
+    def test_mysql_json_plan(self):
+        plan = json.loads('''{"query_block": {"nested_loop": [
+            {"table": {"table_name": "app_invoice", "access_type": "ALL"}},
+            {"table": {"table_name": "app_client", "access_type": "eq_ref"}}
+        ]}}''')
+        self.assertEqual(query_profile._mysql_scans(plan, []), ['app_invoice'])
@@ -0,0 +1,119 @@
+"""Tests for app/services/rate_limiter.py and the cache-backed login lockout."""
+from datetime import timedelta
+from unittest.mock import patch
+
+from django.core.cache import cache
+from django.test import SimpleTestCase, TestCase
+from django.utils import timezone
+
+from app.models import LoginAttempt
+from app.services import rate_limiter
+from app.services.rate_limiter import SlidingWindowLimiter
+
+
+class FakeClock:
+    def __init__(self, now=1_000_000.0):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+
+class SlidingWindowLimiterTest(SimpleTestCase):
+
+    def setUp(self):
+        cache.clear()
+        self.clock = FakeClock()
+        self.limiter = SlidingWindowLimiter('test', limit=3, window=60, lockout=120, clock=self.clock)
+
+    def test_locks_on_limit_and_reports_remaining(self):
+        self.assertEqual(self.limiter.hit('a@example.com'), (False, 2))
+        self.assertEqual(self.limiter.hit('A@example.com '), (False, 1))
+        self.assertEqual(self.limiter.hit('a@example.com'), (True, 0))
+
+        self.assertTrue(self.limiter.is_locked('a@example.com'))
+        self.assertEqual(self.limiter.retry_after('a@example.com'), 120)
+        self.assertFalse(self.limiter.is_locked('b@example.com'))
+
+    def test_previous_window_is_weighted_by_overlap(self):
+        self.clock.now = 60 * 20_000 + 30
+        self.limiter.hit('a')
+        self.limiter.hit('a')
+
+        self.clock.now += 60  # halfway into the next bucket: 2 * 0.5 carried over
+        self.assertEqual(self.limiter.attempts('a'), 1)
+        self.clock.now += 30  # previous bucket no longer overlaps
+        self.assertEqual(self.limiter.attempts('a'), 0)
+
+    def test_lock_expires_and_reset_clears(self):
+        for _ in range(3):
+            self.limiter.hit('a')
+        self.clock.now += 121
+        self.assertFalse(self.limiter.is_locked('a'))
+
+        self.limiter.hit('a')
+        self.limiter.reset('a')
+        self.assertEqual(self.limiter.attempts('a'), 0)
+
+    def test_longest_lock_wins_in_one_read(self):
+        other = SlidingWindowLimiter('other', limit=1, window=60, lockout=600, clock=self.clock)
+        other.hit('10.0.0.1')
+
+        with patch.object(cache, 'get_many', wraps=cache.get_many) as get_many:
+            remaining = rate_limiter.retry_after((self.limiter, 'a'), (other, '10.0.0.1'), (other, None))
+
+        self.assertEqual(remaining, 600)
+        get_many.assert_called_once()
+
+
+@patch('app.tasks_security.persist_login_attempts')
+class LoginLockoutTest(TestCase):
+
+    def setUp(self):
+        cache.clear()
+
+    def test_lockout_needs_no_query(self, persist):
+        for _ in range(LoginAttempt.MAX_ATTEMPTS):
+            LoginAttempt.record_attempt('User@Example.com', '10.0.0.1', False, 'invalid_credentials')
+
+        with self.assertNumQueries(0):
+            self.assertTrue(LoginAttempt.is_locked_out('user@example.com'))
+            self.assertFalse(LoginAttempt.is_locked_out('other@example.com', '10.0.0.2'))
+        self.assertEqual(persist.delay.call_count, LoginAttempt.MAX_ATTEMPTS)
+        self.assertEqual(persist.delay.call_args[0][0][0]['email'], 'user@example.com')
+
+    def test_ip_is_locked_across_emails(self, persist):
+        for n in range(LoginAttempt.MAX_ATTEMPTS_PER_IP):
+            LoginAttempt.record_attempt(f'user{n}@example.com', '10.0.0.1', False, 'invalid_credentials')
+
+        self.assertTrue(LoginAttempt.is_locked_out('new@example.com', '10.0.0.1'))
+        self.assertFalse(LoginAttempt.is_locked_out('new@example.com', '10.0.0.2'))
+
+    def test_success_clears_email_failures(self, persist):
+        for _ in range(LoginAttempt.MAX_ATTEMPTS - 1):
+            LoginAttempt.record_attempt('user@example.com', '10.0.0.1', False)
+        LoginAttempt.record_attempt('user@example.com', '10.0.0.1', True)
+        LoginAttempt.record_attempt('user@example.com', '10.0.0.1', False)
+
+        self.assertFalse(LoginAttempt.is_locked_out('user@example.com'))
+
+    def test_falls_back_to_direct_insert_without_broker(self, persist):
+        persist.delay.side_effect = ConnectionError('broker down')
+
+        LoginAttempt.record_attempt('user@example.com', '10.0.0.1', False, 'invalid_credentials')
+
+        attempt = LoginAttempt.objects.get()
+        self.assertEqual((attempt.email, attempt.failure_reason), ('user@example.com', 'invalid_credentials'))
+
+    def test_prune_keeps_recent_attempts(self, persist):
+        now = timezone.now()
+        LoginAttempt.objects.bulk_create([
+            LoginAttempt(email='old@example.com', timestamp=now - timedelta(days=100)),
+            LoginAttempt(email='old@example.com', timestamp=now - timedelta(days=95)),
+            LoginAttempt(email='new@example.com', timestamp=now - timedelta(days=1)),
+        ])
+
+        deleted = LoginAttempt.prune(now - timedelta(days=90), batch_size=1)
+
+        self.assertEqual(deleted, 2)
+        self.assertEqual(list(LoginAttempt.objects.values_list('email', flat=True)), ['new@example.com'])
@@ -0,0 +1,118 @@
+"""Tests for app/services/realtime_push.py — Notification rows pushed over Redis."""
+import json
+from datetime import timedelta
+from unittest.mock import MagicMock, patch
+
+from django.test import TestCase, override_settings
+from django.utils import timezone
+
+from app.models import Assignment, Notification
+from app.services import realtime_push
+from app.tests.factories import FixtureMixin
+
+
+@override_settings(REALTIME_REDIS_URL='redis://realtime:6379/0')
+class NotificationPushTest(FixtureMixin, TestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.redis = MagicMock()
+        client = patch.object(realtime_push, '_client', self.redis)
+        client.start()
+        self.addCleanup(client.stop)
+        self.user = self.create_user('u')
+
+    def _create(self):
+        return Notification.objects.create(
+            recipient=self.user, type=Notification.Type.SYSTEM, title='Hi', content='Body',
+        )
+
+    def test_published_to_recipient_after_commit(self):
+        with self.captureOnCommitCallbacks(execute=False) as callbacks:
+            notification = self._create()
+        self.redis.publish.assert_not_called()
+
+        for callback in callbacks:
+            callback()
+
+        channel, message = self.redis.publish.call_args.args
+        event = json.loads(message)
+        self.assertEqual(channel, 'jhbridge:notifications')
+        self.assertEqual(event['recipient_id'], str(self.user.pk))
+        self.assertEqual(event['payload']['id'], notification.pk)
+
+    def test_updates_are_not_pushed(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            notification = self._create()
+        self.redis.publish.reset_mock()
+
+        with self.captureOnCommitCallbacks(execute=True):
+            notification.read = True
+            notification.save()
+
+        self.redis.publish.assert_not_called()
+
+    def test_redis_failure_is_swallowed(self):
+        self.redis.publish.side_effect = ConnectionError('down')
+        with self.captureOnCommitCallbacks(execute=True):
+            self._create()
+        self.assertTrue(Notification.objects.exists())
+
+    @override_settings(REALTIME_REDIS_URL='')
+    def test_disabled_without_url(self):
+        self.assertFalse(realtime_push.publish('notifications', {'type': 'NOTIFICATION'}))
+        self.redis.publish.assert_not_called()
+
+    def test_replayable_channels_are_logged_first(self):
+        self.redis.xadd.return_value = '1700000000000-0'
+
+        realtime_push.publish('assignment-updates', {'type': 'ASSIGNMENT_CREATED'})
+
+        self.assertEqual(self.redis.xadd.call_args.args[0], 'jhbridge:stream:assignment-updates')
+        event = json.loads(self.redis.publish.call_args.args[1])
+        self.assertEqual(event['event_id'], '1700000000000-0')
+
+
+@override_settings(REALTIME_REDIS_URL='redis://realtime:6379/0')
+@patch('app.services.calendar_sync_dispatcher.request_sync')
+@patch('app.tasks.send_assignment_status_emails')
+@patch('app.tasks.send_assignment_status_email')
+class AssignmentPushTest(FixtureMixin, TestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.redis = MagicMock()
+        self.redis.xadd.side_effect = (f'1700000000000-{n}' for n in range(100))
+        client = patch.object(realtime_push, '_client', self.redis)
+        client.start()
+        self.addCleanup(client.stop)
+        self.create_reference_data()
+
+    def _events(self):
+        return [json.loads(call.args[1]) for call in self.redis.publish.call_args_list]
+
+    def test_status_changes_are_logged_and_published(self, *mocks):
+        start = timezone.now() + timedelta(days=1)
+        created, = self.bulk_assignments([
+            dict(status='PENDING', start_time=start, end_time=start + timedelta(hours=1)),
+        ])
+        assignment = Assignment.objects.get(pk=created.pk)
+        with self.captureOnCommitCallbacks(execute=True):
+            assignment.status = 'CONFIRMED'
+            assignment.save(update_fields=['status'])
+        with self.captureOnCommitCallbacks(execute=True):
+            assignment.location = 'Court B'
+            assignment.save(update_fields=['location'])
+
+        event, = self._events()
+        self.assertEqual(event['type'], 'ASSIGNMENT_CONFIRMED')
+        self.assertEqual(event['event_id'], '1700000000000-0')
+        self.assertEqual(
+            (event['payload']['assignment_id'], event['payload']['previous_status']),
+            (assignment.pk, 'PENDING'),
+        )
+        key, fields = self.redis.xadd.call_args.args
+        self.assertEqual(key, 'jhbridge:stream:assignment-updates')
+        self.assertEqual(json.loads(fields['event'])['type'], 'ASSIGNMENT_CONFIRMED')
+        channel, _ = self.redis.publish.call_args.args
+        self.assertEqual(channel, 'jhbridge:assignments')
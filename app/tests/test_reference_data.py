@@ -0,0 +1,107 @@
+"""Tests for app/services/reference_data.py — versioned language / service type registry."""
+from decimal import Decimal
+from unittest.mock import patch
+
+from django.core.cache import cache
+from django.test import TestCase
+
+from app.api.serializers.reference import ReferenceField
+from app.models import Language, ServiceType
+from app.services import reference_data
+
+
+class ReferenceDataTest(TestCase):
+
+    def setUp(self):
+        cache.clear()
+        self.portuguese = Language.objects.create(name='Portuguese', code='pt')
+        self.english = Language.objects.create(name='English', code='en')
+        self.medical = ServiceType.objects.create(
+            name='Medical', description='', base_rate=Decimal('40'), cancellation_policy='',
+        )
+
+    def test_lookups(self):
+        self.assertEqual(reference_data.language(self.portuguese.pk),
+                         (self.portuguese.pk, 'Portuguese', 'pt', True))
+        self.assertEqual(reference_data.service_type_name(self.medical.pk), 'Medical')
+        self.assertEqual(reference_data.language_id(' english '), self.english.pk)
+        self.assertEqual(reference_data.service_type_id('MEDICAL'), self.medical.pk)
+        self.assertIsNone(reference_data.language_id('Klingon'))
+        self.assertEqual(reference_data.language_name(None), '')
+        self.assertLess(reference_data.language_sort_key(self.english.pk),
+                        reference_data.language_sort_key(self.portuguese.pk))
+
+    def test_warm_lookups_do_not_query(self):
+        reference_data.get_registry()
+        with self.assertNumQueries(0):
+            reference_data.language_name(self.english.pk)
+            reference_data.service_type(self.medical.pk)
+            reference_data.language_id('Portuguese')
+
+    def test_save_invalidates(self):
+        reference_data.get_registry()
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.english.name = 'English (US)'
+            self.english.save()
+
+        self.assertEqual(reference_data.language_name(self.english.pk), 'English (US)')
+
+    def test_follows_version_bumped_by_another_process(self):
+        registry = reference_data.get_registry()
+        # Another process saves a row: it bumps the shared version only
+        Language.objects.filter(pk=self.english.pk).update(name='Inglês')
+        cache.incr(reference_data.VERSION_KEY)
+
+        self.assertEqual(reference_data.language_name(self.english.pk), 'English')
+        with patch.object(reference_data, 'VERSION_CHECK_SECONDS', 0):
+            self.assertEqual(reference_data.language_name(self.english.pk), 'Inglês')
+        self.assertIsNot(reference_data.get_registry(), registry)
+
+    def test_snapshots_are_shared_per_version(self):
+        reference_data.get_registry()
+        reference_data._registry = None
+
+        with self.assertNumQueries(0):
+            self.assertEqual(reference_data.language_name(self.portuguese.pk), 'Portuguese')
+
+    def test_unknown_id_reloads_once(self):
+        reference_data.get_registry()
+        # bulk_create sends no post_save, as for a row another process just created
+        [spanish] = Language.objects.bulk_create([Language(name='Spanish', code='es')])
+
+        self.assertIsNone(reference_data.language(spanish.pk))
+        with patch.object(reference_data, 'MISS_RELOAD_SECONDS', 0):
+            self.assertEqual(reference_data.language_name(spanish.pk), 'Spanish')
+
+    def test_lost_version_key_keeps_snapshot(self):
+        registry = reference_data.get_registry()
+        cache.clear()
+
+        with patch.object(reference_data, 'VERSION_CHECK_SECONDS', 0), self.assertNumQueries(0):
+            self.assertIs(reference_data.get_registry(), registry)
+        self.assertEqual(reference_data.get_version(), registry.version)
+
+    def test_max_age_rereads_tables_and_republishes(self):
+        registry = reference_data.get_registry()
+        # A change whose bump was lost: the shared rows are stale too
+        Language.objects.filter(pk=self.english.pk).update(name='Inglês')
+
+        with patch.multiple(reference_data, VERSION_CHECK_SECONDS=0, MAX_AGE_SECONDS=0):
+            self.assertEqual(reference_data.language_name(self.english.pk), 'Inglês')
+        self.assertGreater(reference_data.get_version(), registry.version)
+
+    def test_max_age_keeps_version_when_tables_unchanged(self):
+        registry = reference_data.get_registry()
+
+        with patch.multiple(reference_data, VERSION_CHECK_SECONDS=0, MAX_AGE_SECONDS=0):
+            self.assertIsNot(reference_data.get_registry(), registry)
+        self.assertEqual(reference_data.get_version(), registry.version)
+
+    def test_reference_field(self):
+        self.assertEqual(ReferenceField('language').to_representation(self.portuguese.pk), 'Portuguese')
+        self.assertEqual(
+            ReferenceField('language', fields=('id', 'name', 'code')).to_representation(self.english.pk),
+            {'id': self.english.pk, 'name': 'English', 'code': 'en'},
+        )
+        self.assertIsNone(ReferenceField('service_type').to_representation(None))
@@ -6,6 +6,7 @@ from datetime import datetime, timezone as dt_tz
 from unittest.mock import MagicMock, PropertyMock, patch
 
 import pytz
+from django.db.models import Prefetch
 from django.test import SimpleTestCase
 
 from app.api.serializers.assignments import AssignmentListSerializer, AssignmentDetailSerializer, _local_isoformat
@@ -198,9 +199,9 @@ class InterpreterListSerializerTest(SimpleTestCase):
             loc.is_on_mission = is_on_mission
             loc.latitude = 42.3601
             loc.longitude = -71.0589
-            interp.locations.first.return_value = loc
+            interp.latest_locations = [loc]  # prefetch_latest_location()
         else:
-            interp.locations.first.return_value = None
+            interp.latest_locations = []
 
         interp.languages.all.return_value = []
         # missions_count and avg_rating come from annotation
@@ -252,9 +253,11 @@ class InterpreterListSerializerTest(SimpleTestCase):
         qs.prefetch_related.return_value = qs
         qs.annotate.return_value = qs
         InterpreterListSerializer.setup_eager_loading(qs)
-        # Verify 'locations' appears in one of the prefetch_related calls
-        all_calls = str(qs.prefetch_related.call_args_list)
-        self.assertIn('locations', all_calls)
+        # Only the newest location is prefetched, never the whole history
+        lookups = [arg for c in qs.prefetch_related.call_args_list for arg in c.args]
+        self.assertNotIn('locations', lookups)
+        prefetch = next(arg for arg in lookups if isinstance(arg, Prefetch))
+        self.assertEqual((prefetch.prefetch_through, prefetch.to_attr), ('locations', 'latest_locations'))
 
 
 # ---------------------------------------------------------------------------
@@ -19,7 +19,7 @@ def _make_api_key(key='abcdef1234567890' * 2, is_active=True, expires_at=None):
     k.id = 'uuid-1234'
     k.name = 'Test Key'
     k.app_name = 'Command Center'
-    k.key = key
+    k.prefix = key[:8]
     k.is_active = is_active
     k.expires_at = expires_at
     k.last_used = None
@@ -206,12 +206,13 @@ class APIKeyRotateTest(SimpleTestCase):
         vset = APIKeyViewSet()
         api_key = MagicMock()
         api_key.id = 'uuid-9999'
-        api_key.key = 'newkey' * 10 + 'xx'
+        api_key.set_key.side_effect = lambda raw: raw
         vset.get_object = MagicMock(return_value=api_key)
 
         response = vset.rotate(MagicMock(), pk='uuid-9999')
-        api_key.save.assert_called_once_with(update_fields=['key'])
-        self.assertEqual(response.data['key'], api_key.key)
+        api_key.set_key.assert_called_once_with('newkey' * 10 + 'xx')
+        api_key.save.assert_called_once_with(update_fields=['prefix', 'key_hash'])
+        self.assertEqual(response.data['key'], 'newkey' * 10 + 'xx')
 
     @patch('app.api.viewsets.settings.secrets')
     def test_rotate_response_has_detail(self, mock_secrets):
@@ -1,5 +1,5 @@
 """Tests for app/utils/timezone.py — state-based timezone utilities."""
-from datetime import datetime
+from datetime import date, datetime, timedelta
 
 import pytz
 from django.test import SimpleTestCase
@@ -16,6 +16,7 @@ from app.utils.timezone import (
     format_datetime_for_state,
     format_datetime_for_interpreter,
     format_boston_datetime,
+    day_bounds,
 )
 
 
@@ -174,6 +175,17 @@ class FormatDatetimeConvenienceTest(SimpleTestCase):
         self.assertIn('CST', result)
 
 
+class DayBoundsTest(SimpleTestCase):
+    """day_bounds() must select the same rows as the ``__date`` lookup."""
+
+    def test_bounds_are_local_midnights(self):
+        start, end = day_bounds(date(2026, 3, 8))  # DST starts: a 23-hour day
+        local = dj_timezone.get_current_timezone()
+        self.assertEqual(start.astimezone(local).replace(tzinfo=None), datetime(2026, 3, 8))
+        self.assertEqual(end.astimezone(local).replace(tzinfo=None), datetime(2026, 3, 9))
+        self.assertEqual(end.astimezone(pytz.utc) - start.astimezone(pytz.utc), timedelta(hours=23))
+
+
 class BackwardCompatibilityTest(SimpleTestCase):
     """Ensure BOSTON_TZ constant is still importable and correct."""
 
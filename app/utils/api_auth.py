@@ -1,6 +1,5 @@
 import re
 from django.conf import settings
-from ..models import APIKey
 
 
 class APIKeyExtractor:
@@ -52,22 +51,11 @@ class APIKeyValidator:
         """
         if not key:
             return None
-            
-        try:
-            api_key = APIKey.objects.get(key=key)
-            
-            # Vérifie si la clé est valide (active et non expirée)
-            if not api_key.is_valid():
-                return None
-                
-            # Marque la clé comme utilisée
-            api_key.mark_as_used()
-            
-            # Retourne l'utilisateur associé
-            return api_key.user
-            
-        except APIKey.DoesNotExist:
-            return None
+
+        # Recherche par préfixe + hash en temps constant, cache LRU en
+        # mémoire, compteurs d'usage écrits par lots (app.services.api_keys)
+        from ..services import api_keys
+        return api_keys.resolve(key)
 
 
 def get_api_key_settings():
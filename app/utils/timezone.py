@@ -9,6 +9,8 @@ local time rather than always defaulting to Boston / America/New_York.
 The raw STATE_TIMEZONES dict lives in shared/constants.py so the FastAPI
 microservice can also import it without needing Django configured.
 """
+from datetime import datetime, time, timedelta
+
 import pytz
 from django.utils import timezone as dj_timezone
 
@@ -19,6 +21,9 @@ from shared.constants import STATE_TIMEZONES, DEFAULT_TZ_NAME  # noqa: re-export
 BOSTON_TZ = pytz.timezone(DEFAULT_TZ_NAME)
 DEFAULT_TZ = BOSTON_TZ
 
+# Built once: per-row callers (list serializers) skip the pytz name lookup.
+STATE_TZINFOS = {state: pytz.timezone(name) for state, name in STATE_TIMEZONES.items()}
+
 
 # ---------------------------------------------------------------------------
 # Core helpers
@@ -35,8 +40,7 @@ def get_timezone_for_state(state: str) -> pytz.BaseTzInfo:
     Returns:
         A pytz timezone object.
     """
-    tz_name = STATE_TIMEZONES.get((state or '').upper().strip(), DEFAULT_TZ_NAME)
-    return pytz.timezone(tz_name)
+    return STATE_TZINFOS.get((state or '').upper().strip(), DEFAULT_TZ)
 
 
 def get_interpreter_timezone(interpreter) -> pytz.BaseTzInfo:
@@ -98,6 +102,22 @@ def format_datetime_for_interpreter(dt, interpreter) -> str:
     return format_local_datetime(dt, get_interpreter_timezone(interpreter))
 
 
+# ---------------------------------------------------------------------------
+# Query helpers
+# ---------------------------------------------------------------------------
+
+def day_bounds(day) -> tuple:
+    """``(start, end)`` aware datetimes of *day* in the current timezone.
+
+    Filter with ``start_time__gte=start, start_time__lt=end`` rather than
+    ``start_time__date=day``: the ``__date`` lookup wraps the column in a
+    function, so the database cannot use an index on it.
+    """
+    start = dj_timezone.make_aware(datetime.combine(day, time.min))
+    end = dj_timezone.make_aware(datetime.combine(day + timedelta(days=1), time.min))
+    return start, end
+
+
 # ---------------------------------------------------------------------------
 # Backward-compatibility alias (used by app/admin/utils.py and the mixin)
 # ---------------------------------------------------------------------------
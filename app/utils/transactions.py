@@ -0,0 +1,43 @@
+"""
+Per-transaction batching of ``transaction.on_commit`` work.
+
+``batch_on_commit()`` hands every caller in one transaction the same batch
+object and flushes it once, on commit. The batch is tracked here rather than
+by searching Django's private ``connection.run_on_commit`` list: the
+scheduled callback is referenced only by that list, so when a rollback (of
+the transaction or of the savepoint that scheduled it) discards it, the weak
+reference kept here dies with it and the next caller starts a new batch.
+"""
+import weakref
+
+from django.db import DEFAULT_DB_ALIAS, transaction
+
+
+class _FlushOnCommit:
+    def __init__(self, batch):
+        self.batch = batch
+        self.ran = False
+
+    def __call__(self):
+        self.ran = True
+        self.batch.flush()
+
+
+def batch_on_commit(key, factory, using=DEFAULT_DB_ALIAS):
+    """The batch stored under *key* for the open transaction on *using*.
+
+    The first call in a transaction builds it with *factory()* and schedules
+    its ``flush()`` on commit; later calls return the same object. Call it
+    inside an atomic block.
+    """
+    connection = transaction.get_connection(using)
+    batches = getattr(connection, '_commit_batches', None)
+    if batches is None:
+        batches = connection._commit_batches = {}
+    ref = batches.get(key)
+    callback = ref() if ref is not None else None
+    if callback is None or callback.ran:
+        callback = _FlushOnCommit(factory())
+        batches[key] = weakref.ref(callback)
+        transaction.on_commit(callback, using=using)
+    return callback.batch
@@ -0,0 +1,17 @@
+"""
+``bulk_create`` as an insert-or-update, on every supported backend.
+
+PostgreSQL and SQLite need the conflict target (``ON CONFLICT (...)``);
+MySQL's ``ON DUPLICATE KEY UPDATE`` takes none and Django raises
+``NotSupportedError`` when ``unique_fields`` is passed there. Callers upsert
+on the primary key, the key MySQL matches anyway.
+"""
+from django.db import connections
+
+
+def bulk_upsert(queryset, objs, unique_fields, update_fields):
+    """Insert *objs*, updating *update_fields* of rows whose *unique_fields* exist."""
+    kwargs = {}
+    if connections[queryset.db].features.supports_update_conflicts_with_target:
+        kwargs['unique_fields'] = unique_fields
+    return queryset.bulk_create(objs, update_conflicts=True, update_fields=update_fields, **kwargs)
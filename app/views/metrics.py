@@ -0,0 +1,16 @@
+"""Prometheus scrape endpoint for the request metrics of this process."""
+from django.conf import settings
+from django.http import Http404, HttpResponse
+
+from shared import instrumentation
+from shared.metrics import CONTENT_TYPE, REGISTRY
+
+
+def metrics(request):
+    """``GET /metrics`` — Prometheus text format behind bearer METRICS_TOKEN; 404 without one."""
+    token = settings.METRICS_TOKEN
+    if not token:
+        raise Http404
+    if not instrumentation.bearer_matches(request.headers.get('Authorization'), token):
+        return HttpResponse(status=401)
+    return HttpResponse(REGISTRY.render(), content_type=CONTENT_TYPE)
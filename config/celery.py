@@ -2,6 +2,8 @@
 import os
 from celery import Celery
 
+from config import celery_topology
+
 # Définir les variables d'environnement pour Django
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'config.settings')  # Remplacer 'project' par le nom de votre projet
 
@@ -11,6 +13,9 @@ app = Celery('config')  # Remplacer 'project' par le nom de votre projet
 # Charger la configuration depuis Django settings
 app.config_from_object('django.conf:settings', namespace='CELERY')
 
+# Files d'attente, routage et profils par type de tâche (voir celery_topology.py)
+celery_topology.apply(app)
+
 # Découverte automatique des tâches dans les applications Django
 app.autodiscover_tasks()
 
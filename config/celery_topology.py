@@ -0,0 +1,161 @@
+"""
+Celery queue topology: queues, task routing, per-queue task defaults and
+worker profiles.
+
+Each kind of work has its own queue so a burst on one (500 reminder emails,
+Google rate-limit retries, a long payroll report) cannot starve the others:
+
+    default    anything not routed below
+    emails     transactional email (app/tasks.py)
+    calendar   Google Calendar sync and reconciliation (app/tasks_calendar.py)
+    documents  PDF rendering, contracts, pay stubs (app/tasks_documents*.py)
+    reports    exports, payroll, backups and stats rebuilds (app/tasks_exports.py, ...)
+
+Per-queue task defaults (rate limit, acks_late, time limits) are applied as
+Celery annotations, but only where the task's own decorator left the Celery
+default — an explicit ``@shared_task(rate_limit=...)`` always wins. Rate
+limits are per worker process, as everywhere in Celery.
+
+Redis has no per-queue visibility timeout: ``visibility_timeout`` in
+CELERY_BROKER_TRANSPORT_OPTIONS must exceed the longest ``acks_late`` task
+(reports, 1h) and any countdown, or the message is delivered twice.
+
+Priorities use the Redis transport's priority steps; 0 is served first.
+Run one worker per queue with the profile's options (``python manage.py
+celery_queues --profiles`` prints the commands), or a single
+``celery -A config worker`` that consumes every queue in development.
+"""
+from celery import Task
+from kombu import Exchange, Queue
+
+PRIORITY_HIGH = 0
+PRIORITY_NORMAL = 3
+PRIORITY_LOW = 6
+PRIORITY_BULK = 9
+PRIORITY_STEPS = [PRIORITY_HIGH, PRIORITY_NORMAL, PRIORITY_LOW, PRIORITY_BULK]
+
+DEFAULT_QUEUE = 'default'
+
+# Worker options per queue: autoscale (max, min), prefetch multiplier and
+# max tasks per child; ``task_defaults`` are applied to every task routed there.
+QUEUES = {
+    'default': {
+        'autoscale': (4, 1),
+        'prefetch': 4,
+        'task_defaults': {'acks_late': False, 'time_limit': 300},
+    },
+    'emails': {
+        # Many short I/O-bound tasks. At-most-once: a redelivery after a
+        # worker crash would send the email twice.
+        'autoscale': (8, 2),
+        'prefetch': 4,
+        'task_defaults': {'acks_late': False, 'rate_limit': '10/s',
+                          'soft_time_limit': 30, 'time_limit': 60},
+    },
+    'calendar': {
+        # Pushes are idempotent; few slots so Google's quota is shared fairly.
+        'autoscale': (2, 1),
+        'prefetch': 1,
+        'task_defaults': {'acks_late': True, 'reject_on_worker_lost': True,
+                          'rate_limit': '5/s', 'time_limit': 600},
+    },
+    'documents': {
+        # CPU- and memory-heavy rendering; recycle children to cap RSS.
+        'autoscale': (4, 1),
+        'prefetch': 1,
+        'max_tasks_per_child': 50,
+        'task_defaults': {'acks_late': True, 'reject_on_worker_lost': True,
+                          'soft_time_limit': 240, 'time_limit': 300},
+    },
+    'reports': {
+        'autoscale': (2, 1),
+        'prefetch': 1,
+        'max_tasks_per_child': 20,
+        'task_defaults': {'acks_late': True, 'reject_on_worker_lost': True,
+                          'soft_time_limit': 3300, 'time_limit': 3600},
+    },
+}
+
+# First match wins; patterns are fnmatch-style task names.
+TASK_ROUTES = [
+    ('app.tasks_calendar.reconcile_calendar', {'queue': 'calendar', 'priority': PRIORITY_LOW}),
+    ('app.tasks_calendar.bulk_backfill_calendar', {'queue': 'calendar', 'priority': PRIORITY_BULK}),
+    ('app.tasks_calendar.*', {'queue': 'calendar'}),
+    ('app.tasks.*', {'queue': 'emails'}),
+    ('app.tasks_security.prune_login_attempts', {'queue': 'default', 'priority': PRIORITY_LOW}),
+    ('app.tasks_stats.*', {'queue': 'reports', 'priority': PRIORITY_LOW}),
+    ('app.tasks_documents*', {'queue': 'documents'}),
+    ('app.tasks_exports.*', {'queue': 'reports'}),
+    ('app.tasks_payroll*', {'queue': 'reports'}),
+    ('app.tasks_backup*', {'queue': 'reports'}),
+]
+
+
+def task_queues():
+    return [
+        Queue(name, Exchange(name, type='direct'), routing_key=name)
+        for name in QUEUES
+    ]
+
+
+def queue_for(task_name):
+    """Queue a task name is routed to."""
+    from fnmatch import fnmatchcase
+
+    for pattern, route in TASK_ROUTES:
+        if fnmatchcase(task_name, pattern):
+            return route['queue']
+    return DEFAULT_QUEUE
+
+
+class QueueTaskDefaults:
+    """Celery annotation applying the routed queue's ``task_defaults``.
+
+    Only attributes the task left at Celery's own default are filled in.
+    """
+
+    def annotate(self, task):
+        defaults = QUEUES[queue_for(task.name)]['task_defaults']
+        return {
+            key: value for key, value in defaults.items()
+            if getattr(task, key, None) == getattr(Task, key, None)
+        } or None
+
+
+def apply(app):
+    """Install the topology on a Celery *app* (after settings are loaded)."""
+    transport_options = dict(app.conf.broker_transport_options or {})
+    transport_options.setdefault('visibility_timeout', 7200)
+    transport_options.setdefault('queue_order_strategy', 'priority')
+    transport_options.setdefault('priority_steps', PRIORITY_STEPS)
+    transport_options.setdefault('sep', ':')
+
+    app.conf.update(
+        task_queues=task_queues(),
+        task_default_queue=DEFAULT_QUEUE,
+        task_default_exchange=DEFAULT_QUEUE,
+        task_default_routing_key=DEFAULT_QUEUE,
+        task_default_priority=PRIORITY_NORMAL,
+        task_routes=(TASK_ROUTES,),
+        task_annotations=(QueueTaskDefaults(),),
+        broker_transport_options=transport_options,
+    )
+
+
+def worker_command(queue):
+    """``celery worker`` command line for *queue*'s profile."""
+    profile = QUEUES[queue]
+    high, low = profile['autoscale']
+    parts = [
+        'celery -A config worker',
+        f'-Q {queue}',
+        f'-n {queue}@%h',
+        f'--autoscale={high},{low}',
+        f'--prefetch-multiplier={profile["prefetch"]}',
+    ]
+    if profile.get('max_tasks_per_child'):
+        parts.append(f'--max-tasks-per-child={profile["max_tasks_per_child"]}')
+    if profile['prefetch'] == 1:
+        parts.append('-O fair')
+    parts.append('-l info')
+    return ' '.join(parts)
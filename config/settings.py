@@ -53,6 +53,8 @@ GOOGLE_CALENDAR_TIMEZONE = os.getenv('GOOGLE_CALENDAR_TIMEZONE', 'America/New_Yo
 GOOGLE_CALENDAR_ADMIN_EMAILS = [
     e.strip() for e in os.getenv('GOOGLE_CALENDAR_ADMIN_EMAILS', '').split(',') if e.strip()
 ]
+# Calendar pushes for the same assignment within this window collapse into one
+GCAL_SYNC_DEBOUNCE_SECONDS = int(os.getenv('GCAL_SYNC_DEBOUNCE_SECONDS', 5))
 # Google Drive root folder (JHBridge/ shared folder, service account must have Editor access)
 GOOGLE_DRIVE_ROOT_FOLDER_ID = os.getenv('GOOGLE_DRIVE_ROOT_FOLDER_ID', '')
 
@@ -169,6 +171,7 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    "app.middleware.RequestInstrumentationMiddleware",  # first: times the whole stack
     "django.middleware.security.SecurityMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
     "django.middleware.locale.LocaleMiddleware",  # Internationalisation middleware
@@ -353,6 +356,44 @@ CELERY_BROKER_CONNECTION_RETRY_ON_STARTUP = False
 CELERY_BROKER_CONNECTION_MAX_RETRIES = 0
 CELERY_RESULT_BACKEND_MAX_RETRIES = 0
 CELERY_BROKER_CONNECTION_TIMEOUT = 2
+# Queues, routes and per-queue task defaults: config/celery_topology.py.
+# Unacknowledged (acks_late) messages are redelivered after this many seconds,
+# so it must exceed the longest task and countdown.
+CELERY_BROKER_TRANSPORT_OPTIONS = {
+    'visibility_timeout': int(os.getenv('CELERY_VISIBILITY_TIMEOUT', 7200)),
+}
+
+# Login attempts are audit-only (lockouts use cache counters); pruned after this
+LOGIN_ATTEMPT_RETENTION_DAYS = int(os.getenv('LOGIN_ATTEMPT_RETENTION_DAYS', 90))
+
+# Shared cache: Redis when configured so web and worker processes see the same
+# keys (sync coalescing, counters); per-process memory otherwise.
+REDIS_CACHE_URL = os.getenv('REDIS_CACHE_URL') or os.getenv('REDIS_URL', '')
+if REDIS_CACHE_URL:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+            'LOCATION': REDIS_CACHE_URL,
+            'TIMEOUT': 300,
+        },
+    }
+
+# Redis pub/sub the FastAPI WebSocket workers listen to (app.services.realtime_push)
+REALTIME_REDIS_URL = os.getenv('REALTIME_REDIS_URL') or os.getenv('REDIS_URL', '')
+# Events kept per replayable channel stream (match EVENT_LOG_MAXLEN in services/)
+REALTIME_STREAM_MAXLEN = int(os.getenv('REALTIME_STREAM_MAXLEN', 10000))
+
+# Request instrumentation (app.middleware, shared/instrumentation.py): Server-Timing
+# header, Prometheus metrics at /metrics, slow request/query logs, sampled cProfile
+INSTRUMENTATION_ENABLED = os.getenv('INSTRUMENTATION_ENABLED', 'True') == 'True'
+INSTRUMENTATION_SERVER_TIMING = os.getenv('INSTRUMENTATION_SERVER_TIMING', 'True') == 'True'
+INSTRUMENTATION_SLOW_REQUEST_MS = int(os.getenv('INSTRUMENTATION_SLOW_REQUEST_MS', 1000))
+INSTRUMENTATION_SLOW_QUERY_MS = int(os.getenv('INSTRUMENTATION_SLOW_QUERY_MS', 200))
+# Share of requests run under cProfile; only the slow ones are kept
+INSTRUMENTATION_PROFILE_SAMPLE_RATE = float(os.getenv('INSTRUMENTATION_PROFILE_SAMPLE_RATE', 0))
+INSTRUMENTATION_PROFILE_DIR = os.getenv('INSTRUMENTATION_PROFILE_DIR', '/tmp/jhbridge-profiles')
+# /metrics requires "Authorization: Bearer <METRICS_TOKEN>" and is a 404 while unset
+METRICS_TOKEN = os.getenv('METRICS_TOKEN', '')
 
 # Social Auth Configuration
 AUTHENTICATION_BACKENDS = (
@@ -430,9 +471,24 @@ STORAGES = {
         "BACKEND": "django.contrib.staticfiles.storage.StaticFilesStorage",
         # Si vous vouliez servir les static files depuis S3 'jhbridge-assets', changez ici:
         # "BACKEND": "custom_storages.AssetStorage",
-    }
+    },
+    "pdf_cache": {
+        "BACKEND": "custom_storages.RenderCacheStorage",
+    },
+    "exports": {
+        "BACKEND": "custom_storages.TempStorage",
+    },
 }
 
+# Rendered PDF cache (pay stubs, earnings summaries)
+PDF_RENDER_CACHE_ENABLED = os.getenv('PDF_RENDER_CACHE_ENABLED', 'True') == 'True'
+PDF_RENDER_CACHE_REDIRECT = os.getenv('PDF_RENDER_CACHE_REDIRECT', 'False') == 'True'
+PDF_RENDER_CACHE_URL_EXPIRY = int(os.getenv('PDF_RENDER_CACHE_URL_EXPIRY', 300))
+
+# CSV/XLSX exports: larger row counts are built in the background and delivered by link
+EXPORT_BACKGROUND_THRESHOLD = int(os.getenv('EXPORT_BACKGROUND_THRESHOLD', 100000))
+EXPORT_URL_EXPIRY = int(os.getenv('EXPORT_URL_EXPIRY', 86400))
+
 # Configuration Legacy (pour compatibilité)
 DEFAULT_FILE_STORAGE = "custom_storages.MediaStorage"
 
@@ -15,3 +15,18 @@ PASSWORD_HASHERS = [
 # Disable migrations for faster tests and to bypass broken migrations if needed
 # However, for model tests, we DO need a schema. 
 # We'll try with migrations first on sqlite, it's usually more forgiving.
+
+# Keep the rendered-PDF cache off S3 during tests
+STORAGES = {
+    **STORAGES,
+    "pdf_cache": {"BACKEND": "django.core.files.storage.InMemoryStorage"},
+    "exports": {"BACKEND": "django.core.files.storage.InMemoryStorage"},
+}
+
+# Per-process cache regardless of REDIS_CACHE_URL in the environment
+CACHES = {
+    'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'},
+}
+
+# Never publish WebSocket events from tests
+REALTIME_REDIS_URL = ''
@@ -1,6 +1,8 @@
 from django.contrib import admin
 from django.urls import path, include
 
+from app.views.metrics import metrics
+
 handler404 = 'app.views.errors.error_404'
 handler500 = 'app.views.errors.error_500'
 handler403 = 'app.views.errors.error_403'
@@ -10,5 +12,6 @@ urlpatterns = [
     path("admin/mfa/", include('app.admin.mfa_urls')),
     path("admin/", admin.site.urls),
     path('api/v1/', include('app.api.urls')),
+    path('metrics', metrics, name='metrics'),
     path('', include('app.urls')),  # Inclure les URLs de l'application app
 ]
\ No newline at end of file
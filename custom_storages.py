@@ -53,4 +53,17 @@ class TempStorage(S3Boto3Storage):
     Storage for temporary uploads (Lifecycle 24h).
     """
     bucket_name = 'jhbridge-temp-uploads'
-    location = ''
\ No newline at end of file
+    location = ''
+
+
+class RenderCacheStorage(S3Boto3Storage):
+    """
+    Cache of rendered PDFs (pay stubs, earnings summaries).
+    Keys are content hashes, so objects are immutable and safe to overwrite.
+    Expired after 30 days by the render-cache/ lifecycle rule
+    (scripts/setup_aws_buckets.py); a later request simply renders again.
+    """
+    bucket_name = getattr(settings, 'AWS_STORAGE_BUCKET_NAME', 'jhbridge-documents-prod')
+    location = 'render-cache'
+    file_overwrite = True
+    default_acl = 'private'
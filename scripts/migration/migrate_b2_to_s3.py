@@ -1,3 +1,9 @@
+"""
+One-shot sequential B2 -> S3 copy.
+
+For large stores prefer ``python manage.py migrate_storage``: parallel workers,
+streaming multipart copies, a resumable checkpoint and size/ETag verification.
+"""
 import boto3
 import os
 import sys
@@ -23,6 +23,8 @@ BUCKETS = {
     'jhbridge-documents-prod': {
         'Versioning': False,
         'Encryption': True,
+        # Cache des PDF rendus (RenderCacheStorage) : régénérés à la demande
+        'Lifecycle': {'Days': 30, 'Prefix': 'render-cache/'},
         'CORS': ['GET']
     },
     'jhbridge-temp-uploads': {
@@ -99,7 +101,7 @@ def create_bucket(s3, bucket_name, config):
         except Exception as e:
             print(f"   ⚠️ Erreur versioning: {e}")
 
-    # 4. Lifecycle (pour temp)
+    # 4. Lifecycle (temp, cache des rendus)
     if config.get('Lifecycle'):
         try:
             s3.put_bucket_lifecycle_configuration(
@@ -108,7 +110,7 @@ def create_bucket(s3, bucket_name, config):
                     'Rules': [{
                         'ID': 'AutoDelete',
                         'Status': 'Enabled',
-                        'Prefix': '',
+                        'Prefix': config['Lifecycle'].get('Prefix', ''),
                         'Expiration': {'Days': config['Lifecycle']['Days']}
                     }]
                 }
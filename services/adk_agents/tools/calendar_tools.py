@@ -22,19 +22,18 @@ def sync_assignment_to_calendar(assignment_id: int) -> dict:
     Args:
         assignment_id: The assignment's database ID
     """
-    if not _calendar_client:
-        return {"status": "error", "error_message": "Calendar client not configured. Set up OAuth2 credentials first."}
-    try:
-        event = _calendar_client.sync_assignment(assignment_id)
-        return {
-            "status": "success",
-            "event_id": event.get("id", ""),
-            "link": event.get("htmlLink", ""),
-            "message": f"Assignment {assignment_id} synced to calendar",
-        }
-    except Exception as e:
-        logger.error(f"Calendar sync error: {e}")
-        return {"status": "error", "error_message": str(e)}
+    # Calendar writes go through Django's debounced sync dispatcher
+    from services.adk_agents.tools.db_write_tools import _post
+
+    result = _post(f"/assignments/{assignment_id}/sync-calendar/", {})
+    if result["status"] != "success":
+        logger.error(f"Calendar sync error: {result['error_message']}")
+        return result
+    return {
+        "status": "success",
+        "gcal_sync_status": result["data"].get("gcal_sync_status", ""),
+        "message": f"Calendar sync queued for assignment {assignment_id}",
+    }
 
 
 def get_calendar_events(date_start: str, date_end: str) -> dict:
@@ -1,17 +1,22 @@
 """
 FastAPI routes for Google Calendar integration.
+
+Reads go straight to Google; event writes are delegated to Django's calendar
+sync dispatcher so there is a single, debounced write path.
 """
 import logging
 from datetime import date, datetime, timedelta
 
+import httpx
 from fastapi import APIRouter, HTTPException, Query
 
-from services.calendar_sync.mapper import assignment_to_calendar_event
+from services.config import get_settings
 from services.db.database import async_session_factory
 from services.db import queries
 from services.schemas.calendar import CalendarEvent, SyncAssignmentRequest, SyncAllTodayResponse
 
 logger = logging.getLogger(__name__)
+settings = get_settings()
 
 router = APIRouter(prefix="/calendar", tags=["Calendar"])
 
@@ -66,23 +71,30 @@ async def list_events(
     return {"count": len(events), "events": events}
 
 
+async def _request_django_sync(client: httpx.AsyncClient, assignment_id: int) -> httpx.Response:
+    """Ask Django's calendar sync dispatcher to push one assignment.
+
+    Django owns calendar writes: it debounces requests per assignment and
+    pushes only the latest state, so this service never writes events itself.
+    """
+    return await client.post(
+        f"{settings.DJANGO_API_URL}/assignments/{assignment_id}/sync-calendar/",
+        headers={"Authorization": f"Bearer {settings.DJANGO_ADMIN_TOKEN}"},
+    )
+
+
 @router.post("/sync-assignment")
 async def sync_assignment(req: SyncAssignmentRequest):
-    """Sync a single assignment to Google Calendar."""
-    _require_client()
+    """Queue a calendar sync for a single assignment (via Django)."""
+    async with httpx.AsyncClient(timeout=10) as client:
+        resp = await _request_django_sync(client, req.assignment_id)
 
-    async with async_session_factory() as db:
-        assignment = await queries.get_assignment_by_id(db, req.assignment_id)
-
-    if not assignment:
+    if resp.status_code == 404:
         raise HTTPException(status_code=404, detail="Assignment not found")
+    if resp.status_code != 200:
+        raise HTTPException(status_code=502, detail=f"Calendar sync request failed: {resp.text[:200]}")
 
-    event_body = assignment_to_calendar_event(assignment)
-    result = await _calendar_client.create_event(event_body)
-    if not result:
-        raise HTTPException(status_code=500, detail="Failed to create calendar event")
-
-    return {"status": "synced", **result}
+    return {"status": "queued", "assignment_id": req.assignment_id, **resp.json()}
 
 
 @router.delete("/event/{event_id}")
@@ -98,28 +110,23 @@ async def delete_event(event_id: str):
 
 @router.post("/sync-all-today")
 async def sync_all_today():
-    """Sync all of today's assignments to Google Calendar."""
-    _require_client()
-
+    """Queue calendar syncs for all of today's assignments (via Django)."""
     async with async_session_factory() as db:
         assignments = await queries.get_active_assignments_today(db)
 
     synced = 0
     errors = []
 
-    for a in assignments:
-        # Need full assignment details for the mapper
-        async with async_session_factory() as db:
-            full = await queries.get_assignment_by_id(db, a["id"])
-        if not full:
-            errors.append(f"Assignment {a['id']} not found")
-            continue
-
-        event_body = assignment_to_calendar_event(full)
-        result = await _calendar_client.create_event(event_body)
-        if result:
-            synced += 1
-        else:
-            errors.append(f"Failed to sync assignment {a['id']}")
+    async with httpx.AsyncClient(timeout=10) as client:
+        for a in assignments:
+            try:
+                resp = await _request_django_sync(client, a["id"])
+            except httpx.HTTPError as exc:
+                errors.append(f"Failed to sync assignment {a['id']}: {exc}")
+                continue
+            if resp.status_code == 200:
+                synced += 1
+            else:
+                errors.append(f"Failed to sync assignment {a['id']}: HTTP {resp.status_code}")
 
     return {"synced": synced, "total": len(assignments), "errors": errors}
@@ -35,6 +35,9 @@ class Settings(BaseSettings):
 
     # ── Redis ───────────────────────────────────────────────────
     REDIS_URL: str = "redis://localhost:6379/0"
+    EVENT_LOG_MAXLEN: int = 10000       # events kept per replayable channel
+    EVENT_LOG_REPLAY_LIMIT: int = 1000  # beyond this a reconnect must resync
+    REDIS_CACHE_URL: str = ""           # Django's cache Redis when not REDIS_URL
 
     # ── JWT (same secret as Django for token validation) ────────
     JWT_SECRET_KEY: str = ""
@@ -63,6 +66,15 @@ class Settings(BaseSettings):
     HOST: str = "0.0.0.0"
     PORT: int = 8001
 
+    # ── Instrumentation (services/instrumentation.py) ───────────
+    INSTRUMENTATION_ENABLED: bool = True
+    INSTRUMENTATION_SERVER_TIMING: bool = True
+    INSTRUMENTATION_SLOW_REQUEST_MS: int = 1000
+    INSTRUMENTATION_SLOW_QUERY_MS: int = 200
+    INSTRUMENTATION_PROFILE_SAMPLE_RATE: float = 0.0  # only slow sampled requests are kept
+    INSTRUMENTATION_PROFILE_DIR: str = "/tmp/jhbridge-profiles"
+    METRICS_TOKEN: str = ""  # /metrics requires "Authorization: Bearer <token>"; 404 while unset
+
 
 @lru_cache
 def get_settings() -> Settings:
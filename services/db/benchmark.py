@@ -0,0 +1,103 @@
+"""
+Micro-benchmark of the hot lookups of services/db/queries.py (ADK tools).
+
+    python -m services.db.benchmark [--repeat 50] [--database-url URL]
+
+Each call runs on a fresh session, as the ADK tools do, with the reference
+cache warm. For every query it reports the statements executed per call and
+the best / median wall time. Sample ids are the lowest ones in the database.
+"""
+import argparse
+import asyncio
+import statistics
+import time
+from dataclasses import dataclass
+
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+from services.db import queries
+from services.db.models import Assignment, Interpreter
+from services.instrumentation import instrument_engine
+from shared import instrumentation
+
+
+@dataclass
+class Result:
+    name: str
+    queries: int
+    best_ms: float
+    median_ms: float
+
+
+def cases(assignment_id: int, interpreter_id: int) -> dict:
+    """Query name -> ``call(db)`` coroutine factory."""
+    return {
+        "get_assignment_by_id": lambda db: queries.get_assignment_by_id(db, assignment_id),
+        "get_interpreter_by_id": lambda db: queries.get_interpreter_by_id(db, interpreter_id),
+        "get_pending_quote_requests": queries.get_pending_quote_requests,
+    }
+
+
+async def _sample_ids(session_factory) -> tuple[int, int]:
+    async with session_factory() as db:
+        assignment_id = (await db.execute(select(func.min(Assignment.id)))).scalar()
+        interpreter_id = (await db.execute(select(func.min(Interpreter.id)))).scalar()
+    return assignment_id or 0, interpreter_id or 0
+
+
+async def _measure(session_factory, name: str, call, repeat: int) -> Result:
+    async with session_factory() as db:
+        await call(db)  # warm-up: reference cache, compiled statement, pool
+
+    timings, counts = [], []
+    for _ in range(repeat):
+        stats, token = instrumentation.begin()
+        started = time.perf_counter()
+        try:
+            async with session_factory() as db:
+                await call(db)
+        finally:
+            instrumentation.end(token)
+        timings.append((time.perf_counter() - started) * 1000)
+        counts.append(stats.db_count)
+    return Result(name, max(counts), min(timings), statistics.median(timings))
+
+
+async def run(engine, repeat: int = 20) -> list[Result]:
+    instrument_engine(engine)
+    session_factory = async_sessionmaker(engine, expire_on_commit=False)
+    assignment_id, interpreter_id = await _sample_ids(session_factory)
+    return [
+        await _measure(session_factory, name, call, repeat)
+        for name, call in cases(assignment_id, interpreter_id).items()
+    ]
+
+
+def format_report(results: list[Result]) -> str:
+    lines = [f"{'query':<32} {'queries':>7} {'best ms':>9} {'median ms':>10}"]
+    lines += [f"{r.name:<32} {r.queries:>7} {r.best_ms:>9.2f} {r.median_ms:>10.2f}" for r in results]
+    return "\n".join(lines)
+
+
+async def _main(database_url: str, repeat: int) -> None:
+    engine = create_async_engine(database_url)
+    try:
+        print(format_report(await run(engine, repeat)))
+    finally:
+        await engine.dispose()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=50)
+    parser.add_argument("--database-url", help="SQLAlchemy async URL (default: MYSQL_URL from the settings)")
+    args = parser.parse_args()
+    if args.database_url is None:
+        from services.config import get_settings
+        args.database_url = get_settings().async_database_url
+    asyncio.run(_main(args.database_url, args.repeat))
+
+
+if __name__ == "__main__":
+    main()
@@ -5,6 +5,8 @@ Connects to the same MySQL database as the Django application.
 from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 
 from services.config import get_settings
+from services.db import reference
+from services.instrumentation import instrument_engine
 
 settings = get_settings()
 
@@ -16,6 +18,11 @@ engine = create_async_engine(
     pool_recycle=3600,
     pool_pre_ping=True,
 )
+if settings.INSTRUMENTATION_ENABLED:
+    instrument_engine(engine)
+
+# Reference data follows the version Django publishes in its cache
+reference.configure(settings.REDIS_CACHE_URL or settings.REDIS_URL)
 
 async_session_factory = async_sessionmaker(
     engine,
@@ -53,7 +53,9 @@ class User(Base):
     is_dashboard_enabled = Column(Boolean, default=False)
 
     client_profile = relationship("Client", back_populates="user", uselist=False)
-    interpreter_profile = relationship("Interpreter", back_populates="user", uselist=False)
+    interpreter_profile = relationship(
+        "Interpreter", back_populates="user", uselist=False, foreign_keys="Interpreter.user_id",
+    )
 
 
 class Client(Base):
@@ -129,6 +131,24 @@ class Interpreter(Base):
     assignments = relationship("Assignment", back_populates="interpreter")
 
 
+class InterpreterStats(Base):
+    """Denormalised performance row maintained by Django (app.services.interpreter_stats)."""
+    __tablename__ = "app_interpreter_stats"
+
+    interpreter_id: int = Column(BigInteger, ForeignKey("app_interpreter.id"), primary_key=True)
+    missions_completed = Column(Integer, default=0)
+    missions_accepted = Column(Integer, default=0)
+    missions_cancelled = Column(Integer, default=0)
+    missions_no_show = Column(Integer, default=0)
+    acceptance_rate = Column(Float, default=0)
+    no_show_rate = Column(Float, default=0)
+    avg_rating = Column(Float, nullable=True)
+    ratings_count = Column(Integer, default=0)
+    total_earned = Column(Numeric(12, 2), default=0)
+    last_mission_date = Column(DateTime, nullable=True)
+    updated_at = Column(DateTime)
+
+
 class InterpreterLocation(Base):
     __tablename__ = "app_interpreter_location"
 
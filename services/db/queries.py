@@ -1,22 +1,32 @@
 """
 Optimized async database queries for the FastAPI service.
 Read operations go directly to MySQL; write operations use Django DRF API.
+
+Lookups run on every ADK tool call, so each is a single statement: built
+once at import with bind parameters (SQLAlchemy then reuses its compiled
+form from the engine's cache), joined rather than followed by per-field
+lookups, with Language / ServiceType names resolved from the in-process
+cache of services.db.reference.
 """
+import asyncio
+import base64
+import binascii
+import json
 from datetime import date, datetime, time, timedelta
 
-from sqlalchemy import and_, func, select
+from sqlalchemy import and_, bindparam, func, or_, select
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import selectinload
 
 from services.db.models import (
     Assignment,
-    AssignmentFeedback,
     Client,
     ContactMessage,
     EmailLog,
     Interpreter,
     InterpreterLanguage,
     InterpreterLocation,
+    InterpreterStats,
     Language,
     Lead,
     Notification,
@@ -26,10 +36,34 @@ from services.db.models import (
     ServiceType,
     User,
 )
+from services.db.reference import get_reference_data
+
+
+async def _execute_concurrently(db: AsyncSession, *statements) -> list[list]:
+    """Rows of independent read-only *statements*, run at the same time.
+
+    Each runs on its own session (its own pooled connection) bound like *db*,
+    so it sees committed data only, not *db*'s pending changes.
+    """
+    async def run(statement):
+        async with AsyncSession(db.bind, expire_on_commit=False) as session:
+            return (await session.execute(statement)).all()
+
+    return list(await asyncio.gather(*(run(statement) for statement in statements)))
 
 
 # ── Interpreter queries ──────────────────────────────────────────
 
+def _stats_fields(stats: InterpreterStats | None) -> dict:
+    """Performance figures from the interpreter's stats row (zeros if not built yet)."""
+    return {
+        "completed_missions": stats.missions_completed if stats else 0,
+        "average_rating": stats.avg_rating if stats else None,
+        "acceptance_rate": stats.acceptance_rate if stats else 0,
+        "no_show_rate": stats.no_show_rate if stats else 0,
+    }
+
+
 async def get_available_interpreters(
     db: AsyncSession,
     language: str,
@@ -38,8 +72,9 @@ async def get_available_interpreters(
 ) -> list[dict]:
     """Find active interpreters matching language and optional location."""
     stmt = (
-        select(Interpreter, User, Language)
+        select(Interpreter, User, Language, InterpreterStats)
         .join(User, Interpreter.user_id == User.id)
+        .outerjoin(InterpreterStats, InterpreterStats.interpreter_id == Interpreter.id)
         .join(InterpreterLanguage, InterpreterLanguage.interpreter_id == Interpreter.id)
         .join(Language, InterpreterLanguage.language_id == Language.id)
         .where(
@@ -58,7 +93,7 @@ async def get_available_interpreters(
     rows = result.all()
 
     interpreters = {}
-    for interp, user, lang in rows:
+    for interp, user, lang, stats in rows:
         if interp.id not in interpreters:
             interpreters[interp.id] = {
                 "id": interp.id,
@@ -72,56 +107,42 @@ async def get_available_interpreters(
                 "certifications": interp.certifications or [],
                 "languages": [],
                 "active": interp.active,
+                **_stats_fields(stats),
             }
         interpreters[interp.id]["languages"].append(lang.name)
 
     return list(interpreters.values())
 
 
+_INTERPRETER_DETAIL = (
+    select(Interpreter, User, InterpreterStats, InterpreterLanguage)
+    .join(User, Interpreter.user_id == User.id)
+    .outerjoin(InterpreterStats, InterpreterStats.interpreter_id == Interpreter.id)
+    .outerjoin(InterpreterLanguage, InterpreterLanguage.interpreter_id == Interpreter.id)
+    .where(Interpreter.id == bindparam("interpreter_id"))
+    .order_by(InterpreterLanguage.id)
+)
+
+
 async def get_interpreter_by_id(db: AsyncSession, interpreter_id: int) -> dict | None:
     """Get full interpreter details by ID."""
-    stmt = (
-        select(Interpreter, User)
-        .join(User, Interpreter.user_id == User.id)
-        .where(Interpreter.id == interpreter_id)
-    )
-    result = await db.execute(stmt)
-    row = result.first()
-    if not row:
+    reference = await get_reference_data(db)
+    rows = (await db.execute(_INTERPRETER_DETAIL, {"interpreter_id": interpreter_id})).all()
+    if not rows:
         return None
 
-    interp, user = row
-
-    # Get languages
-    lang_stmt = (
-        select(Language, InterpreterLanguage)
-        .join(InterpreterLanguage, InterpreterLanguage.language_id == Language.id)
-        .where(InterpreterLanguage.interpreter_id == interpreter_id)
-    )
-    lang_result = await db.execute(lang_stmt)
+    interp, user, stats, _ = rows[0]
     languages = [
         {
-            "name": lang.name,
+            "name": reference.language(il.language_id),
             "proficiency": il.proficiency,
             "certified": il.certified,
             "is_primary": il.is_primary,
         }
-        for lang, il in lang_result.all()
+        for _, _, _, il in rows
+        if il is not None
     ]
 
-    # Get assignment stats
-    stats_stmt = select(
-        func.count(Assignment.id).label("total"),
-        func.avg(AssignmentFeedback.rating).label("avg_rating"),
-    ).select_from(Assignment).outerjoin(
-        AssignmentFeedback, AssignmentFeedback.assignment_id == Assignment.id
-    ).where(
-        Assignment.interpreter_id == interpreter_id,
-        Assignment.status == "COMPLETED",
-    )
-    stats_result = await db.execute(stats_stmt)
-    stats = stats_result.first()
-
     return {
         "id": interp.id,
         "name": f"{user.first_name} {user.last_name}",
@@ -136,8 +157,7 @@ async def get_interpreter_by_id(db: AsyncSession, interpreter_id: int) -> dict |
         "certifications": interp.certifications or [],
         "languages": languages,
         "years_of_experience": interp.years_of_experience,
-        "completed_missions": stats.total if stats else 0,
-        "average_rating": round(float(stats.avg_rating), 2) if stats and stats.avg_rating else None,
+        **_stats_fields(stats),
         "active": interp.active,
         "has_accepted_contract": interp.has_accepted_contract,
     }
@@ -207,46 +227,25 @@ async def get_client_by_email(db: AsyncSession, email: str) -> dict | None:
 
 # ── Assignment queries ───────────────────────────────────────────
 
+_ASSIGNMENT_DETAIL = (
+    select(Assignment, User.first_name, User.last_name, Client.company_name)
+    .outerjoin(Interpreter, Assignment.interpreter_id == Interpreter.id)
+    .outerjoin(User, Interpreter.user_id == User.id)
+    .outerjoin(Client, Assignment.client_id == Client.id)
+    .where(Assignment.id == bindparam("assignment_id"))
+)
+
+
 async def get_assignment_by_id(db: AsyncSession, assignment_id: int) -> dict | None:
     """Get assignment with all related data."""
-    stmt = (
-        select(Assignment)
-        .where(Assignment.id == assignment_id)
-    )
-    result = await db.execute(stmt)
-    assignment = result.scalar_one_or_none()
-    if not assignment:
+    reference = await get_reference_data(db)
+    row = (await db.execute(_ASSIGNMENT_DETAIL, {"assignment_id": assignment_id})).first()
+    if not row:
         return None
 
-    # Get related data
-    interp_name = ""
-    if assignment.interpreter_id:
-        interp_stmt = (
-            select(User.first_name, User.last_name)
-            .join(Interpreter, Interpreter.user_id == User.id)
-            .where(Interpreter.id == assignment.interpreter_id)
-        )
-        interp_result = await db.execute(interp_stmt)
-        interp_row = interp_result.first()
-        if interp_row:
-            interp_name = f"{interp_row.first_name} {interp_row.last_name}"
-
-    client_display = assignment.client_name or ""
-    if assignment.client_id:
-        client_stmt = select(Client.company_name).where(Client.id == assignment.client_id)
-        client_result = await db.execute(client_stmt)
-        client_row = client_result.scalar_one_or_none()
-        if client_row:
-            client_display = client_row
-
-    stype_stmt = select(ServiceType.name).where(ServiceType.id == assignment.service_type_id)
-    stype = (await db.execute(stype_stmt)).scalar_one_or_none() or ""
-
-    src_lang_stmt = select(Language.name).where(Language.id == assignment.source_language_id)
-    src_lang = (await db.execute(src_lang_stmt)).scalar_one_or_none() or ""
-
-    tgt_lang_stmt = select(Language.name).where(Language.id == assignment.target_language_id)
-    tgt_lang = (await db.execute(tgt_lang_stmt)).scalar_one_or_none() or ""
+    assignment, first_name, last_name, company_name = row
+    interp_name = f"{first_name} {last_name}" if first_name is not None else ""
+    client_display = company_name or assignment.client_name or ""
 
     return {
         "id": assignment.id,
@@ -255,9 +254,9 @@ async def get_assignment_by_id(db: AsyncSession, assignment_id: int) -> dict | N
         "interpreter_id": assignment.interpreter_id,
         "client": client_display,
         "client_id": assignment.client_id,
-        "service_type": stype,
-        "source_language": src_lang,
-        "target_language": tgt_lang,
+        "service_type": reference.service_type(assignment.service_type_id),
+        "source_language": reference.language(assignment.source_language_id),
+        "target_language": reference.language(assignment.target_language_id),
         "start_time": assignment.start_time.isoformat() if assignment.start_time else None,
         "end_time": assignment.end_time.isoformat() if assignment.end_time else None,
         "location": assignment.location,
@@ -308,40 +307,38 @@ async def get_active_assignments_today(db: AsyncSession) -> list[dict]:
     return assignments
 
 
+_PENDING_QUOTE_REQUESTS = (
+    select(QuoteRequest)
+    .where(QuoteRequest.status == "PENDING")
+    .order_by(QuoteRequest.created_at.desc())
+)
+_UNPROCESSED_PUBLIC_QUOTE_REQUESTS = (
+    select(PublicQuoteRequest)
+    .where(PublicQuoteRequest.processed == False)
+    .order_by(PublicQuoteRequest.created_at.desc())
+)
+
+
 async def get_pending_quote_requests(db: AsyncSession) -> list[dict]:
     """Get all unprocessed quote requests (both internal and public)."""
-    # Internal quote requests
-    stmt = (
-        select(QuoteRequest, ServiceType, Language)
-        .join(ServiceType, QuoteRequest.service_type_id == ServiceType.id)
-        .join(Language, QuoteRequest.source_language_id == Language.id)
-        .where(QuoteRequest.status == "PENDING")
-        .order_by(QuoteRequest.created_at.desc())
+    reference = await get_reference_data(db)
+    internal_rows, public_rows = await _execute_concurrently(
+        db, _PENDING_QUOTE_REQUESTS, _UNPROCESSED_PUBLIC_QUOTE_REQUESTS,
     )
-    result = await db.execute(stmt)
+
     internal = [
         {
             "type": "internal",
             "id": qr.id,
-            "service_type": stype.name,
-            "language": lang.name,
+            "service_type": reference.service_type(qr.service_type_id),
+            "language": reference.language(qr.source_language_id),
             "requested_date": qr.requested_date.isoformat() if qr.requested_date else None,
             "duration_minutes": qr.duration,
             "location": f"{qr.city}, {qr.state}",
             "created_at": qr.created_at.isoformat() if qr.created_at else None,
         }
-        for qr, stype, lang in result.all()
+        for (qr,) in internal_rows
     ]
-
-    # Public quote requests
-    pub_stmt = (
-        select(PublicQuoteRequest, ServiceType, Language)
-        .join(ServiceType, PublicQuoteRequest.service_type_id == ServiceType.id)
-        .join(Language, PublicQuoteRequest.source_language_id == Language.id)
-        .where(PublicQuoteRequest.processed == False)
-        .order_by(PublicQuoteRequest.created_at.desc())
-    )
-    pub_result = await db.execute(pub_stmt)
     public = [
         {
             "type": "public",
@@ -349,14 +346,14 @@ async def get_pending_quote_requests(db: AsyncSession) -> list[dict]:
             "name": pqr.full_name,
             "company": pqr.company_name,
             "email": pqr.email,
-            "service_type": stype.name,
-            "language": lang.name,
+            "service_type": reference.service_type(pqr.service_type_id),
+            "language": reference.language(pqr.source_language_id),
             "requested_date": pqr.requested_date.isoformat() if pqr.requested_date else None,
             "duration_minutes": pqr.duration,
             "location": f"{pqr.city}, {pqr.state}",
             "created_at": pqr.created_at.isoformat() if pqr.created_at else None,
         }
-        for pqr, stype, lang in pub_result.all()
+        for (pqr,) in public_rows
     ]
 
     return internal + public
@@ -364,6 +361,21 @@ async def get_pending_quote_requests(db: AsyncSession) -> list[dict]:
 
 # ── EmailLog (read/write) ────────────────────────────────────────
 
+def encode_email_cursor(row) -> str:
+    """Opaque keyset cursor for the inbox: ``(received_at, id)`` of the last row."""
+    raw = json.dumps([row.received_at.isoformat(), row.id], separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode()).decode()
+
+
+def decode_email_cursor(cursor: str) -> tuple[datetime, int]:
+    """Inverse of :func:`encode_email_cursor`. Raises ``ValueError`` if malformed."""
+    try:
+        received_at, row_id = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+        return datetime.fromisoformat(received_at), int(row_id)
+    except (TypeError, ValueError, binascii.Error) as exc:
+        raise ValueError("Invalid cursor") from exc
+
+
 async def get_email_logs(
     db: AsyncSession,
     category: str | None = None,
@@ -373,8 +385,15 @@ async def get_email_logs(
     from_email: str | None = None,
     page: int = 1,
     page_size: int = 20,
-) -> tuple[list, int]:
-    """Query EmailLog with optional filters. Returns (rows, total_count)."""
+    cursor: str | None = None,
+    with_total: bool = True,
+) -> tuple[list, int | None, str | None]:
+    """Query EmailLog with optional filters. Returns (rows, total_count, next_cursor).
+
+    With *cursor* the page is found by keyset on ``(received_at, id)`` instead
+    of OFFSET, so deep pages cost the same as the first. *page* is only used
+    without a cursor. ``total_count`` is None when *with_total* is false.
+    """
     stmt = select(EmailLog)
     count_stmt = select(func.count()).select_from(EmailLog)
 
@@ -394,14 +413,25 @@ async def get_email_logs(
         stmt = stmt.where(and_(*filters))
         count_stmt = count_stmt.where(and_(*filters))
 
-    total_result = await db.execute(count_stmt)
-    total = total_result.scalar_one()
-
-    offset = (page - 1) * page_size
-    stmt = stmt.order_by(EmailLog.received_at.desc()).offset(offset).limit(page_size)
-    result = await db.execute(stmt)
+    total = None
+    if with_total:
+        total_result = await db.execute(count_stmt)
+        total = total_result.scalar_one()
+
+    stmt = stmt.order_by(EmailLog.received_at.desc(), EmailLog.id.desc())
+    if cursor:
+        received_at, row_id = decode_email_cursor(cursor)
+        stmt = stmt.where(or_(
+            EmailLog.received_at < received_at,
+            and_(EmailLog.received_at == received_at, EmailLog.id < row_id),
+        ))
+    else:
+        stmt = stmt.offset((page - 1) * page_size)
+    result = await db.execute(stmt.limit(page_size + 1))
     rows = result.scalars().all()
-    return rows, total
+
+    next_cursor = encode_email_cursor(rows[page_size - 1]) if len(rows) > page_size else None
+    return rows[:page_size], total, next_cursor
 
 
 async def mark_email_read(db: AsyncSession, gmail_id: str, is_read: bool = True) -> bool:
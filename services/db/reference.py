@@ -0,0 +1,107 @@
+"""
+In-process cache of the reference tables (Language, ServiceType).
+
+These rows change a few times a year but their names are needed by nearly
+every ADK tool call. Queries select the foreign keys and resolve the names
+here instead of joining both tables (three times for an assignment).
+
+The snapshot follows the version Django bumps on every Language /
+ServiceType change (app.services.reference_data), read from Django's cache
+Redis at most every ``VERSION_CHECK_SECONDS``. Without Redis it is simply
+reloaded every ``TTL_SECONDS``, which also bounds staleness if Redis loses
+the key.
+"""
+import logging
+import time
+from dataclasses import dataclass
+
+import redis.asyncio as aioredis
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from services.db.models import Language, ServiceType
+from shared import instrumentation
+from shared.constants import REFERENCE_DATA_VERSION_REDIS_KEY
+
+logger = logging.getLogger(__name__)
+
+TTL_SECONDS = 300
+VERSION_CHECK_SECONDS = 5
+
+_LANGUAGES = select(Language.id, Language.name)
+_SERVICE_TYPES = select(ServiceType.id, ServiceType.name)
+
+
+@dataclass(frozen=True)
+class ReferenceData:
+    languages: dict[int, str]
+    service_types: dict[int, str]
+    version: int | None = None
+
+    def language(self, language_id: int | None) -> str:
+        return self.languages.get(language_id, "")
+
+    def service_type(self, service_type_id: int | None) -> str:
+        return self.service_types.get(service_type_id, "")
+
+
+_redis_url = ""
+_snapshot: ReferenceData | None = None
+_expires_at = 0.0
+_checked_at = 0.0
+
+
+def configure(redis_url: str) -> None:
+    """Follow the version Django publishes in the cache Redis at *redis_url*."""
+    global _redis_url
+    _redis_url = redis_url
+
+
+async def _shared_version() -> int | None:
+    """Version Django last published, or None if unknown or unreachable."""
+    if not _redis_url:
+        return None
+    client = aioredis.from_url(_redis_url)
+    try:
+        value = await client.get(REFERENCE_DATA_VERSION_REDIS_KEY)
+    except Exception as e:
+        logger.warning(f"Reference data version unavailable: {e}")
+        return None
+    finally:
+        await client.aclose()
+    return int(value) if value is not None else None
+
+
+async def get_reference_data(db: AsyncSession) -> ReferenceData:
+    """Current snapshot, loaded with *db* when missing, expired or behind Django's version."""
+    global _snapshot, _expires_at, _checked_at
+    now = time.monotonic()
+    snapshot = _snapshot
+    if snapshot is not None and now < _expires_at:
+        if now - _checked_at < VERSION_CHECK_SECONDS:
+            instrumentation.record_cache(True)
+            return snapshot
+        version = await _shared_version()
+        _checked_at = now
+        if version is None or version == snapshot.version:
+            instrumentation.record_cache(True)
+            return snapshot
+    else:
+        version = await _shared_version()
+
+    instrumentation.record_cache(False)
+    # No lock: concurrent reloads are idempotent, and ADK tools run each call
+    # on its own event loop, which an asyncio.Lock could not span.
+    languages = dict((await db.execute(_LANGUAGES)).all())
+    service_types = dict((await db.execute(_SERVICE_TYPES)).all())
+    _snapshot = ReferenceData(languages=languages, service_types=service_types, version=version)
+    _expires_at = time.monotonic() + TTL_SECONDS
+    _checked_at = time.monotonic()
+    return _snapshot
+
+
+def invalidate() -> None:
+    """Drop the snapshot; the next lookup reloads it."""
+    global _snapshot, _expires_at
+    _snapshot = None
+    _expires_at = 0.0
@@ -69,27 +69,41 @@ async def get_inbox(
     is_read: Optional[bool] = Query(None),
     is_processed: Optional[bool] = Query(None),
     from_email: Optional[str] = Query(None),
+    cursor: Optional[str] = Query(None, description="next_cursor from the previous page (replaces page)"),
+    include_total: Optional[bool] = Query(None, description="Count matches; defaults to true without a cursor"),
 ):
-    """List emails from the database with optional filters."""
+    """List emails from the database with optional filters.
+
+    Follow ``next_cursor`` for deep pages: it seeks on (received_at, id)
+    instead of OFFSET and skips the COUNT(*) unless ``include_total`` is set.
+    """
     if not _db_factory:
         raise HTTPException(status_code=503, detail="Database not available")
 
     from services.db import queries
 
+    with_total = include_total if include_total is not None else cursor is None
     async with _db_factory() as db:
-        rows, total = await queries.get_email_logs(
-            db,
-            category=category,
-            priority=priority,
-            is_read=is_read,
-            is_processed=is_processed,
-            from_email=from_email,
-            page=page,
-            page_size=page_size,
-        )
+        try:
+            rows, total, next_cursor = await queries.get_email_logs(
+                db,
+                category=category,
+                priority=priority,
+                is_read=is_read,
+                is_processed=is_processed,
+                from_email=from_email,
+                page=page,
+                page_size=page_size,
+                cursor=cursor,
+                with_total=with_total,
+            )
+        except ValueError:
+            raise HTTPException(status_code=400, detail="Invalid cursor")
 
     emails = [EmailLogOut.model_validate(row) for row in rows]
-    return InboxResponse(emails=emails, total=total, page=page, page_size=page_size)
+    return InboxResponse(
+        emails=emails, total=total, page=page, page_size=page_size, next_cursor=next_cursor,
+    )
 
 
 # ── Mark as read ─────────────────────────────────────────────────
@@ -0,0 +1,111 @@
+"""
+FastAPI side of the request instrumentation (shared/instrumentation.py).
+
+``InstrumentationMiddleware`` is a plain ASGI middleware (WebSocket scopes
+pass through untouched): it times each HTTP request, adds the
+``Server-Timing`` header when the response starts and records the request
+in the Prometheus metrics served by ``metrics_response()`` at ``/metrics``.
+``instrument_engine()`` times SQL through SQLAlchemy cursor events, and
+``setup()`` applies the settings and hooks outbound HTTP (Django API,
+Google APIs, Resend).
+"""
+import time
+from urllib.parse import urlsplit
+
+from fastapi import Request, Response
+from sqlalchemy import event
+
+from shared import instrumentation
+from shared.metrics import CONTENT_TYPE, REGISTRY
+
+_QUERY_STARTS = "instrumentation_query_starts"
+
+
+def setup(settings):
+    targets = {}
+    django_host = urlsplit(settings.DJANGO_API_URL).hostname
+    if django_host:
+        targets[django_host.lower()] = "django"
+    instrumentation.configure(
+        slow_request_ms=settings.INSTRUMENTATION_SLOW_REQUEST_MS,
+        slow_query_ms=settings.INSTRUMENTATION_SLOW_QUERY_MS,
+        profile_sample_rate=settings.INSTRUMENTATION_PROFILE_SAMPLE_RATE,
+        profile_dir=settings.INSTRUMENTATION_PROFILE_DIR,
+        targets=targets,
+    )
+    instrumentation.install_http_hooks()
+
+
+def instrument_engine(engine):
+    """Time every statement of *engine* (sync or async) in the request metrics."""
+    sync_engine = getattr(engine, "sync_engine", engine)
+    if event.contains(sync_engine, "before_cursor_execute", _before_cursor_execute):
+        return
+
+    event.listen(sync_engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(sync_engine, "after_cursor_execute", _after_cursor_execute)
+    event.listen(sync_engine, "handle_error", _handle_error)
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault(_QUERY_STARTS, []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    starts = conn.info.get(_QUERY_STARTS)
+    if starts:
+        instrumentation.record_query(time.perf_counter() - starts.pop(), statement)
+
+
+def _handle_error(exception_context):
+    starts = exception_context.connection.info.get(_QUERY_STARTS) if exception_context.connection else None
+    if starts:
+        instrumentation.record_query(time.perf_counter() - starts.pop(), exception_context.statement)
+
+
+def _route(scope):
+    route = scope.get("route")
+    return getattr(route, "path", None) or "unmatched"
+
+
+class InstrumentationMiddleware:
+    def __init__(self, app, server_timing=True):
+        self.app = app
+        self.server_timing = server_timing
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        stats, token = instrumentation.begin()
+        profile = instrumentation.start_profile()
+        status = 500
+
+        async def send_with_timing(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+                if self.server_timing:
+                    header = instrumentation.server_timing(stats, time.perf_counter() - stats.started)
+                    message.setdefault("headers", [])
+                    message["headers"] = list(message["headers"]) + [(b"server-timing", header.encode())]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            instrumentation.end(token)
+            route = _route(scope)
+            duration = instrumentation.finish_request(stats, scope["method"], route, status)
+            if profile is not None:
+                instrumentation.finish_profile(profile, route, duration)
+
+
+def metrics_response(request: Request, token: str = "") -> Response:
+    """Prometheus text format behind bearer *token*; 404 without one."""
+    if not token:
+        return Response(status_code=404)
+    if not instrumentation.bearer_matches(request.headers.get("authorization"), token):
+        return Response(status_code=401)
+    return Response(REGISTRY.render(), media_type=CONTENT_TYPE)
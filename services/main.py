@@ -6,7 +6,7 @@ import asyncio
 import logging
 from contextlib import asynccontextmanager
 
-from fastapi import FastAPI
+from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
 
 from services.config import get_settings
@@ -34,20 +34,28 @@ async def lifespan(app: FastAPI):
     from services.realtime.manager import ConnectionManager
     ws_manager = ConnectionManager()
 
-    from services.realtime.router import set_manager
-    set_manager(ws_manager)
-
-    # ── Redis broadcaster ─────────────────────────────────────────
+    # ── Redis broadcaster + presence registry ─────────────────────
     from services.realtime.broadcaster import RedisBroadcaster
+    from services.realtime.presence import PresenceRegistry
     broadcaster = RedisBroadcaster(ws_manager)
+    presence = None
     redis_task = None
+    presence_task = None
     try:
         await broadcaster.connect()
         redis_task = asyncio.create_task(broadcaster.run_listener_loop())
+        presence = PresenceRegistry(broadcaster.redis, ws_manager, broadcaster.worker_id)
+        ws_manager.on_change = presence.mark_dirty
+        presence_task = asyncio.create_task(presence.run())
+        presence.mark_dirty()
         logger.info("Redis broadcaster started")
     except Exception as e:
+        # The broadcaster still delivers to this worker's sockets
         logger.warning(f"Redis not available, WS broadcast via local only: {e}")
-        broadcaster = None
+        broadcaster.redis = None
+
+    from services.realtime.router import set_manager
+    set_manager(ws_manager, presence, broadcaster.event_log if broadcaster.redis else None)
 
     # ── Tracking deps ─────────────────────────────────────────────
     from services.realtime.tracking import set_tracking_deps
@@ -98,10 +106,16 @@ async def lifespan(app: FastAPI):
     # ── Shutdown ──────────────────────────────────────────────────
     logger.info("Shutting down JHBridge services...")
     sync_task.cancel()
+    if presence_task:
+        presence_task.cancel()
+    if presence:
+        try:
+            await presence.withdraw()
+        except Exception as e:
+            logger.warning(f"Presence withdraw failed: {e}")
     if redis_task:
         redis_task.cancel()
-    if broadcaster:
-        await broadcaster.disconnect()
+    await broadcaster.disconnect()
     await close_db()
     logger.info("Shutdown complete")
 
@@ -126,6 +140,15 @@ def create_app() -> FastAPI:
         allow_headers=["*"],
     )
 
+    # ── Instrumentation (outermost: added last) ───────────────────
+    from services import instrumentation
+    if settings.INSTRUMENTATION_ENABLED:
+        instrumentation.setup(settings)
+        app.add_middleware(
+            instrumentation.InstrumentationMiddleware,
+            server_timing=settings.INSTRUMENTATION_SERVER_TIMING,
+        )
+
     # ── Routers ───────────────────────────────────────────────────
     from services.ai_agent.router import router as ai_router
     from services.ai_agent.queue_router import router as queue_router
@@ -153,6 +176,10 @@ def create_app() -> FastAPI:
     async def health():
         return {"status": "ok", "service": "jhbridge-services"}
 
+    @app.get("/metrics", tags=["System"], include_in_schema=False)
+    async def metrics(request: Request):
+        return instrumentation.metrics_response(request, settings.METRICS_TOKEN)
+
     return app
 
 
@@ -1,38 +1,89 @@
 """
 Redis pub/sub broadcaster — bridges Django signals / Celery tasks
-with the FastAPI WebSocket real-time layer.
+with the FastAPI WebSocket real-time layer, across every FastAPI worker.
 
-- Publishes events from FastAPI to Redis channels
-- Subscribes to Redis channels and forwards messages to WebSocket connections
+Every message published to Redis is wrapped in an envelope tagged with the
+publishing worker's id:
+
+    {"v": 1, "id": "<uuid>", "origin": "<worker id>", "channel": "...", "data": {...}}
+
+``broadcast_event`` delivers to this worker's sockets directly and publishes
+the envelope; each worker's listener forwards envelopes to its own sockets
+but skips those it originated, so every connected client receives an event
+exactly once whichever worker it is attached to. Plain JSON published by
+other services (no envelope) is forwarded as-is.
+
+Events on replayable channels are first appended to the channel's Redis
+Stream (event_log.py) and carry its entry id as ``event_id``, so clients can
+resume with ``?since=``.
+
+Without Redis the broadcaster still delivers locally, so a single worker
+keeps working.
 """
 import asyncio
 import json
 import logging
+import os
+import socket
+import uuid
 
 import redis.asyncio as aioredis
 
 from services.config import get_settings
+from services.realtime.event_log import EventLog
 from services.realtime.events import REDIS_CHANNELS, Channel
 
 logger = logging.getLogger(__name__)
 
+ENVELOPE_VERSION = 1
+
+# Redis channel name -> WebSocket channel
+WS_CHANNELS = {v: k for k, v in REDIS_CHANNELS.items()}
+
+
+def new_worker_id() -> str:
+    return f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:6]}"
+
+
+def make_envelope(channel: str, data: dict, origin: str) -> dict:
+    return {
+        "v": ENVELOPE_VERSION,
+        "id": uuid.uuid4().hex,
+        "origin": origin,
+        "channel": getattr(channel, "value", channel),
+        "data": data,
+    }
+
+
+def open_envelope(message: dict) -> tuple[str | None, dict]:
+    """``(origin, data)`` of a published message; legacy messages have no origin."""
+    if isinstance(message, dict) and message.get("v") == ENVELOPE_VERSION and "data" in message:
+        return message.get("origin"), message["data"]
+    return None, message
+
 
 class RedisBroadcaster:
     """Manages Redis pub/sub for cross-service real-time events."""
 
-    def __init__(self, ws_manager):
+    def __init__(self, ws_manager, worker_id: str | None = None):
         self.settings = get_settings()
         self.ws_manager = ws_manager
+        self.worker_id = worker_id or new_worker_id()
         self.redis = None
         self.pubsub = None
+        self.event_log = None
         self._listener_task = None
 
-    async def connect(self):
-        """Connect to Redis."""
-        self.redis = aioredis.from_url(
+    async def connect(self, redis=None):
+        """Connect to Redis (or adopt an existing client)."""
+        self.redis = redis or aioredis.from_url(
             self.settings.REDIS_URL, decode_responses=True
         )
-        logger.info("Redis broadcaster connected")
+        await self.redis.ping()
+        self.event_log = EventLog(
+            self.redis, self.settings.EVENT_LOG_MAXLEN, self.settings.EVENT_LOG_REPLAY_LIMIT,
+        )
+        logger.info(f"Redis broadcaster connected (worker {self.worker_id})")
 
     async def disconnect(self):
         """Clean shutdown."""
@@ -47,29 +98,60 @@ class RedisBroadcaster:
 
     # ── Publishing ────────────────────────────────────────────────
 
-    async def publish_event(self, channel: str, data: dict):
-        """Publish an event to a Redis channel."""
+    async def publish_event(self, channel: str, data: dict) -> bool:
+        """Publish an event to a Redis channel for every worker. False if not sent."""
         if not self.redis:
-            return
+            return False
         redis_channel = REDIS_CHANNELS.get(channel, f"jhbridge:{channel}")
-        await self.redis.publish(redis_channel, json.dumps(data))
+        envelope = make_envelope(channel, data, self.worker_id)
+        try:
+            await self.redis.publish(redis_channel, json.dumps(envelope))
+        except Exception as e:
+            logger.warning(f"Redis publish on {redis_channel} failed, local delivery only: {e}")
+            return False
+        return True
+
+    async def append_event(self, channel: str, data: dict) -> dict:
+        """Log *data* if its channel is replayable; returns it stamped with ``event_id``."""
+        if not (self.redis and self.event_log):
+            return data
+        try:
+            event_id = await self.event_log.append(channel, data)
+        except Exception as e:
+            logger.warning(f"Event log append on {channel} failed: {e}")
+            return data
+        return {**data, "event_id": event_id} if event_id else data
 
     async def broadcast_event(self, channel: str, data: dict):
-        """Publish to Redis AND broadcast to local WebSocket connections."""
-        await self.publish_event(channel, data)
+        """Deliver to local WebSocket connections and publish for the other workers."""
+        data = await self.append_event(channel, data)
         if self.ws_manager:
             await self.ws_manager.broadcast(channel, data)
+        await self.publish_event(channel, data)
 
     # ── Subscribing ───────────────────────────────────────────────
 
+    async def handle_message(self, redis_channel: str, raw: str):
+        """Forward one pub/sub message to local sockets unless this worker sent it."""
+        ws_channel = WS_CHANNELS.get(redis_channel)
+        if not ws_channel:
+            return
+        try:
+            message = json.loads(raw)
+        except (json.JSONDecodeError, TypeError):
+            return
+        origin, data = open_envelope(message)
+        if origin == self.worker_id:
+            return  # already delivered locally by broadcast_event
+        if self.ws_manager:
+            await self.ws_manager.broadcast(ws_channel, data)
+
     async def start_listener(self):
         """Subscribe to all Redis channels and forward to WebSocket."""
         if not self.redis:
             return
 
         self.pubsub = self.redis.pubsub()
-        redis_to_ws = {v: k for k, v in REDIS_CHANNELS.items()}
-
         await self.pubsub.subscribe(*REDIS_CHANNELS.values())
         logger.info(f"Redis listener subscribed to: {list(REDIS_CHANNELS.values())}")
 
@@ -79,29 +161,18 @@ class RedisBroadcaster:
             async for message in self.pubsub.listen():
                 if message["type"] != "message":
                     continue
-
-                redis_channel = message["channel"]
-                ws_channel = redis_to_ws.get(redis_channel)
-                if not ws_channel:
-                    continue
-
-                try:
-                    data = json.loads(message["data"])
-                except (json.JSONDecodeError, TypeError):
-                    continue
-
-                # Forward to all WebSocket clients on this channel
-                if self.ws_manager:
-                    await self.ws_manager.broadcast(ws_channel, data)
+                await self.handle_message(message["channel"], message["data"])
 
         except asyncio.CancelledError:
             logger.info("Redis listener cancelled")
+            raise
         except Exception as e:
             logger.error(f"Redis listener error: {e}")
+            raise
 
     async def run_listener_loop(self):
         """Wrapper that restarts the listener on failure."""
-        while True:
+        while self.redis:
             try:
                 await self.start_listener()
             except asyncio.CancelledError:
@@ -0,0 +1,93 @@
+"""
+Replayable event log for WebSocket channels, kept in bounded Redis Streams.
+
+Events on ``REPLAYABLE_CHANNELS`` are appended to ``jhbridge:stream:<channel>``
+(XADD, MAXLEN ~ EVENT_LOG_MAXLEN) before they are published; the stream
+entry id — monotonically increasing, ``<ms>-<seq>`` — is stamped on the
+event as ``event_id``. Django appends the same way (app.services.realtime_push).
+
+A client that reconnects with ``?since=<last event_id>`` gets every event
+after that id replayed before live delivery resumes. When the log cannot
+prove nothing was missed — *since* is older than the oldest retained entry,
+newer than the newest (stream recreated), malformed, or more than
+``replay_limit`` events behind — the client is sent ``RESYNC_REQUIRED`` and
+refetches from the API instead.
+"""
+import json
+import logging
+
+from services.realtime.events import Channel
+from shared.constants import REALTIME_REPLAYABLE_CHANNELS, REALTIME_STREAM_KEY
+
+logger = logging.getLogger(__name__)
+
+STREAM_KEY = REALTIME_STREAM_KEY
+
+REPLAYABLE_CHANNELS = frozenset(Channel(name) for name in REALTIME_REPLAYABLE_CHANNELS)
+
+RESYNC_REQUIRED = "RESYNC_REQUIRED"
+
+
+def parse_id(event_id) -> tuple[int, int] | None:
+    """``"1700000000000-3"`` -> ``(1700000000000, 3)``; None if malformed."""
+    try:
+        ms, _, seq = str(event_id).partition("-")
+        return int(ms), int(seq or 0)
+    except ValueError:
+        return None
+
+
+def is_replayable(channel) -> bool:
+    return channel in REPLAYABLE_CHANNELS
+
+
+class EventLog:
+    """Appends events to, and replays them from, per-channel Redis Streams."""
+
+    def __init__(self, redis, maxlen: int = 10000, replay_limit: int = 1000):
+        self.redis = redis
+        self.maxlen = maxlen
+        self.replay_limit = replay_limit
+
+    @staticmethod
+    def key(channel) -> str:
+        return STREAM_KEY.format(getattr(channel, "value", channel))
+
+    async def append(self, channel, data: dict) -> str | None:
+        """Store *data*; returns its stream id (None for non-replayable channels)."""
+        if not is_replayable(channel):
+            return None
+        return await self.redis.xadd(
+            self.key(channel), {"event": json.dumps(data, default=str)},
+            maxlen=self.maxlen, approximate=True,
+        )
+
+    async def replay(self, channel, since: str) -> tuple[list[dict], bool]:
+        """``(events after since, resync_required)``."""
+        after = parse_id(since)
+        if after is None or not is_replayable(channel):
+            return [], True
+        key = self.key(channel)
+        oldest = await self.redis.xrange(key, "-", "+", count=1)
+        newest = await self.redis.xrevrange(key, "+", "-", count=1)
+        if not oldest or parse_id(oldest[0][0]) > after or parse_id(newest[0][0]) < after:
+            return [], True
+
+        start = f"({after[0]}-{after[1]}"  # exclusive
+        entries = await self.redis.xrange(key, start, "+", count=self.replay_limit + 1)
+        if len(entries) > self.replay_limit:
+            return [], True
+        events = []
+        for entry_id, fields in entries:
+            try:
+                event = json.loads(fields["event"])
+            except (KeyError, TypeError, json.JSONDecodeError):
+                logger.warning(f"Skipping unreadable event {entry_id} on {key}")
+                continue
+            event["event_id"] = entry_id
+            events.append(event)
+        return events, False
+
+    async def latest_id(self, channel) -> str | None:
+        newest = await self.redis.xrevrange(self.key(channel), "+", "-", count=1)
+        return newest[0][0] if newest else None
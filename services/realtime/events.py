@@ -3,6 +3,8 @@ Event type enums and channel definitions for WebSocket real-time system.
 """
 from enum import Enum
 
+from shared.constants import REALTIME_REDIS_CHANNELS
+
 
 class EventType(str, Enum):
     # Email events
@@ -43,10 +45,5 @@ class Channel(str, Enum):
     EMAIL_UPDATES = "email-updates"
 
 
-# Redis pub/sub channel names
-REDIS_CHANNELS = {
-    Channel.NOTIFICATIONS: "jhbridge:notifications",
-    Channel.LIVE_TRACKING: "jhbridge:tracking",
-    Channel.ASSIGNMENT_UPDATES: "jhbridge:assignments",
-    Channel.EMAIL_UPDATES: "jhbridge:emails",
-}
+# Redis pub/sub channel names, shared with Django's publisher
+REDIS_CHANNELS = {Channel(name): redis_channel for name, redis_channel in REALTIME_REDIS_CHANNELS.items()}
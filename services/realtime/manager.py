@@ -1,11 +1,28 @@
 """
-WebSocket connection manager — tracks active connections by channel and user.
+WebSocket connection manager — tracks this worker's active connections by
+channel and user. A user may hold several connections (tabs, devices) on
+the same channel; each gets its own connection id.
+
+Cluster-wide counts come from the presence registry (presence.py), which
+publishes ``get_connection_count()`` snapshots of every worker to Redis.
+
+Each connection may narrow what it receives with filters (subscriptions.py);
+``broadcast`` asks the subscription index once per event which connections
+match. Events with a top-level ``recipient_id`` go to that user only.
+
+While a reconnecting client is replayed missed events (event_log.py), live
+events for it are held back and released after the replay, minus any the
+replay already covered, so it sees every event once and in order.
 """
 import logging
+import uuid
 from datetime import datetime, timezone
 
 from fastapi import WebSocket
 
+from services.realtime.event_log import parse_id
+from services.realtime.subscriptions import SubscriptionIndex
+
 logger = logging.getLogger(__name__)
 
 
@@ -13,53 +30,116 @@ class ConnectionManager:
     """Manages WebSocket connections grouped by channel."""
 
     def __init__(self):
-        # {channel: {user_id: WebSocket}}
-        self.connections: dict[str, dict[str, WebSocket]] = {}
+        # {channel: {user_id: {connection_id: WebSocket}}}
+        self.connections: dict[str, dict[str, dict[str, WebSocket]]] = {}
+        self.subscriptions = SubscriptionIndex()
+        self.replaying: dict[str, list[dict]] = {}  # connection id -> held live events
+        self.on_change = None  # called after connect/disconnect (presence)
 
-    async def connect(self, websocket: WebSocket, channel: str, user_id: str):
-        """Accept a WebSocket connection and register it to a channel."""
+    async def connect(self, websocket: WebSocket, channel: str, user_id: str) -> str:
+        """Accept a WebSocket connection and register it to a channel.
+
+        Returns the connection id to pass to ``disconnect``.
+        """
         await websocket.accept()
-        if channel not in self.connections:
-            self.connections[channel] = {}
-        self.connections[channel][user_id] = websocket
-        logger.info(f"WS connected: user={user_id} channel={channel}")
-
-    def disconnect(self, channel: str, user_id: str):
-        """Remove a WebSocket connection."""
-        if channel in self.connections:
-            self.connections[channel].pop(user_id, None)
-            if not self.connections[channel]:
-                del self.connections[channel]
+        connection_id = uuid.uuid4().hex
+        self.connections.setdefault(channel, {}).setdefault(user_id, {})[connection_id] = websocket
+        self.subscriptions.add(channel, connection_id, user_id)
+        logger.info(f"WS connected: user={user_id} channel={channel} conn={connection_id[:8]}")
+        self._changed()
+        return connection_id
+
+    def disconnect(self, channel: str, user_id: str, connection_id: str | None = None):
+        """Remove one connection, or all of the user's connections on *channel*."""
+        users = self.connections.get(channel)
+        if users is None or user_id not in users:
+            return
+        if connection_id is None:
+            for cid in users.pop(user_id):
+                self.subscriptions.remove(channel, cid)
+        else:
+            users[user_id].pop(connection_id, None)
+            self.subscriptions.remove(channel, connection_id)
+            self.replaying.pop(connection_id, None)
+            if not users[user_id]:
+                del users[user_id]
+        if not users:
+            del self.connections[channel]
         logger.info(f"WS disconnected: user={user_id} channel={channel}")
+        self._changed()
 
-    async def send_personal(self, channel: str, user_id: str, data: dict):
-        """Send a message to a specific user on a channel."""
-        ws = self.connections.get(channel, {}).get(user_id)
-        if ws:
-            try:
-                await ws.send_json({
-                    **data,
-                    "timestamp": datetime.now(timezone.utc).isoformat(),
-                })
-            except Exception as e:
-                logger.warning(f"WS send_personal failed: {e}")
-                self.disconnect(channel, user_id)
-
-    async def broadcast(self, channel: str, data: dict):
-        """Broadcast a message to all connections on a channel."""
-        connections = self.connections.get(channel, {})
-        payload = {
+    def subscribe(self, channel: str, connection_id: str, filters: dict | None) -> dict:
+        """Replace a connection's filters (None clears them). Raises FilterError."""
+        return self.subscriptions.subscribe(channel, connection_id, filters)
+
+    def begin_replay(self, connection_id: str):
+        """Hold live events for *connection_id* until ``end_replay``."""
+        self.replaying[connection_id] = []
+
+    async def end_replay(self, websocket: WebSocket, connection_id: str, last_id: str | None):
+        """Release held events newer than the last replayed id."""
+        held = self.replaying.get(connection_id, [])
+        after = parse_id(last_id) if last_id else None
+        # Events keep arriving while we send; drain until none are left
+        while held:
+            payload = held.pop(0)
+            event_id = parse_id(payload.get("event_id")) if payload.get("event_id") else None
+            if after and event_id and event_id <= after:
+                continue
+            await websocket.send_json(payload)
+        self.replaying.pop(connection_id, None)
+
+    def _changed(self):
+        if self.on_change:
+            self.on_change()
+
+    @staticmethod
+    def _stamp(data: dict) -> dict:
+        return {
             **data,
             "timestamp": datetime.now(timezone.utc).isoformat(),
         }
-        disconnected = []
-        for user_id, ws in connections.items():
+
+    async def _send_many(self, channel: str, targets, payload: dict) -> int:
+        """Send *payload* to ``(user_id, connection_id, ws)`` targets; drop dead sockets."""
+        sent = 0
+        dead = []
+        for user_id, connection_id, ws in targets:
+            held = self.replaying.get(connection_id)
+            if held is not None:
+                held.append(payload)
+                sent += 1
+                continue
             try:
                 await ws.send_json(payload)
+                sent += 1
             except Exception:
-                disconnected.append(user_id)
-        for uid in disconnected:
-            self.disconnect(channel, uid)
+                dead.append((user_id, connection_id))
+        for user_id, connection_id in dead:
+            self.disconnect(channel, user_id, connection_id)
+        return sent
+
+    async def send_personal(self, channel: str, user_id: str, data: dict) -> int:
+        """Send a message to every connection of a specific user on a channel."""
+        sockets = self.connections.get(channel, {}).get(user_id, {})
+        targets = [(user_id, cid, ws) for cid, ws in list(sockets.items())]
+        return await self._send_many(channel, targets, self._stamp(data))
+
+    async def broadcast(self, channel: str, data: dict) -> int:
+        """Send a message to every connection on a channel whose filters match it."""
+        if data.get("recipient_id") is not None:
+            return await self.send_personal(channel, str(data["recipient_id"]), data)
+        users = self.connections.get(channel, {})
+        if not users:
+            return 0
+        matched = self.subscriptions.match(channel, data)
+        targets = [
+            (user_id, cid, ws)
+            for user_id, sockets in list(users.items())
+            for cid, ws in list(sockets.items())
+            if cid in matched
+        ]
+        return await self._send_many(channel, targets, self._stamp(data))
 
     def get_channel_users(self, channel: str) -> list[str]:
         """Return list of user IDs connected to a channel."""
@@ -67,4 +147,11 @@ class ConnectionManager:
 
     def get_connection_count(self) -> dict[str, int]:
         """Return connection counts per channel."""
-        return {ch: len(users) for ch, users in self.connections.items()}
+        return {
+            str(getattr(ch, "value", ch)): sum(len(sockets) for sockets in users.values())
+            for ch, users in self.connections.items()
+        }
+
+    def get_user_count(self) -> dict[str, int]:
+        """Return distinct connected users per channel."""
+        return {str(getattr(ch, "value", ch)): len(users) for ch, users in self.connections.items()}
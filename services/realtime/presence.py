@@ -0,0 +1,105 @@
+"""
+Cluster-wide WebSocket presence registry.
+
+Each FastAPI worker publishes a snapshot of its own connections to Redis:
+
+    jhbridge:presence:workers          sorted set, worker id -> last heartbeat
+    jhbridge:presence:worker:<id>      hash, "<channel>:connections" / "<channel>:users"
+
+Snapshots are rewritten shortly after any connect/disconnect and at least
+every ``interval`` seconds; a worker that stops heartbeating (crash, scale
+down) drops out after ``ttl`` seconds, so counts never leak. ``/ws/status``
+sums the live snapshots.
+
+User counts are distinct per worker: a user with tabs on two workers counts
+twice in the cluster total.
+"""
+import asyncio
+import logging
+import time
+
+logger = logging.getLogger(__name__)
+
+WORKERS_KEY = "jhbridge:presence:workers"
+WORKER_KEY = "jhbridge:presence:worker:{}"
+
+
+class PresenceRegistry:
+    """Publishes this worker's connection counts and reads the cluster's."""
+
+    def __init__(self, redis, manager, worker_id: str, ttl: int = 30, interval: int = 10,
+                 clock=time.time):
+        self.redis = redis
+        self.manager = manager
+        self.worker_id = worker_id
+        self.ttl = ttl
+        self.interval = interval
+        self.clock = clock
+        self._dirty = asyncio.Event()
+
+    def mark_dirty(self):
+        """Ask the heartbeat loop to publish soon (connect/disconnect hook)."""
+        self._dirty.set()
+
+    def snapshot(self) -> dict[str, int]:
+        fields = {}
+        for channel, count in self.manager.get_connection_count().items():
+            fields[f"{channel}:connections"] = count
+        for channel, count in self.manager.get_user_count().items():
+            fields[f"{channel}:users"] = count
+        return fields
+
+    async def publish(self):
+        now = self.clock()
+        key = WORKER_KEY.format(self.worker_id)
+        fields = self.snapshot()
+        pipe = self.redis.pipeline()
+        pipe.delete(key)
+        if fields:
+            pipe.hset(key, mapping=fields)
+        pipe.expire(key, self.ttl)
+        pipe.zadd(WORKERS_KEY, {self.worker_id: now})
+        pipe.zremrangebyscore(WORKERS_KEY, "-inf", now - self.ttl)
+        await pipe.execute()
+
+    async def withdraw(self):
+        """Remove this worker from the registry (clean shutdown)."""
+        pipe = self.redis.pipeline()
+        pipe.delete(WORKER_KEY.format(self.worker_id))
+        pipe.zrem(WORKERS_KEY, self.worker_id)
+        await pipe.execute()
+
+    async def cluster_counts(self) -> dict:
+        """``{"workers": n, "channels": {ch: conns}, "users": {ch: users}}`` over live workers."""
+        workers = await self.redis.zrangebyscore(WORKERS_KEY, self.clock() - self.ttl, "+inf")
+        pipe = self.redis.pipeline()
+        for worker_id in workers:
+            pipe.hgetall(WORKER_KEY.format(worker_id))
+        snapshots = await pipe.execute() if workers else []
+
+        channels: dict[str, int] = {}
+        users: dict[str, int] = {}
+        for snapshot in snapshots:
+            for field, value in (snapshot or {}).items():
+                channel, _, kind = field.rpartition(":")
+                target = channels if kind == "connections" else users
+                target[channel] = target.get(channel, 0) + int(value)
+        return {"workers": len(workers), "channels": channels, "users": users}
+
+    async def run(self):
+        """Heartbeat loop: publish on change (debounced) or every ``interval`` seconds."""
+        while True:
+            try:
+                await asyncio.wait_for(self._dirty.wait(), timeout=self.interval)
+                await asyncio.sleep(0.5)  # fold bursts of connects into one write
+            except asyncio.TimeoutError:
+                pass
+            except asyncio.CancelledError:
+                break
+            self._dirty.clear()
+            try:
+                await self.publish()
+            except asyncio.CancelledError:
+                break
+            except Exception as e:
+                logger.warning(f"Presence heartbeat failed: {e}")
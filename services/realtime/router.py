@@ -1,5 +1,17 @@
 """
 WebSocket endpoints for real-time notifications and updates.
+
+Client messages after connecting:
+
+    {"type": "ping"}                              -> {"type": "pong"}
+    {"type": "subscribe", "filters": {...}}       -> {"type": "subscribed", "filters": {...}}
+    {"type": "unsubscribe"}                       -> {"type": "subscribed", "filters": {}}
+
+See services/realtime/subscriptions.py for the filters each channel accepts.
+
+/ws/assignment-updates and /ws/email-updates accept ``?since=<event_id>``
+(the last ``event_id`` the client saw): missed events are replayed first,
+or ``{"type": "RESYNC_REQUIRED"}`` is sent when they are no longer retained.
 """
 import logging
 
@@ -7,19 +19,25 @@ from fastapi import APIRouter, Query, WebSocket, WebSocketDisconnect
 from jose import JWTError, jwt
 
 from services.config import get_settings
+from services.realtime.event_log import RESYNC_REQUIRED, is_replayable
 from services.realtime.events import Channel
+from services.realtime.subscriptions import FilterError
 
 logger = logging.getLogger(__name__)
 
 router = APIRouter(tags=["WebSocket"])
 
-# Connection manager injected at startup
+# Connection manager, presence registry and event log injected at startup
 _manager = None
+_presence = None
+_event_log = None
 
 
-def set_manager(manager):
-    global _manager
+def set_manager(manager, presence=None, event_log=None):
+    global _manager, _presence, _event_log
     _manager = manager
+    _presence = presence
+    _event_log = event_log
 
 
 def _verify_ws_token(token: str) -> dict | None:
@@ -37,81 +55,106 @@ def _verify_ws_token(token: str) -> dict | None:
         return None
 
 
-@router.websocket("/ws/notifications")
-async def ws_notifications(websocket: WebSocket, token: str = Query(...)):
-    """General notification channel for all authenticated users."""
+async def _replay(websocket: WebSocket, channel: Channel, connection_id: str, user_id: str,
+                  since: str):
+    """Send the events missed since *since*, or RESYNC_REQUIRED, then go live."""
+    _manager.begin_replay(connection_id)
+    last_id = None
+    try:
+        if _event_log is None:
+            events, resync = [], True
+        else:
+            try:
+                events, resync = await _event_log.replay(channel, since)
+            except Exception as e:
+                logger.warning(f"Event log replay on {channel} failed: {e}")
+                events, resync = [], True
+        if resync:
+            latest = await _event_log.latest_id(channel) if _event_log else None
+            await websocket.send_json({"type": RESYNC_REQUIRED, "since": since, "latest_event_id": latest})
+        for event in events:
+            recipient = event.get("recipient_id")
+            if recipient is None or str(recipient) == user_id:
+                await websocket.send_json({**event, "replayed": True})
+            last_id = event["event_id"]
+    finally:
+        await _manager.end_replay(websocket, connection_id, last_id)
+
+
+async def _serve(websocket: WebSocket, token: str, channel: Channel, since: str | None = None):
+    """Authenticate, register the connection and answer client messages until it closes."""
     user = _verify_ws_token(token)
     if not user:
         await websocket.close(code=4001, reason="Invalid or missing token")
         return
 
-    await _manager.connect(websocket, Channel.NOTIFICATIONS, user["user_id"])
+    connection_id = await _manager.connect(websocket, channel, user["user_id"])
     try:
+        if since and is_replayable(channel):
+            await _replay(websocket, channel, connection_id, user["user_id"], since)
         while True:
             data = await websocket.receive_json()
-            if data.get("type") == "ping":
-                await websocket.send_json({"type": "pong"})
+            await _handle_client_message(websocket, channel, connection_id, data)
     except WebSocketDisconnect:
-        _manager.disconnect(Channel.NOTIFICATIONS, user["user_id"])
+        pass
+    finally:
+        _manager.disconnect(channel, user["user_id"], connection_id)
+
+
+async def _handle_client_message(websocket: WebSocket, channel: Channel, connection_id: str, data):
+    kind = data.get("type") if isinstance(data, dict) else None
+    if kind == "ping":
+        await websocket.send_json({"type": "pong"})
+    elif kind in ("subscribe", "unsubscribe"):
+        filters = data.get("filters") if kind == "subscribe" else None
+        try:
+            applied = _manager.subscribe(channel, connection_id, filters)
+        except FilterError as e:
+            await websocket.send_json({"type": "error", "detail": str(e)})
+            return
+        await websocket.send_json({"type": "subscribed", "filters": applied})
+
+
+@router.websocket("/ws/notifications")
+async def ws_notifications(websocket: WebSocket, token: str = Query(...)):
+    """General notification channel; per-user Notification rows arrive here directly."""
+    await _serve(websocket, token, Channel.NOTIFICATIONS)
 
 
 @router.websocket("/ws/live-tracking")
 async def ws_live_tracking(websocket: WebSocket, token: str = Query(...)):
-    """Live GPS tracking channel — broadcasts interpreter location updates."""
-    user = _verify_ws_token(token)
-    if not user:
-        await websocket.close(code=4001, reason="Invalid or missing token")
-        return
-
-    await _manager.connect(websocket, Channel.LIVE_TRACKING, user["user_id"])
-    try:
-        while True:
-            data = await websocket.receive_json()
-            if data.get("type") == "ping":
-                await websocket.send_json({"type": "pong"})
-    except WebSocketDisconnect:
-        _manager.disconnect(Channel.LIVE_TRACKING, user["user_id"])
+    """Live GPS tracking channel — interpreter location updates, filterable by
+    interpreter, assignment and map bounding box."""
+    await _serve(websocket, token, Channel.LIVE_TRACKING)
 
 
 @router.websocket("/ws/assignment-updates")
-async def ws_assignment_updates(websocket: WebSocket, token: str = Query(...)):
-    """Assignment lifecycle events channel."""
-    user = _verify_ws_token(token)
-    if not user:
-        await websocket.close(code=4001, reason="Invalid or missing token")
-        return
-
-    await _manager.connect(websocket, Channel.ASSIGNMENT_UPDATES, user["user_id"])
-    try:
-        while True:
-            data = await websocket.receive_json()
-            if data.get("type") == "ping":
-                await websocket.send_json({"type": "pong"})
-    except WebSocketDisconnect:
-        _manager.disconnect(Channel.ASSIGNMENT_UPDATES, user["user_id"])
+async def ws_assignment_updates(websocket: WebSocket, token: str = Query(...),
+                                since: str | None = Query(None)):
+    """Assignment lifecycle events channel, filterable by interpreter and assignment;
+    resumable with ?since=<event_id>."""
+    await _serve(websocket, token, Channel.ASSIGNMENT_UPDATES, since)
 
 
 @router.websocket("/ws/email-updates")
-async def ws_email_updates(websocket: WebSocket, token: str = Query(...)):
-    """Email inbox events channel — new emails, classifications, replies."""
-    user = _verify_ws_token(token)
-    if not user:
-        await websocket.close(code=4001, reason="Invalid or missing token")
-        return
-
-    await _manager.connect(websocket, Channel.EMAIL_UPDATES, user["user_id"])
-    try:
-        while True:
-            data = await websocket.receive_json()
-            if data.get("type") == "ping":
-                await websocket.send_json({"type": "pong"})
-    except WebSocketDisconnect:
-        _manager.disconnect(Channel.EMAIL_UPDATES, user["user_id"])
+async def ws_email_updates(websocket: WebSocket, token: str = Query(...),
+                           since: str | None = Query(None)):
+    """Email inbox events channel — new emails, classifications, replies;
+    filterable by category, resumable with ?since=<event_id>."""
+    await _serve(websocket, token, Channel.EMAIL_UPDATES, since)
 
 
 @router.get("/ws/status")
 async def ws_status():
-    """Get current WebSocket connection counts."""
+    """Get WebSocket connection counts: cluster-wide when Redis is up, else this worker."""
     if not _manager:
         return {"channels": {}}
-    return {"channels": _manager.get_connection_count()}
+    local = _manager.get_connection_count()
+    if _presence:
+        try:
+            cluster = await _presence.cluster_counts()
+            return {**cluster, "local": local, "scope": "cluster"}
+        except Exception as e:
+            logger.warning(f"Presence registry unavailable: {e}")
+    return {"channels": local, "users": _manager.get_user_count(), "workers": 1,
+            "local": local, "scope": "worker"}
@@ -0,0 +1,217 @@
+"""
+Per-connection event filters for the WebSocket channels.
+
+After connecting, a client may narrow what it receives by sending
+
+    {"type": "subscribe", "filters": {"interpreter_ids": [3, 7],
+                                      "bbox": [south, west, north, east]}}
+
+and widen it again with ``{"type": "unsubscribe"}``. A connection without
+filters receives everything on its channel (the previous behaviour).
+
+Filters combine with AND across keys and OR within a key; an event that
+lacks the field a filter restricts on does not match. Which keys each
+channel accepts is listed in ``CHANNEL_FILTERS``.
+
+``SubscriptionIndex`` keeps, per channel, an inverted index from filter
+value to connection ids, so an event is evaluated once — one lookup per
+filter key, plus a scan of the bounding-box subscribers only — rather than
+once per connected socket.
+
+Events addressed to one user (top-level ``recipient_id``) bypass filters;
+the connection manager sends them to that user's connections only.
+"""
+from services.realtime.events import Channel
+
+MAX_FILTER_VALUES = 500
+
+# channel -> filter key -> payload fields offering a value for it
+# ("bbox" reads latitude/longitude)
+CHANNEL_FILTERS = {
+    Channel.NOTIFICATIONS: {},
+    Channel.LIVE_TRACKING: {
+        "interpreter_ids": ("interpreter_id",),
+        "assignment_ids": ("current_assignment_id",),
+        "bbox": ("latitude", "longitude"),
+    },
+    Channel.ASSIGNMENT_UPDATES: {
+        "interpreter_ids": ("interpreter_id",),
+        "assignment_ids": ("assignment_id", "id"),
+    },
+    Channel.EMAIL_UPDATES: {
+        "categories": ("category",),
+    },
+}
+
+
+class FilterError(ValueError):
+    """A subscribe message the channel cannot honour."""
+
+
+def _channel(channel) -> Channel:
+    return channel if isinstance(channel, Channel) else Channel(channel)
+
+
+def parse_filters(channel, raw) -> dict:
+    """Validate a client's ``filters`` object into ``{key: frozenset | bbox tuple}``."""
+    if raw is None:
+        return {}
+    if not isinstance(raw, dict):
+        raise FilterError("filters must be an object")
+    allowed = CHANNEL_FILTERS.get(_channel(channel), {})
+    unknown = set(raw) - set(allowed)
+    if unknown:
+        raise FilterError(f"unsupported filters for this channel: {sorted(unknown)}")
+
+    filters = {}
+    for key, value in raw.items():
+        if key == "bbox":
+            try:
+                south, west, north, east = (float(v) for v in value)
+            except (TypeError, ValueError):
+                raise FilterError("bbox must be [south, west, north, east]")
+            if south > north:
+                raise FilterError("bbox south must not exceed north")
+            filters["bbox"] = (south, west, north, east)
+            continue
+        if not isinstance(value, list) or len(value) > MAX_FILTER_VALUES:
+            raise FilterError(f"{key} must be a list of at most {MAX_FILTER_VALUES} values")
+        # ids compare as strings so 7 and "7" are the same interpreter
+        filters[key] = frozenset(str(v) for v in value)
+    return filters
+
+
+def in_bbox(bbox, latitude, longitude) -> bool:
+    south, west, north, east = bbox
+    if not south <= latitude <= north:
+        return False
+    if west <= east:
+        return west <= longitude <= east
+    return longitude >= west or longitude <= east  # box crosses the antimeridian
+
+
+def event_fields(channel, data: dict) -> dict:
+    """The values an event offers to each of its channel's filter keys."""
+    payload = data.get("payload")
+    if not isinstance(payload, dict):
+        payload = data
+    fields = {}
+    for key, names in CHANNEL_FILTERS.get(channel, {}).items():
+        if key == "bbox":
+            try:
+                fields[key] = (float(payload["latitude"]), float(payload["longitude"]))
+            except (KeyError, TypeError, ValueError):
+                fields[key] = None
+        else:
+            fields[key] = {str(payload[name]) for name in names if payload.get(name) is not None}
+    return fields
+
+
+class ChannelSubscriptions:
+    """Filters of every connection on one channel, indexed by value."""
+
+    def __init__(self, channel: Channel):
+        self.channel = channel
+        self.owners: dict[str, str] = {}  # connection id -> user id
+        self.filters: dict[str, dict] = {}
+        self.restricted: dict[str, set[str]] = {}  # filter key -> connection ids using it
+        # id filter key -> value -> connection ids
+        self.index: dict[str, dict[str, set[str]]] = {
+            key: {} for key in CHANNEL_FILTERS.get(channel, {}) if key != "bbox"
+        }
+
+    def add(self, connection_id: str, user_id: str):
+        self.owners[connection_id] = user_id
+        self.filters[connection_id] = {}
+
+    def remove(self, connection_id: str):
+        self._unindex(connection_id)
+        self.owners.pop(connection_id, None)
+        self.filters.pop(connection_id, None)
+
+    def set_filters(self, connection_id: str, filters: dict):
+        self._unindex(connection_id)
+        self.filters[connection_id] = filters
+        for key, value in filters.items():
+            self.restricted.setdefault(key, set()).add(connection_id)
+            if key in self.index:
+                for item in value:
+                    self.index[key].setdefault(item, set()).add(connection_id)
+
+    def _unindex(self, connection_id: str):
+        for key, value in self.filters.get(connection_id, {}).items():
+            self.restricted.get(key, set()).discard(connection_id)
+            if key in self.index:
+                for item in value:
+                    ids = self.index[key].get(item)
+                    if ids is not None:
+                        ids.discard(connection_id)
+                        if not ids:
+                            del self.index[key][item]
+
+    def match(self, data: dict) -> set[str]:
+        """Connection ids that should receive *data*."""
+        matched = set(self.owners)
+        if not any(self.restricted.values()):
+            return matched
+        fields = event_fields(self.channel, data)
+        for key, restricted in self.restricted.items():
+            if not restricted:
+                continue
+            if key == "bbox":
+                point = fields["bbox"]
+                rejected = {
+                    cid for cid in restricted
+                    if point is None or not in_bbox(self.filters[cid]["bbox"], *point)
+                }
+            else:
+                accepted = set()
+                for value in fields[key]:
+                    accepted |= self.index[key].get(value, set())
+                rejected = restricted - accepted
+            matched -= rejected
+        return matched
+
+
+class SubscriptionIndex:
+    """``ChannelSubscriptions`` for every channel of one worker."""
+
+    def __init__(self):
+        self.channels: dict[str, ChannelSubscriptions] = {}
+
+    def _get(self, channel) -> ChannelSubscriptions:
+        channel = _channel(channel)
+        if channel not in self.channels:
+            self.channels[channel] = ChannelSubscriptions(channel)
+        return self.channels[channel]
+
+    def add(self, channel, connection_id: str, user_id: str):
+        self._get(channel).add(connection_id, user_id)
+
+    def remove(self, channel, connection_id: str):
+        subs = self.channels.get(_channel(channel))
+        if subs is not None:
+            subs.remove(connection_id)
+            if not subs.owners:
+                del self.channels[_channel(channel)]
+
+    def subscribe(self, channel, connection_id: str, raw_filters) -> dict:
+        """Replace a connection's filters; returns them normalised. Raises FilterError."""
+        filters = parse_filters(channel, raw_filters)
+        subs = self.channels.get(_channel(channel))
+        if subs is None or connection_id not in subs.owners:
+            raise FilterError("unknown connection")
+        subs.set_filters(connection_id, filters)
+        return describe(filters)
+
+    def match(self, channel, data: dict) -> set[str]:
+        subs = self.channels.get(_channel(channel))
+        return subs.match(data) if subs else set()
+
+
+def describe(filters: dict) -> dict:
+    """JSON-friendly form of parsed filters (echoed back to the client)."""
+    return {
+        key: list(value) if key == "bbox" else sorted(value)
+        for key, value in filters.items()
+    }
@@ -43,29 +43,23 @@ async def update_location(loc: LocationUpdate):
             "timestamp": datetime.now(timezone.utc),
         })
 
-    # Broadcast to WS live-tracking channel
-    if _manager:
-        await _manager.broadcast(Channel.LIVE_TRACKING, {
-            "type": EventType.INTERPRETER_LOCATION_UPDATE,
-            "payload": {
-                "id": loc_id,
-                "interpreter_id": loc.interpreter_id,
-                "latitude": loc.latitude,
-                "longitude": loc.longitude,
-                "accuracy": loc.accuracy,
-                "is_on_mission": loc.is_on_mission,
-                "current_assignment_id": loc.current_assignment_id,
-            },
-        })
-
-    # Also publish to Redis for cross-service consumption
-    if _broadcaster:
-        await _broadcaster.publish_event(Channel.LIVE_TRACKING, {
-            "type": EventType.INTERPRETER_LOCATION_UPDATE,
+    # One event for local sockets and, through Redis, every other worker
+    event = {
+        "type": EventType.INTERPRETER_LOCATION_UPDATE,
+        "payload": {
+            "id": loc_id,
             "interpreter_id": loc.interpreter_id,
             "latitude": loc.latitude,
             "longitude": loc.longitude,
-        })
+            "accuracy": loc.accuracy,
+            "is_on_mission": loc.is_on_mission,
+            "current_assignment_id": loc.current_assignment_id,
+        },
+    }
+    if _broadcaster:
+        await _broadcaster.broadcast_event(Channel.LIVE_TRACKING, event)
+    elif _manager:
+        await _manager.broadcast(Channel.LIVE_TRACKING, event)
 
     return {"status": "ok", "id": loc_id}
 
@@ -71,9 +71,10 @@ class EmailLogOut(BaseModel):
 
 class InboxResponse(BaseModel):
     emails: list[EmailLogOut]
-    total: int
+    total: Optional[int] = None  # omitted on cursor pages unless include_total=true
     page: int = 1
     page_size: int = 20
+    next_cursor: Optional[str] = None
 
 
 class EmailReadUpdate(BaseModel):
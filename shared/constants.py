@@ -122,3 +122,29 @@ def tz_for_state(state: str) -> str:
     Falls back to Eastern time for unknown/empty states.
     """
     return STATE_TIMEZONES.get((state or '').upper().strip(), DEFAULT_TZ_NAME)
+
+
+# ---------------------------------------------------------------------------
+# Reference data (Language, ServiceType) version
+# ---------------------------------------------------------------------------
+# Bumped by Django (app.services.reference_data) on every change; both services
+# reload their in-process copy when it moves. Django's cache stores it as a
+# plain Redis integer under its own key layout (":<cache version>:<key>"),
+# which is the key the FastAPI service reads.
+REFERENCE_DATA_VERSION_KEY = 'reference-data:version'
+REFERENCE_DATA_VERSION_REDIS_KEY = f':1:{REFERENCE_DATA_VERSION_KEY}'
+
+# ---------------------------------------------------------------------------
+# Realtime (WebSocket) channels
+# ---------------------------------------------------------------------------
+# Django publishes (app.services.realtime_push) on the Redis pub/sub channels
+# the FastAPI workers subscribe to (services/realtime). Events on the
+# replayable channels are first appended to the channel's Redis Stream.
+REALTIME_REDIS_CHANNELS = {
+    'notifications': 'jhbridge:notifications',
+    'live-tracking': 'jhbridge:tracking',
+    'assignment-updates': 'jhbridge:assignments',
+    'email-updates': 'jhbridge:emails',
+}
+REALTIME_STREAM_KEY = 'jhbridge:stream:{}'
+REALTIME_REPLAYABLE_CHANNELS = frozenset({'assignment-updates', 'email-updates'})
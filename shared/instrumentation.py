@@ -0,0 +1,328 @@
+"""
+Request instrumentation shared by the Django app and the FastAPI service.
+
+A request opens a ``RequestStats`` (``begin()``), held in a context variable
+so that every layer below can add to it without being passed anything:
+
+  - SQL statements      ``record_query()`` — Django ``execute_wrapper``,
+                        SQLAlchemy cursor events
+  - cache lookups       ``record_cache()``
+  - outbound HTTP       ``record_http()`` — installed on ``requests``,
+                        ``httplib2`` (Google API clients) and ``httpx`` by
+                        ``install_http_hooks()``; the host decides the target
+                        label (google, resend, django, fastapi, other)
+
+``finish_request()`` folds the stats into the Prometheus metrics of
+shared.metrics and logs slow requests; ``server_timing()`` renders them as a
+``Server-Timing`` header. SQL and HTTP outside a request (Celery tasks,
+background loops) still count in the metrics, under route ``background``.
+
+``start_profile()`` samples requests for cProfile (``profile_sample_rate``),
+one at a time per process; ``finish_profile()`` keeps the profile only if
+the request turned out slow. Under asyncio the profile also contains the
+other tasks the event loop ran meanwhile.
+
+No Django or FastAPI dependency — pure Python only.
+"""
+import cProfile
+import functools
+import hmac
+import logging
+import os
+import random
+import re
+import tempfile
+import threading
+import time
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from urllib.parse import urlsplit
+
+from shared.metrics import REGISTRY
+
+logger = logging.getLogger(__name__)
+
+BACKGROUND = 'background'
+
+REQUESTS = REGISTRY.counter(
+    'http_requests_total', 'HTTP requests served', ('method', 'route', 'status'),
+)
+REQUEST_SECONDS = REGISTRY.histogram(
+    'http_request_duration_seconds', 'Time to produce the response', ('method', 'route'),
+)
+SLOW_REQUESTS = REGISTRY.counter(
+    'http_slow_requests_total', 'Requests slower than the slow-request threshold', ('route',),
+)
+DB_QUERIES = REGISTRY.counter('db_queries_total', 'SQL statements executed', ('route',))
+DB_SECONDS = REGISTRY.histogram('db_query_duration_seconds', 'SQL statement duration')
+SLOW_QUERIES = REGISTRY.counter('db_slow_queries_total', 'SQL statements slower than the slow-query threshold')
+CACHE_REQUESTS = REGISTRY.counter('cache_requests_total', 'Cache lookups by outcome', ('result',))
+OUTBOUND_REQUESTS = REGISTRY.counter(
+    'outbound_http_requests_total', 'Outbound HTTP calls', ('target', 'status'),
+)
+OUTBOUND_SECONDS = REGISTRY.histogram(
+    'outbound_http_duration_seconds', 'Outbound HTTP call duration', ('target',),
+)
+PROFILES = REGISTRY.counter('profiles_captured_total', 'Slow requests saved as cProfile dumps', ('route',))
+
+
+@dataclass
+class Config:
+    slow_request_ms: float = 1000
+    slow_query_ms: float = 200
+    profile_sample_rate: float = 0.0
+    profile_dir: str = os.path.join(tempfile.gettempdir(), 'jhbridge-profiles')
+    # host -> target label for outbound calls (e.g. the other service)
+    targets: dict = field(default_factory=dict)
+
+
+config = Config()
+
+
+def configure(**options):
+    for name, value in options.items():
+        if not hasattr(config, name):
+            raise TypeError(f'Unknown instrumentation option {name!r}')
+        setattr(config, name, value)
+
+
+@dataclass
+class RequestStats:
+    started: float
+    db_count: int = 0
+    db_seconds: float = 0.0
+    cache_hits: int = 0
+    cache_misses: int = 0
+    http_count: int = 0
+    http_seconds: float = 0.0
+
+
+_current = ContextVar('request_stats', default=None)
+
+
+def current():
+    return _current.get()
+
+
+def begin():
+    """Start measuring a request: ``(stats, token)``; pass the token to ``end()``."""
+    stats = RequestStats(started=time.perf_counter())
+    return stats, _current.set(stats)
+
+
+def end(token):
+    _current.reset(token)
+
+
+# ---------------------------------------------------------------------------
+# Recording
+# ---------------------------------------------------------------------------
+def record_query(seconds, sql=''):
+    stats = _current.get()
+    if stats is not None:
+        stats.db_count += 1
+        stats.db_seconds += seconds
+    else:
+        DB_QUERIES.inc(route=BACKGROUND)
+    DB_SECONDS.observe(seconds)
+    if seconds * 1000 >= config.slow_query_ms:
+        SLOW_QUERIES.inc()
+        # Placeholders only: parameter values are never logged
+        logger.warning("Slow query (%.0f ms): %s", seconds * 1000, ' '.join(str(sql).split())[:1000])
+
+
+def record_cache(hit, count=1):
+    stats = _current.get()
+    if stats is not None:
+        if hit:
+            stats.cache_hits += count
+        else:
+            stats.cache_misses += count
+    if count:
+        CACHE_REQUESTS.inc(count, result='hit' if hit else 'miss')
+
+
+def target_for(url):
+    """Target label of an outbound call to *url*."""
+    host = (urlsplit(str(url)).hostname or '').lower()
+    if host in config.targets:
+        return config.targets[host]
+    if host.endswith(('googleapis.com', 'google.com')):
+        return 'google'
+    if host.endswith('resend.com'):
+        return 'resend'
+    return 'other'
+
+
+def record_http(url, seconds, status):
+    target = target_for(url)
+    stats = _current.get()
+    if stats is not None:
+        stats.http_count += 1
+        stats.http_seconds += seconds
+    OUTBOUND_REQUESTS.inc(target=target, status=status)
+    OUTBOUND_SECONDS.observe(seconds, target=target)
+
+
+def finish_request(stats, method, route, status):
+    """Record a finished request in the metrics; returns its duration in seconds."""
+    duration = time.perf_counter() - stats.started
+    REQUESTS.inc(method=method, route=route, status=status)
+    REQUEST_SECONDS.observe(duration, method=method, route=route)
+    if stats.db_count:
+        DB_QUERIES.inc(stats.db_count, route=route)
+    if duration * 1000 >= config.slow_request_ms:
+        SLOW_REQUESTS.inc(route=route)
+        logger.warning(
+            "Slow request %s %s: %.0f ms (%d queries %.0f ms, %d outbound calls %.0f ms)",
+            method, route, duration * 1000, stats.db_count, stats.db_seconds * 1000,
+            stats.http_count, stats.http_seconds * 1000,
+        )
+    return duration
+
+
+def server_timing(stats, total_seconds):
+    """``Server-Timing`` header value for *stats*."""
+    parts = [f'db;dur={stats.db_seconds * 1000:.1f};desc="{stats.db_count} queries"']
+    lookups = stats.cache_hits + stats.cache_misses
+    if lookups:
+        parts.append(f'cache;desc="{stats.cache_hits}/{lookups} hits"')
+    if stats.http_count:
+        parts.append(f'http;dur={stats.http_seconds * 1000:.1f};desc="{stats.http_count} calls"')
+    parts.append(f'total;dur={total_seconds * 1000:.1f}')
+    return ', '.join(parts)
+
+
+def bearer_matches(authorization, token):
+    """True if the ``Authorization`` header carries ``Bearer <token>``."""
+    scheme, _, value = (authorization or '').partition(' ')
+    return scheme.lower() == 'bearer' and hmac.compare_digest(value.strip().encode(), token.encode())
+
+
+# ---------------------------------------------------------------------------
+# Sampled profiling
+# ---------------------------------------------------------------------------
+_profiling = threading.Lock()
+
+
+def start_profile():
+    """A running cProfile.Profile if this request is sampled, else None."""
+    rate = config.profile_sample_rate
+    if rate <= 0 or random.random() >= rate or not _profiling.acquire(blocking=False):
+        return None
+    profile = cProfile.Profile()
+    try:
+        profile.enable()
+    except ValueError:  # another profiler is active in this thread
+        _profiling.release()
+        return None
+    return profile
+
+
+def stop_profile(profile):
+    """Stop *profile* without keeping it."""
+    try:
+        profile.disable()
+    finally:
+        _profiling.release()
+
+
+def finish_profile(profile, route, duration_seconds):
+    """Stop *profile*; dump it to ``profile_dir`` if the request was slow. Returns the path or None."""
+    stop_profile(profile)
+    if duration_seconds * 1000 < config.slow_request_ms:
+        return None
+    os.makedirs(config.profile_dir, exist_ok=True)
+    slug = re.sub(r'[^A-Za-z0-9]+', '-', route).strip('-') or 'root'
+    path = os.path.join(
+        config.profile_dir, f'{time.strftime("%Y%m%dT%H%M%S")}-{slug[:60]}-{duration_seconds * 1000:.0f}ms.prof',
+    )
+    profile.dump_stats(path)
+    PROFILES.inc(route=route)
+    logger.warning("Slow request %s profiled to %s", route, path)
+    return path
+
+
+# ---------------------------------------------------------------------------
+# Outbound HTTP hooks
+# ---------------------------------------------------------------------------
+_hooked = set()
+
+
+def _timed(url, call):
+    started = time.perf_counter()
+    status = 'error'
+    try:
+        response = call()
+        status = getattr(response, 'status_code', None) or getattr(response, 'status', None) or status
+        return response
+    finally:
+        record_http(url, time.perf_counter() - started, status)
+
+
+def _hook_requests():
+    import requests
+
+    original = requests.Session.send
+
+    @functools.wraps(original)
+    def send(self, request, **kwargs):
+        return _timed(request.url, lambda: original(self, request, **kwargs))
+
+    requests.Session.send = send
+
+
+def _hook_httplib2():
+    import httplib2
+
+    original = httplib2.Http.request
+
+    @functools.wraps(original)
+    def request(self, uri, *args, **kwargs):
+        started = time.perf_counter()
+        status = 'error'
+        try:
+            response, content = original(self, uri, *args, **kwargs)
+            status = response.status
+            return response, content
+        finally:
+            record_http(uri, time.perf_counter() - started, status)
+
+    httplib2.Http.request = request
+
+
+def _hook_httpx():
+    import httpx
+
+    original_send = httpx.Client.send
+    original_async_send = httpx.AsyncClient.send
+
+    @functools.wraps(original_send)
+    def send(self, request, **kwargs):
+        return _timed(request.url, lambda: original_send(self, request, **kwargs))
+
+    @functools.wraps(original_async_send)
+    async def async_send(self, request, **kwargs):
+        started = time.perf_counter()
+        status = 'error'
+        try:
+            response = await original_async_send(self, request, **kwargs)
+            status = response.status_code
+            return response
+        finally:
+            record_http(request.url, time.perf_counter() - started, status)
+
+    httpx.Client.send = send
+    httpx.AsyncClient.send = async_send
+
+
+def install_http_hooks():
+    """Time outbound calls of every installed HTTP client library (idempotent)."""
+    for name, hook in (('requests', _hook_requests), ('httplib2', _hook_httplib2), ('httpx', _hook_httpx)):
+        if name in _hooked:
+            continue
+        try:
+            hook()
+        except ImportError:
+            continue
+        _hooked.add(name)
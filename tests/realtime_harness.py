@@ -0,0 +1,267 @@
+"""
+Test harness for the FastAPI realtime layer (services/realtime).
+
+``Cluster`` starts several workers — each with its own ConnectionManager,
+RedisBroadcaster (distinct worker id, running listener) and PresenceRegistry
+— against one shared Redis, and ``FakeSocket`` records what each client
+receives. By default the shared Redis is ``FakeRedis``, an in-memory stand-in
+for the few commands the realtime layer uses; set REALTIME_TEST_REDIS_URL to
+run against a real server, where ``run_worker_process`` also runs workers in
+separate OS processes.
+"""
+import asyncio
+import fnmatch
+import os
+import time
+
+from services.realtime.broadcaster import RedisBroadcaster
+from services.realtime.manager import ConnectionManager
+from services.realtime.presence import PresenceRegistry
+
+REDIS_URL = os.environ.get("REALTIME_TEST_REDIS_URL", "")
+
+
+class FakeSocket:
+    """Stands in for a FastAPI WebSocket; records every JSON message sent."""
+
+    def __init__(self, fail=False):
+        self.sent = []
+        self.accepted = False
+        self.fail = fail
+
+    async def accept(self):
+        self.accepted = True
+
+    async def send_json(self, data):
+        if self.fail:
+            raise RuntimeError("socket closed")
+        self.sent.append(data)
+
+    def events(self, event_type=None):
+        return [m for m in self.sent if event_type is None or m.get("type") == event_type]
+
+
+class FakePubSub:
+    def __init__(self, redis):
+        self.redis = redis
+        self.channels = set()
+        self.queue = asyncio.Queue()
+
+    async def subscribe(self, *channels):
+        self.channels.update(channels)
+        self.redis.subscribers.append(self)
+
+    async def unsubscribe(self, *channels):
+        if self in self.redis.subscribers:
+            self.redis.subscribers.remove(self)
+
+    async def close(self):
+        pass
+
+    async def listen(self):
+        while True:
+            yield await self.queue.get()
+
+
+class FakePipeline:
+    def __init__(self, redis):
+        self.redis = redis
+        self.calls = []
+
+    def __getattr__(self, name):
+        def queue(*args, **kwargs):
+            self.calls.append((name, args, kwargs))
+            return self
+        return queue
+
+    async def execute(self):
+        return [await getattr(self.redis, name)(*args, **kwargs) for name, args, kwargs in self.calls]
+
+
+class FakeRedis:
+    """In-memory Redis subset: pub/sub, hashes, sorted sets, streams, pipelines."""
+
+    def __init__(self):
+        self.subscribers = []
+        self.data = {}
+
+    def pipeline(self):
+        return FakePipeline(self)
+
+    def pubsub(self):
+        return FakePubSub(self)
+
+    async def ping(self):
+        return True
+
+    async def close(self):
+        pass
+
+    async def publish(self, channel, message):
+        receivers = [s for s in self.subscribers if channel in s.channels]
+        for subscriber in receivers:
+            subscriber.queue.put_nowait({"type": "message", "channel": channel, "data": message})
+        return len(receivers)
+
+    async def delete(self, *keys):
+        return sum(1 for key in keys if self.data.pop(key, None) is not None)
+
+    async def expire(self, key, seconds):
+        return key in self.data
+
+    async def keys(self, pattern="*"):
+        return [key for key in self.data if fnmatch.fnmatchcase(key, pattern)]
+
+    async def hset(self, key, mapping=None, **kwargs):
+        self.data.setdefault(key, {}).update({k: str(v) for k, v in (mapping or {}).items()})
+        return len(mapping or {})
+
+    async def hgetall(self, key):
+        return dict(self.data.get(key, {}))
+
+    async def zadd(self, key, mapping):
+        self.data.setdefault(key, {}).update(mapping)
+        return len(mapping)
+
+    async def zrem(self, key, *members):
+        zset = self.data.get(key, {})
+        return sum(1 for member in members if zset.pop(member, None) is not None)
+
+    async def zrangebyscore(self, key, low, high):
+        low = float(low)
+        high = float(high)
+        zset = self.data.get(key, {})
+        return [m for m, score in sorted(zset.items(), key=lambda item: item[1]) if low <= score <= high]
+
+    async def zremrangebyscore(self, key, low, high):
+        doomed = await self.zrangebyscore(key, low, high)
+        return await self.zrem(key, *doomed)
+
+    @staticmethod
+    def _stream_id(entry_id):
+        ms, _, seq = entry_id.partition("-")
+        return int(ms), int(seq or 0)
+
+    async def xadd(self, key, fields, maxlen=None, approximate=True):
+        stream = self.data.setdefault(key, [])
+        ms = int(time.time() * 1000)
+        seq = 0
+        if stream:
+            last_ms, last_seq = self._stream_id(stream[-1][0])
+            if ms <= last_ms:
+                ms, seq = last_ms, last_seq + 1
+        entry_id = f"{ms}-{seq}"
+        stream.append((entry_id, dict(fields)))
+        if maxlen is not None:
+            del stream[:-maxlen]
+        return entry_id
+
+    def _xrange(self, key, low, high):
+        def bound(value, default):
+            if value in ("-", "+"):
+                return default, False
+            exclusive = value.startswith("(")
+            return self._stream_id(value.lstrip("(")), exclusive
+
+        (lo, lo_ex), (hi, hi_ex) = bound(low, (0, 0)), bound(high, (float("inf"), 0))
+        return [
+            (entry_id, fields) for entry_id, fields in self.data.get(key, [])
+            if (lo < self._stream_id(entry_id) if lo_ex else lo <= self._stream_id(entry_id))
+            and (self._stream_id(entry_id) < hi if hi_ex else self._stream_id(entry_id) <= hi)
+        ]
+
+    async def xrange(self, key, min="-", max="+", count=None):
+        return self._xrange(key, min, max)[:count]
+
+    async def xrevrange(self, key, max="+", min="-", count=None):
+        return list(reversed(self._xrange(key, min, max)))[:count]
+
+
+class Worker:
+    """One FastAPI worker's realtime state."""
+
+    def __init__(self, redis, name):
+        self.manager = ConnectionManager()
+        self.broadcaster = RedisBroadcaster(self.manager, worker_id=name)
+        self.presence = PresenceRegistry(redis, self.manager, name)
+        self.redis = redis
+        self.task = None
+
+    async def start(self):
+        await self.broadcaster.connect(self.redis)
+        self.task = asyncio.create_task(self.broadcaster.run_listener_loop())
+        # Let the listener subscribe before anything is published
+        while self.broadcaster.pubsub is None:
+            await asyncio.sleep(0)
+        await asyncio.sleep(0)
+
+    async def stop(self):
+        if self.task:
+            self.task.cancel()
+            try:
+                await self.task
+            except asyncio.CancelledError:
+                pass
+
+    async def connect(self, channel, user_id, socket=None):
+        socket = socket or FakeSocket()
+        connection_id = await self.manager.connect(socket, channel, user_id)
+        return socket, connection_id
+
+
+class Cluster:
+    """``size`` workers sharing one Redis (FakeRedis unless REALTIME_TEST_REDIS_URL is set)."""
+
+    def __init__(self, size=3, redis=None):
+        self.size = size
+        self.redis = redis
+        self.workers = []
+
+    async def __aenter__(self):
+        if self.redis is None:
+            if REDIS_URL:
+                import redis.asyncio as aioredis
+                self.redis = aioredis.from_url(REDIS_URL, decode_responses=True)
+            else:
+                self.redis = FakeRedis()
+        for n in range(self.size):
+            worker = Worker(self.redis, f"worker-{n}")
+            await worker.start()
+            self.workers.append(worker)
+        return self
+
+    async def __aexit__(self, *exc):
+        for worker in self.workers:
+            await worker.stop()
+
+    async def settle(self, rounds=20):
+        """Let listeners forward everything published so far."""
+        for _ in range(rounds):
+            await asyncio.sleep(0.01 if REDIS_URL else 0)
+
+
+def run_worker_process(redis_url, name, channel, publishes, expected, results):
+    """Entry point for one worker in its own process (real Redis only).
+
+    Connects one client, publishes *publishes* events, waits for *expected*
+    deliveries and puts ``(name, received event ids)`` on *results*.
+    """
+    async def main():
+        import redis.asyncio as aioredis
+
+        redis = aioredis.from_url(redis_url, decode_responses=True)
+        worker = Worker(redis, name)
+        await worker.start()
+        socket, _ = await worker.connect(channel, "user-1")
+        await asyncio.sleep(0.5)  # every process subscribed
+        for n in range(publishes):
+            await worker.broadcaster.broadcast_event(channel, {"type": "TEST", "id": f"{name}-{n}"})
+        for _ in range(200):
+            if len(socket.sent) >= expected:
+                break
+            await asyncio.sleep(0.05)
+        await asyncio.sleep(0.2)  # surface any duplicate
+        await worker.stop()
+        results.put((name, [message["id"] for message in socket.sent]))
+
+    asyncio.run(main())
@@ -0,0 +1,159 @@
+"""ADK lookups of services/db/queries.py: results, statements per call, reference cache."""
+import os
+import tempfile
+from datetime import datetime
+from unittest import IsolatedAsyncioTestCase, mock
+
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+from services.db import benchmark, queries, reference
+from services.db.models import (
+    Assignment,
+    Base,
+    Client,
+    Interpreter,
+    InterpreterLanguage,
+    InterpreterStats,
+    Language,
+    PublicQuoteRequest,
+    QuoteRequest,
+    ServiceType,
+    User,
+)
+from services.instrumentation import instrument_engine
+from shared import instrumentation
+
+
+class QueriesTest(IsolatedAsyncioTestCase):
+
+    async def asyncSetUp(self):
+        # A file, not :memory: — concurrent queries each take their own connection
+        tmp = tempfile.mkdtemp()
+        self.addCleanup(os.rmdir, tmp)
+        path = os.path.join(tmp, "db.sqlite3")
+        self.addCleanup(lambda: os.path.exists(path) and os.remove(path))
+        self.engine = create_async_engine(f"sqlite+aiosqlite:///{path}")
+        instrument_engine(self.engine)
+        self.sessions = async_sessionmaker(self.engine, expire_on_commit=False)
+        reference.invalidate()
+        self.addCleanup(reference.invalidate)
+
+        async with self.engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+        now = datetime(2026, 3, 2, 9, 0)
+        async with self.sessions() as db:
+            db.add_all([
+                Language(id=1, name="Portuguese", code="pt"),
+                Language(id=2, name="English", code="en"),
+                ServiceType(id=1, name="Medical"),
+                User(id=1, first_name="Ana", last_name="Silva", email="ana@example.com", username="ana"),
+                User(id=2, first_name="Bo", last_name="Client", email="bo@example.com", username="bo"),
+            ])
+            await db.flush()
+            db.add_all([
+                Interpreter(id=1, user_id=1, city="Boston", state="MA", active=True),
+                Client(id=1, user_id=2, company_name="Acme Health"),
+            ])
+            await db.flush()
+            db.add_all([
+                InterpreterLanguage(id=1, interpreter_id=1, language_id=1, proficiency="NATIVE", is_primary=True),
+                InterpreterLanguage(id=2, interpreter_id=1, language_id=2, proficiency="FLUENT"),
+                InterpreterStats(interpreter_id=1, missions_completed=7, avg_rating=4.5),
+                Assignment(
+                    id=1, interpreter_id=1, client_id=1, service_type_id=1, source_language_id=1,
+                    target_language_id=2, start_time=now, end_time=now, status="CONFIRMED", interpreter_rate=40,
+                ),
+                Assignment(
+                    id=2, client_name="Walk-in", service_type_id=1, source_language_id=2,
+                    target_language_id=1, start_time=now, end_time=now, status="PENDING", interpreter_rate=40,
+                ),
+                QuoteRequest(
+                    id=1, client_id=1, service_type_id=1, source_language_id=1, target_language_id=2,
+                    status="PENDING", city="Boston", state="MA", created_at=now,
+                ),
+                PublicQuoteRequest(
+                    id=1, full_name="Cy", service_type_id=1, source_language_id=2, target_language_id=1,
+                    processed=False, city="Salem", state="MA", created_at=now,
+                ),
+            ])
+            await db.commit()
+
+    async def asyncTearDown(self):
+        await self.engine.dispose()
+
+    async def call(self, query, *args):
+        """(result, statements executed) of one call on a fresh session."""
+        stats, token = instrumentation.begin()
+        try:
+            async with self.sessions() as db:
+                result = await query(db, *args)
+        finally:
+            instrumentation.end(token)
+        return result, stats.db_count
+
+    async def test_assignment_is_one_statement_once_reference_data_is_cached(self):
+        assignment, cold = await self.call(queries.get_assignment_by_id, 1)
+        walk_in, warm = await self.call(queries.get_assignment_by_id, 2)
+
+        self.assertEqual((cold, warm), (3, 1))
+        self.assertEqual(
+            {k: assignment[k] for k in ("interpreter", "client", "service_type", "source_language", "target_language")},
+            {"interpreter": "Ana Silva", "client": "Acme Health", "service_type": "Medical",
+             "source_language": "Portuguese", "target_language": "English"},
+        )
+        self.assertEqual((walk_in["interpreter"], walk_in["client"]), ("", "Walk-in"))
+        self.assertEqual(await self.call(queries.get_assignment_by_id, 99), (None, 1))
+
+    async def test_interpreter_details_in_one_statement(self):
+        await self.call(queries.get_interpreter_by_id, 1)
+        interpreter, count = await self.call(queries.get_interpreter_by_id, 1)
+
+        self.assertEqual(count, 1)
+        self.assertEqual(interpreter["name"], "Ana Silva")
+        self.assertEqual(interpreter["completed_missions"], 7)
+        self.assertEqual(
+            [(lang["name"], lang["proficiency"], lang["is_primary"]) for lang in interpreter["languages"]],
+            [("Portuguese", "NATIVE", True), ("English", "FLUENT", False)],
+        )
+
+    async def test_pending_quote_requests_run_concurrently(self):
+        await self.call(queries.get_pending_quote_requests)
+        pending, count = await self.call(queries.get_pending_quote_requests)
+
+        self.assertEqual(count, 2)
+        self.assertEqual(
+            [(q["type"], q["service_type"], q["language"]) for q in pending],
+            [("internal", "Medical", "Portuguese"), ("public", "Medical", "English")],
+        )
+
+    async def test_reference_data_expires(self):
+        async with self.sessions() as db:
+            first = await reference.get_reference_data(db)
+            self.assertIs(await reference.get_reference_data(db), first)
+            reference.invalidate()
+            self.assertIsNot(await reference.get_reference_data(db), first)
+
+    async def test_reference_data_follows_the_shared_version(self):
+        versions = iter([3, 3, 4])
+
+        async def shared_version():
+            return next(versions)
+
+        with mock.patch.object(reference, "_shared_version", shared_version), \
+                mock.patch.object(reference, "VERSION_CHECK_SECONDS", 0):
+            async with self.sessions() as db:
+                first = await reference.get_reference_data(db)
+                self.assertIs(await reference.get_reference_data(db), first)
+                second = await reference.get_reference_data(db)
+
+        self.assertEqual((first.version, second.version), (3, 4))
+        self.assertIsNot(second, first)
+
+    async def test_benchmark_reports_every_query(self):
+        results = await benchmark.run(self.engine, repeat=2)
+
+        self.assertEqual(
+            {r.name: r.queries for r in results},
+            {"get_assignment_by_id": 1, "get_interpreter_by_id": 1, "get_pending_quote_requests": 2},
+        )
+        self.assertIn("get_pending_quote_requests", benchmark.format_report(results))
@@ -0,0 +1,105 @@
+"""Metrics registry (shared/metrics.py) and FastAPI instrumentation (services/instrumentation.py)."""
+from unittest import IsolatedAsyncioTestCase, TestCase
+
+import httpx
+from fastapi import FastAPI, Request
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from services import instrumentation as fastapi_instrumentation
+from shared import instrumentation
+from shared.metrics import Registry
+
+
+class RegistryTest(TestCase):
+
+    def test_prometheus_text_format(self):
+        registry = Registry()
+        calls = registry.counter('calls_total', 'Calls', ('target',))
+        latency = registry.histogram('latency_seconds', 'Latency', buckets=(0.1, 1))
+        calls.inc(target='go"ogle')
+        calls.inc(2, target='go"ogle')
+        latency.observe(0.05)
+        latency.observe(0.5)
+
+        self.assertEqual(registry.render().splitlines(), [
+            '# HELP calls_total Calls',
+            '# TYPE calls_total counter',
+            'calls_total{target="go\\"ogle"} 3',
+            '# HELP latency_seconds Latency',
+            '# TYPE latency_seconds histogram',
+            'latency_seconds_bucket{le="0.1"} 1',
+            'latency_seconds_bucket{le="1"} 2',
+            'latency_seconds_bucket{le="+Inf"} 2',
+            'latency_seconds_sum 0.55',
+            'latency_seconds_count 2',
+        ])
+
+    def test_labels_must_match(self):
+        calls = Registry().counter('calls_total', 'Calls', ('target',))
+        with self.assertRaises(ValueError):
+            calls.inc(route='x')
+
+    def test_outbound_targets(self):
+        instrumentation.configure(targets={'django.internal': 'django'})
+        self.addCleanup(instrumentation.configure, targets={})
+
+        self.assertEqual(instrumentation.target_for('https://gmail.googleapis.com/gmail/v1/users'), 'google')
+        self.assertEqual(instrumentation.target_for('https://api.resend.com/emails'), 'resend')
+        self.assertEqual(instrumentation.target_for('http://django.internal:8000/api/v1/'), 'django')
+        self.assertEqual(instrumentation.target_for('https://example.com/'), 'other')
+
+
+class FastAPIInstrumentationTest(IsolatedAsyncioTestCase):
+
+    async def asyncSetUp(self):
+        self.engine = create_async_engine('sqlite+aiosqlite://')
+        fastapi_instrumentation.instrument_engine(self.engine)
+        fastapi_instrumentation.instrument_engine(self.engine)  # idempotent
+        app = FastAPI()
+        app.add_middleware(fastapi_instrumentation.InstrumentationMiddleware)
+
+        @app.get('/items/{item_id}')
+        async def item(item_id: int):
+            async with self.engine.connect() as conn:
+                await conn.execute(text('SELECT 1'))
+                await conn.execute(text('SELECT 2'))
+            return {'id': item_id}
+
+        @app.get('/metrics')
+        async def metrics(request: Request):
+            return fastapi_instrumentation.metrics_response(request, token='scrape-me')
+
+        @app.get('/open-metrics')
+        async def open_metrics(request: Request):
+            return fastapi_instrumentation.metrics_response(request, token='')
+
+        self.client = httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url='http://test')
+
+    async def asyncTearDown(self):
+        await self.client.aclose()
+        await self.engine.dispose()
+
+    async def test_server_timing_and_metrics(self):
+        before = instrumentation.REQUESTS.value(method='GET', route='/items/{item_id}', status='200')
+
+        response = await self.client.get('/items/7')
+
+        self.assertEqual(response.status_code, 200)
+        self.assertRegex(response.headers['server-timing'], r'^db;dur=[\d.]+;desc="2 queries", total;dur=')
+        self.assertEqual(
+            instrumentation.REQUESTS.value(method='GET', route='/items/{item_id}', status='200'), before + 1,
+        )
+
+        self.assertEqual((await self.client.get('/open-metrics')).status_code, 404)
+        self.assertEqual((await self.client.get('/metrics')).status_code, 401)
+        scrape = await self.client.get('/metrics', headers={'Authorization': 'Bearer scrape-me'})
+        self.assertIn('http_requests_total{method="GET",route="/items/{item_id}",status="200"}', scrape.text)
+
+    async def test_queries_outside_a_request_count_as_background(self):
+        before = instrumentation.DB_QUERIES.value(route=instrumentation.BACKGROUND)
+
+        async with self.engine.connect() as conn:
+            await conn.execute(text('SELECT 1'))
+
+        self.assertEqual(instrumentation.DB_QUERIES.value(route=instrumentation.BACKGROUND), before + 1)
@@ -0,0 +1,168 @@
+"""Multi-worker fan-out, connection registry and presence for services/realtime."""
+import importlib.util
+import multiprocessing
+import unittest
+from unittest import IsolatedAsyncioTestCase, mock
+
+from realtime_harness import REDIS_URL, Cluster, FakeRedis, FakeSocket, Worker, run_worker_process
+from services.realtime import broadcaster as broadcaster_module
+from services.realtime.events import REDIS_CHANNELS, Channel
+
+
+class FanoutTest(IsolatedAsyncioTestCase):
+
+    async def test_every_client_gets_each_event_once(self):
+        async with Cluster(size=3) as cluster:
+            sockets = [
+                (await worker.connect(Channel.ASSIGNMENT_UPDATES, f"user-{n}"))[0]
+                for n, worker in enumerate(cluster.workers)
+            ]
+
+            await cluster.workers[0].broadcaster.broadcast_event(
+                Channel.ASSIGNMENT_UPDATES, {"type": "ASSIGNMENT_CREATED", "payload": {"id": 7}},
+            )
+            await cluster.settle()
+
+            for socket in sockets:
+                self.assertEqual([m["payload"]["id"] for m in socket.sent], [7])
+
+    async def test_messages_from_other_services_are_forwarded(self):
+        async with Cluster(size=2) as cluster:
+            socket, _ = await cluster.workers[1].connect(Channel.EMAIL_UPDATES, "user-1")
+
+            await cluster.redis.publish(REDIS_CHANNELS[Channel.EMAIL_UPDATES], '{"type": "NEW_EMAIL"}')
+            await cluster.settle()
+
+            self.assertEqual(socket.events("NEW_EMAIL")[0]["type"], "NEW_EMAIL")
+
+    async def test_local_delivery_without_redis(self):
+        worker = Worker(FakeRedis(), "solo")
+        socket, _ = await worker.connect(Channel.NOTIFICATIONS, "user-1")
+
+        await worker.broadcaster.broadcast_event(Channel.NOTIFICATIONS, {"type": "NOTIFICATION"})
+
+        self.assertEqual(len(socket.sent), 1)
+
+    @unittest.skipUnless(importlib.util.find_spec("aiomysql"), "tracking needs the async MySQL driver")
+    async def test_tracking_publishes_one_full_payload(self):
+        from services.realtime import tracking
+
+        async with Cluster(size=2) as cluster:
+            local, _ = await cluster.workers[0].connect(Channel.LIVE_TRACKING, "dispatcher-1")
+            remote, _ = await cluster.workers[1].connect(Channel.LIVE_TRACKING, "dispatcher-2")
+            update = mock.Mock(interpreter_id=3, latitude=42.3, longitude=-71.0, accuracy=5.0,
+                               is_on_mission=True, current_assignment_id=11)
+
+            with mock.patch.object(tracking, "async_session_factory", mock.MagicMock()), \
+                    mock.patch.object(tracking.queries, "save_interpreter_location",
+                                      mock.AsyncMock(return_value=99)):
+                tracking.set_tracking_deps(cluster.workers[0].manager, cluster.workers[0].broadcaster)
+                await tracking.update_location(update)
+            await cluster.settle()
+
+            self.assertEqual(len(local.sent), 1)
+            self.assertEqual(len(remote.sent), 1)
+            for socket in (local, remote):
+                self.assertEqual(socket.sent[0]["payload"]["current_assignment_id"], 11)
+
+
+class ConnectionRegistryTest(IsolatedAsyncioTestCase):
+
+    async def test_second_tab_does_not_replace_first(self):
+        worker = Worker(FakeRedis(), "solo")
+        first, first_id = await worker.connect(Channel.NOTIFICATIONS, "user-1")
+        second, _ = await worker.connect(Channel.NOTIFICATIONS, "user-1")
+
+        sent = await worker.manager.send_personal(Channel.NOTIFICATIONS, "user-1", {"type": "NOTIFICATION"})
+        self.assertEqual(sent, 2)
+
+        worker.manager.disconnect(Channel.NOTIFICATIONS, "user-1", first_id)
+        await worker.manager.broadcast(Channel.NOTIFICATIONS, {"type": "NOTIFICATION"})
+        self.assertEqual((len(first.sent), len(second.sent)), (1, 2))
+        self.assertEqual(worker.manager.get_connection_count(), {"notifications": 1})
+
+    async def test_dead_socket_is_dropped(self):
+        worker = Worker(FakeRedis(), "solo")
+        await worker.connect(Channel.NOTIFICATIONS, "user-1", FakeSocket(fail=True))
+        alive, _ = await worker.connect(Channel.NOTIFICATIONS, "user-1")
+
+        await worker.manager.broadcast(Channel.NOTIFICATIONS, {"type": "NOTIFICATION"})
+
+        self.assertEqual(len(alive.sent), 1)
+        self.assertEqual(worker.manager.get_connection_count(), {"notifications": 1})
+
+
+class PresenceTest(IsolatedAsyncioTestCase):
+
+    async def test_status_counts_every_live_worker(self):
+        async with Cluster(size=2) as cluster:
+            await cluster.workers[0].connect(Channel.LIVE_TRACKING, "user-1")
+            await cluster.workers[0].connect(Channel.LIVE_TRACKING, "user-1")
+            await cluster.workers[1].connect(Channel.LIVE_TRACKING, "user-2")
+            for worker in cluster.workers:
+                await worker.presence.publish()
+
+            counts = await cluster.workers[1].presence.cluster_counts()
+
+            self.assertEqual(counts["workers"], 2)
+            self.assertEqual(counts["channels"]["live-tracking"], 3)
+            self.assertEqual(counts["users"]["live-tracking"], 2)
+
+    async def test_silent_worker_drops_out(self):
+        redis = FakeRedis()
+        now = [1000.0]
+        alive = Worker(redis, "alive")
+        gone = Worker(redis, "gone")
+        for worker in (alive, gone):
+            worker.presence.clock = lambda: now[0]
+            await worker.connect(Channel.NOTIFICATIONS, "user-1")
+        await gone.presence.publish()
+        now[0] += 20
+        await alive.presence.publish()
+        now[0] += 15  # "gone" last seen 35s ago, past the 30s ttl
+
+        counts = await alive.presence.cluster_counts()
+
+        self.assertEqual((counts["workers"], counts["channels"]), (1, {"notifications": 1}))
+
+    async def test_connect_marks_presence_dirty(self):
+        worker = Worker(FakeRedis(), "solo")
+        worker.manager.on_change = worker.presence.mark_dirty
+
+        await worker.connect(Channel.NOTIFICATIONS, "user-1")
+
+        self.assertTrue(worker.presence._dirty.is_set())
+
+
+@unittest.skipUnless(REDIS_URL, "set REALTIME_TEST_REDIS_URL to run workers in separate processes")
+class MultiProcessFanoutTest(unittest.TestCase):
+
+    def test_each_process_delivers_every_event_once(self):
+        processes, publishes = 3, 5
+        context = multiprocessing.get_context("spawn")
+        results = context.Queue()
+        workers = [
+            context.Process(target=run_worker_process, args=(
+                REDIS_URL, f"proc-{n}", Channel.ASSIGNMENT_UPDATES.value, publishes,
+                processes * publishes, results,
+            ))
+            for n in range(processes)
+        ]
+        for process in workers:
+            process.start()
+        received = dict(results.get(timeout=30) for _ in workers)
+        for process in workers:
+            process.join(timeout=10)
+
+        expected = sorted(f"proc-{n}-{i}" for n in range(processes) for i in range(publishes))
+        for name, ids in received.items():
+            self.assertEqual(sorted(ids), expected, name)
+
+
+class EnvelopeTest(unittest.TestCase):
+
+    def test_round_trip_and_legacy(self):
+        envelope = broadcaster_module.make_envelope(Channel.NOTIFICATIONS, {"type": "X"}, "w1")
+        self.assertEqual(envelope["channel"], "notifications")
+        self.assertEqual(broadcaster_module.open_envelope(envelope), ("w1", {"type": "X"}))
+        self.assertEqual(broadcaster_module.open_envelope({"type": "X"}), (None, {"type": "X"}))
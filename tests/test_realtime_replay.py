@@ -0,0 +1,131 @@
+"""Replayable per-channel event log and ?since= resume (services/realtime/event_log.py)."""
+import json
+from unittest import IsolatedAsyncioTestCase
+
+from realtime_harness import Cluster, FakeRedis, FakeSocket, Worker
+from services.realtime import router
+from services.realtime.event_log import RESYNC_REQUIRED, EventLog, parse_id
+from services.realtime.events import Channel
+from shared.constants import REALTIME_REDIS_CHANNELS, REALTIME_STREAM_KEY
+
+
+def status_changed(assignment_id):
+    return {"type": "ASSIGNMENT_STATUS_CHANGED", "payload": {"id": assignment_id}}
+
+
+class EventLogTest(IsolatedAsyncioTestCase):
+
+    async def asyncSetUp(self):
+        self.log = EventLog(FakeRedis(), maxlen=5, replay_limit=3)
+        self.ids = [await self.log.append(Channel.ASSIGNMENT_UPDATES, status_changed(n)) for n in range(5)]
+
+    async def test_ids_increase_and_replay_is_exclusive(self):
+        self.assertEqual(self.ids, sorted(self.ids, key=parse_id))
+
+        events, resync = await self.log.replay(Channel.ASSIGNMENT_UPDATES, self.ids[2])
+
+        self.assertFalse(resync)
+        self.assertEqual([e["payload"]["id"] for e in events], [3, 4])
+        self.assertEqual([e["event_id"] for e in events], self.ids[3:])
+
+    async def test_caught_up_client_gets_nothing(self):
+        self.assertEqual(await self.log.replay(Channel.ASSIGNMENT_UPDATES, self.ids[-1]), ([], False))
+
+    async def test_resync_when_gap_cannot_be_replayed(self):
+        trimmed = self.ids[0]
+        for n in range(5, 8):
+            await self.log.append(Channel.ASSIGNMENT_UPDATES, status_changed(n))
+
+        for since in (trimmed, "garbage", "99999999999999-0"):
+            self.assertEqual(await self.log.replay(Channel.ASSIGNMENT_UPDATES, since), ([], True), since)
+        # still retained, but more than replay_limit behind
+        oldest, _ = (await self.log.redis.xrange(self.log.key(Channel.ASSIGNMENT_UPDATES), count=1))[0]
+        self.assertEqual(await self.log.replay(Channel.ASSIGNMENT_UPDATES, oldest), ([], True))
+
+    async def test_replays_entries_appended_by_django(self):
+        # app.services.realtime_push XADDs the shared stream key itself
+        event_id = await self.log.redis.xadd(
+            REALTIME_STREAM_KEY.format("assignment-updates"), {"event": json.dumps(status_changed(9))},
+        )
+
+        events, resync = await self.log.replay(Channel.ASSIGNMENT_UPDATES, self.ids[-1])
+
+        self.assertFalse(resync)
+        self.assertEqual([(e["event_id"], e["payload"]["id"]) for e in events], [(event_id, 9)])
+
+    async def test_only_replayable_channels_are_logged(self):
+        self.assertIsNone(await self.log.append(Channel.LIVE_TRACKING, {"type": "X"}))
+        self.assertEqual(await self.log.replay(Channel.LIVE_TRACKING, self.ids[0]), ([], True))
+
+
+class ResumeTest(IsolatedAsyncioTestCase):
+
+    async def test_every_worker_delivers_the_same_event_id(self):
+        async with Cluster(size=2) as cluster:
+            local, _ = await cluster.workers[0].connect(Channel.EMAIL_UPDATES, "u1")
+            remote, _ = await cluster.workers[1].connect(Channel.EMAIL_UPDATES, "u2")
+
+            await cluster.workers[0].broadcaster.broadcast_event(
+                Channel.EMAIL_UPDATES, {"type": "NEW_EMAIL", "payload": {"id": 1}},
+            )
+            await cluster.settle()
+
+            self.assertIsNotNone(local.sent[0]["event_id"])
+            self.assertEqual(local.sent[0]["event_id"], remote.sent[0]["event_id"])
+
+    async def test_reconnect_replays_missed_events_then_goes_live(self):
+        async with Cluster(size=1) as cluster:
+            worker = cluster.workers[0]
+            router.set_manager(worker.manager, event_log=worker.broadcaster.event_log)
+            self.addCleanup(router.set_manager, None)
+            first, _ = await worker.connect(Channel.ASSIGNMENT_UPDATES, "u1")
+            await worker.broadcaster.broadcast_event(Channel.ASSIGNMENT_UPDATES, status_changed(1))
+            since = first.sent[-1]["event_id"]
+            for n in (2, 3):
+                await worker.broadcaster.broadcast_event(Channel.ASSIGNMENT_UPDATES, status_changed(n))
+
+            socket = FakeSocket()
+            connection_id = await worker.manager.connect(socket, Channel.ASSIGNMENT_UPDATES, "u1")
+            await router._replay(socket, Channel.ASSIGNMENT_UPDATES, connection_id, "u1", since)
+            await worker.broadcaster.broadcast_event(Channel.ASSIGNMENT_UPDATES, status_changed(4))
+
+            self.assertEqual([m["payload"]["id"] for m in socket.sent], [2, 3, 4])
+            self.assertTrue(all(m.get("replayed") for m in socket.sent[:2]))
+
+    async def test_unknown_offset_gets_resync_signal(self):
+        async with Cluster(size=1) as cluster:
+            worker = cluster.workers[0]
+            router.set_manager(worker.manager, event_log=worker.broadcaster.event_log)
+            self.addCleanup(router.set_manager, None)
+            await worker.broadcaster.broadcast_event(Channel.EMAIL_UPDATES, {"type": "NEW_EMAIL"})
+
+            socket = FakeSocket()
+            connection_id = await worker.manager.connect(socket, Channel.EMAIL_UPDATES, "u1")
+            await router._replay(socket, Channel.EMAIL_UPDATES, connection_id, "u1", "1-0")
+
+            self.assertEqual(socket.sent[0]["type"], RESYNC_REQUIRED)
+            self.assertIsNotNone(socket.sent[0]["latest_event_id"])
+
+
+class HeldEventsTest(IsolatedAsyncioTestCase):
+
+    async def test_live_events_during_replay_are_released_once(self):
+        worker = Worker(FakeRedis(), "solo")
+        socket, connection_id = await worker.connect(Channel.ASSIGNMENT_UPDATES, "u1")
+        worker.manager.begin_replay(connection_id)
+
+        for event_id in ("5-0", "6-0", "7-0"):
+            await worker.manager.broadcast(Channel.ASSIGNMENT_UPDATES, {"type": "X", "event_id": event_id})
+        self.assertEqual(socket.sent, [])
+
+        await worker.manager.end_replay(socket, connection_id, "6-0")  # replay covered 5 and 6
+
+        self.assertEqual([m["event_id"] for m in socket.sent], ["7-0"])
+        self.assertEqual(worker.manager.replaying, {})
+
+
+class SharedChannelsTest(IsolatedAsyncioTestCase):
+
+    async def test_channels_match_what_django_publishes(self):
+        self.assertEqual({c.value for c in Channel}, set(REALTIME_REDIS_CHANNELS))
+        self.assertEqual(EventLog.key(Channel.EMAIL_UPDATES), REALTIME_STREAM_KEY.format("email-updates"))
@@ -0,0 +1,136 @@
+"""Per-connection WebSocket filters (services/realtime/subscriptions.py)."""
+import unittest
+from unittest import IsolatedAsyncioTestCase
+
+from realtime_harness import Cluster, FakeRedis, FakeSocket, Worker
+from services.realtime import router
+from services.realtime.events import Channel
+from services.realtime.subscriptions import FilterError, SubscriptionIndex, in_bbox
+
+
+def location(interpreter_id, lat, lng, assignment_id=None):
+    return {"type": "INTERPRETER_LOCATION_UPDATE", "payload": {
+        "id": 1000 + interpreter_id, "interpreter_id": interpreter_id,
+        "latitude": lat, "longitude": lng, "current_assignment_id": assignment_id,
+    }}
+
+
+class SubscriptionIndexTest(unittest.TestCase):
+
+    def setUp(self):
+        self.index = SubscriptionIndex()
+        for cid in ("all", "by-id", "boston", "both"):
+            self.index.add(Channel.LIVE_TRACKING, cid, f"user-{cid}")
+        self.index.subscribe(Channel.LIVE_TRACKING, "by-id", {"interpreter_ids": [3, "7"]})
+        self.index.subscribe(Channel.LIVE_TRACKING, "boston", {"bbox": [42.2, -71.2, 42.5, -70.9]})
+        self.index.subscribe(Channel.LIVE_TRACKING, "both", {"interpreter_ids": [7],
+                                                             "bbox": [42.2, -71.2, 42.5, -70.9]})
+
+    def match(self, event):
+        return self.index.match(Channel.LIVE_TRACKING, event)
+
+    def test_filters_and_across_keys_or_within(self):
+        self.assertEqual(self.match(location(7, 42.36, -71.06)), {"all", "by-id", "boston", "both"})
+        self.assertEqual(self.match(location(3, 42.36, -71.06)), {"all", "by-id", "boston"})
+        self.assertEqual(self.match(location(7, 40.7, -74.0)), {"all", "by-id"})
+        self.assertEqual(self.match(location(9, 40.7, -74.0)), {"all"})
+
+    def test_missing_field_does_not_match_a_filter_on_it(self):
+        self.assertEqual(self.match({"type": "SYSTEM_ALERT"}), {"all"})
+
+    def test_resubscribe_and_remove_reindex(self):
+        self.index.subscribe(Channel.LIVE_TRACKING, "by-id", {"interpreter_ids": [9]})
+        self.assertIn("by-id", self.match(location(9, 0, 0)))
+        self.assertNotIn("by-id", self.match(location(3, 0, 0)))
+
+        self.index.subscribe(Channel.LIVE_TRACKING, "by-id", None)
+        self.index.remove(Channel.LIVE_TRACKING, "both")
+        self.assertEqual(self.match(location(5, 0, 0)), {"all", "by-id"})
+        subs = self.index.channels[Channel.LIVE_TRACKING]
+        self.assertEqual(subs.index["interpreter_ids"], {})
+
+    def test_rejects_filters_the_channel_cannot_apply(self):
+        self.index.add(Channel.EMAIL_UPDATES, "mail", "user-1")
+        with self.assertRaises(FilterError):
+            self.index.subscribe(Channel.EMAIL_UPDATES, "mail", {"bbox": [0, 0, 1, 1]})
+        with self.assertRaises(FilterError):
+            self.index.subscribe(Channel.LIVE_TRACKING, "all", {"bbox": [0, 0]})
+        with self.assertRaises(FilterError):
+            self.index.subscribe(Channel.LIVE_TRACKING, "all", {"interpreter_ids": "3"})
+
+    def test_bbox_across_antimeridian(self):
+        self.assertTrue(in_bbox((-20, 170, -10, -170), -15, 179))
+        self.assertTrue(in_bbox((-20, 170, -10, -170), -15, -175))
+        self.assertFalse(in_bbox((-20, 170, -10, -170), -15, 0))
+
+
+class FilteredDeliveryTest(IsolatedAsyncioTestCase):
+
+    async def test_each_socket_gets_only_matching_events(self):
+        async with Cluster(size=2) as cluster:
+            watcher, watcher_id = await cluster.workers[1].connect(Channel.ASSIGNMENT_UPDATES, "disp-1")
+            everything, _ = await cluster.workers[1].connect(Channel.ASSIGNMENT_UPDATES, "disp-2")
+            cluster.workers[1].manager.subscribe(Channel.ASSIGNMENT_UPDATES, watcher_id,
+                                                 {"assignment_ids": [42]})
+
+            for assignment_id in (41, 42):
+                await cluster.workers[0].broadcaster.broadcast_event(
+                    Channel.ASSIGNMENT_UPDATES,
+                    {"type": "ASSIGNMENT_STATUS_CHANGED", "payload": {"id": assignment_id}},
+                )
+            await cluster.settle()
+
+            self.assertEqual([m["payload"]["id"] for m in watcher.sent], [42])
+            self.assertEqual([m["payload"]["id"] for m in everything.sent], [41, 42])
+
+    async def test_recipient_id_reaches_only_that_user(self):
+        async with Cluster(size=2) as cluster:
+            mine, _ = await cluster.workers[0].connect(Channel.NOTIFICATIONS, "5")
+            other_tab, _ = await cluster.workers[1].connect(Channel.NOTIFICATIONS, "5")
+            theirs, _ = await cluster.workers[1].connect(Channel.NOTIFICATIONS, "6")
+
+            # Published by Django (app.services.realtime_push): plain JSON, no envelope
+            await cluster.redis.publish(
+                "jhbridge:notifications",
+                '{"type": "NOTIFICATION", "recipient_id": "5", "payload": {"id": 1}}',
+            )
+            await cluster.settle()
+
+            self.assertEqual((len(mine.sent), len(other_tab.sent), len(theirs.sent)), (1, 1, 0))
+
+    async def test_disconnect_drops_subscription(self):
+        worker = Worker(FakeRedis(), "solo")
+        _, connection_id = await worker.connect(Channel.EMAIL_UPDATES, "user-1")
+        worker.manager.subscribe(Channel.EMAIL_UPDATES, connection_id, {"categories": ["QUOTE"]})
+
+        worker.manager.disconnect(Channel.EMAIL_UPDATES, "user-1", connection_id)
+
+        self.assertEqual(worker.manager.subscriptions.channels, {})
+
+
+class ClientMessageTest(IsolatedAsyncioTestCase):
+
+    async def asyncSetUp(self):
+        self.worker = Worker(FakeRedis(), "solo")
+        router.set_manager(self.worker.manager)
+        self.addCleanup(router.set_manager, None)
+        self.socket = FakeSocket()
+        self.connection_id = await self.worker.manager.connect(self.socket, Channel.EMAIL_UPDATES, "u")
+
+    async def send(self, message):
+        await router._handle_client_message(self.socket, Channel.EMAIL_UPDATES, self.connection_id, message)
+        return self.socket.sent[-1]
+
+    async def test_subscribe_is_acknowledged_and_applied(self):
+        reply = await self.send({"type": "subscribe", "filters": {"categories": ["QUOTE"]}})
+        self.assertEqual(reply, {"type": "subscribed", "filters": {"categories": ["QUOTE"]}})
+
+        await self.worker.manager.broadcast(Channel.EMAIL_UPDATES, {"payload": {"category": "SPAM"}})
+        self.assertEqual(len(self.socket.sent), 1)
+
+        reply = await self.send({"type": "unsubscribe"})
+        self.assertEqual(reply["filters"], {})
+
+    async def test_invalid_filters_are_reported(self):
+        reply = await self.send({"type": "subscribe", "filters": {"interpreter_ids": [1]}})
+        self.assertEqual(reply["type"], "error")